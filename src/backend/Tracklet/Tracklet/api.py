@@ -1,14 +1,22 @@
 """Main JSON interface views."""
 
 import collections
+import copy
+import functools
 import json
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.core.exceptions import FieldError
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connection, transaction
 from django.http import JsonResponse
 from django.urls import path, reverse
+from django.utils import translation
 from django.utils.translation import gettext_lazy as _
 from django.views.generic.base import RedirectView
 
@@ -36,6 +44,7 @@ from users.permissions import check_user_permission, prefetch_rule_sets
 from .helpers import plugins_info, str2bool
 from .helpers_email import is_email_configured
 from .mixins import ListAPI, RetrieveUpdateAPI
+from .serializers import BulkCreateSerializerMixin
 from .status import check_system_health, is_worker_running
 from .version import inventreeApiText
 
@@ -523,6 +532,9 @@ class BulkCreateMixin:
                 if has_unique_errors:
                     raise ValidationError(unique_errors)
 
+            if self.can_bulk_create(self.get_serializer_class()):
+                return self.bulk_create_items(data)
+
             with transaction.atomic():
                 for item in data:
                     serializer = self.get_serializer(data=item)
@@ -541,6 +553,72 @@ class BulkCreateMixin:
 
         return super().create(request, *args, **kwargs)
 
+    def can_bulk_create(self, serializer_class) -> bool:
+        """Determine if the vectorized bulk create path can be used.
+
+        - The serializer must opt-in via the BulkCreateSerializerMixin class
+        - The database must return primary keys from bulk inserts
+        """
+        return (
+            issubclass(serializer_class, BulkCreateSerializerMixin)
+            and connection.features.can_return_rows_from_bulk_insert
+        )
+
+    def perform_bulk_create(self, serializer, instances: list) -> list:
+        """Insert the provided (unsaved) instances into the database.
+
+        Arguments:
+            serializer: The serializer instance which validated the first item
+            instances: List of model instances to create
+
+        Returns:
+            The list of created instances
+        """
+        return serializer.bulk_create(instances)
+
+    def bulk_create_items(self, data: list) -> Response:
+        """Validate and create multiple items, using a single insert query.
+
+        Related instances are resolved once for all items (rather than for each item).
+        """
+        # Shared context, which caches related instances across all items
+        context = self.get_serializer_context()
+
+        self.get_serializer(context=context).prefetch_bulk_instances(data)
+
+        item_serializers = []
+        errors = []
+        has_errors = False
+
+        for item in data:
+            serializer = self.get_serializer(data=item, context=context)
+
+            if serializer.is_valid():
+                item_serializers.append(serializer)
+                errors.append([])
+            else:
+                errors.append(serializer.errors)
+                has_errors = True
+
+        if has_errors:
+            raise ValidationError(errors)
+
+        instances = [
+            serializer.build_bulk_instance() for serializer in item_serializers
+        ]
+
+        try:
+            with transaction.atomic():
+                instances = self.perform_bulk_create(item_serializers[0], instances)
+        except DjangoValidationError as exc:
+            raise ValidationError(detail=serializers.as_serializer_error(exc))
+
+        item_serializers[0].bulk_create_complete(instances)
+
+        output = self.get_serializer(instances, many=True, context=context)
+
+        return Response(output.data, status=201)
+
 
 class BulkUpdateMixin(BulkOperationMixin):
     """Mixin class for enabling 'bulk update' operations for various models.
@@ -700,10 +778,32 @@ class APISearchViewSerializer(serializers.Serializer):
     search_regex = serializers.BooleanField(default=False, required=False)
     search_whole = serializers.BooleanField(default=False, required=False)
     search_notes = serializers.BooleanField(default=False, required=False)
+    search_projection = serializers.BooleanField(default=False, required=False)
     limit = serializers.IntegerField(default=1, required=False)
     offset = serializers.IntegerField(default=0, required=False)
 
 
+@functools.cache
+def search_projection_serializer(model, fields: tuple):
+    """Construct a lightweight serializer class for search results.
+
+    A "search projection" only returns a small set of concrete model fields,
+    and does not require any of the (expensive) queryset annotations which are
+    applied by the full API serializer for the given model.
+
+    Arguments:
+        model: The model class to serialize
+        fields: Tuple of field names to include in the projection
+    """
+    meta = type('Meta', (), {'model': model, 'fields': list(fields)})
+
+    return type(
+        f'{model.__name__}SearchSerializer',
+        (serializers.ModelSerializer,),
+        {'Meta': meta},
+    )
+
+
 class APISearchView(GenericAPIView):
     """A general-purpose 'search' API endpoint.
 
@@ -711,6 +811,11 @@ class APISearchView(GenericAPIView):
     to consolidate multiple API requests into a single query.
 
     Is much more efficient and simplifies code!
+
+    - Each requested model type is searched in a separate worker thread
+    - Each search is allotted its own time budget (settings.SEARCH_TIMEOUT), starting when the search starts
+    - Model types which do not complete within their budget return an error entry
+    - If 'search_projection' is specified, a lightweight serializer is used
     """
 
     permission_classes = [Tracklet.permissions.IsAuthenticatedOrReadScope]
@@ -750,6 +855,85 @@ class APISearchView(GenericAPIView):
             'customer': {'is_customer': True},
         }
 
+    def can_search_parallel(self) -> bool:
+        """Determine if the individual searches can be run in parallel.
+
+        Each worker thread uses a separate database connection,
+        which cannot see any uncommitted data from the current transaction.
+        So, we only run in parallel if we are not inside an atomic block.
+        """
+        if getattr(settings, 'SEARCH_WORKERS', 1) <= 1:
+            return False
+
+        return not connection.in_atomic_block
+
+    def search_projection(self, view):
+        """Perform a search against the provided view, using a lightweight serializer.
+
+        Arguments:
+            view: The (initialized) list view to search against
+
+        Returns:
+            The paginated search results, or None if the view does not support projection
+        """
+        fields = getattr(view, 'search_projection_fields', None)
+
+        if not fields:
+            return None
+
+        model = view.serializer_class.Meta.model
+        serializer_class = search_projection_serializer(model, tuple(fields))
+
+        # Note: we do not call view.get_queryset() here,
+        # as that would apply the full set of queryset annotations
+        queryset = view.filter_queryset(model._default_manager.all())
+
+        page = view.paginate_queryset(queryset)
+
+        if page is None:
+            page = queryset
+
+        serializer = serializer_class(
+            page, many=True, context=view.get_serializer_context()
+        )
+
+        return view.get_paginated_response(serializer.data).data
+
+    def run_search(self, view, projection: bool = False, language=None):
+        """Run a single search query against the provided view.
+
+        Arguments:
+            view: The (initialized) list view to search against
+            projection: If True, attempt to use a "search projection" serializer
+            language: Language code to activate for the search (worker threads)
+
+        Returns:
+            A dict of search results for the view
+        """
+        try:
+            with translation.override(language):
+                if projection:
+                    try:
+                        if (results := self.search_projection(view)) is not None:
+                            return results
+                    except FieldError:
+                        # Filtering requires annotations - fallback to the full search
+                        pass
+
+                return view.list(view.request).data
+        except Exception as exc:
+            return {'error': str(exc)}
+
+    def run_search_worker(self, view, projection: bool = False, language=None):
+        """Run a single search query in a worker thread.
+
+        The database connection opened by this thread is closed on completion.
+        """
+        try:
+            return self.run_search(view, projection=projection, language=language)
+        finally:
+            connection.close()
+
     def post(self, request, *args, **kwargs):
         """Perform search query against available models."""
         data = request.data
@@ -769,20 +953,27 @@ class APISearchView(GenericAPIView):
         if 'search' not in data:
             raise ValidationError({'search': 'Search term must be provided'})
 
-        search_filters = self.get_result_filters()
+        projection = helpers.str2bool(data.get('search_projection', False))
 
-        # Create a clone of the request object to modify
-        # Use GET method for the individual list views
-        cloned_request = clone_request(request, 'GET')
+        search_filters = self.get_result_filters()
 
         # Fetch and cache all groups associated with the current user
         groups = prefetch_rule_sets(request.user)
 
-        for key, cls in self.get_result_types().items():
+        result_types = self.get_result_types()
+
+        # Construct a list of views to search against
+        views = {}
+
+        for key, cls in result_types.items():
             # Only return results which are specifically requested
             if key in data:
                 params = data[key]
 
+                # Ignore if the params are wrong
+                if type(params) is not dict:
+                    continue
+
                 for k, v in pass_through_params.items():
                     params[k] = request.data.get(k, v)
 
@@ -791,19 +982,27 @@ class APISearchView(GenericAPIView):
                     for k, v in search_filters[key].items():
                         params[k] = v
 
+                # Order results by relevance when the search index is available
+                if settings.SEARCH_INDEX_ENABLED:
+                    params.setdefault('ordering', '-search_rank')
+
                 # Enforce json encoding
                 params['format'] = 'json'
 
-                # Ignore if the params are wrong
-                if type(params) is not dict:
-                    continue
-
                 view = cls()
 
+                # Create a clone of the request object to modify
+                # Use GET method for the individual list views
+                # Each view requires a separate copy, as they may be run concurrently
+                cloned_request = clone_request(request, 'GET')
+                cloned_request._request = copy.copy(request._request)
+
                 # Override regular query params with specific ones for this search request
                 cloned_request._request.GET = params
                 view.request = cloned_request
                 view.format_kwarg = 'format'
+                view.args = args
+                view.kwargs = kwargs
 
                 # Check permissions and update results dict with particular query
                 model = view.serializer_class.Meta.model
@@ -816,12 +1015,105 @@ class APISearchView(GenericAPIView):
                     }
                     continue
 
-                try:
-                    results[key] = view.list(request, *args, **kwargs).data
-                except Exception as exc:
-                    results[key] = {'error': str(exc)}
+                views[key] = view
+
+        if len(views) > 1 and self.can_search_parallel():
+            results.update(self.search_parallel(views, projection=projection))
+        else:
+            for key, view in views.items():
+                results[key] = self.run_search(view, projection=projection)
+
+        # Return results in a consistent order
+        return Response({key: results[key] for key in result_types if key in results})
+
+    def search_parallel(self, views: dict, projection: bool = False) -> dict:
+        """Run the provided search views concurrently.
+
+        Arguments:
+            views: A dict of {key: view} to search against
+            projection: If True, attempt to use "search projection" serializers
+
+        Returns:
+            A dict of {key: results} for each provided view.
+            Any view which did not complete within its time budget returns an error.
+
+        Each search is allotted its own time budget, which starts when a worker thread picks it up.
+        The total search time is limited to the time required if every search used its full budget.
+        """
+        results = {}
+
+        language = translation.get_language()
+        timeout = float(getattr(settings, 'SEARCH_TIMEOUT', 5))
+        workers = min(int(settings.SEARCH_WORKERS), len(views))
+
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='inventree-search'
+        )
+
+        t_start = time.monotonic()
+
+        # Time at which each search was started (by a worker thread)
+        started = {}
+
+        def run_search(key, view):
+            started[key] = time.monotonic()
+            return self.run_search_worker(
+                view, projection=projection, language=language
+            )
+
+        futures = {
+            key: executor.submit(run_search, key, view) for key, view in views.items()
+        }
+
+        t_limit = t_start + timeout * math.ceil(len(views) / workers)
+
+        pending = dict(futures)
+
+        try:
+            while pending:
+                now = time.monotonic()
+
+                # Searches which have not started yet are only limited by the overall deadline
+                deadlines = {
+                    key: min(started[key] + timeout, t_limit)
+                    if key in started
+                    else t_limit
+                    for key in pending
+                }
+
+                for key, deadline in deadlines.items():
+                    if deadline <= now:
+                        del pending[key]
+
+                if not pending:
+                    break
+
+                done, _ = wait(
+                    list(pending.values()),
+                    timeout=min(deadlines[key] for key in pending) - now,
+                    return_when=FIRST_COMPLETED,
+                )
+
+                for key in [key for key, future in pending.items() if future in done]:
+                    del pending[key]
+        finally:
+            # Do not wait for any slow searches to complete
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for key, future in futures.items():
+            if future.done() and not future.cancelled():
+                results[key] = future.result()
+            else:
+                logger.warning(
+                    "Search for '%s' exceeded time budget of %ss", key, timeout
+                )
+                results[key] = {'error': _('Search timed out')}
+
+        logger.debug(
+            'Searched %s models in %.3fs', len(views), time.monotonic() - t_start
+        )
 
-        return Response(results)
+        return results
 
 
 class GenericMetadataView(RetrieveUpdateAPI):
@@ -1,11 +1,38 @@
 """InvenTree API version information."""
 
 # InvenTree API version
-INVENTREE_API_VERSION = 453
+INVENTREE_API_VERSION = 461
 """Increment this API version number whenever there is a significant change to the API that any clients need to know about."""
 
 INVENTREE_API_TEXT = """
 
+v461 -> 2026-10-19
+    - Adds "load_times" field to the plugin registry status API endpoint
+
+v460 -> 2026-10-19
+    - Adds print job queue status endpoint for label printer machines
+
+v459 -> 2026-10-19
+    - Adds the /api/barcode/batch/ endpoint for processing multiple barcode scans in a single request
+
+v458 -> 2026-10-19
+    - Adds "include_inherited" filter to the StockItemTracking API endpoint, to include tracking entries shared from parent stock items
+
+v457 -> 2026-10-19
+    - Adds "can_build_recursive" field to the part requirements API endpoint
+
+v456 -> 2026-10-19
+    - Adds optional keyset pagination to list endpoints via the "cursor" query parameter
+    - Adds "count" query parameter to list endpoints (exact, estimate, none)
+
+v455 -> 2026-10-19
+    - API list endpoints optionally use a full-text search index for "search" queries
+    - Adds "search_rank" ordering option for search results when the index is enabled
+
+v454 -> 2026-10-19
+    - Adds "search_projection" option to the global search API endpoint
+    - Global search queries for multiple model types are performed concurrently
+
 v453 -> 2026-02-11 : https://github.com/inventree/InvenTree/pull/11244
     - Adds (internal) endpoint to end a observability tooling session
 
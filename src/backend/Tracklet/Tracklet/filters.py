@@ -27,6 +27,11 @@ class InvenTreeDateFilter(rest_filters.DateFilter):
         return super().filter(qs, value)
 
 
+# Name of the annotation applied by the search index, which can be used for ordering
+SEARCH_RANK_FIELD = 'search_rank'
+ORDERING_PARAM = filters.OrderingFilter.ordering_param
+
+
 class InvenTreeSearchFilter(filters.SearchFilter):
     """Custom search filter which allows adjusting of search terms dynamically."""
 
@@ -91,8 +96,66 @@ class InvenTreeSearchFilter(filters.SearchFilter):
 
         return terms
 
+    def use_search_index(self, request, view, queryset) -> bool:
+        """Determine whether the full-text search index can be used for this request.
+
+        The index is only used for plain search queries against indexed models,
+        as regex and whole-word searches require direct field comparison.
+        """
+        import common.search
+
+        if not common.search.search_index_enabled():
+            return False
+
+        if not common.search.is_indexed(queryset.model):
+            return False
+
+        params = request.query_params
+
+        for param in ['search_regex', 'search_whole']:
+            if Tracklet.helpers.str2bool(params.get(param, False)):
+                return False
+
+        if Tracklet.helpers.str2bool(params.get('search_notes', False)):
+            return 'notes' in common.search.get_index_fields(queryset.model)
+
+        return True
+
+    def filter_queryset(self, request, queryset, view):
+        """Filter the queryset against the search index, where available."""
+        search_terms = self.get_search_terms(request)
+
+        if not search_terms or not self.use_search_index(request, view, queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        import common.search
+
+        ordering = request.query_params.get(ORDERING_PARAM, '') or ''
+        ranked = SEARCH_RANK_FIELD in [
+            field.strip().lstrip('-') for field in ordering.split(',')
+        ]
+
+        return common.search.search_queryset(queryset, search_terms, ranked=ranked)
+
+
+class InvenTreeSearchOrderingFilter(filters.OrderingFilter):
+    """OrderingFilter class which allows ordering by search rank.
+
+    The 'search_rank' annotation is applied by InvenTreeSearchFilter,
+    when the search index is used for the request.
+    """
+
+    def get_valid_fields(self, queryset, view, context=None):
+        """Allow ordering by search rank, if the queryset has been ranked by the search filter."""
+        valid_fields = super().get_valid_fields(queryset, view, context=context or {})
+
+        if SEARCH_RANK_FIELD in queryset.query.annotations:
+            valid_fields = [*valid_fields, (SEARCH_RANK_FIELD, SEARCH_RANK_FIELD)]
+
+        return valid_fields
+
 
-class InvenTreeOrderingFilter(filters.OrderingFilter):
+class InvenTreeOrderingFilter(InvenTreeSearchOrderingFilter):
     """Custom OrderingFilter class which allows aliased filtering of related fields.
 
     To use, simply specify this filter in the "filter_backends" section.
@@ -223,7 +286,7 @@ class NumericInFilter(rest_filters.BaseInFilter):
 SEARCH_ORDER_FILTER = [
     drf_backend.DjangoFilterBackend,
     InvenTreeSearchFilter,
-    filters.OrderingFilter,
+    InvenTreeSearchOrderingFilter,
 ]
 
 SEARCH_ORDER_FILTER_ALIAS = [
@@ -0,0 +1,20 @@
+"""Custom management command to rebuild the global barcode index.
+
+- Required after importing a new dataset (which contains linked barcodes)
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Rebuild the global barcode index."""
+
+    def handle(self, *args, **kwargs):
+        """Rebuild the barcode index for all models which support barcodes."""
+        from plugin.base.barcodes.helper import rebuild_barcode_index
+
+        self.stdout.write('Rebuilding barcode index')
+
+        n = rebuild_barcode_index()
+
+        self.stdout.write(f'Created {n} barcode index entries')
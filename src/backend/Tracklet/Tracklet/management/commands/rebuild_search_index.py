@@ -0,0 +1,20 @@
+"""Custom management command to rebuild the full-text search index.
+
+- Required after enabling the search index, or after importing a new dataset
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Rebuild the full-text search index."""
+
+    def handle(self, *args, **kwargs):
+        """Rebuild the search index for all indexed models."""
+        import common.search
+
+        self.stdout.write('Rebuilding search index')
+
+        n = common.search.rebuild_index()
+
+        self.stdout.write(f'Created {n} search index entries')
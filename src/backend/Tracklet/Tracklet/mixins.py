@@ -14,6 +14,7 @@ from Tracklet.helpers import (
     remove_non_printable_characters,
     strip_html_tags,
 )
+from Tracklet.pagination import InvenTreePagination
 from Tracklet.schema import schema_for_view_output_options
 from Tracklet.serializers import FilterableSerializerMixin
 
@@ -132,10 +133,14 @@ class CleanMixin:
 class ListAPI(generics.ListAPIView):
     """View for list API."""
 
+    pagination_class = InvenTreePagination
+
 
 class ListCreateAPI(CleanMixin, generics.ListCreateAPIView):
     """View for list and create API."""
 
+    pagination_class = InvenTreePagination
+
 
 class CreateAPI(CleanMixin, generics.CreateAPIView):
     """View for create API."""
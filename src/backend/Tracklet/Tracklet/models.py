@@ -32,12 +32,117 @@ import Tracklet.format
 import Tracklet.helpers
 import Tracklet.helpers_model
 import Tracklet.sentry
+import Tracklet.tree
 
 logger = structlog.get_logger('inventree')
 
 
 class DiffMixin:
-    """Mixin which can be used to determine which fields have changed, compared to the instance saved to the database."""
+    """Mixin which can be used to determine which fields have changed, compared to the instance saved to the database.
+
+    If FIELD_SNAPSHOT is set, the field values are captured when the instance is
+    loaded from the database (and refreshed after each save). The field deltas are
+    then calculated against this snapshot, rather than re-fetching the instance.
+
+    Mutable values (e.g. JSON metadata) are not captured, as they would need to be copied
+    on every load. Instead, these fields are fetched from the database when the deltas are calculated.
+    """
+
+    # Capture field values on load, rather than re-fetching the instance to calculate deltas
+    FIELD_SNAPSHOT = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Construct an instance from the database, and capture a snapshot of the loaded values."""
+        instance = super().from_db(db, field_names, values)
+
+        if cls.FIELD_SNAPSHOT:
+            instance.take_field_snapshot()
+
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Reload field values from the database, and update the snapshot."""
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+
+        if self.FIELD_SNAPSHOT:
+            self.take_field_snapshot(fields=fields)
+
+    def save(self, *args, **kwargs):
+        """Save the instance, and update the snapshot to match the saved values."""
+        super().save(*args, **kwargs)
+
+        if self.FIELD_SNAPSHOT:
+            self.take_field_snapshot()
+
+    def take_field_snapshot(self, fields: Optional[list] = None):
+        """Capture the current field values of this instance.
+
+        Arguments:
+            fields: Optional list of field names to update (default = all loaded fields)
+        """
+        deferred = self.get_deferred_fields()
+        snapshot = getattr(self, '_field_snapshot', None) or {}
+
+        if fields is None:
+            snapshot = {}
+
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+
+            if fields is not None and not {field.name, field.attname} & set(fields):
+                continue
+
+            value = getattr(self, field.attname)
+
+            if isinstance(value, (dict, list)):
+                # Mutable values can be edited in-place, so are fetched when required
+                snapshot.pop(field.attname, None)
+                continue
+
+            snapshot[field.attname] = value
+
+        self._field_snapshot = snapshot
+
+    def get_snapshot_instance(self):
+        """Return an instance constructed from the field snapshot.
+
+        Any fields which are not included in the snapshot (e.g. mutable values)
+        are fetched from the database, with a single query.
+
+        Returns:
+            object: Instance of the object (as loaded), or None if a snapshot is not available
+        """
+        snapshot = getattr(self, '_field_snapshot', None)
+
+        if not self.pk or not snapshot:
+            return None
+
+        fields = self._meta.concrete_fields
+        values = dict(snapshot)
+
+        if missing := [
+            field.attname for field in fields if field.attname not in values
+        ]:
+            row = (
+                self.__class__.objects
+                .using(self._state.db)
+                .filter(pk=self.pk)
+                .values(*missing)
+                .first()
+            )
+
+            if row is None:
+                return None
+
+            values.update(row)
+
+        return self.__class__.from_db(
+            self._state.db,
+            [field.attname for field in fields],
+            [values[field.attname] for field in fields],
+        )
 
     def get_db_instance(self):
         """Return the instance of the object saved in the database.
@@ -45,6 +150,9 @@ class DiffMixin:
         Returns:
             object: Instance of the object saved in the database
         """
+        if self.FIELD_SNAPSHOT and (instance := self.get_snapshot_instance()):
+            return instance
+
         if self.pk:
             try:
                 return self.__class__.objects.get(pk=self.pk)
@@ -73,6 +181,10 @@ class DiffMixin:
             if field.name == 'id':
                 continue
 
+            # Compare the raw values first, to avoid fetching related objects
+            if getattr(self, field.attname) == getattr(db_instance, field.attname):
+                continue
+
             if getattr(self, field.name) != getattr(db_instance, field.name):
                 deltas[field.name] = {
                     'old': getattr(db_instance, field.name),
@@ -627,7 +739,13 @@ class InvenTreeParameterMixin(InvenTreePermissionCheckMixin, models.Model):
         """
         params = {}
 
-        for parameter in self.parameters.all().prefetch_related('template'):
+        parameters = self.parameters
+
+        if parameters._result_cache is None:
+            # Not pre-fetched - fetch the parameter templates in the same query
+            parameters = parameters.select_related('template')
+
+        for parameter in parameters:
             params[parameter.template.name] = parameter.data
 
         return params
@@ -905,8 +1023,10 @@ class InvenTreeTree(ContentTypeMixin, MPTTModel):
         parent = getattr(self, self.NODE_PARENT_KEY, None)
 
         if db_instance:
+            parent_key = self._meta.get_field(self.NODE_PARENT_KEY).attname
+
             # If the tree_id or parent has changed, we need to rebuild the tree
-            if getattr(db_instance, self.NODE_PARENT_KEY) != parent:
+            if getattr(db_instance, parent_key) != getattr(self, parent_key):
                 trees.add(db_instance.tree_id)
             if db_instance.tree_id != self.tree_id:
                 trees.add(self.tree_id)
@@ -919,7 +1039,7 @@ class InvenTreeTree(ContentTypeMixin, MPTTModel):
             if tree_id:
                 self.partial_rebuild(tree_id)
 
-        if len(trees) > 0:
+        if len(trees) > 0 and not Tracklet.tree.is_rebuild_deferred():
             # A tree update was performed, so we need to refresh the instance
             try:
                 self.refresh_from_db()
@@ -935,7 +1055,11 @@ class InvenTreeTree(ContentTypeMixin, MPTTModel):
         """Perform a partial rebuild of the tree structure.
 
         If a failure occurs, log the error and return False.
+        If tree rebuilds are currently deferred, the tree is marked for a later rebuild.
         """
+        if Tracklet.tree.mark_tree_dirty(self.__class__, tree_id):
+            return True
+
         try:
             self.__class__.objects.partial_rebuild(tree_id)
             return True
@@ -1361,6 +1485,7 @@ class InvenTreeBarcodeMixin(models.Model):
 
         if save:
             self.save()
+            self.update_barcode_index()
 
         return True
 
@@ -1370,6 +1495,13 @@ class InvenTreeBarcodeMixin(models.Model):
         self.barcode_hash = ''
 
         self.save()
+        self.update_barcode_index()
+
+    def update_barcode_index(self):
+        """Update the global barcode index for this model instance."""
+        from plugin.base.barcodes.helper import update_barcode_index
+
+        update_barcode_index(self)
 
 
 def notify_staff_users_of_error(instance, label: str, context: dict):
@@ -0,0 +1,412 @@
+"""Pagination classes for the Tracklet API.
+
+By default, list endpoints use limit / offset pagination. For large tables,
+deep pages become progressively slower (the database must skip over OFFSET rows),
+and each page also requires a full COUNT(*) query.
+
+Clients can opt-in to "keyset" (cursor) pagination by providing the 'cursor'
+query parameter. In this mode, each page is fetched by filtering against the
+ordering values of the last item on the previous page, which has a constant
+cost regardless of how deep into the result set the client is.
+
+The 'count' query parameter can be used to control how the total count is calculated:
+- exact: Perform a full COUNT(*) query (default for limit / offset pagination)
+- estimate: Use the query planner estimate (PostgreSQL only, otherwise exact)
+- none: Do not calculate the total count (default for cursor pagination)
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.expressions import OrderBy
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+
+COUNT_MODES = [COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE]
+
+# Prefix for the annotations used to order and filter keyset pages
+KEYSET_PREFIX = '_keyset_'
+
+
+class KeysetCursorEncoder(DjangoJSONEncoder):
+    """JSON encoder for cursor values.
+
+    Datetime values are encoded with full (microsecond) precision,
+    otherwise items could be skipped or repeated across page boundaries.
+    """
+
+    def default(self, o):
+        """Encode the provided object."""
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+
+        return super().default(o)
+
+
+class InvenTreePagination(LimitOffsetPagination):
+    """Limit / offset pagination, with optional keyset (cursor) pagination.
+
+    - Provide the 'cursor' query parameter (empty for the first page) to use keyset pagination
+    - The 'next' link contains the cursor for the following page
+    - Keyset pagination is forward-only, the 'previous' link is always null
+
+    Keyset pagination uses the ordering applied to the queryset
+    (e.g. by the InvenTreeOrderingFilter), with the primary key as a tie-breaker.
+    Null values are sorted according to the database default (as for limit / offset pagination).
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_query_description = _(
+        'Cursor for keyset pagination (leave empty for the first page)'
+    )
+
+    count_query_param = 'count'
+    count_query_description = _(
+        'Method used to calculate the total count (exact, estimate, none)'
+    )
+
+    # Number of results returned when using a cursor without a limit
+    cursor_default_limit = 100
+
+    # Planner estimates below this value are replaced with an exact count
+    estimate_threshold = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate the provided queryset."""
+        self.request = request
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        self.count_mode = self.get_count_mode(request)
+
+        if self.cursor_mode:
+            return self.paginate_cursor(queryset, request)
+
+        if self.count_mode == COUNT_EXACT:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.limit = self.get_limit(request)
+
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count = self.get_count(queryset)
+
+        # Fetch an additional item to determine if there is a following page
+        items = list(queryset[self.offset : self.offset + self.limit + 1])
+        self.has_next = len(items) > self.limit
+
+        return items[: self.limit]
+
+    def paginate_cursor(self, queryset, request):
+        """Paginate the provided queryset using keyset pagination."""
+        self.limit = self.get_limit(request) or self.cursor_default_limit
+        self.offset = 0
+        self.count = self.get_count(queryset)
+
+        ordering = self.get_keyset_ordering(queryset)
+        queryset = self.apply_keyset_ordering(queryset, ordering)
+
+        if values := self.decode_cursor(request, ordering):
+            queryset = queryset.filter(
+                self.get_keyset_filter(
+                    ordering, values, nulls_largest=self.nulls_largest(queryset)
+                )
+            )
+
+        items = list(queryset[: self.limit + 1])
+        self.has_next = len(items) > self.limit
+        items = items[: self.limit]
+
+        self.next_cursor = None
+
+        if self.has_next:
+            last = items[-1]
+            self.next_cursor = self.encode_cursor(
+                ordering,
+                [getattr(last, f'{KEYSET_PREFIX}{i}') for i in range(len(ordering))],
+            )
+
+        return items
+
+    def get_count_mode(self, request) -> str:
+        """Return the count mode for the provided request."""
+        default = COUNT_NONE if self.cursor_mode else COUNT_EXACT
+        mode = request.query_params.get(self.count_query_param, '') or default
+        mode = str(mode).strip().lower()
+
+        if mode not in COUNT_MODES:
+            raise ValidationError({
+                self.count_query_param: _('Invalid count option')
+                + f': {", ".join(COUNT_MODES)}'
+            })
+
+        return mode
+
+    def get_count(self, queryset):
+        """Return the total count for the queryset, based on the count mode."""
+        if self.count_mode == COUNT_NONE:
+            return None
+
+        if self.count_mode == COUNT_ESTIMATE:
+            estimate = self.estimate_count(queryset)
+
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+
+        return super().get_count(queryset)
+
+    def estimate_count(self, queryset):
+        """Return the query planner estimate for the number of rows in the queryset.
+
+        Returns None if an estimate is not available for the database backend.
+        """
+        connection = connections[queryset.db]
+
+        if connection.vendor != 'postgresql':
+            return None
+
+        sql, params = queryset.order_by().query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        try:
+            return int(plan[0]['Plan']['Plan Rows'])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
+
+    def nulls_largest(self, queryset) -> bool:
+        """Return True if the database sorts null values as if they were larger than any other value.
+
+        This is the case for PostgreSQL and Oracle, whereas SQLite and MySQL sort null values first.
+        """
+        return connections[queryset.db].vendor in ['postgresql', 'oracle']
+
+    def get_keyset_ordering(self, queryset) -> list:
+        """Return the ordering for the queryset as a list of (field, descending) tuples.
+
+        The primary key is appended as a tie-breaker, so that the ordering is unique.
+        """
+        ordering = list(queryset.query.order_by)
+
+        if not ordering and queryset.query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+
+        pk_names = {'pk', queryset.model._meta.pk.name, queryset.model._meta.pk.attname}
+
+        result = []
+
+        for item in ordering:
+            if isinstance(item, str) and item != '?':
+                descending = item.startswith('-')
+                name = item.removeprefix('-')
+            elif isinstance(item, OrderBy) and isinstance(item.expression, F):
+                descending = item.descending
+                name = item.expression.name
+            elif isinstance(item, F):
+                descending = False
+                name = item.name
+            else:
+                raise ValidationError({
+                    self.cursor_query_param: _(
+                        'Cursor pagination is not supported for the requested ordering'
+                    )
+                })
+
+            if name in pk_names:
+                name = 'pk'
+
+            if name in [field for field, _descending in result]:
+                continue
+
+            result.append((name, descending))
+
+            if name == 'pk':
+                # The primary key is unique - any further fields are redundant
+                break
+
+        if not result or result[-1][0] != 'pk':
+            result.append(('pk', False))
+
+        return result
+
+    def apply_keyset_ordering(self, queryset, ordering: list):
+        """Annotate and order the queryset by the keyset fields.
+
+        Null values are not explicitly placed, so that the (database default) ordering
+        matches the ordering used for limit / offset pagination.
+        """
+        queryset = queryset.annotate(**{
+            f'{KEYSET_PREFIX}{i}': F(name) for i, (name, _desc) in enumerate(ordering)
+        })
+
+        order_by = []
+
+        for i, (_name, descending) in enumerate(ordering):
+            field = F(f'{KEYSET_PREFIX}{i}')
+            order_by.append(field.desc() if descending else field.asc())
+
+        return queryset.order_by(*order_by)
+
+    def get_keyset_filter(
+        self, ordering: list, values: list, nulls_largest: bool = True
+    ) -> Q:
+        """Construct a filter which selects all items *after* the provided values.
+
+        For ordering (a, b, pk), this is equivalent to:
+        a > x OR (a = x AND (b > y OR (b = y AND pk > z)))
+
+        Arguments:
+            ordering: The keyset ordering, as a list of (field, descending) tuples
+            values: The ordering values of the last item on the previous page
+            nulls_largest: True if the database sorts null values after any other (ascending) value
+        """
+        query = None
+
+        for i in reversed(range(len(ordering))):
+            key = f'{KEYSET_PREFIX}{i}'
+            descending = ordering[i][1]
+            value = values[i]
+
+            # Are null values sorted after all other values (for this field)?
+            nulls_after = nulls_largest != descending
+
+            if value is None:
+                after = None if nulls_after else Q(**{f'{key}__isnull': False})
+                equal = Q(**{f'{key}__isnull': True})
+            else:
+                lookup = 'lt' if descending else 'gt'
+                after = Q(**{f'{key}__{lookup}': value})
+                equal = Q(**{key: value})
+
+                if nulls_after:
+                    after |= Q(**{f'{key}__isnull': True})
+
+            if query is not None:
+                tail = equal & query
+                query = tail if after is None else after | tail
+            else:
+                query = after
+
+        return query if query is not None else Q(pk__in=[])
+
+    def encode_cursor(self, ordering: list, values: list) -> str:
+        """Encode the provided ordering values into a cursor string."""
+        data = {
+            'o': [f'-{name}' if desc else name for name, desc in ordering],
+            'v': values,
+        }
+
+        encoded = json.dumps(data, cls=KeysetCursorEncoder).encode()
+
+        return base64.urlsafe_b64encode(encoded).decode()
+
+    def decode_cursor(self, request, ordering: list):
+        """Decode the cursor provided with the request.
+
+        Returns:
+            A list of ordering values, or None if no cursor value was provided
+        """
+        cursor = request.query_params.get(self.cursor_query_param, '')
+
+        if not cursor:
+            return None
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            keys = data['o']
+            values = data['v']
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ValidationError({self.cursor_query_param: _('Invalid cursor')})
+
+        expected = [f'-{name}' if desc else name for name, desc in ordering]
+
+        if keys != expected or not isinstance(values, list) or len(values) != len(keys):
+            raise ValidationError({
+                self.cursor_query_param: _(
+                    'Cursor does not match the requested ordering'
+                )
+            })
+
+        return values
+
+    def get_next_link(self):
+        """Return the link to the next page of results."""
+        if self.cursor_mode:
+            if not self.next_cursor:
+                return None
+
+            url = remove_query_param(
+                self.request.build_absolute_uri(), self.offset_query_param
+            )
+
+            return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+        if self.count_mode == COUNT_EXACT:
+            return super().get_next_link()
+
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_previous_link(self):
+        """Return the link to the previous page of results.
+
+        Keyset pagination is forward-only, so no link is provided in cursor mode.
+        """
+        if self.cursor_mode:
+            return None
+
+        return super().get_previous_link()
+
+    def get_paginated_response_schema(self, schema):
+        """The total count may be null, depending on the count mode."""
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        """Return the query parameters for the API schema."""
+        parameters = super().get_schema_operation_parameters(view)
+
+        parameters.extend([
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.cursor_query_description),
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.count_query_description),
+                'schema': {'type': 'string', 'enum': COUNT_MODES},
+            },
+        ])
+
+        return parameters
@@ -95,7 +95,9 @@ class ExtendedAutoSchema(AutoSchema):
         # what the schema defines to be the expected result. This forces limit to be present, producing the expected
         # type.
         pagination_class = getattr(self.view, 'pagination_class', None)
-        if pagination_class and pagination_class == LimitOffsetPagination:
+        if isinstance(pagination_class, type) and issubclass(
+            pagination_class, LimitOffsetPagination
+        ):
             for parameter in parameters:
                 if parameter['name'] == 'limit':
                     parameter['required'] = True
@@ -646,6 +646,121 @@ class InvenTreeModelSerializer(FilterableSerializerField, serializers.ModelSeria
         return data
 
 
+# Serializer context key for related instances which have been resolved in bulk
+BULK_INSTANCE_CACHE = 'bulk_instances'
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField which can resolve instances from a pre-fetched cache.
+
+    The cache is populated by BulkCreateSerializerMixin.prefetch_bulk_instances,
+    and avoids a separate database lookup for each item in a bulk create request.
+    """
+
+    def to_internal_value(self, data):
+        """Return the cached instance (if available) for the provided primary key."""
+        cache = self.context.get(BULK_INSTANCE_CACHE, {}).get(self.field_name)
+
+        if cache and not isinstance(data, bool):
+            if (instance := cache.get(str(data))) is not None:
+                return instance
+
+        return super().to_internal_value(data)
+
+
+class BulkCreateSerializerMixin:
+    """Mixin for serializers which support the vectorized 'bulk create' path.
+
+    When a list of items is submitted to an API endpoint which uses the BulkCreateMixin,
+    serializers which inherit from this mixin are processed as follows:
+
+    - Related instances are resolved with a single query per related field
+    - Each item is validated, using the resolved related instances
+    - All instances are inserted with a single bulk_create query
+    - Post-save side effects are performed once, for the entire batch
+
+    Note that bulk_create does not call the model save() method,
+    or send the pre_save / post_save signals. Any required side effects
+    must be implemented in bulk_create() or bulk_create_complete().
+
+    Attributes:
+        bulk_create_batch_size: Maximum number of rows inserted per query
+    """
+
+    bulk_create_batch_size = 500
+
+    # Use the cache-aware field for auto-generated related fields
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    def prefetch_bulk_instances(self, data: list) -> None:
+        """Resolve the related instances for each item in the provided data.
+
+        Arguments:
+            data: List of (unvalidated) data items
+
+        The resolved instances are stored in the serializer context,
+        which must be shared with the serializers used to validate each item.
+        """
+        cache = self.context.setdefault(BULK_INSTANCE_CACHE, {})
+
+        for field_name, field in self.fields.items():
+            if field.read_only or not isinstance(field, BulkPrimaryKeyRelatedField):
+                continue
+
+            values = {item.get(field_name) for item in data if isinstance(item, dict)}
+
+            values = {
+                v for v in values if v not in (None, '') and not isinstance(v, bool)
+            }
+
+            if not values:
+                continue
+
+            try:
+                instances = field.get_queryset().in_bulk(list(values))
+            except (ValueError, TypeError, DjangoValidationError):
+                # Invalid values will be reported during item validation
+                continue
+
+            cache[field_name] = {str(pk): obj for pk, obj in instances.items()}
+
+    def build_bulk_instance(self):
+        """Construct an (unsaved) model instance from the validated data.
+
+        Note: Many-to-many fields are not supported for bulk creation.
+        """
+        data = {**self.validated_data}
+
+        for field in self.skip_create_fields():
+            data.pop(field, None)
+
+        return self.Meta.model(**data)
+
+    def bulk_create(self, instances: list) -> list:
+        """Insert the provided instances into the database."""
+        return self.Meta.model.objects.bulk_create(
+            instances, batch_size=self.bulk_create_batch_size
+        )
+
+    def bulk_create_complete(self, instances: list) -> None:
+        """Perform any post-save side effects, once the instances have been created.
+
+        The default implementation triggers the 'created' plugin event for each instance,
+        using a single background task.
+        """
+        from plugin.base.event.events import trigger_bulk_event
+
+        model = self.Meta.model
+        table = model._meta.db_table
+
+        trigger_bulk_event(
+            f'{table}.created',
+            [instance.pk for instance in instances],
+            table=table,
+            model=model.__name__,
+        )
+
+
 class InvenTreeTaggitSerializer(TaggitSerializer):
     """Updated from https://github.com/glemmaPaul/django-taggit-serializer."""
 
@@ -233,6 +233,10 @@ PLUGIN_RETRY = get_setting(
     'INVENTREE_PLUGIN_RETRY', 'PLUGIN_RETRY', 3, typecast=int
 )  # How often should plugin loading be tried?
 
+PLUGIN_REGISTRY_CHECK_INTERVAL = get_setting(
+    'INVENTREE_PLUGIN_CHECK_INTERVAL', 'plugin_check_interval', 5, typecast=int
+)  # Minimum time (in seconds) between checks for plugin registry changes (per process)
+
 # Hash of the plugin file (will be updated on each change)
 PLUGIN_FILE_HASH = ''
 
@@ -969,6 +973,32 @@ if GLOBAL_CACHE_ENABLED:  # pragma: no cover
     # as well
     Q_CLUSTER['django_redis'] = 'worker'
 
+# Global search configuration
+# Number of worker threads used to search across multiple models concurrently
+SEARCH_WORKERS = get_setting(
+    'INVENTREE_SEARCH_WORKERS', 'search.workers', 4, typecast=int
+)
+
+# Time budget (in seconds) for each model type in a global search request
+SEARCH_TIMEOUT = get_setting(
+    'INVENTREE_SEARCH_TIMEOUT', 'search.timeout', 5, typecast=float
+)
+
+# Use the full-text search index (see common.search) for API search queries
+SEARCH_INDEX_ENABLED = get_boolean_setting(
+    'INVENTREE_SEARCH_INDEX', 'search.index', False
+)
+
+# Report rendering configuration
+# Number of worker processes used to render multiple reports to PDF concurrently
+REPORT_RENDER_WORKERS = get_setting(
+    'INVENTREE_REPORT_WORKERS', 'report.workers', 4, typecast=int
+)
+
+# Number of reports rendered by each worker process
+REPORT_RENDER_CHUNK_SIZE = get_setting(
+    'INVENTREE_REPORT_CHUNK_SIZE', 'report.chunk_size', 10, typecast=int
+)
 
 SILENCED_SYSTEM_CHECKS = ['templates.E003', 'templates.W003']
 
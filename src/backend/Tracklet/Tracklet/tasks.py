@@ -590,7 +590,11 @@ def update_exchange_rates(force: bool = False):
     try:
         from djmoney.contrib.exchange.models import Rate
 
-        from common.currency import currency_code_default, currency_codes
+        from common.currency import (
+            clear_exchange_rates,
+            currency_code_default,
+            currency_codes,
+        )
         from Tracklet.exchange import InvenTreeExchange
     except AppRegistryNotReady:  # pragma: no cover
         # Apps not yet loaded!
@@ -621,6 +625,9 @@ def update_exchange_rates(force: bool = False):
             currency__in=currency_codes()
         ).delete()
 
+        # Discard the in-process exchange rate snapshot
+        clear_exchange_rates()
+
         # Record successful task execution
         record_task_success('update_exchange_rates')
 
@@ -6,17 +6,52 @@ from django.conf import settings
 from django.template.loaders.base import Loader as BaseLoader
 from django.template.loaders.cached import Loader as CachedLoader
 
+# Incremented to invalidate all compiled report templates (in this process)
+REPORT_TEMPLATE_GENERATION = 0
+
+
+def clear_report_template_cache():
+    """Invalidate all compiled report templates.
+
+    Called when a report template, snippet or asset is uploaded.
+    Compiled templates in other processes are invalidated when the template file is modified.
+    """
+    global REPORT_TEMPLATE_GENERATION
+
+    REPORT_TEMPLATE_GENERATION += 1
+
+
+def template_file_signature(path) -> tuple | None:
+    """Return a (mtime, size) signature for a template file, or None if the file does not exist."""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
 
 class InvenTreeTemplateLoader(CachedLoader):
-    """Custom template loader which bypasses cache for PDF export."""
+    """Custom template loader which validates cached report templates."""
+
+    def __init__(self, engine, loaders):
+        """Initialize the loader, with a separate cache for report templates."""
+        super().__init__(engine, loaders)
+
+        # Compiled report templates: {key: (template, signature, generation)}
+        self.report_cache = {}
 
     def get_template(self, template_name, skip=None):
         """Return a template object for the given template name.
 
-        Any custom report or label templates will be forced to reload (without cache).
-        This ensures that generated PDF reports / labels are always up-to-date.
+        Any custom report or label templates are cached separately, and are reloaded if:
+        - The template file has been modified (mtime or size has changed)
+        - The report template cache has been cleared (see clear_report_template_cache)
+
+        This ensures that generated PDF reports / labels are always up-to-date,
+        without compiling the template for every rendered report or label.
         """
-        # List of template patterns to skip cache for
+        # List of template patterns which are validated against the template file
         skip_cache_dirs = [
             os.path.abspath(os.path.join(settings.MEDIA_ROOT, 'report')),
             os.path.abspath(os.path.join(settings.MEDIA_ROOT, 'label')),
@@ -28,8 +63,27 @@ class InvenTreeTemplateLoader(CachedLoader):
 
         template_path = str(template.name)
 
-        # If the template matches any of the skip patterns, reload it without cache
-        if any(template_path.startswith(d) for d in skip_cache_dirs):
-            template = BaseLoader.get_template(self, template_name, skip)
+        if not any(template_path.startswith(d) for d in skip_cache_dirs):
+            return template
+
+        key = self.cache_key(template_name, skip)
+        signature = template_file_signature(template.origin.name)
+
+        if cached := self.report_cache.get(key):
+            if signature is not None and cached[1:] == (
+                signature,
+                REPORT_TEMPLATE_GENERATION,
+            ):
+                return cached[0]
+
+        # Reload the template without cache
+        template = BaseLoader.get_template(self, template_name, skip)
+
+        self.report_cache[key] = (template, signature, REPORT_TEMPLATE_GENERATION)
 
         return template
+
+    def reset(self):
+        """Reset any state maintained by the loader instance."""
+        super().reset()
+        self.report_cache.clear()
@@ -1,14 +1,19 @@
 """Low level tests for the InvenTree API."""
 
+import time
 from base64 import b64encode
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest import mock
 
+from django.contrib.auth.models import User
+from django.test import override_settings
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.test import APITransactionTestCase
 
-from Tracklet.api import read_license_file
+from Tracklet.api import APISearchView, read_license_file
 from Tracklet.api_version import INVENTREE_API_VERSION
 from Tracklet.unit_test import InvenTreeAPITestCase, InvenTreeTestCase
 from Tracklet.version import inventreeApiText, parse_version_text
@@ -503,6 +508,200 @@ class SearchTests(InvenTreeAPITestCase):
                     result['error'], 'User does not have permission to view this model'
                 )
 
+    def test_search_projection(self):
+        """Test that the 'search_projection' option returns lightweight results."""
+        query = {'search': 'chair', 'limit': 3, 'part': {}, 'build': {}}
+
+        response = self.post(reverse('api-search'), query, expected_code=200)
+        full = response.data['part']
+
+        query['search_projection'] = True
+        response = self.post(reverse('api-search'), query, expected_code=200)
+        projected = response.data['part']
+
+        # Same search hits are returned
+        self.assertEqual(projected['count'], full['count'])
+        self.assertEqual(
+            [p['pk'] for p in projected['results']], [p['pk'] for p in full['results']]
+        )
+
+        # But only the projected fields are included
+        for result in projected['results']:
+            self.assertIn('name', result)
+            self.assertNotIn('total_in_stock', result)
+
+        self.assertEqual(response.data['build']['count'], 0)
+
+
+class ParallelSearchTests(APITransactionTestCase):
+    """Unit tests for running the global search in parallel worker threads.
+
+    Searches are only run in parallel outside of an atomic block,
+    so these tests cannot be run inside a TestCase transaction.
+    """
+
+    fixtures = ['category', 'part', 'location']
+
+    def setUp(self):
+        """Create a user to search with."""
+        super().setUp()
+
+        self.user = User.objects.create_superuser(
+            username='testuser', password='password', email='test@testing.com'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, delays: dict):
+        """Run a search against multiple models, with an artificial delay for each model.
+
+        Arguments:
+            delays: A dict of {view class name: delay (seconds)}
+        """
+        run_search = APISearchView.run_search
+
+        def delayed_search(view_instance, view, *args, **kwargs):
+            delay = delays.get(view.__class__.__name__, 0)
+
+            if delay > 1:
+                # Simulate a search which does not complete
+                time.sleep(delay)
+                return {}
+
+            time.sleep(delay)
+            return run_search(view_instance, view, *args, **kwargs)
+
+        query = {
+            'search': 'chair',
+            'limit': 3,
+            'part': {},
+            'partcategory': {},
+            'stocklocation': {},
+        }
+
+        with (
+            mock.patch.object(
+                APISearchView, 'run_search', autospec=True, side_effect=delayed_search
+            ),
+            mock.patch.object(
+                APISearchView,
+                'search_parallel',
+                autospec=True,
+                side_effect=APISearchView.search_parallel,
+            ) as search_parallel,
+        ):
+            response = self.client.post(reverse('api-search'), query, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(search_parallel.call_count, 1)
+
+        return response.data
+
+    @override_settings(SEARCH_WORKERS=2, SEARCH_TIMEOUT=1.0)
+    def test_parallel_search(self):
+        """Test that each model is searched in a separate worker thread."""
+        data = self.search({})
+
+        self.assertEqual(data['part']['count'], 5)
+        self.assertEqual(len(data['part']['results']), 3)
+
+        for key in ['partcategory', 'stocklocation']:
+            self.assertIn('count', data[key])
+
+    @override_settings(SEARCH_WORKERS=2, SEARCH_TIMEOUT=1.0)
+    def test_search_timeout(self):
+        """Test that each model search is allotted its own time budget."""
+        # Three searches across two workers take longer than a single time budget,
+        # but each search completes within its own budget
+        data = self.search({
+            'PartList': 0.6,
+            'CategoryList': 0.6,
+            'StockLocationList': 0.6,
+        })
+
+        for key in ['part', 'partcategory', 'stocklocation']:
+            self.assertNotIn('error', data[key])
+
+        # A search which exceeds its budget returns an error
+        data = self.search({'CategoryList': 3})
+
+        self.assertEqual(data['partcategory'], {'error': 'Search timed out'})
+        self.assertEqual(data['part']['count'], 5)
+        self.assertNotIn('error', data['stocklocation'])
+
+
+class PaginationTests(InvenTreeAPITestCase):
+    """Tests for the API pagination options."""
+
+    fixtures = ['category', 'part', 'location']
+
+    roles = ['part.view']
+
+    def walk_cursor(self, url, params):
+        """Return all results by following the cursor links."""
+        results = []
+
+        response = self.get(url, {**params, 'cursor': ''}, expected_code=200)
+
+        while True:
+            results.extend(item['pk'] for item in response.data['results'])
+            self.assertIsNone(response.data['previous'])
+
+            if not response.data['next']:
+                break
+
+            response = self.get(response.data['next'], expected_code=200)
+
+        return results
+
+    def test_cursor_pagination(self):
+        """Test that keyset pagination returns the same results as offset pagination."""
+        url = reverse('api-part-list')
+
+        for ordering in ['name', '-name', 'IPN', '-IPN', 'pk']:
+            expected = [p['pk'] for p in self.get(url, {'ordering': ordering}).data]
+
+            results = self.walk_cursor(url, {'ordering': ordering, 'limit': 3})
+            self.assertEqual(results, expected)
+
+        # Count is skipped by default for cursor pagination
+        response = self.get(url, {'cursor': '', 'limit': 5})
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(len(response.data['results']), 5)
+
+        response = self.get(url, {'cursor': '', 'limit': 5, 'count': 'exact'})
+        self.assertEqual(response.data['count'], len(expected))
+
+        # Invalid cursor
+        response = self.get(url, {'cursor': 'not-a-cursor'}, expected_code=400)
+        self.assertIn('cursor', response.data)
+
+        # Cursor which does not match the requested ordering
+        response = self.get(url, {'cursor': '', 'limit': 1, 'ordering': 'name'})
+        cursor = response.data['next'].split('cursor=')[1]
+        response = self.get(
+            url, {'cursor': cursor, 'ordering': '-name'}, expected_code=400
+        )
+
+    def test_count_options(self):
+        """Test the 'count' option for limit / offset pagination."""
+        url = reverse('api-part-list')
+
+        n = len(self.get(url).data)
+
+        response = self.get(url, {'limit': 2, 'offset': 0, 'count': 'none'})
+        self.assertIsNone(response.data['count'])
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.get(url, {'limit': 2, 'offset': n - 1, 'count': 'none'})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+        # Estimated counts fall back to an exact count for small tables
+        response = self.get(url, {'limit': 2, 'count': 'estimate'})
+        self.assertEqual(response.data['count'], n)
+
+        self.get(url, {'limit': 2, 'count': 'approx'}, expected_code=400)
+
 
 class GeneralApiTests(InvenTreeAPITestCase):
     """Tests for various api endpoints."""
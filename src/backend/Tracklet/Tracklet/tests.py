@@ -32,12 +32,12 @@ import Tracklet.format
 import Tracklet.helpers
 import Tracklet.helpers_model
 import Tracklet.tasks
-from common.currency import currency_codes
+from common.currency import convert_money_list, currency_codes, get_exchange_rate
 from common.models import CustomUnit, InvenTreeSetting
 from common.settings import get_global_setting
 from Tracklet.helpers_mixin import ClassProviderMixin, ClassValidationMixin
 from Tracklet.sanitizer import sanitize_svg
-from Tracklet.unit_test import InvenTreeTestCase, in_env_context
+from Tracklet.unit_test import ExchangeRateMixin, InvenTreeTestCase, in_env_context
 from part.models import Part, PartCategory
 from stock.models import StockItem, StockLocation
 
@@ -1142,7 +1142,7 @@ class TestVersionNumber(TestCase):
         self.assertEqual(d, version.inventreeCommitDate())
 
 
-class CurrencyTests(TestCase):
+class CurrencyTests(ExchangeRateMixin, TestCase):
     """Unit tests for currency / exchange rate functionality."""
 
     def test_rates(self):
@@ -1193,6 +1193,50 @@ class CurrencyTests(TestCase):
         with self.assertRaises(MissingRate):
             convert_money(Money(100, 'GBP'), 'ZWL')
 
+    def test_rate_snapshot(self):
+        """Test the in-process exchange rate snapshot."""
+        self.generate_exchange_rates()
+
+        self.assertEqual(get_exchange_rate('USD', 'AUD'), Decimal('1.5'))
+
+        # Rates are now held in memory
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_exchange_rate('AUD', 'CAD'), Decimal('1.7') / Decimal('1.5')
+            )
+
+            values = convert_money_list(
+                [Money(30, 'AUD'), None, Money(9, 'GBP'), Money(5, 'USD')], 'USD'
+            )
+
+        self.assertAlmostEqual(values[0].amount, Decimal(20))
+        self.assertIsNone(values[1])
+        self.assertAlmostEqual(values[2].amount, Decimal(10))
+        self.assertEqual(values[3], Money(5, 'USD'))
+
+        for value in values:
+            if value is not None:
+                self.assertEqual(str(value.currency), 'USD')
+
+        # Results match the djmoney conversion
+        self.assertAlmostEqual(
+            convert_money_list([Money(100, 'CAD')], 'GBP')[0].amount,
+            convert_money(Money(100, 'CAD'), 'GBP').amount,
+        )
+
+        with self.assertRaises(MissingRate):
+            convert_money_list([Money(1, 'NZD')], 'USD')
+
+        self.assertEqual(
+            convert_money_list([Money(1, 'NZD')], 'USD', ignore_missing=True), [None]
+        )
+
+        # Removing a rate discards the snapshot
+        Rate.objects.filter(currency='AUD').delete()
+
+        with self.assertRaises(MissingRate):
+            get_exchange_rate('AUD', 'USD')
+
 
 class TestStatus(TestCase):
     """Unit tests for status functions."""
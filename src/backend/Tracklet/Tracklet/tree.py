@@ -0,0 +1,135 @@
+"""Deferred maintenance of MPTT tree structures.
+
+Whenever a node is moved within a tree (or nodes are bulk created), the
+nested set values for that tree must be rebuilt. Rebuilding a tree is expensive,
+and locks a large range of rows - so when many nodes are modified at once
+(e.g. splitting, merging or installing stock items in bulk), rebuilding the
+tree after every single change dominates the cost of the operation.
+
+Within a deferred_tree_rebuild() block, trees are instead marked as "dirty",
+and each dirty tree is rebuilt exactly once:
+- When the block exits (or when the enclosing transaction is committed)
+- Or, in a single background task (if background=True)
+
+Note that the tree values (lft, rght, level) of affected nodes are not
+accurate until the deferred rebuild has been performed.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import transaction
+
+import structlog
+
+logger = structlog.get_logger('inventree')
+
+# Thread-local state for tracking deferred tree rebuilds
+tree_data = threading.local()
+
+
+def is_rebuild_deferred() -> bool:
+    """Return True if tree rebuilds are currently being deferred."""
+    return getattr(tree_data, 'depth', 0) > 0
+
+
+def mark_tree_dirty(model, tree_id: int) -> bool:
+    """Mark a tree as requiring a rebuild.
+
+    Arguments:
+        model: The (MPTT) model class
+        tree_id: The ID of the tree to rebuild
+
+    Returns:
+        bool: True if the rebuild has been deferred, False if it must be performed immediately
+    """
+    if not is_rebuild_deferred():
+        return False
+
+    if tree_id:
+        label = model._meta.label
+        tree_data.dirty.setdefault(label, set()).add(int(tree_id))
+
+    return True
+
+
+@contextmanager
+def deferred_tree_rebuild(background: bool = False):
+    """Context manager which defers tree rebuilds until the end of the block.
+
+    Blocks can be nested - the dirty trees are rebuilt when the outermost block exits.
+    If the block is inside a transaction, the rebuild is performed on commit.
+
+    Arguments:
+        background: If True, offload the rebuild to a background worker
+    """
+    if not is_rebuild_deferred():
+        tree_data.depth = 0
+        tree_data.dirty = {}
+
+    tree_data.depth += 1
+
+    try:
+        yield
+    finally:
+        tree_data.depth -= 1
+
+        if tree_data.depth == 0:
+            dirty = {label: sorted(trees) for label, trees in tree_data.dirty.items()}
+            tree_data.dirty = {}
+
+            if dirty:
+                transaction.on_commit(
+                    lambda: schedule_tree_rebuild(dirty, background=background)
+                )
+
+
+def schedule_tree_rebuild(dirty: dict, background: bool = False):
+    """Rebuild the provided dirty trees.
+
+    Arguments:
+        dirty: A dict of {model label: [tree_id, ...]}
+        background: If True, offload the rebuild to a background worker
+    """
+    from Tracklet.tasks import offload_task
+
+    for label, tree_ids in dirty.items():
+        if background:
+            offload_task(rebuild_trees, label, tree_ids, group='tree')
+        else:
+            rebuild_trees(label, tree_ids)
+
+
+def rebuild_trees(label: str, tree_ids: list[int]) -> bool:
+    """Rebuild the specified trees for a particular model.
+
+    If any partial rebuild fails, the entire tree structure is rebuilt.
+
+    Arguments:
+        label: The model label (e.g. 'stock.stockitem')
+        tree_ids: The list of tree_id values to rebuild
+
+    Returns:
+        bool: True if all partial rebuilds were successful
+    """
+    import Tracklet.exceptions
+    import Tracklet.sentry
+
+    model = apps.get_model(label)
+
+    logger.info('Rebuilding %s trees: %s', label, tree_ids)
+
+    for tree_id in tree_ids:
+        try:
+            model.objects.partial_rebuild(tree_id)
+        except Exception as e:
+            Tracklet.sentry.report_exception(e)
+            Tracklet.exceptions.log_error('rebuild_trees')
+            logger.exception('Failed to rebuild %s tree <%s>: %s', label, tree_id, e)
+
+            # Rebuild the entire tree (expensive!!!)
+            model.objects.rebuild()
+            return False
+
+    return True
@@ -0,0 +1,307 @@
+"""Automatic stock allocation for build orders.
+
+The allocation planner loads all of the data required to auto-allocate a build order
+(outstanding build lines, valid parts, candidate stock items and existing allocations)
+in a fixed number of queries, independent of the number of build lines.
+
+Stock is then allocated in memory, and all new BuildItem objects are created in bulk.
+As the remaining quantity of each stock item is tracked in memory,
+a stock item which is suitable for multiple build lines is never over-allocated.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Q, Subquery, Sum
+
+import structlog
+
+import part.models
+import stock.models
+from build.filters import annotate_allocated_quantity
+from build.models import BuildItem
+from order.models import SalesOrderAllocation
+from order.status_codes import SalesOrderStatusGroups
+from part.buildability import invalidate_buildability
+
+logger = structlog.get_logger('inventree')
+
+# Allocation priority for each type of part
+PRIORITY_DIRECT = 1
+PRIORITY_VARIANT = 2
+PRIORITY_SUBSTITUTE = 3
+
+
+class AutoAllocationPlanner:
+    """Plan (and create) the automatic stock allocations for a build order."""
+
+    def __init__(
+        self,
+        build,
+        location=None,
+        exclude_location=None,
+        interchangeable: bool = False,
+        substitutes: bool = True,
+        optional_items: bool = False,
+    ):
+        """Initialize the planner.
+
+        Arguments:
+            build: The Build object to allocate against
+            location: If provided, only allocate stock from this location (or sublocations)
+            exclude_location: If provided, do not allocate stock from this location (or sublocations)
+            interchangeable: If True, stock items are interchangeable (multiple items may be allocated to a line)
+            substitutes: If True, allow allocation of substitute parts
+            optional_items: If True, allocate stock to optional BOM items
+        """
+        self.build = build
+        self.location = location
+        self.exclude_location = exclude_location
+        self.interchangeable = interchangeable
+        self.substitutes = substitutes
+        self.optional_items = optional_items
+
+    def get_lines(self) -> list:
+        """Return the build lines which require allocation.
+
+        Returns:
+            A list of (BuildLine, unallocated quantity) tuples
+        """
+        # Auto-allocation is only possible for "untracked" line items
+        lines = self.build.untracked_line_items.filter(bom_item__consumable=False)
+
+        if not self.optional_items:
+            # User has specified that optional_items are to be ignored
+            lines = lines.filter(bom_item__optional=False)
+
+        lines = lines.select_related('bom_item', 'bom_item__sub_part').annotate(
+            allocated=annotate_allocated_quantity()
+        )
+
+        result = []
+
+        for line in lines:
+            unallocated = max(line.quantity - line.consumed - line.allocated, 0)
+
+            if unallocated > 0:
+                result.append((line, unallocated))
+
+        return result
+
+    def load_parts(self, bom_items: list):
+        """Determine the valid parts (and allocation priority) for each BOM item.
+
+        Equivalent to BomItem.get_valid_parts_for_allocation(allow_inactive=False),
+        for all BOM items at once.
+        """
+        substitutes = {}
+
+        if self.substitutes:
+            for bom_item, part_id in part.models.BomItemSubstitute.objects.filter(
+                bom_item__in=[item.pk for item in bom_items]
+            ).values_list('bom_item', 'part'):
+                substitutes.setdefault(bom_item, []).append(part_id)
+
+        base_parts = {item.sub_part_id for item in bom_items}
+
+        for part_ids in substitutes.values():
+            base_parts.update(part_ids)
+
+        # Load all parts in the variant trees of the base parts
+        tree_ids = part.models.Part.objects.filter(pk__in=base_parts).values('tree_id')
+
+        parts = {}
+
+        for pk, tree_id, lft, rght, trackable, active in (
+            part.models.Part.objects
+            .filter(tree_id__in=Subquery(tree_ids))
+            .order_by()
+            .values_list('pk', 'tree_id', 'lft', 'rght', 'trackable', 'active')
+        ):
+            parts[pk] = (tree_id, lft, rght, trackable, active)
+
+        def variants(part_id: int) -> list:
+            tree_id, lft, rght, *_ = parts[part_id]
+
+            return [
+                pk
+                for pk, node in parts.items()
+                if node[0] == tree_id and node[1] > lft and node[2] < rght
+            ]
+
+        # Valid parts for each BOM item: {bom_item: {part_id: priority}}
+        self.valid_parts = {}
+
+        for bom_item in bom_items:
+            sub_part = bom_item.sub_part_id
+            variant_parts = variants(sub_part)
+
+            options = {sub_part: PRIORITY_DIRECT}
+
+            if bom_item.allow_variants:
+                for pk in variant_parts:
+                    options.setdefault(pk, PRIORITY_VARIANT)
+
+            for sub in substitutes.get(bom_item.pk, []):
+                candidates = [sub]
+
+                if bom_item.allow_variants:
+                    candidates += variants(sub)
+
+                for pk in candidates:
+                    # Variants of the sub_part retain their priority
+                    priority = (
+                        PRIORITY_VARIANT if pk in variant_parts else PRIORITY_SUBSTITUTE
+                    )
+                    options.setdefault(pk, priority)
+
+            trackable = parts[sub_part][3]
+
+            self.valid_parts[bom_item.pk] = {
+                pk: priority
+                for pk, priority in options.items()
+                if parts[pk][3] == trackable and parts[pk][4]
+            }
+
+    def load_stock(self):
+        """Load the candidate stock items, and the quantity available for each.
+
+        Serialized stock items cannot be auto-allocated.
+        """
+        part_ids = set()
+
+        for options in self.valid_parts.values():
+            part_ids.update(options.keys())
+
+        items = stock.models.StockItem.objects.filter(
+            stock.models.StockItem.IN_STOCK_FILTER, part__in=part_ids
+        ).filter(Q(serial=None) | Q(serial=''))
+
+        if self.location:
+            # Filter only stock items located "below" the specified location
+            items = items.filter(
+                location__in=self.location.get_descendants(include_self=True)
+            )
+
+        if self.exclude_location:
+            # Exclude any stock items from the provided location
+            items = items.exclude(
+                location__in=self.exclude_location.get_descendants(include_self=True)
+            )
+
+        # Candidate stock items for each part: {part_id: [item_id, ...]}
+        self.stock_items = {}
+
+        # Quantity available for allocation: {item_id: quantity}
+        self.available = {}
+
+        # Part for each candidate stock item: {item_id: part_id}
+        self.item_parts = {}
+
+        for pk, part_id, quantity in items.values_list('pk', 'part', 'quantity'):
+            self.stock_items.setdefault(part_id, []).append(pk)
+            self.available[pk] = quantity
+            self.item_parts[pk] = part_id
+
+        # Subtract any existing allocations against the candidate items
+        build_allocations = (
+            BuildItem.objects
+            .filter(stock_item__in=items.values('pk'))
+            .order_by()
+            .values('stock_item')
+            .annotate(total=Sum('quantity'))
+            .values_list('stock_item', 'total')
+        )
+
+        sales_allocations = (
+            SalesOrderAllocation.objects
+            .filter(
+                item__in=items.values('pk'),
+                line__order__status__in=SalesOrderStatusGroups.OPEN,
+                shipment__shipment_date=None,
+            )
+            .order_by()
+            .values('item')
+            .annotate(total=Sum('quantity'))
+            .values_list('item', 'total')
+        )
+
+        for allocations in [build_allocations, sales_allocations]:
+            for pk, total in allocations:
+                self.available[pk] = max(self.available[pk] - (total or 0), 0)
+
+    def plan(self) -> list:
+        """Calculate the stock allocations for the build order.
+
+        Returns:
+            A list of (BuildLine, stock item ID, quantity) tuples
+        """
+        lines = self.get_lines()
+
+        if not lines:
+            return []
+
+        self.load_parts([line.bom_item for line, _quantity in lines])
+        self.load_stock()
+
+        # Preserve the database ordering of stock items (within each priority)
+        ordering = {pk: idx for idx, pk in enumerate(self.available.keys())}
+
+        allocations = []
+
+        for line, unallocated in lines:
+            options = self.valid_parts[line.bom_item.pk]
+
+            # Sort the available stock items by priority:
+            # 1. Direct part matches
+            # 2. Variant part matches
+            # 3. Substitute part matches
+            candidates = sorted(
+                (
+                    (priority, ordering[pk], pk)
+                    for part_id, priority in options.items()
+                    for pk in self.stock_items.get(part_id, [])
+                )
+            )
+
+            if len(candidates) != 1 and not self.interchangeable:
+                # Multiple stock items available, and we cannot choose between them
+                continue
+
+            for _priority, _idx, pk in candidates:
+                quantity = min(unallocated, self.available[pk])
+
+                if quantity > 0:
+                    allocations.append((line, pk, quantity))
+
+                    self.available[pk] -= quantity
+                    unallocated -= quantity
+
+                if unallocated <= 0:
+                    # We have now fully-allocated this line - no need to continue!
+                    break
+
+        return allocations
+
+    def allocate(self) -> int:
+        """Create the planned allocations (with a single bulk query).
+
+        Returns:
+            The number of BuildItem objects created
+        """
+        items = [
+            BuildItem(build_line=line, stock_item_id=pk, quantity=Decimal(quantity))
+            for line, pk, quantity in self.plan()
+        ]
+
+        BuildItem.objects.bulk_create(items)
+
+        # Bulk creation bypasses the signals which invalidate cached buildability results
+        invalidate_buildability({self.item_parts[item.stock_item_id] for item in items})
+
+        logger.info(
+            'Auto-allocated %s stock items against build order %s',
+            len(items),
+            self.build.pk,
+        )
+
+        return len(items)
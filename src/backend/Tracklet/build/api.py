@@ -380,6 +380,16 @@ class BuildList(
         'priority',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = [
+        'pk',
+        'reference',
+        'title',
+        'part',
+        'quantity',
+        'status',
+    ]
+
     def get_serializer(self, *args, **kwargs):
         """Add extra context information to the endpoint serializer."""
         kwargs['create'] = True
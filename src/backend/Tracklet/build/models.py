@@ -16,7 +16,6 @@ from django.utils.translation import gettext_lazy as _
 
 import structlog
 from mptt.models import TreeForeignKey
-from rest_framework import serializers
 
 import generic.states
 import Tracklet.fields
@@ -25,6 +24,7 @@ import Tracklet.helpers_model
 import Tracklet.models
 import Tracklet.ready
 import Tracklet.tasks
+import Tracklet.tree
 import part.models
 import report.mixins
 import stock.models
@@ -73,6 +73,10 @@ class BuildReportContext(report.mixins.BaseReportContext):
     title: str
 
 
+# Related data which is prefetched when generating BuildReportContext for multiple builds
+BUILD_REPORT_PREFETCH = ['build_outputs__part', 'build_lines__bom_item__sub_part']
+
+
 class Build(
     Tracklet.models.PluginValidationMixin,
     report.mixins.InvenTreeReportMixin,
@@ -218,6 +222,8 @@ class Build(
                 'target_date': _('Target date must be after start date')
             })
 
+    REPORT_PREFETCH = BUILD_REPORT_PREFETCH
+
     def report_context(self) -> BuildReportContext:
         """Generate custom report context data."""
         return {
@@ -999,6 +1005,14 @@ class Build(
             # Generate stock allocations
             BuildItem.objects.bulk_create(allocations)
 
+            # Bulk creation bypasses the signals which invalidate cached buildability results
+            if allocations:
+                from part.buildability import invalidate_buildability
+
+                invalidate_buildability({
+                    allocation.stock_item.part_id for allocation in allocations
+                })
+
         else:
             """Create a single build output of the given quantity."""
 
@@ -1092,6 +1106,17 @@ class Build(
         # Save the updated BuildItem objects
         BuildItem.objects.bulk_update(items_to_save, ['quantity'])
 
+        # Bulk update bypasses the signals which invalidate cached buildability results
+        if items_to_save:
+            from part.buildability import invalidate_buildability
+
+            invalidate_buildability(
+                stock.models.StockItem.objects
+                .filter(pk__in=[item.stock_item_id for item in items_to_save])
+                .values_list('part_id', flat=True)
+                .distinct()
+            )
+
         # Delete the remaining BuildItem objects
         BuildItem.objects.filter(pk__in=[item.pk for item in items_to_delete]).delete()
 
@@ -1109,8 +1134,9 @@ class Build(
         )
 
         # Remove stock
-        for item in items:
-            item.complete_allocation(user=user)
+        with Tracklet.tree.deferred_tree_rebuild():
+            for item in items:
+                item.complete_allocation(user=user)
 
         # Delete allocation
         items.all().delete()
@@ -1251,9 +1277,10 @@ class Build(
             # Split the stock item
             output = output.splitStock(quantity, user=user, allow_production=True)
 
-        for build_item in allocated_items:
-            # Complete the allocation of stock for that item
-            build_item.complete_allocation(user=user)
+        with Tracklet.tree.deferred_tree_rebuild():
+            for build_item in allocated_items:
+                # Complete the allocation of stock for that item
+                build_item.complete_allocation(user=user)
 
         # Delete the BuildItem objects from the database
         allocated_items.all().delete()
@@ -1301,127 +1328,22 @@ class Build(
         - If a single stock item is found, we can allocate that and move on!
         - If multiple stock items are found, we *may* be able to allocate:
             - If the calling function has specified that items are interchangeable
-        """
-        location = kwargs.get('location')
-        exclude_location = kwargs.get('exclude_location')
-        interchangeable = kwargs.get('interchangeable', False)
-        substitutes = kwargs.get('substitutes', True)
-        optional_items = kwargs.get('optional_items', False)
-
-        def stock_sort(item, bom_item, variant_parts):
-            if item.part == bom_item.sub_part:
-                return 1
-            elif item.part in variant_parts:
-                return 2
-            return 3
-
-        new_items = []
-
-        # Auto-allocation is only possible for "untracked" line items
-        for line_item in self.untracked_line_items.all():
-            # Find the referenced BomItem
-            bom_item = line_item.bom_item
-
-            if bom_item.consumable:
-                # Do not auto-allocate stock to consumable BOM items
-                continue
 
-            if bom_item.optional and not optional_items:
-                # User has specified that optional_items are to be ignored
-                continue
-
-            variant_parts = bom_item.sub_part.get_descendants(include_self=False)
-
-            unallocated_quantity = line_item.unallocated_quantity()
-
-            if unallocated_quantity <= 0:
-                # This BomItem is fully allocated, we can continue
-                continue
-
-            # Check which parts we can "use" (may include variants and substitutes)
-            available_parts = bom_item.get_valid_parts_for_allocation(
-                allow_variants=True, allow_inactive=False, allow_substitutes=substitutes
-            )
-
-            # Look for available stock items
-            available_stock = stock.models.StockItem.objects.filter(
-                stock.models.StockItem.IN_STOCK_FILTER
-            )
-
-            # Filter by list of available parts
-            available_stock = available_stock.filter(part__in=list(available_parts))
-
-            # Filter out "serialized" stock items, these cannot be auto-allocated
-            available_stock = available_stock.filter(
-                Q(serial=None) | Q(serial='')
-            ).distinct()
-
-            if location:
-                # Filter only stock items located "below" the specified location
-                sublocations = location.get_descendants(include_self=True)
-                available_stock = available_stock.filter(
-                    location__in=list(sublocations)
-                )
-
-            if exclude_location:
-                # Exclude any stock items from the provided location
-                sublocations = exclude_location.get_descendants(include_self=True)
-                available_stock = available_stock.exclude(
-                    location__in=list(sublocations)
-                )
-
-            """
-            Next, we sort the available stock items with the following priority:
-            1. Direct part matches (+1)
-            2. Variant part matches (+2)
-            3. Substitute part matches (+3)
-
-            This ensures that allocation priority is first given to "direct" parts
-            """
-            available_stock = sorted(
-                available_stock,
-                key=lambda item, b=bom_item, v=variant_parts: stock_sort(item, b, v),
-            )
-
-            if len(available_stock) == 1 or interchangeable:
-                # Either there is only a single stock item available,
-                # or all items are "interchangeable" and we don't care where we take stock from
-
-                for stock_item in available_stock:
-                    # Skip inactive parts
-                    if not stock_item.part.active:
-                        continue
-
-                    # How much of the stock item is "available" for allocation?
-                    quantity = min(
-                        unallocated_quantity, stock_item.unallocated_quantity()
-                    )
-
-                    if quantity > 0:
-                        try:
-                            new_items.append(
-                                BuildItem(
-                                    build_line=line_item,
-                                    stock_item=stock_item,
-                                    quantity=quantity,
-                                )
-                            )
-
-                            # Subtract the required quantity
-                            unallocated_quantity -= quantity
-
-                        except (ValidationError, serializers.ValidationError) as exc:
-                            # Catch model errors and re-throw as DRF errors
-                            raise ValidationError(
-                                exc.message, detail=serializers.as_serializer_error(exc)
-                            )
+        The allocation is planned in memory (see build.allocation),
+        and the new BuildItem objects are created in a single query.
+        """
+        from build.allocation import AutoAllocationPlanner
 
-                    if unallocated_quantity <= 0:
-                        # We have now fully-allocated this BomItem - no need to continue!
-                        break
+        planner = AutoAllocationPlanner(
+            self,
+            location=kwargs.get('location'),
+            exclude_location=kwargs.get('exclude_location'),
+            interchangeable=kwargs.get('interchangeable', False),
+            substitutes=kwargs.get('substitutes', True),
+            optional_items=kwargs.get('optional_items', False),
+        )
 
-        # Bulk-create the new BuildItem objects
-        BuildItem.objects.bulk_create(new_items)
+        planner.allocate()
 
     def unallocated_lines(self, tracked: Optional[bool] = None) -> QuerySet:
         """Returns a list of BuildLine objects which have not been fully allocated."""
@@ -1616,6 +1538,10 @@ class BuildLineReportContext(report.mixins.BaseReportContext):
     quantity: decimal.Decimal
 
 
+# Related data which is prefetched when generating BuildLineReportContext for multiple lines
+BUILD_LINE_REPORT_PREFETCH = ['bom_item__sub_part', 'allocations__stock_item']
+
+
 class BuildLine(report.mixins.InvenTreeReportMixin, Tracklet.models.InvenTreeModel):
     """A BuildLine object links a BOMItem to a Build.
 
@@ -1644,6 +1570,8 @@ class BuildLine(report.mixins.InvenTreeReportMixin, Tracklet.models.InvenTreeMod
         """Return the API URL used to access this model."""
         return reverse('api-build-line-list')
 
+    REPORT_PREFETCH = BUILD_LINE_REPORT_PREFETCH
+
     def report_context(self) -> BuildLineReportContext:
         """Generate custom report context for this BuildLine object."""
         return {
@@ -1692,6 +1620,12 @@ class BuildLine(report.mixins.InvenTreeReportMixin, Tracklet.models.InvenTreeMod
 
     def allocated_quantity(self):
         """Calculate the total allocated quantity for this BuildLine."""
+        if 'allocations' in getattr(self, '_prefetched_objects_cache', {}):
+            # Use pre-fetched allocations (e.g. when generating multiple reports)
+            return sum(
+                (item.quantity for item in self.allocations.all()), decimal.Decimal(0)
+            )
+
         # Queryset containing all BuildItem objects allocated against this BuildLine
         allocations = self.allocations.all()
 
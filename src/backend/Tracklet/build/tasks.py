@@ -13,6 +13,7 @@ import common.notifications
 import Tracklet.helpers
 import Tracklet.helpers_model
 import Tracklet.tasks
+import Tracklet.tree
 from build.events import BuildEvents
 from build.status_codes import BuildStatusGroups
 from Tracklet.ready import isImportingData
@@ -76,12 +77,13 @@ def consume_build_line(line_id: int, notes: str = '', user_id: int | None = None
         )
         return
 
-    for item in line_item.allocations.all():
-        item.complete_allocation(
-            quantity=item.quantity,
-            notes=notes,
-            user=User.objects.filter(pk=user_id).first() if user_id else None,
-        )
+    with Tracklet.tree.deferred_tree_rebuild():
+        for item in line_item.allocations.all():
+            item.complete_allocation(
+                quantity=item.quantity,
+                notes=notes,
+                user=User.objects.filter(pk=user_id).first() if user_id else None,
+            )
 
 
 @tracer.start_as_current_span('complete_build_allocations')
@@ -170,6 +172,7 @@ def check_build_stock(build):
 
     Send an email out to any subscribed users if stock is low.
     """
+    from part.buildability import BuildabilityGraph
     from part.models import Part
 
     # Do not notify if we are importing data
@@ -191,14 +194,28 @@ def check_build_stock(build):
         logger.exception("Invalid build.part passed to 'build.tasks.check_build_stock'")
         return
 
+    bom_items = list(part.get_bom_items(include_virtual=False))
+
+    # Load stock information for all required parts in bulk
+    graph = BuildabilityGraph([part.pk], max_depth=1)
+    graph.load_trees([bom_item.sub_part_id for bom_item in bom_items])
+    graph.load_stock()
+
     # Iterate through each non-virtual BOM item for this part
-    for bom_item in part.get_bom_items(include_virtual=False):
+    for bom_item in bom_items:
         sub_part = bom_item.sub_part
+        variants = [sub_part.pk, *graph.get_descendants(sub_part.pk)]
 
         # The 'in stock' quantity depends on whether the bom_item allows variants
-        in_stock = sub_part.get_stock_count(include_variants=bom_item.allow_variants)
+        in_stock = sum(
+            (
+                graph.in_stock.get(pk, 0)
+                for pk in (variants if bom_item.allow_variants else [sub_part.pk])
+            ),
+            Decimal(0),
+        )
 
-        allocated = sub_part.allocation_count()
+        allocated = sum((graph.allocated.get(pk, 0) for pk in variants), Decimal(0))
 
         available = max(0, in_stock - allocated)
 
@@ -844,11 +844,24 @@ class AutoAllocationTests(BuildTestBase):
 
     def test_fully_auto(self):
         """We should be able to auto-allocate against a build in a single go."""
-        self.build.auto_allocate_stock(
-            interchangeable=True, substitutes=True, optional_items=True
-        )
+        from part.buildability import get_buildability_tokens
 
-        self.assertTrue(self.build.is_fully_allocated(tracked=False))
+        parts = [self.sub_part_1.pk, self.sub_part_2.pk]
+
+        with self.settings(GLOBAL_CACHE_ENABLED=True):
+            tokens = get_buildability_tokens(parts)
+
+            self.build.auto_allocate_stock(
+                interchangeable=True, substitutes=True, optional_items=True
+            )
+
+            self.assertTrue(self.build.is_fully_allocated(tracked=False))
+
+            # Cached buildability results for the allocated parts are invalidated
+            new_tokens = get_buildability_tokens(parts)
+
+        for pk in parts:
+            self.assertNotEqual(tokens[pk], new_tokens[pk])
 
         self.assertEqual(self.line_1.unallocated_quantity(), 0)
         self.assertEqual(self.line_2.unallocated_quantity(), 0)
@@ -925,6 +938,26 @@ class AutoAllocationTests(BuildTestBase):
 
         self.assertEqual(self.build.allocated_stock.count(), N - 8)
 
+    def test_shared_stock(self):
+        """Stock items which are valid for multiple lines must not be over-allocated."""
+        # Remove stock for sub_part_1, and allow sub_part_2 as a substitute
+        StockItem.objects.filter(part=self.sub_part_1).delete()
+        BomItemSubstitute.objects.create(bom_item=self.bom_item_1, part=self.sub_part_2)
+
+        self.build.auto_allocate_stock(
+            interchangeable=True, substitutes=True, optional_items=True
+        )
+
+        # Each sub_part_2 stock item is allocated exactly once
+        for item in StockItem.objects.filter(part=self.sub_part_2):
+            self.assertEqual(item.allocations.count(), 1)
+            self.assertEqual(item.allocation_count(), 5)
+            self.assertEqual(item.unallocated_quantity(), 0)
+
+        # The substitute part provides the remaining stock for line_2
+        self.assertTrue(self.line_2.is_fully_allocated())
+        self.assertFalse(self.line_1.is_fully_allocated())
+
 
 class ExternalBuildTest(InvenTreeAPITestCase):
     """Unit tests for external build order functionality."""
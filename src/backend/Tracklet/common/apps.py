@@ -25,11 +25,19 @@ class CommonConfig(AppConfig):
 
         setAppLoaded(self.name)
 
+        self.connect_search_index()
+
         if Tracklet.ready.isRunningMigrations():  # pragma: no cover
             return
 
         self.clear_restart_flag()
 
+    def connect_search_index(self):
+        """Connect the signals which maintain the full-text search index."""
+        import common.search
+
+        common.search.connect_signals()
+
     @ignore_ready_warning
     def clear_restart_flag(self):
         """Clear the SERVER_RESTART_REQUIRED setting."""
@@ -2,6 +2,8 @@
 
 import decimal
 import math
+import threading
+import time
 from typing import Optional
 
 from django.core.exceptions import ValidationError
@@ -233,3 +235,165 @@ def get_price(
         cost = pb_cost * quantity
         return Tracklet.helpers.normalize(cost + instance.base_cost)
     return None
+
+
+# Minimum interval (seconds) between checks for updated exchange rates
+EXCHANGE_RATE_CHECK_INTERVAL = 60
+
+# In-process snapshot of the exchange rate table
+exchange_rate_data = {'key': None, 'checked': None, 'base': None, 'rates': {}}
+exchange_rate_lock = threading.Lock()
+
+
+def clear_exchange_rates() -> None:
+    """Discard the in-process exchange rate snapshot.
+
+    The rates are reloaded from the database on the next conversion.
+    """
+    with exchange_rate_lock:
+        exchange_rate_data.update(key=None, checked=None, base=None, rates={})
+
+
+def exchange_rate_key() -> Optional[tuple]:
+    """Return a key which identifies the current set of exchange rates.
+
+    The key is the name of the exchange backend, and the timestamp of the last rate update.
+    Returns None if no exchange rates are available.
+    """
+    from djmoney.contrib.exchange.models import (
+        ExchangeBackend,
+        get_default_backend_name,
+    )
+
+    name = get_default_backend_name()
+
+    last_update = (
+        ExchangeBackend.objects
+        .filter(name=name)
+        .values_list('last_update', flat=True)
+        .first()
+    )
+
+    if last_update is None:
+        return None
+
+    return (name, last_update)
+
+
+def get_exchange_rates() -> tuple[Optional[str], dict]:
+    """Return the base currency and a {currency: rate} dict of all exchange rates.
+
+    Rates are loaded from the database once, and held in memory until the
+    exchange rates are updated. The database is checked for updated rates
+    at most once every EXCHANGE_RATE_CHECK_INTERVAL seconds.
+    """
+    from djmoney.contrib.exchange.models import ExchangeBackend, Rate
+
+    with exchange_rate_lock:
+        now = time.monotonic()
+        checked = exchange_rate_data['checked']
+
+        if checked is None or now - checked > EXCHANGE_RATE_CHECK_INTERVAL:
+            key = exchange_rate_key()
+
+            if key is None:
+                exchange_rate_data.update(key=None, base=None, rates={})
+            elif key != exchange_rate_data['key']:
+                backend = ExchangeBackend.objects.get(name=key[0])
+                rates = dict(
+                    Rate.objects.filter(backend=backend).values_list(
+                        'currency', 'value'
+                    )
+                )
+
+                rates[backend.base_currency] = decimal.Decimal(1)
+
+                exchange_rate_data.update(
+                    key=key, base=backend.base_currency, rates=rates
+                )
+
+            exchange_rate_data['checked'] = now
+
+        return exchange_rate_data['base'], exchange_rate_data['rates']
+
+
+def get_exchange_rate(source, target) -> decimal.Decimal:
+    """Return the exchange rate between two currencies.
+
+    Equivalent to djmoney.contrib.exchange.models.get_rate,
+    but uses the in-process exchange rate snapshot.
+
+    Raises:
+        MissingRate: If the rate for either currency is not available
+    """
+    from djmoney.contrib.exchange.exceptions import MissingRate
+
+    source = str(source)
+    target = str(target)
+
+    if source == target:
+        return decimal.Decimal(1)
+
+    _base, rates = get_exchange_rates()
+
+    if source not in rates or target not in rates:
+        raise MissingRate(f'Rate {source} -> {target} does not exist')
+
+    return rates[target] / rates[source]
+
+
+def convert_money(value, currency):
+    """Convert a Money value to the specified currency.
+
+    Drop-in replacement for djmoney.contrib.exchange.models.convert_money
+    """
+    from djmoney.money import Money
+
+    if value is None:
+        return None
+
+    rate = get_exchange_rate(value.currency, currency)
+
+    return Money(value.amount * rate, currency)
+
+
+def convert_money_list(values, currency, ignore_missing: bool = False) -> list:
+    """Convert a list of Money values to the specified currency.
+
+    Each exchange rate is looked up once per source currency,
+    rather than once per value.
+
+    Arguments:
+        values: An iterable of Money values (None values are passed through)
+        currency: The target currency code
+        ignore_missing: If True, values which cannot be converted are returned as None
+
+    Raises:
+        MissingRate: If a rate is not available (and ignore_missing is False)
+    """
+    from djmoney.contrib.exchange.exceptions import MissingRate
+    from djmoney.money import Money
+
+    rates = {}
+    results = []
+
+    for value in values:
+        if value is None:
+            results.append(None)
+            continue
+
+        code = str(value.currency)
+
+        if code not in rates:
+            try:
+                rates[code] = get_exchange_rate(code, currency)
+            except MissingRate:
+                if not ignore_missing:
+                    raise
+                rates[code] = None
+
+        rate = rates[code]
+
+        results.append(None if rate is None else Money(value.amount * rate, currency))
+
+    return results
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.11 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def install_search_backend(apps, schema_editor):
+    """Create the database objects required by the search backend."""
+    import common.search
+
+    common.search.get_backend(schema_editor.connection.vendor).install(schema_editor)
+
+
+def uninstall_search_backend(apps, schema_editor):
+    """Remove the database objects created by the search backend."""
+    import common.search
+
+    common.search.get_backend(schema_editor.connection.vendor).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0041_auto_20251203_1244"),
+        ("contenttypes", "0002_remove_content_type_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model_id", models.PositiveIntegerField()),
+                ("document", models.TextField(blank=True, default="")),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "model_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Search Index Entry",
+                "unique_together": {("model_type", "model_id")},
+            },
+        ),
+        migrations.RunPython(
+            install_search_backend, reverse_code=uninstall_search_backend
+        ),
+    ]
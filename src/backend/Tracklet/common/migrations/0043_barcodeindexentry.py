@@ -0,0 +1,42 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('common', '0042_searchindexentry'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BarcodeIndexEntry',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('barcode_hash', models.CharField(db_index=True, max_length=128)),
+                ('model_id', models.PositiveIntegerField()),
+                (
+                    'model_type',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='contenttypes.contenttype',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Barcode Index Entry',
+                'unique_together': {('model_type', 'model_id')},
+            },
+        )
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [('common', '0043_barcodeindexentry')]
+
+    operations = [
+        migrations.AlterField(
+            model_name='barcodescanresult',
+            name='timestamp',
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_index=True,
+                help_text='Date and time of the barcode scan',
+                verbose_name='Timestamp',
+            ),
+        )
+    ]
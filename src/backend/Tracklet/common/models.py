@@ -43,11 +43,12 @@ import structlog
 from anymail.signals import inbound, tracking
 from django_q.signals import post_spawn
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
+from djmoney.contrib.exchange.models import ExchangeBackend, Rate
 from opentelemetry import trace
 from rest_framework.exceptions import PermissionDenied
 from taggit.managers import TaggableManager
 
+import common.currency
 import common.validators
 import Tracklet.conversion
 import Tracklet.exceptions
@@ -1375,7 +1376,7 @@ class PriceBreak(MetaMixin):
             currency_code: The currency code to convert to (e.g "USD" or "AUD")
         """
         try:
-            converted = convert_money(self.price, currency_code)
+            converted = common.currency.convert_money(self.price, currency_code)
         except MissingRate:
             logger.warning(
                 'No currency conversion rate available for %s -> %s',
@@ -1884,6 +1885,16 @@ def after_custom_unit_updated(sender, instance, **kwargs):
     reload_unit_registry()
 
 
+@receiver(post_save, sender=ExchangeBackend, dispatch_uid='exchange_backend_saved')
+@receiver(post_delete, sender=ExchangeBackend, dispatch_uid='exchange_backend_deleted')
+@receiver(post_save, sender=Rate, dispatch_uid='exchange_rate_saved')
+@receiver(post_delete, sender=Rate, dispatch_uid='exchange_rate_deleted')
+def after_exchange_rate_updated(sender, instance, **kwargs):
+    """Callback when exchange rates are updated or deleted."""
+    # Force reload of the exchange rate snapshot
+    common.currency.clear_exchange_rates()
+
+
 def rename_attachment(instance, filename: str):
     """Callback function to rename an uploaded attachment file.
 
@@ -2618,6 +2629,14 @@ class Parameter(
 
         - Update the numeric data field (if applicable)
         """
+        self.prepare_save()
+        super().save(*args, **kwargs)
+
+    def prepare_save(self):
+        """Prepare the Parameter for saving to the database.
+
+        Note: This is also called for Parameters which are created in bulk.
+        """
         self.calculate_numeric_value()
 
         # Convert 'boolean' values to 'True' / 'False'
@@ -2626,7 +2645,6 @@ class Parameter(
             self.data_numeric = 1 if self.data else 0
 
         self.check_save()
-        super().save(*args, **kwargs)
 
     def delete(self):
         """Perform custom delete checks before deleting a Parameter instance."""
@@ -2821,6 +2839,7 @@ class BarcodeScanResult(Tracklet.models.InvenTreeModel):
 
     timestamp = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name=_('Timestamp'),
         help_text=_('Date and time of the barcode scan'),
     )
@@ -2938,6 +2957,69 @@ class DataOutput(models.Model):
         self.save()
 
 
+class SearchIndexEntry(models.Model):
+    """Full-text search index entry for a single model instance.
+
+    The searchable text for each indexed model instance is flattened into a single document,
+    which allows a search to be performed against a single (indexed) table,
+    rather than against many (joined) fields on the original model.
+
+    Refer to common.search for the available search backends.
+
+    Attributes:
+        model_type: The type of model which this entry indexes
+        model_id: The ID of the model instance which this entry indexes
+        document: The flattened (searchable) text for the model instance
+        updated: Date and time that the entry was last updated
+    """
+
+    class Meta:
+        """Metaclass options."""
+
+        verbose_name = _('Search Index Entry')
+        unique_together = [('model_type', 'model_id')]
+
+    model_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name='+'
+    )
+
+    model_id = models.PositiveIntegerField()
+
+    document = models.TextField(blank=True, default='')
+
+    updated = models.DateTimeField(auto_now=True)
+
+
+class BarcodeIndexEntry(models.Model):
+    """Index entry which maps a linked (third-party) barcode to a model instance.
+
+    The barcode hash of each linked barcode is stored in a single (indexed) table,
+    so that a scanned barcode can be resolved with a single database query,
+    rather than querying each model which supports barcodes.
+
+    Refer to plugin.base.barcodes.helper for the functions which maintain the index.
+
+    Attributes:
+        barcode_hash: The hash of the linked barcode data
+        model_type: The type of model which the barcode is linked to
+        model_id: The ID of the model instance which the barcode is linked to
+    """
+
+    class Meta:
+        """Metaclass options."""
+
+        verbose_name = _('Barcode Index Entry')
+        unique_together = [('model_type', 'model_id')]
+
+    barcode_hash = models.CharField(max_length=128, db_index=True)
+
+    model_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name='+'
+    )
+
+    model_id = models.PositiveIntegerField()
+
+
 # region Email
 class Priority(models.IntegerChoices):
     """Enumeration for defining email priority levels."""
@@ -0,0 +1,768 @@
+"""Full-text search index for Tracklet models.
+
+The searchable fields for each indexed model are flattened into a single
+SearchIndexEntry document, which is kept up to date via model signals.
+Index updates are applied when the current transaction is committed.
+Documents which include fields of related models (e.g. the name of the Part for a StockItem)
+are updated by a background task when the related model instance is saved.
+
+Searching against the index is performed by a database specific backend:
+
+- PostgreSQL: tsvector expression index (GIN), with a pg_trgm index for partial matches
+- SQLite: FTS5 shadow table, kept in sync with the index table via triggers
+- Other: Substring matching against the flattened document
+
+If a full-text query returns no results, the search falls back to
+substring (trigram) matching against the indexed documents.
+"""
+
+import functools
+import re
+import threading
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, OuterRef, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.db.utils import DatabaseError, OperationalError, ProgrammingError
+
+import structlog
+
+import Tracklet.ready
+
+logger = structlog.get_logger('inventree')
+
+# Name of the SQLite FTS5 shadow table
+SQLITE_FTS_TABLE = 'common_searchindexentry_fts'
+
+# Fields which are flattened into the search document for each indexed model
+# Keys are model labels, values are lists of (optionally related) field names
+SEARCH_INDEX_FIELDS = {
+    'build.build': [
+        'reference',
+        'title',
+        'part__name',
+        'part__IPN',
+        'part__description',
+        'project_code__code',
+    ],
+    'company.company': ['name', 'description', 'website', 'tax_id'],
+    'company.manufacturerpart': [
+        'MPN',
+        'description',
+        'manufacturer__name',
+        'part__IPN',
+        'part__name',
+        'part__description',
+    ],
+    'company.supplierpart': [
+        'SKU',
+        'description',
+        'supplier__name',
+        'manufacturer_part__MPN',
+        'manufacturer_part__manufacturer__name',
+        'part__IPN',
+        'part__name',
+        'part__description',
+        'part__keywords',
+    ],
+    'operations.event': ['reference', 'title', 'notes'],
+    'operations.eventfurnitureassignment': [
+        'event__reference',
+        'part__name',
+        'part__IPN',
+        'part__category__pathstring',
+        'item__name',
+        'item__category',
+        'notes',
+    ],
+    'operations.furnitureitem': [
+        'name',
+        'category',
+        'description',
+        'asset_tag',
+        'notes',
+    ],
+    'operations.rentalasset': ['name', 'asset_tag', 'serial', 'notes'],
+    'operations.rentalorder': ['reference', 'customer__name', 'notes'],
+    'order.purchaseorder': [
+        'reference',
+        'description',
+        'supplier__name',
+        'supplier_reference',
+        'project_code__code',
+    ],
+    'order.returnorder': [
+        'reference',
+        'description',
+        'customer__name',
+        'customer_reference',
+        'project_code__code',
+    ],
+    'order.salesorder': [
+        'reference',
+        'description',
+        'customer__name',
+        'customer_reference',
+        'project_code__code',
+    ],
+    'part.part': [
+        'name',
+        'description',
+        'IPN',
+        'revision',
+        'keywords',
+        'category__name',
+    ],
+    'part.partcategory': ['name', 'description', 'pathstring'],
+    'stock.stockitem': [
+        'title',
+        'serial',
+        'batch',
+        'category__name',
+        'location__name',
+        'part__name',
+        'part__IPN',
+        'part__description',
+        'supplier_part__SKU',
+        'supplier_part__supplier__name',
+        'supplier_part__manufacturer_part__MPN',
+        'supplier_part__manufacturer_part__manufacturer__name',
+    ],
+    'stock.stocklocation': ['name', 'description', 'pathstring'],
+}
+
+
+# Pending search index updates for the current thread (applied when the transaction is committed)
+index_data = threading.local()
+
+
+def search_index_enabled() -> bool:
+    """Return True if the full-text search index is enabled."""
+    return bool(getattr(settings, 'SEARCH_INDEX_ENABLED', False))
+
+
+def get_index_fields(model) -> Optional[list]:
+    """Return the list of indexed fields for the provided model (or None if not indexed)."""
+    return SEARCH_INDEX_FIELDS.get(model._meta.label_lower)
+
+
+def is_indexed(model) -> bool:
+    """Return True if the provided model is included in the search index."""
+    return get_index_fields(model) is not None
+
+
+def build_document(instance) -> str:
+    """Construct the flattened search document for the provided model instance."""
+    values = []
+
+    for field in get_index_fields(instance.__class__) or []:
+        value = instance
+
+        for attr in field.split('__'):
+            value = getattr(value, attr, None)
+
+            if value is None:
+                break
+
+        if value not in [None, '']:
+            values.append(str(value))
+
+    return ' '.join(values)
+
+
+@functools.cache
+def get_index_dependencies() -> dict:
+    """Return the related models whose fields are included in the documents of indexed models.
+
+    Returns:
+        A dict of {related model label: {'fields': set, 'dependents': list}}, where
+        - 'fields' is the set of field names of the related model which are indexed
+        - 'dependents' is a list of (indexed model label, lookup) tuples,
+          where 'lookup' filters the indexed model by the related model instance
+    """
+    dependencies = {}
+
+    for label, fields in SEARCH_INDEX_FIELDS.items():
+        try:
+            model = apps.get_model(label)
+        except LookupError:  # pragma: no cover
+            continue
+
+        for field in fields:
+            attrs = field.split('__')
+            related_model = model
+
+            for idx, attr in enumerate(attrs[:-1]):
+                try:
+                    related_model = related_model._meta.get_field(attr).related_model
+                except FieldDoesNotExist:
+                    related_model = None
+
+                if related_model is None:
+                    break
+
+                entry = dependencies.setdefault(
+                    related_model._meta.label_lower, {'fields': set(), 'dependents': []}
+                )
+
+                entry['fields'].add(attrs[idx + 1])
+
+                dependent = (label, '__'.join(attrs[: idx + 1]))
+
+                if dependent not in entry['dependents']:
+                    entry['dependents'].append(dependent)
+
+    return dependencies
+
+
+def tokenize(terms: list) -> list:
+    """Split the provided search terms into a list of word tokens."""
+    return re.findall(r'\w+', ' '.join(terms).lower())
+
+
+class SearchBackend:
+    """Default search backend, which performs substring matching against the index.
+
+    Database specific subclasses provide full-text matching and ranking.
+    """
+
+    vendor = None
+
+    def match(self, entries, tokens: list):
+        """Return the index entries which match the provided word tokens.
+
+        Arguments:
+            entries: Queryset of SearchIndexEntry objects (for a single model type)
+            tokens: List of (lowercase) word tokens
+
+        Returns:
+            A queryset of matching SearchIndexEntry objects, or None if full-text matching is not supported
+        """
+        return None
+
+    def match_partial(self, entries, terms: list):
+        """Return the index entries which contain each of the provided search terms."""
+        for term in terms:
+            entries = entries.filter(document__icontains=term)
+
+        return entries
+
+    def rank(self, queryset, entries, tokens: list):
+        """Return an expression which ranks full-text matches for the provided queryset."""
+        return Value(0.0, output_field=FloatField())
+
+    def rank_partial(self, queryset, entries, terms: list):
+        """Return an expression which ranks partial matches for the provided queryset."""
+        return Value(0.0, output_field=FloatField())
+
+    def install(self, schema_editor):
+        """Create any database objects required by this backend."""
+
+    def uninstall(self, schema_editor):
+        """Remove any database objects created by this backend."""
+
+
+class PostgresSearchBackend(SearchBackend):
+    """PostgreSQL search backend, using tsvector matching and pg_trgm for partial matches."""
+
+    vendor = 'postgresql'
+
+    trigram_enabled = None
+
+    def document_vector(self):
+        """Return the tsvector expression which matches the GIN expression index."""
+        from django.contrib.postgres.search import SearchVectorField
+
+        return Func(
+            F('document'),
+            function='to_tsvector',
+            template="%(function)s('simple'::regconfig, %(expressions)s)",
+            output_field=SearchVectorField(),
+        )
+
+    def query(self, tokens: list):
+        """Return a prefix-matching tsquery for the provided tokens."""
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens),
+            search_type='raw',
+            config='simple',
+        )
+
+    def match(self, entries, tokens: list):
+        """Match index entries using the tsvector expression index."""
+        return entries.annotate(search_vector=self.document_vector()).filter(
+            search_vector=self.query(tokens)
+        )
+
+    def rank(self, queryset, entries, tokens: list):
+        """Rank results using ts_rank."""
+        from django.contrib.postgres.search import SearchRank
+
+        ranking = (
+            entries
+            .filter(model_id=OuterRef('pk'))
+            .annotate(rank=SearchRank(self.document_vector(), self.query(tokens)))
+            .values('rank')[:1]
+        )
+
+        return Subquery(ranking, output_field=FloatField())
+
+    def rank_partial(self, queryset, entries, terms: list):
+        """Rank partial matches using trigram word similarity (if available)."""
+        if not self.has_trigram():
+            return super().rank_partial(queryset, entries, terms)
+
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        ranking = (
+            entries
+            .filter(model_id=OuterRef('pk'))
+            .annotate(rank=TrigramWordSimilarity(' '.join(terms), 'document'))
+            .values('rank')[:1]
+        )
+
+        return Subquery(ranking, output_field=FloatField())
+
+    def has_trigram(self) -> bool:
+        """Determine if the pg_trgm extension is available."""
+        if self.trigram_enabled is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                self.trigram_enabled = cursor.fetchone() is not None
+
+        return self.trigram_enabled
+
+    def install(self, schema_editor):
+        """Create the GIN expression indexes."""
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS common_searchindexentry_tsv_idx '
+            'ON common_searchindexentry '
+            "USING GIN (to_tsvector('simple'::regconfig, document))"
+        )
+
+        # The pg_trgm extension may not be available (or the user may lack permissions)
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                # Note: Index UPPER(document) to match the SQL generated for 'icontains'
+                schema_editor.execute(
+                    'CREATE INDEX IF NOT EXISTS common_searchindexentry_trgm_idx '
+                    'ON common_searchindexentry '
+                    'USING GIN (UPPER(document) gin_trgm_ops)'
+                )
+        except DatabaseError:
+            logger.warning(
+                'pg_trgm extension not available - partial matches will not be indexed'
+            )
+
+    def uninstall(self, schema_editor):
+        """Remove the GIN expression indexes."""
+        schema_editor.execute('DROP INDEX IF EXISTS common_searchindexentry_trgm_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS common_searchindexentry_tsv_idx')
+
+
+class SqliteSearchBackend(SearchBackend):
+    """SQLite search backend, using an FTS5 shadow table."""
+
+    vendor = 'sqlite'
+
+    def query(self, tokens: list) -> str:
+        """Return a prefix-matching FTS5 query for the provided tokens."""
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def match(self, entries, tokens: list):
+        """Match index entries using the FTS5 shadow table."""
+        return entries.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s',
+                [self.query(tokens)],
+            )
+        )
+
+    def rank(self, queryset, entries, tokens: list):
+        """Rank results using the FTS5 bm25 function.
+
+        Note: bm25 returns *lower* values for better matches, so the result is negated.
+        """
+        from common.models import SearchIndexEntry
+
+        qn = connection.ops.quote_name
+        table = qn(queryset.model._meta.db_table)
+        pk = qn(queryset.model._meta.pk.column)
+        index_table = SearchIndexEntry._meta.db_table
+        model_type = ContentType.objects.get_for_model(queryset.model)
+
+        return RawSQL(
+            f'SELECT -bm25({SQLITE_FTS_TABLE}) FROM {SQLITE_FTS_TABLE} '
+            f'JOIN {index_table} ON {index_table}.id = {SQLITE_FTS_TABLE}.rowid '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s '
+            f'AND {index_table}.model_type_id = %s '
+            f'AND {index_table}.model_id = {table}.{pk}',
+            [self.query(tokens), model_type.pk],
+            output_field=FloatField(),
+        )
+
+    def install(self, schema_editor):
+        """Create the FTS5 shadow table, and the triggers which keep it in sync."""
+        try:
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5('
+                "document, content='common_searchindexentry', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+        except OperationalError:
+            logger.warning('SQLite FTS5 extension not available')
+            return
+
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS common_searchindexentry_ai '
+            'AFTER INSERT ON common_searchindexentry BEGIN '
+            f'INSERT INTO {SQLITE_FTS_TABLE}(rowid, document) VALUES (new.id, new.document); '
+            'END'
+        )
+
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS common_searchindexentry_ad '
+            'AFTER DELETE ON common_searchindexentry BEGIN '
+            f'INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, document) '
+            "VALUES ('delete', old.id, old.document); "
+            'END'
+        )
+
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS common_searchindexentry_au '
+            'AFTER UPDATE ON common_searchindexentry BEGIN '
+            f'INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, document) '
+            "VALUES ('delete', old.id, old.document); "
+            f'INSERT INTO {SQLITE_FTS_TABLE}(rowid, document) VALUES (new.id, new.document); '
+            'END'
+        )
+
+    def uninstall(self, schema_editor):
+        """Remove the FTS5 shadow table and triggers."""
+        for trigger in ['ai', 'ad', 'au']:
+            schema_editor.execute(
+                f'DROP TRIGGER IF EXISTS common_searchindexentry_{trigger}'
+            )
+
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}')
+
+
+SEARCH_BACKENDS = {
+    backend.vendor: backend
+    for backend in [PostgresSearchBackend(), SqliteSearchBackend()]
+}
+
+
+def get_backend(vendor: Optional[str] = None) -> SearchBackend:
+    """Return the search backend for the provided database vendor (default = current connection)."""
+    return SEARCH_BACKENDS.get(vendor or connection.vendor) or SearchBackend()
+
+
+def search_queryset(queryset, terms: list, ranked: bool = False):
+    """Filter the provided queryset against the search index.
+
+    Arguments:
+        queryset: The queryset to filter (the model must be indexed)
+        terms: List of search terms - each term must match
+        ranked: If True, annotate the queryset with a 'search_rank' field
+
+    Returns:
+        The filtered (and optionally annotated) queryset
+    """
+    from common.models import SearchIndexEntry
+
+    backend = get_backend()
+
+    model_type = ContentType.objects.get_for_model(queryset.model)
+    entries = SearchIndexEntry.objects.filter(model_type=model_type)
+
+    tokens = tokenize(terms)
+    hits = backend.match(entries, tokens) if tokens else None
+    partial = hits is None or not hits.exists()
+
+    if partial:
+        # Fallback to partial matching of the provided search terms
+        hits = backend.match_partial(entries, terms)
+
+    queryset = queryset.filter(pk__in=hits.values('model_id'))
+
+    if ranked:
+        if partial:
+            rank = backend.rank_partial(queryset, entries, terms)
+        else:
+            rank = backend.rank(queryset, entries, tokens)
+
+        queryset = queryset.annotate(search_rank=rank)
+
+    return queryset
+
+
+def update_index(instance):
+    """Create or update the search index entry for the provided model instance."""
+    from common.models import SearchIndexEntry
+
+    SearchIndexEntry.objects.update_or_create(
+        model_type=ContentType.objects.get_for_model(instance.__class__),
+        model_id=instance.pk,
+        defaults={'document': build_document(instance)},
+    )
+
+
+def update_index_bulk(model, pks: list) -> int:
+    """Create or update the search index entries for multiple instances of a model.
+
+    This is used when model instances are updated in bulk (without model signals).
+
+    Arguments:
+        model: The (indexed) model class
+        pks: List of primary key values for the updated instances
+
+    Returns:
+        The number of index entries created
+    """
+    from common.models import SearchIndexEntry
+
+    if not pks or not search_index_enabled() or not is_indexed(model):
+        return 0
+
+    fields = get_index_fields(model) or []
+    model_type = ContentType.objects.get_for_model(model)
+
+    related = sorted({field.rsplit('__', 1)[0] for field in fields if '__' in field})
+
+    entries = [
+        SearchIndexEntry(
+            model_type=model_type,
+            model_id=instance.pk,
+            document=build_document(instance),
+        )
+        for instance in model.objects.filter(pk__in=pks).select_related(*related)
+    ]
+
+    with transaction.atomic():
+        SearchIndexEntry.objects.filter(
+            model_type=model_type, model_id__in=pks
+        ).delete()
+        SearchIndexEntry.objects.bulk_create(entries)
+
+    return len(entries)
+
+
+def remove_index(instance):
+    """Remove the search index entry for the provided model instance."""
+    from common.models import SearchIndexEntry
+
+    SearchIndexEntry.objects.filter(
+        model_type=ContentType.objects.get_for_model(instance.__class__),
+        model_id=instance.pk,
+    ).delete()
+
+
+def rebuild_index(model=None, batch_size: int = 500) -> int:
+    """Rebuild the search index.
+
+    Arguments:
+        model: Optional model class to rebuild (default = all indexed models)
+        batch_size: Number of entries to create per database query
+
+    Returns:
+        The number of index entries created
+    """
+    from common.models import SearchIndexEntry
+
+    if model is not None:
+        models_to_index = [model]
+    else:
+        models_to_index = []
+
+        for label in SEARCH_INDEX_FIELDS:
+            try:
+                models_to_index.append(apps.get_model(label))
+            except LookupError:  # pragma: no cover
+                pass
+
+    n = 0
+
+    for index_model in models_to_index:
+        fields = get_index_fields(index_model) or []
+        model_type = ContentType.objects.get_for_model(index_model)
+
+        # Fetch related models in the same query
+        related = sorted({
+            field.rsplit('__', 1)[0] for field in fields if '__' in field
+        })
+
+        queryset = index_model.objects.all().select_related(*related)
+
+        with transaction.atomic():
+            SearchIndexEntry.objects.filter(model_type=model_type).delete()
+
+            entries = []
+
+            for instance in queryset.iterator(chunk_size=batch_size):
+                entries.append(
+                    SearchIndexEntry(
+                        model_type=model_type,
+                        model_id=instance.pk,
+                        document=build_document(instance),
+                    )
+                )
+
+                if len(entries) >= batch_size:
+                    SearchIndexEntry.objects.bulk_create(entries)
+                    n += len(entries)
+                    entries = []
+
+            SearchIndexEntry.objects.bulk_create(entries)
+            n += len(entries)
+
+        logger.info('Rebuilt search index for %s', index_model._meta.label)
+
+    return n
+
+
+def update_dependent_index(label: str, pks: list, batch_size: int = 500) -> int:
+    """Update the index entries which include fields of the provided related model instances.
+
+    Arguments:
+        label: The label of the related model (e.g. 'part.part')
+        pks: List of primary key values for the updated related model instances
+        batch_size: Number of index entries to update per database query
+
+    Returns:
+        The number of index entries updated
+    """
+    n = 0
+
+    dependents = get_index_dependencies().get(label, {}).get('dependents', [])
+
+    for index_label, lookup in dependents:
+        model = apps.get_model(index_label)
+
+        ids = list(
+            model.objects
+            .filter(**{f'{lookup}__in': pks})
+            .values_list('pk', flat=True)
+            .distinct()
+        )
+
+        for idx in range(0, len(ids), batch_size):
+            n += update_index_bulk(model, ids[idx : idx + batch_size])
+
+    return n
+
+
+def schedule_index_update(model, pk, related: bool = False):
+    """Schedule an update of the search index for the provided model instance.
+
+    Updates are collected for the current thread, and applied when the current transaction is committed.
+
+    Arguments:
+        model: The model class
+        pk: The primary key of the model instance
+        related: If True, update the documents which include fields of this (related) instance
+    """
+    pending = getattr(index_data, 'pending', None)
+
+    if pending is None:
+        pending = index_data.pending = {'indexed': {}, 'related': {}}
+
+    key = 'related' if related else 'indexed'
+    pending[key].setdefault(model._meta.label_lower, set()).add(pk)
+
+    # Note: Each callback applies all pending updates, so later callbacks are usually no-ops.
+    # This ensures that updates are not lost if a savepoint (and its callback) is rolled back.
+    transaction.on_commit(apply_pending_updates)
+
+
+def apply_pending_updates():
+    """Apply the pending search index updates for the current thread."""
+    from Tracklet.tasks import offload_task
+
+    pending = getattr(index_data, 'pending', None)
+    index_data.pending = None
+
+    if not pending:
+        return
+
+    try:
+        for label, pks in pending['indexed'].items():
+            update_index_bulk(apps.get_model(label), sorted(pks))
+
+        # Related updates may affect many documents, so they are performed in the background
+        for label, pks in pending['related'].items():
+            offload_task(update_dependent_index, label, sorted(pks), group='search')
+    except (OperationalError, ProgrammingError):  # pragma: no cover
+        logger.warning('Failed to update search index')
+
+
+def after_indexed_model_saved(sender, instance, raw: bool = False, **kwargs):
+    """Update the search index when an indexed model instance is saved."""
+    if raw or not search_index_enabled() or Tracklet.ready.isImportingData():
+        return
+
+    schedule_index_update(sender, instance.pk)
+
+
+def after_related_model_saved(
+    sender, instance, raw: bool = False, update_fields=None, **kwargs
+):
+    """Update the documents which include fields of a related model instance, when it is saved."""
+    if raw or not search_index_enabled() or Tracklet.ready.isImportingData():
+        return
+
+    fields = get_index_dependencies().get(sender._meta.label_lower, {}).get('fields')
+
+    # Ignore updates which do not affect any indexed fields
+    if update_fields is not None and not fields.intersection(update_fields):
+        return
+
+    schedule_index_update(sender, instance.pk, related=True)
+
+
+def after_indexed_model_deleted(sender, instance, **kwargs):
+    """Remove the search index entry when an indexed model instance is deleted."""
+    if not search_index_enabled() or Tracklet.ready.isImportingData():
+        return
+
+    try:
+        remove_index(instance)
+    except (OperationalError, ProgrammingError):  # pragma: no cover
+        logger.warning('Failed to update search index for %s', sender._meta.label)
+
+
+def connect_signals():
+    """Connect the model signals which maintain the search index."""
+    for label in SEARCH_INDEX_FIELDS:
+        try:
+            model = apps.get_model(label)
+        except LookupError:  # pragma: no cover
+            continue
+
+        post_save.connect(
+            after_indexed_model_saved,
+            sender=model,
+            dispatch_uid=f'search_index_saved_{label}',
+        )
+
+        post_delete.connect(
+            after_indexed_model_deleted,
+            sender=model,
+            dispatch_uid=f'search_index_deleted_{label}',
+        )
+
+    for label in get_index_dependencies():
+        post_save.connect(
+            after_related_model_saved,
+            sender=apps.get_model(label),
+            dispatch_uid=f'search_index_related_saved_{label}',
+        )
@@ -1,7 +1,7 @@
 """JSON serializers for common components."""
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, OuterRef, Subquery
+from django.db.models import Count, OuterRef, Subquery, prefetch_related_objects
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
@@ -18,11 +18,12 @@ import common.models as common_models
 import common.validators
 import generic.states.custom
 from importer.registry import register_importer
-from Tracklet.helpers import get_objectreference
+from Tracklet.helpers import current_time, get_objectreference
 from Tracklet.helpers_model import construct_absolute_url
 from Tracklet.mixins import DataImportExportSerializerMixin
 from Tracklet.models import InvenTreeParameterMixin
 from Tracklet.serializers import (
+    BulkCreateSerializerMixin,
     ContentTypeField,
     FilterableSerializerMixin,
     InvenTreeAttachmentSerializerField,
@@ -767,7 +768,10 @@ class ParameterTemplateSerializer(
 
 @register_importer()
 class ParameterSerializer(
-    FilterableSerializerMixin, DataImportExportSerializerMixin, InvenTreeModelSerializer
+    BulkCreateSerializerMixin,
+    FilterableSerializerMixin,
+    DataImportExportSerializerMixin,
+    InvenTreeModelSerializer,
 ):
     """Serializer for the Parameter model."""
 
@@ -793,9 +797,6 @@ class ParameterSerializer(
 
     def save(self, **kwargs):
         """Save the Parameter instance."""
-        from Tracklet.models import InvenTreeParameterMixin
-        from users.permissions import check_user_permission
-
         model_type = self.validated_data.get('model_type', None)
 
         if model_type is None and self.instance:
@@ -804,6 +805,19 @@ class ParameterSerializer(
         # Ensure that the user has permission to modify parameters for the specified model
         user = self.context.get('request').user
 
+        self.check_model_permission(model_type, user)
+
+        instance = super().save(**kwargs)
+        instance.updated_by = user
+        instance.save()
+
+        return instance
+
+    def check_model_permission(self, model_type, user):
+        """Check that the user can create or edit parameters for the specified model type."""
+        from Tracklet.models import InvenTreeParameterMixin
+        from users.permissions import check_user_permission
+
         target_model_class = model_type.model_class()
 
         if not issubclass(target_model_class, InvenTreeParameterMixin):
@@ -819,11 +833,22 @@ class ParameterSerializer(
         if not target_model_class.check_related_permission('change', user):
             raise PermissionDenied(permission_error_msg)
 
-        instance = super().save(**kwargs)
-        instance.updated_by = user
-        instance.save()
+    def bulk_create(self, instances: list) -> list:
+        """Check permissions and prepare each Parameter, before bulk insertion."""
+        user = self.context.get('request').user
 
-        return instance
+        for model_type in {instance.model_type for instance in instances}:
+            self.check_model_permission(model_type, user)
+
+        # Fetch the linked model instances in bulk (required for check_save)
+        prefetch_related_objects(instances, 'content_object')
+
+        for instance in instances:
+            instance.prepare_save()
+            instance.updated = current_time()
+            instance.updated_by = user
+
+        return super().bulk_create(instances)
 
     # Note: The choices are overridden at run-time on class initialization
     model_type = ContentTypeField(
@@ -377,6 +377,15 @@ SYSTEM_SETTINGS: dict[str, InvenTreeSettingsKeyType] = {
         'default': 100,
         'validator': [int, MinValueValidator(1)],
     },
+    'BARCODE_RESULTS_DELETE_DAYS': {
+        'name': _('Barcode Scan Deletion Interval'),
+        'description': _(
+            'Barcode scan results will be deleted after specified number of days'
+        ),
+        'default': 30,
+        'units': _('days'),
+        'validator': [int, MinValueValidator(1)],
+    },
     'BARCODE_INPUT_DELAY': {
         'name': _('Barcode Input Delay'),
         'description': _('Barcode input processing delay time'),
@@ -1155,6 +1164,14 @@ SYSTEM_SETTINGS: dict[str, InvenTreeSettingsKeyType] = {
         'units': _('days'),
         'validator': [int, MinValueValidator(30)],
     },
+    'STOCK_TRACKING_ARCHIVE_OLD_ENTRIES': {
+        'name': _('Archive Old Stock Tracking Entries'),
+        'description': _(
+            'Move old stock tracking entries to an archive table, instead of deleting them'
+        ),
+        'default': False,
+        'validator': bool,
+    },
     'DISPLAY_FULL_NAMES': {
         'name': _('Display Users full names'),
         'description': _('Display Users full names instead of usernames'),
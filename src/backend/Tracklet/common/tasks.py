@@ -35,6 +35,23 @@ def cleanup_old_data_outputs():
         output.delete()
 
 
+@tracer.start_as_current_span('rebuild_search_index')
+@scheduled_task(ScheduledTask.DAILY)
+def rebuild_search_index():
+    """Rebuild the full-text search index.
+
+    Index entries are updated when individual records are saved,
+    but bulk database operations bypass the model signals.
+    """
+    import common.search
+
+    if not common.search.search_index_enabled():
+        return
+
+    n = common.search.rebuild_index()
+    logger.info('Rebuilt search index: %s entries', n)
+
+
 @tracer.start_as_current_span('delete_old_notifications')
 @scheduled_task(ScheduledTask.DAILY)
 def delete_old_notifications():
@@ -56,6 +73,40 @@ def delete_old_notifications():
     NotificationEntry.objects.filter(updated__lte=before).delete()
 
 
+@tracer.start_as_current_span('delete_old_barcode_scans')
+@scheduled_task(ScheduledTask.HOURLY)
+def delete_old_barcode_scans():
+    """Remove old barcode scan results from the database.
+
+    Scan results are deleted by timestamp:
+    - Results older than BARCODE_RESULTS_DELETE_DAYS are removed
+    - Results older than the most recent BARCODE_RESULTS_MAX_NUM results are removed
+    """
+    from common.models import BarcodeScanResult
+    from common.settings import get_global_setting
+
+    days = int(get_global_setting('BARCODE_RESULTS_DELETE_DAYS', 30))
+    threshold = timezone.now() - timedelta(days=days)
+
+    max_scans = int(get_global_setting('BARCODE_RESULTS_MAX_NUM', 100))
+
+    # Timestamp of the oldest scan result which exceeds the maximum count
+    cutoff = (
+        BarcodeScanResult.objects
+        .order_by('-timestamp')
+        .values_list('timestamp', flat=True)[max_scans : max_scans + 1]
+        .first()
+    )
+
+    if cutoff is not None:
+        threshold = max(threshold, cutoff)
+
+    n, _ = BarcodeScanResult.objects.filter(timestamp__lte=threshold).delete()
+
+    if n > 0:
+        logger.info('Deleted %s old barcode scan results', n)
+
+
 @tracer.start_as_current_span('update_news_feed')
 @scheduled_task(ScheduledTask.DAILY)
 def update_news_feed():
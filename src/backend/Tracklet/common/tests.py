@@ -2146,6 +2146,122 @@ class SelectionListTest(InvenTreeAPITestCase):
         self.assertEqual(response.data['data'], self.entry1.value)
 
 
+@override_settings(SEARCH_INDEX_ENABLED=True)
+class SearchIndexTest(InvenTreeAPITestCase):
+    """Tests for the full-text search index."""
+
+    roles = ['part.view']
+
+    def test_index(self):
+        """Test that the search index is maintained and used for API searches."""
+        import common.search
+        from common.models import SearchIndexEntry
+
+        # Index updates are applied when the transaction is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            widget = Part.objects.create(
+                name='Flux capacitor', description='Time travel widget'
+            )
+            Part.objects.create(name='Sprocket', description='Spare bicycle sprocket')
+
+        entry = SearchIndexEntry.objects.get(
+            model_type=ContentType.objects.get_for_model(Part), model_id=widget.pk
+        )
+        self.assertIn('flux capacitor', entry.document.lower())
+
+        url = reverse('api-part-list')
+
+        # Full-text (prefix) match
+        response = self.get(url, {'search': 'capac travel'})
+        self.assertEqual([p['pk'] for p in response.data], [widget.pk])
+
+        # Partial (substring) match falls back to the index document
+        response = self.get(url, {'search': 'apacit'})
+        self.assertEqual([p['pk'] for p in response.data], [widget.pk])
+
+        # Ordering by search rank
+        response = self.get(url, {'search': 'sprocket', 'ordering': '-search_rank'})
+        self.assertEqual(len(response.data), 1)
+
+        # Updates are reflected in the index
+        with self.captureOnCommitCallbacks(execute=True):
+            widget.name = 'Oscillation overthruster'
+            widget.save()
+
+        response = self.get(url, {'search': 'overthruster'})
+        self.assertEqual(len(response.data), 1)
+
+        # Deleted items are removed from the index
+        widget_pk = widget.pk
+
+        widget.active = False
+        widget.save()
+        widget.delete()
+
+        self.assertFalse(
+            SearchIndexEntry.objects.filter(
+                model_type=ContentType.objects.get_for_model(Part), model_id=widget_pk
+            ).exists()
+        )
+
+        # Rebuild the index from scratch
+        self.assertGreaterEqual(common.search.rebuild_index(Part), 1)
+
+    def test_search_rank_ordering(self):
+        """Test that search rank ordering is accepted by the default search ordering filter."""
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from part.api import CategoryList
+        from part.models import PartCategory
+        from Tracklet.filters import (
+            SEARCH_ORDER_FILTER,
+            InvenTreeSearchFilter,
+            InvenTreeSearchOrderingFilter,
+        )
+
+        self.assertIn(InvenTreeSearchOrderingFilter, SEARCH_ORDER_FILTER)
+
+        request = Request(
+            APIRequestFactory().get(
+                '/', {'search': 'capacitors', 'ordering': '-search_rank'}
+            )
+        )
+
+        view = CategoryList()
+
+        queryset = InvenTreeSearchFilter().filter_queryset(
+            request, PartCategory.objects.all(), view
+        )
+
+        ordering = InvenTreeSearchOrderingFilter().get_ordering(request, queryset, view)
+        self.assertEqual(ordering, ['-search_rank'])
+
+    def test_related_index(self):
+        """Test that documents are updated when a related model instance is saved."""
+        from common.models import SearchIndexEntry
+        from part.models import PartCategory
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category = PartCategory.objects.create(name='Capacitors')
+            part = Part.objects.create(name='Widget', category=category)
+
+        def document():
+            return SearchIndexEntry.objects.get(
+                model_type=ContentType.objects.get_for_model(Part), model_id=part.pk
+            ).document
+
+        self.assertIn('Capacitors', document())
+
+        # Renaming the category updates the document for the part
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = 'Resistors'
+            category.save()
+
+        self.assertIn('Resistors', document())
+        self.assertNotIn('Capacitors', document())
+
+
 class AdminTest(AdminTestCase):
     """Tests for the admin interface integration."""
 
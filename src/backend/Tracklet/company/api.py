@@ -74,6 +74,18 @@ class CompanyList(
 
     search_fields = ['name', 'description', 'website', 'tax_id']
 
+    # Lightweight field set for global search results
+    search_projection_fields = [
+        'pk',
+        'name',
+        'description',
+        'website',
+        'image',
+        'is_customer',
+        'is_supplier',
+        'is_manufacturer',
+    ]
+
     ordering_fields = ['active', 'name', 'parts_supplied', 'parts_manufactured']
 
     ordering = 'name'
@@ -221,6 +233,9 @@ class ManufacturerPartList(
         'tags__slug',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'MPN', 'part', 'manufacturer', 'description']
+
 
 class ManufacturerPartDetail(
     ManufacturerPartMixin, OutputOptionsMixin, RetrieveUpdateDestroyAPI
@@ -400,6 +415,9 @@ class SupplierPartList(
         'tags__slug',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'SKU', 'part', 'supplier', 'description']
+
 
 class SupplierPartDetail(
     SupplierPartMixin, OutputOptionsMixin, RetrieveUpdateDestroyAPI
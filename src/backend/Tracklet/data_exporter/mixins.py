@@ -1,10 +1,11 @@
 """Mixin classes for the exporter app."""
 
+import tempfile
 from collections import OrderedDict
 from typing import Any
 
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.utils.translation import gettext_lazy as _
 
 import structlog
@@ -15,6 +16,7 @@ from taggit.serializers import TagListSerializerField
 
 import data_exporter.serializers
 import data_exporter.tasks
+import data_exporter.writers
 import Tracklet.exceptions
 from common.models import DataOutput
 from Tracklet.helpers import str2bool
@@ -209,6 +211,47 @@ class DataExportSerializerMixin:
 
         return dataset.export(file_format)
 
+    def export_chunks_to_file(
+        self, chunks, headers: OrderedDict, file_format: str, fp, callback=None
+    ) -> int:
+        """Incrementally export chunks of serialized data to an open file.
+
+        Arguments:
+            chunks: Iterable of serialized data chunks (each a list of dict objects)
+            headers: The headers to use for the exported data {field: label}
+            file_format: The file format to export to
+            fp: Binary file object to write the exported data to
+            callback: Optional callback function, called with the number of rows written after each chunk
+
+        Returns:
+            int: The number of rows written
+        """
+        writer_class = data_exporter.writers.get_export_writer(file_format)
+
+        if writer_class is None:
+            raise ValueError(f"Unsupported export format: '{file_format}'")
+
+        field_names = list(headers.keys())
+
+        writer = writer_class(fp)
+        writer.write_header(list(headers.values()))
+
+        n = 0
+
+        for chunk in chunks:
+            writer.write_rows(
+                [self.get_nested_value(row, f) for f in field_names] for row in chunk
+            )
+
+            n += len(chunk)
+
+            if callback:
+                callback(n)
+
+        writer.close()
+
+        return n
+
 
 class DataExportViewMixin:
     """An API view mixin for directly exporting selected data.
@@ -220,8 +263,16 @@ class DataExportViewMixin:
 
     Once the export options have been validated, a new DataOutput object will be created,
     and this will be returned to the client (including a download link to the exported file).
+
+    Where supported by the export plugin and file format, the data is exported in chunks,
+    and written incrementally to a temporary file (see export_data_streaming).
+
+    Attributes:
+        export_chunk_size: Number of rows which are serialized (and written) at a time
     """
 
+    export_chunk_size = 500
+
     def is_exporting(self) -> bool:
         """Determine if the view is currently exporting data."""
         if request := getattr(self, 'request', None):
@@ -370,6 +421,20 @@ class DataExportViewMixin:
 
             raise ValidationError(export_error)
 
+        if self.can_stream_export(export_plugin, export_format):
+            self.export_data_streaming(
+                export_plugin,
+                export_format,
+                export_context,
+                output,
+                queryset=queryset,
+                serializer=serializer,
+                headers=headers,
+                filename=filename,
+                serializer_context=context,
+            )
+            return
+
         # The provided plugin is responsible for exporting the data
         # The returned data *must* be a list of dict objects
         try:
@@ -419,6 +484,78 @@ class DataExportViewMixin:
         # Update the output object with the exported data
         output.mark_complete(output=ContentFile(datafile, filename))
 
+    def can_stream_export(self, export_plugin, export_format: str) -> bool:
+        """Determine if the data can be exported using the streaming export path.
+
+        Plugins which provide a custom 'export_data' implementation
+        (returning a list of rows) are always exported via the in-memory path.
+        """
+        if data_exporter.writers.get_export_writer(export_format) is None:
+            return False
+
+        supports_streaming = getattr(export_plugin, 'supports_streaming_export', None)
+
+        return bool(supports_streaming and supports_streaming())
+
+    def export_data_streaming(
+        self,
+        export_plugin,
+        export_format: str,
+        export_context: dict,
+        output: DataOutput,
+        queryset,
+        serializer,
+        headers: OrderedDict,
+        filename: str,
+        serializer_context: dict,
+    ):
+        """Export the data in chunks, writing each chunk to a temporary file.
+
+        The queryset is iterated (rather than evaluated in full),
+        so memory usage does not depend on the number of exported rows.
+        The output progress is updated after each chunk is written.
+        """
+        export_error = _('Error occurred during data export')
+
+        # Augment / update the headers (if required)
+        try:
+            headers = export_plugin.update_headers(headers, export_context)
+        except Exception as e:
+            Tracklet.exceptions.log_error('update_headers', plugin=export_plugin.slug)
+            output.mark_failure(error=str(e))
+            raise ValidationError(export_error)
+
+        def update_progress(n: int):
+            output.progress = n
+            output.save(update_fields=['progress'])
+
+        with tempfile.TemporaryFile() as fp:
+            try:
+                chunks = export_plugin.export_data_chunks(
+                    queryset,
+                    serializer.__class__,
+                    headers,
+                    export_context,
+                    output,
+                    serializer_context=serializer_context,
+                    chunk_size=self.export_chunk_size,
+                )
+
+                n = serializer.export_chunks_to_file(
+                    chunks, headers, export_format, fp, callback=update_progress
+                )
+            except Exception as e:
+                Tracklet.exceptions.log_error(
+                    'export_data_chunks', plugin=export_plugin.slug
+                )
+                output.mark_failure(error=str(e))
+                raise ValidationError(export_error)
+
+            fp.seek(0)
+
+            # Update the output object with the exported data
+            output.mark_complete(progress=n, output=File(fp, name=filename))
+
     def get(self, request, *args, **kwargs):
         """Override the GET method to determine export options."""
         from common.serializers import DataOutputSerializer
@@ -0,0 +1,136 @@
+"""Incremental file writers for exporting tabular data.
+
+Unlike tablib (which builds the entire dataset in memory before exporting),
+these writers append rows directly to an open (binary) file object,
+so that memory usage is independent of the number of exported rows.
+"""
+
+import csv
+import datetime
+import io
+from decimal import Decimal
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+
+
+class ExportWriter:
+    """Base class for writing exported data to a file, one row at a time."""
+
+    def __init__(self, fp):
+        """Initialize the writer against the provided (binary) file object."""
+        self.fp = fp
+
+    def write_header(self, labels: list):
+        """Write the header row."""
+        self.write_row(labels)
+
+    def write_row(self, row: list):
+        """Write a single data row."""
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        """Write multiple data rows."""
+        for row in rows:
+            self.write_row(row)
+
+    def close(self):
+        """Finalize the output file (the underlying file object is not closed)."""
+
+
+class CsvExportWriter(ExportWriter):
+    """Write delimited (CSV / TSV) data."""
+
+    delimiter = ','
+
+    def __init__(self, fp):
+        """Wrap the binary file object for text output."""
+        super().__init__(fp)
+        self.stream = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+        self.writer = csv.writer(self.stream, delimiter=self.delimiter)
+
+    def write_row(self, row: list):
+        """Write a single row to the file."""
+        self.writer.writerow(['' if value is None else value for value in row])
+
+    def close(self):
+        """Flush the text wrapper, and release the underlying file object."""
+        self.stream.flush()
+        self.stream.detach()
+
+
+class TsvExportWriter(CsvExportWriter):
+    """Write tab-separated data."""
+
+    delimiter = '\t'
+
+
+class XlsxExportWriter(ExportWriter):
+    """Write data to an Excel workbook.
+
+    The workbook is opened in 'write only' mode, which streams rows to disk.
+    """
+
+    # Value types which can be written directly to a cell
+    CELL_TYPES = (
+        str,
+        int,
+        float,
+        bool,
+        Decimal,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+    )
+
+    def __init__(self, fp):
+        """Create a new write-only workbook."""
+        super().__init__(fp)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+
+    def cell_value(self, value):
+        """Convert the provided value to a type which can be written to a cell."""
+        if value is None:
+            return None
+
+        if not isinstance(value, self.CELL_TYPES):
+            value = str(value)
+
+        if isinstance(value, str):
+            value = ILLEGAL_CHARACTERS_RE.sub('', value)
+
+        return value
+
+    def write_header(self, labels: list):
+        """Write the header row (in bold)."""
+        cells = []
+
+        for label in labels:
+            cell = WriteOnlyCell(self.sheet, value=self.cell_value(label))
+            cell.font = Font(bold=True)
+            cells.append(cell)
+
+        self.sheet.append(cells)
+
+    def write_row(self, row: list):
+        """Write a single row to the worksheet."""
+        self.sheet.append([self.cell_value(value) for value in row])
+
+    def close(self):
+        """Save the workbook to the file."""
+        self.workbook.save(self.fp)
+
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'tsv': TsvExportWriter,
+    'xlsx': XlsxExportWriter,
+}
+
+
+def get_export_writer(file_format: str):
+    """Return the writer class for the provided file format (or None if not supported)."""
+    return EXPORT_WRITERS.get(str(file_format).lower())
@@ -156,6 +156,27 @@ class MachineRestart(APIView):
         return Response(result)
 
 
+class MachinePrintJobList(APIView):
+    """List endpoint for the recent print jobs of a machine.
+
+    - GET: return the status of the recent print jobs (most recent first)
+    """
+
+    permission_classes = [Tracklet.permissions.IsAuthenticatedOrReadScope]
+
+    @extend_schema(
+        responses={200: MachineSerializers.MachinePrintJobSerializer(many=True)}
+    )
+    def get(self, request, pk):
+        """Return the recent print jobs for a machine."""
+        machine = get_machine(pk)
+
+        results = MachineSerializers.MachinePrintJobSerializer(
+            getattr(machine, 'print_jobs', []), many=True
+        ).data
+        return Response(results)
+
+
 class MachineTypesList(APIView):
     """List API Endpoint for all discovered machine types.
 
@@ -239,6 +260,8 @@ machine_api_urls = [
                     path('', MachineSettingList.as_view(), name='api-machine-settings'),
                 ]),
             ),
+            # print jobs
+            path('jobs/', MachinePrintJobList.as_view(), name='api-machine-jobs'),
             # restart
             path('restart/', MachineRestart.as_view(), name='api-machine-restart'),
             # detail
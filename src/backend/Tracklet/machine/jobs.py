@@ -0,0 +1,421 @@
+"""Print job queue for label printer machines.
+
+Print jobs are added to a queue for each machine, rather than being sent directly to the machine driver:
+
+- Jobs are processed in order, by a limited number of worker threads (the 'concurrency' of the machine),
+  so that concurrent print requests to the same printer do not interleave
+- Consecutive pending jobs which use the same label template (and the same printing options)
+  are combined into a single call to the driver
+- Failed jobs are retried, with an exponential backoff between attempts
+- The status of recent jobs is stored in the shared machine state, and is available via the API
+
+Each process holds its own queue for a machine.
+The concurrency limit is also applied across processes, using "print slots" in the global cache (e.g. Redis).
+If the global cache is not enabled, jobs for each machine are instead printed one at a time,
+by holding a database row lock on the machine configuration while printing.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import StrEnum
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, models, transaction
+
+import structlog
+
+from Tracklet.exceptions import log_error
+from Tracklet.helpers import current_time
+from Tracklet.helpers_mixin import get_shared_class_instance_state_mixin
+
+logger = structlog.get_logger('inventree')
+
+# Maximum number of items printed in a single (combined) driver call
+PRINT_JOB_BATCH_SIZE = 100
+
+# Delay (in seconds) before the first retry of a failed print job (doubled for each further retry)
+PRINT_JOB_RETRY_DELAY = 2
+
+# Number of recent print jobs which are reported for each machine
+PRINT_JOB_HISTORY = 25
+
+# Maximum time (in seconds) that a print slot is held (in case a process exits while printing)
+PRINT_SLOT_TIMEOUT = 600
+
+# Time (in seconds) between attempts to acquire a print slot
+PRINT_SLOT_POLL_INTERVAL = 0.5
+
+
+def freeze_argument(value):
+    """Return a hashable representation of a print job argument.
+
+    Database objects are represented by their model and primary key.
+    """
+    if isinstance(value, models.Model):
+        return (value._meta.label, value.pk)
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze_argument(val)) for key, val in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_argument(val) for val in value)
+
+    return repr(value)
+
+
+class PrintJobStatus(StrEnum):
+    """Status of a print job."""
+
+    PENDING = 'pending'
+    PRINTING = 'printing'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
+
+
+class PrintJob:
+    """A request to print labels (for a list of items) against a label printer machine."""
+
+    def __init__(self, machine_pk, label, items, output=None, **kwargs):
+        """Initialize the print job.
+
+        Arguments:
+            machine_pk: The UUID of the machine to print with
+            label: The LabelTemplate object to use for printing
+            items: The list of database items to print
+            output: Optional DataOutput object, which is updated when the job completes (or fails)
+
+        Keyword arguments are passed through to the driver print_labels() method.
+        """
+        self.pk = uuid4().hex
+        self.machine_pk = str(machine_pk)
+        self.label = label
+        self.items = list(items)
+        self.output = output
+        self.kwargs = kwargs
+
+        self.status = PrintJobStatus.PENDING
+        self.attempts = 0
+        self.error = None
+        self.created = current_time()
+        self.finished = None
+
+        self.done = threading.Event()
+
+    def __repr__(self):
+        """Python representation of a print job."""
+        return f'<PrintJob: {self.pk} ({self.status})>'
+
+    @property
+    def batch_key(self) -> tuple:
+        """Jobs with the same batch key can be combined into a single driver call.
+
+        Only the items of combined jobs are merged, so the jobs must use the same label template,
+        and the same printing options. The output of each job is tracked separately.
+        """
+        return (self.label.pk, freeze_argument(self.kwargs.get('printing_options', {})))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the job to complete (or fail).
+
+        Returns:
+            True if the job has finished, False if the timeout expired
+        """
+        return self.done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        """Return a summary of the job, for reporting via the API."""
+        return {
+            'pk': self.pk,
+            'status': str(self.status),
+            'template': self.label.pk,
+            'items': len(self.items),
+            'attempts': self.attempts,
+            'error': self.error,
+            'created': self.created,
+            'finished': self.finished,
+        }
+
+
+class PrintJobQueue(
+    get_shared_class_instance_state_mixin(lambda x: f'machine:machine:{x.machine_pk}')
+):
+    """Queue of print jobs for a single label printer machine."""
+
+    def __init__(
+        self,
+        machine_pk,
+        concurrency: int = 1,
+        retries: int = 2,
+        background: bool | None = None,
+    ):
+        """Initialize the queue.
+
+        Arguments:
+            machine_pk: The UUID of the machine which the queue belongs to
+            concurrency: Maximum number of jobs which are sent to the machine at the same time
+            retries: Number of times a failed job is retried
+            background: Process jobs in background threads (default = True, except when testing)
+        """
+        self.machine_pk = str(machine_pk)
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.retry_delay = PRINT_JOB_RETRY_DELAY
+
+        if background is None:
+            background = not settings.TESTING
+
+        self.background = background
+
+        self.pending = deque()
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def submit(self, job: PrintJob, background: bool | None = None) -> PrintJob:
+        """Add a print job to the queue.
+
+        In background mode, the job is processed by a worker thread, and this method returns immediately.
+        Otherwise, all pending jobs are processed before this method returns.
+
+        Arguments:
+            job: The print job to add
+            background: Process the job in a worker thread (default = the mode of the queue)
+        """
+        with self.lock:
+            self.pending.append(job)
+
+        self.report([job])
+
+        if background is None:
+            background = self.background
+
+        if background:
+            self.start()
+        else:
+            self.process()
+
+        return job
+
+    def start(self):
+        """Start worker threads for the pending jobs (up to the concurrency limit)."""
+        with self.lock:
+            while len(self.threads) < min(self.concurrency, len(self.pending)):
+                # Worker threads are not daemonic, so that pending jobs are completed before the process exits
+                thread = threading.Thread(
+                    target=self.run, name=f'machine-print-{self.machine_pk[:8]}'
+                )
+                self.threads.append(thread)
+                thread.start()
+
+    def run(self):
+        """Worker thread: process batches of jobs until the queue is empty."""
+        thread = threading.current_thread()
+
+        try:
+            while True:
+                with self.lock:
+                    batch = self.next_batch()
+
+                    # Remove the thread while the lock is held, so that a new job starts a new thread
+                    if not batch:
+                        self.threads.remove(thread)
+                        break
+
+                self.print_batch(batch)
+        except Exception:
+            log_error('PrintJobQueue.run', scope='machine')
+
+            with self.lock:
+                self.threads.remove(thread)
+        finally:
+            # The thread has its own database connection
+            close_old_connections()
+
+    def process(self) -> int:
+        """Process all pending jobs in the current thread.
+
+        Returns:
+            The number of jobs processed
+        """
+        count = 0
+
+        while True:
+            with self.lock:
+                batch = self.next_batch()
+
+            if not batch:
+                break
+
+            self.print_batch(batch)
+            count += len(batch)
+
+        return count
+
+    def next_batch(self) -> list[PrintJob]:
+        """Remove the next batch of jobs from the queue.
+
+        The batch contains the first pending job, and any consecutive jobs which can be combined with it.
+        Note: The queue lock must be held by the caller.
+        """
+        if not self.pending:
+            return []
+
+        batch = [self.pending.popleft()]
+        n_items = len(batch[0].items)
+
+        while self.pending and self.pending[0].batch_key == batch[0].batch_key:
+            n_items += len(self.pending[0].items)
+
+            if n_items > PRINT_JOB_BATCH_SIZE:
+                break
+
+            batch.append(self.pending.popleft())
+
+        return batch
+
+    def print_batch(self, batch: list[PrintJob]):
+        """Send a batch of jobs to the machine driver, retrying on failure."""
+        job = batch[0]
+        items = [item for entry in batch for item in entry.items]
+
+        with self.print_slot():
+            for attempt in range(self.retries + 1):
+                if attempt > 0:
+                    time.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+                self.update(batch, status=PrintJobStatus.PRINTING, attempts=attempt + 1)
+
+                try:
+                    # Any database changes made by a failed attempt are rolled back
+                    with transaction.atomic():
+                        self.print_labels(job.label, items, **job.kwargs)
+                except Exception as exc:
+                    logger.warning(
+                        "Print job %s failed on machine '%s' (attempt %s): %s",
+                        job.pk,
+                        self.machine_pk,
+                        attempt + 1,
+                        exc,
+                    )
+
+                    if attempt >= self.retries:
+                        log_error('PrintJobQueue.print_batch', scope='machine')
+                        self.update(batch, status=PrintJobStatus.FAILED, error=str(exc))
+                else:
+                    self.update(batch, status=PrintJobStatus.COMPLETE, error=None)
+                    break
+
+        # Update the output of each job (once the machine is released)
+        for entry in batch:
+            if entry.output is None:
+                continue
+
+            if entry.status == PrintJobStatus.COMPLETE:
+                entry.output.mark_complete()
+            else:
+                entry.output.mark_failure(error=entry.error)
+
+    def print_labels(self, label, items, **kwargs):
+        """Send labels to the machine driver."""
+        from machine.registry import registry
+
+        machine = registry.get_machine(self.machine_pk)
+
+        if machine is None:
+            raise AttributeError(f"Machine '{self.machine_pk}' not found")
+
+        if machine.driver is None:
+            raise AttributeError(f"Machine '{self.machine_pk}' has no specified driver")
+
+        machine.driver.print_labels(machine, label, items, **kwargs)
+
+    def update(self, jobs: list[PrintJob], status: PrintJobStatus, **kwargs):
+        """Update the status of a list of jobs, and report the new status."""
+        for job in jobs:
+            job.status = status
+
+            for key, value in kwargs.items():
+                setattr(job, key, value)
+
+            if status in [PrintJobStatus.COMPLETE, PrintJobStatus.FAILED]:
+                job.finished = current_time()
+                job.done.set()
+
+        self.report(jobs)
+
+    def report(self, jobs: list[PrintJob]):
+        """Store the status of the provided jobs in the shared machine state."""
+        history = [job.to_dict() for job in reversed(jobs)]
+        updated = {job.pk for job in jobs}
+
+        with self.lock:
+            for entry in self.get_shared_state('print_jobs', []):
+                if entry['pk'] not in updated:
+                    history.append(entry)
+
+            # Most recent jobs are listed first
+            history.sort(key=lambda entry: entry['created'], reverse=True)
+
+            self.set_shared_state('print_jobs', history[:PRINT_JOB_HISTORY])
+
+    @contextmanager
+    def print_slot(self):
+        """Context manager which holds the right to print to the machine.
+
+        If the global cache is enabled, one of the print slots for the machine is held
+        (so that up to 'concurrency' jobs are printed at the same time, across all processes).
+        Otherwise, the machine configuration is locked in the database,
+        so that only one job is printed at a time (across all processes).
+        """
+        if settings.GLOBAL_CACHE_ENABLED:
+            slot = self.acquire_slot(block=True)
+
+            try:
+                yield
+            finally:
+                self.release_slot(slot)
+        else:
+            from machine.models import MachineConfig
+
+            with transaction.atomic():
+                # The lock is held until the transaction is closed
+                list(
+                    MachineConfig.objects
+                    .select_for_update()
+                    .filter(pk=self.machine_pk)
+                    .values_list('pk', flat=True)
+                )
+
+                yield
+
+    def acquire_slot(self, block: bool = False) -> str | None:
+        """Acquire one of the print slots for this machine.
+
+        The number of slots is limited by the concurrency of the machine.
+        Slots are stored in the cache, so are only shared between processes if the global cache is enabled.
+
+        Arguments:
+            block: If True, wait until a slot is available
+
+        Returns:
+            The cache key of the acquired slot, or None if no slot is available
+        """
+        while True:
+            for idx in range(self.concurrency):
+                key = self._get_key(f'print_slot:{idx}')
+
+                if cache.add(key, True, timeout=PRINT_SLOT_TIMEOUT):
+                    return key
+
+            if not block:
+                return None
+
+            time.sleep(PRINT_SLOT_POLL_INTERVAL)
+
+    def release_slot(self, key: str | None):
+        """Release a print slot acquired with acquire_slot()."""
+        if key:
+            cache.delete(key)
@@ -3,6 +3,7 @@
 from typing import cast
 
 from django.contrib.auth.models import AnonymousUser
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.db.models.query import QuerySet
 from django.http import HttpRequest, HttpResponse, JsonResponse
@@ -13,6 +14,7 @@ from rest_framework import serializers
 from rest_framework.request import Request
 
 from generic.states import ColorEnum
+from machine.jobs import PrintJob
 from machine.machine_type import BaseDriver, BaseMachineType, MachineStatus
 from plugin import registry as plg_registry
 from plugin.base.label.mixins import LabelPrintingMixin
@@ -24,7 +26,7 @@ class LabelPrinterBaseDriver(BaseDriver):
     """Base driver for label printer machines.
 
     Attributes:
-        USE_BACKGROUND_WORKER (bool): If True, the `print_label()` and `print_labels()` methods will be run in a background worker (default: True)
+        USE_BACKGROUND_WORKER (bool): If True, print jobs are processed by the print job queue in a background worker, otherwise by worker threads in the current process (default: True)
     """
 
     machine_type = 'label-printer'
@@ -73,7 +75,7 @@ class LabelPrinterBaseDriver(BaseDriver):
                 - copies: number of copies to print for each label
 
         Returns:
-            If `USE_BACKGROUND_WORKER=False`, a JsonResponse object which indicates outcome to the user, otherwise None
+            None - the return value is not used, as print jobs are processed by the print job queue (see machine.jobs)
 
         The default implementation simply calls print_label() for each label, producing multiple single label output "jobs"
         but this can be overridden by the particular driver.
@@ -252,7 +254,21 @@ class LabelPrinterMachine(BaseMachineType):
             'name': _('Printer Location'),
             'description': _('Scope the printer to a specific location'),
             'model': 'stock.stocklocation',
-        }
+        },
+        'CONCURRENCY': {
+            'name': _('Concurrent Print Jobs'),
+            'description': _(
+                'Maximum number of print jobs sent to the printer at the same time'
+            ),
+            'default': 1,
+            'validator': [int, MinValueValidator(1)],
+        },
+        'PRINT_RETRIES': {
+            'name': _('Print Retries'),
+            'description': _('Number of times a failed print job is retried'),
+            'default': 2,
+            'validator': [int, MinValueValidator(0)],
+        },
     }
 
     MACHINE_STATUS: type[LabelPrinterStatus] = LabelPrinterStatus
@@ -268,3 +284,40 @@ class LabelPrinterMachine(BaseMachineType):
             return None
 
         return StockLocation.objects.get(pk=location_pk)
+
+    @property
+    def print_jobs(self) -> list[dict]:
+        """Status of the recent print jobs for this machine (most recent first)."""
+        return self.get_shared_state('print_jobs', [])
+
+    def submit_print_job(
+        self,
+        label: LabelTemplate,
+        items: QuerySet[models.Model],
+        background: bool | None = None,
+        **kwargs,
+    ) -> PrintJob:
+        """Add a print job to the print job queue for this machine.
+
+        The job is sent to the driver print_labels() method by the queue (see machine.jobs).
+
+        Arguments:
+            label: The LabelTemplate object to use for printing
+            items: The list of database items to print (e.g. StockItem instances)
+            background: Process the job in a worker thread (default = the mode of the queue)
+
+        An optional DataOutput object can be provided (as the "output" keyword argument),
+        which is updated when the job completes.
+        Any other keyword arguments are passed through to the driver print_labels() method.
+        """
+        from machine.registry import registry
+
+        queue = registry.get_print_queue(self.pk)
+
+        # Apply the current machine settings to the queue
+        queue.concurrency = max(1, int(self.get_setting('CONCURRENCY', 'M') or 1))
+        queue.retries = max(0, int(self.get_setting('PRINT_RETRIES', 'M') or 0))
+
+        return queue.submit(
+            PrintJob(self.pk, label, items, **kwargs), background=background
+        )
@@ -12,6 +12,7 @@ import Tracklet.cache
 from common.settings import get_global_setting, set_global_setting
 from Tracklet.exceptions import log_error
 from Tracklet.helpers_mixin import get_shared_class_instance_state_mixin
+from machine.jobs import PrintJobQueue
 from machine.machine_type import BaseDriver, BaseMachineType
 
 logger = structlog.get_logger('inventree')
@@ -106,6 +107,9 @@ class MachineRegistry(
         self.driver_instances: dict[str, BaseDriver] = {}
         self.machines: dict[str, BaseMachineType] = {}
 
+        # Print job queues for each machine (in this process)
+        self.print_queues: dict[str, PrintJobQueue] = {}
+
         self.base_drivers: list[type[BaseDriver]] = []
 
         self.ready: bool = False
@@ -323,6 +327,7 @@ class MachineRegistry(
     def remove_machine(self, machine: BaseMachineType):
         """Remove a machine from the registry."""
         self.machines.pop(str(machine.pk), None)
+        self.print_queues.pop(str(machine.pk), None)
         self._update_registry_hash()
 
     @machine_registry_entrypoint(default_value=False)
@@ -378,6 +383,19 @@ class MachineRegistry(
 
         return list(filter(filter_machine, self.machines.values()))
 
+    def get_print_queue(self, machine_pk: str | UUID) -> PrintJobQueue:
+        """Return the print job queue for a machine (creating it if required).
+
+        Arguments:
+            machine_pk: The UUID of the machine
+        """
+        key = str(machine_pk)
+
+        if key not in self.print_queues:
+            self.print_queues[key] = PrintJobQueue(key)
+
+        return self.print_queues[key]
+
     @machine_registry_entrypoint(default_value=[])
     def get_machine_types(self):
         """Get all machine types."""
@@ -7,6 +7,7 @@ from rest_framework import serializers
 from common.serializers import GenericReferencedSettingSerializer
 from Tracklet.helpers_mixin import ClassProviderMixin
 from machine import registry
+from machine.jobs import PrintJobStatus
 from machine.machine_type import MachinePropertyType
 from machine.models import MachineConfig, MachineSetting
 
@@ -246,3 +247,40 @@ class MachineRestartSerializer(serializers.Serializer):
         fields = ['ok']
 
     ok = serializers.BooleanField()
+
+
+class MachinePrintJobSerializer(serializers.Serializer):
+    """Status of a print job in the print job queue for a machine."""
+
+    class Meta:
+        """Meta for a serializer."""
+
+        fields = [
+            'pk',
+            'status',
+            'template',
+            'items',
+            'attempts',
+            'error',
+            'created',
+            'finished',
+        ]
+
+        read_only_fields = fields
+
+    pk = serializers.CharField(label=_('ID'))
+    status = serializers.ChoiceField(
+        label=_('Status'), choices=[status.value for status in PrintJobStatus]
+    )
+    template = serializers.IntegerField(
+        label=_('Template'), help_text=_('Label template used for printing')
+    )
+    items = serializers.IntegerField(
+        label=_('Items'), help_text=_('Number of items to print')
+    )
+    attempts = serializers.IntegerField(
+        label=_('Attempts'), help_text=_('Number of print attempts')
+    )
+    error = serializers.CharField(label=_('Error'), allow_null=True)
+    created = serializers.DateTimeField(label=_('Created'))
+    finished = serializers.DateTimeField(label=_('Finished'), allow_null=True)
@@ -21,3 +21,27 @@ def ping_machines():
     for driver in registry.get_drivers():
         logger.debug("Pinging machines for driver '%s'", driver.SLUG)
         driver.ping_machines()
+
+
+@tracer.start_as_current_span('process_print_job')
+def process_print_job(machine_pk: str, label, items, **kwargs):
+    """Process a print job for a label printer machine in the background worker.
+
+    The job is added to the print job queue for the machine (within the worker process),
+    and is processed before this task completes.
+
+    Arguments:
+        machine_pk: The UUID of the label printer machine
+        label: The LabelTemplate object to use for printing
+        items: The list of database items to print
+
+    An optional DataOutput object can be provided (as the "output" keyword argument),
+    which is updated when the job completes.
+    Any other keyword arguments are passed through to the driver print_labels() method.
+    """
+    machine = registry.get_machine(machine_pk)
+
+    if machine is None:
+        raise AttributeError(f"Machine '{machine_pk}' not found")
+
+    machine.submit_print_job(label, items, background=False, **kwargs)
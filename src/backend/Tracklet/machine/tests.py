@@ -1,17 +1,21 @@
 """Machine app tests."""
 
 from typing import cast
+from unittest import mock
 
 from django.apps import apps
 from django.test import TestCase
 from django.urls import reverse
 
+from common.models import DataOutput
 from Tracklet.unit_test import AdminTestCase, InvenTreeAPITestCase
+from machine.jobs import PrintJob, PrintJobQueue, PrintJobStatus
 from machine.models import MachineConfig
 from machine.registry import registry
 from part.models import Part
 from plugin.models import PluginConfig
 from plugin.registry import registry as plg_registry
+from plugin.testing.label_machines import TestingLabelPrinterDriver
 from report.models import LabelTemplate
 
 
@@ -26,6 +30,7 @@ class TestMachineRegistryMixin(TestCase):
         registry.drivers = {}
         registry.driver_instances = {}
         registry.machines = {}
+        registry.print_queues = {}
         registry.base_drivers = []
         registry.set_shared_state('errors', [])
 
@@ -166,6 +171,34 @@ class TestDriverMachineInterface(TestMachineRegistryMixin, TestCase):
         self.assertEqual(len(registry.get_machines()), 1)
 
 
+class FakePrinter:
+    """Local fake printer, which records print calls and can be made to fail."""
+
+    def __init__(self, failures: int = 0):
+        """Initialize the printer, which fails the first 'failures' print calls."""
+        self.failures = failures
+        self.calls = []
+
+    def print_labels(self, driver, machine, label, items, **kwargs):
+        """Record a print call (replaces the driver method)."""
+        self.calls.append((label.pk, [item.pk for item in items]))
+
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError('Printer not responding')
+
+    def connect(self):
+        """Patch the testing driver to print with this printer."""
+        printer = self
+
+        def print_labels(driver, *args, **kwargs):
+            return printer.print_labels(driver, *args, **kwargs)
+
+        return mock.patch.object(
+            TestingLabelPrinterDriver, 'print_labels', print_labels
+        )
+
+
 class TestLabelPrinterMachineType(InvenTreeAPITestCase):
     """Test the label printer machine type."""
 
@@ -246,7 +279,7 @@ class TestLabelPrinterMachineType(InvenTreeAPITestCase):
         url = reverse('api-label-print')
 
         with self.assertLogs('inventree', level='WARNING') as cm:
-            self.post(
+            response = self.post(
                 url,
                 {
                     'plugin': config.key,
@@ -261,6 +294,9 @@ class TestLabelPrinterMachineType(InvenTreeAPITestCase):
         # 4 entries for each printed label
         self.assertEqual(len(cm.output), 10)
 
+        # The output is marked as complete by the print job queue
+        self.assertTrue(response.data['complete'])
+
         # Check for expected messages
         messages = [
             'Printing Label: TestingLabelPrinterDriver',
@@ -295,6 +331,131 @@ class TestLabelPrinterMachineType(InvenTreeAPITestCase):
 
         self.assertIn('is not a valid choice', str(response.data['machine']))
 
+    def test_print_queue(self):
+        """Test the print job queue for a machine, using a fake printer."""
+        machine = self.create_machine()
+
+        apps.get_app_config('report').create_default_labels()  # type: ignore
+
+        template = LabelTemplate.objects.filter(enabled=True, model_type='part').first()
+        other = LabelTemplate.objects.exclude(pk=template.pk).first()
+        parts = list(Part.objects.all()[:3])
+
+        queue = PrintJobQueue(machine.pk, retries=1, background=False)
+        queue.retry_delay = 0
+
+        options = {'printing_options': {'copies': 1}}
+
+        jobs = [
+            PrintJob(machine.pk, template, [parts[0]], **options),
+            PrintJob(machine.pk, template, [parts[1]], **options),
+            PrintJob(machine.pk, other, [parts[2]], **options),
+            PrintJob(machine.pk, template, [parts[2]], printing_options={'copies': 2}),
+        ]
+
+        queue.pending.extend(jobs)
+
+        printer = FakePrinter()
+
+        with printer.connect():
+            self.assertEqual(queue.process(), 4)
+
+        # Consecutive jobs with the same template (and arguments) are combined
+        self.assertEqual(
+            printer.calls,
+            [
+                (template.pk, [parts[0].pk, parts[1].pk]),
+                (other.pk, [parts[2].pk]),
+                (template.pk, [parts[2].pk]),
+            ],
+        )
+
+        for job in jobs:
+            self.assertTrue(job.wait(timeout=0))
+            self.assertEqual(job.status, PrintJobStatus.COMPLETE)
+            self.assertEqual(job.attempts, 1)
+
+        # A failed job is retried
+        printer = FakePrinter(failures=1)
+
+        with printer.connect():
+            job = queue.submit(PrintJob(machine.pk, template, parts, **options))
+
+        self.assertEqual(job.status, PrintJobStatus.COMPLETE)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(len(printer.calls), 2)
+
+        # The job fails once all retries have been used
+        printer = FakePrinter(failures=5)
+
+        with printer.connect():
+            job = queue.submit(PrintJob(machine.pk, template, parts, **options))
+
+        self.assertEqual(job.status, PrintJobStatus.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.error, 'Printer not responding')
+
+        # The job status is available via the API
+        response = self.get(reverse('api-machine-jobs', kwargs={'pk': machine.pk}))
+
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(response.data[0]['pk'], job.pk)
+        self.assertEqual(response.data[0]['status'], 'failed')
+        self.assertEqual(response.data[0]['items'], 3)
+
+        # Jobs from different print requests are combined, but each job keeps its own output
+        outputs = [
+            DataOutput.objects.create(
+                output_type=DataOutput.DataOutputTypes.LABEL, total=1, complete=False
+            )
+            for _idx in range(2)
+        ]
+
+        jobs = [
+            PrintJob(machine.pk, template, [part], output=output, **options)
+            for part, output in zip(parts[:2], outputs, strict=True)
+        ]
+
+        self.assertEqual(jobs[0].batch_key, jobs[1].batch_key)
+        self.assertEqual(jobs[0].kwargs, options)
+
+        queue.pending.extend(jobs)
+        printer = FakePrinter()
+
+        with printer.connect():
+            self.assertEqual(queue.process(), 2)
+
+        self.assertEqual(printer.calls, [(template.pk, [parts[0].pk, parts[1].pk])])
+
+        for output in outputs:
+            output.refresh_from_db()
+            self.assertTrue(output.complete)
+
+        # A failed job is reported against its output
+        output = DataOutput.objects.create(
+            output_type=DataOutput.DataOutputTypes.LABEL, total=1, complete=False
+        )
+
+        printer = FakePrinter(failures=5)
+
+        with printer.connect():
+            queue.submit(
+                PrintJob(machine.pk, template, parts, output=output, **options)
+            )
+
+        output.refresh_from_db()
+        self.assertFalse(output.complete)
+        self.assertEqual(output.errors, {'error': 'Printer not responding'})
+
+        # The number of concurrent print jobs is limited
+        queue.concurrency = 2
+
+        slots = [queue.acquire_slot(), queue.acquire_slot()]
+        self.assertIsNone(queue.acquire_slot())
+
+        queue.release_slot(slots[0])
+        self.assertIsNotNone(queue.acquire_slot())
+
 
 class AdminTest(AdminTestCase):
     """Tests for the admin interface integration."""
@@ -407,6 +407,9 @@ class PurchaseOrderList(
         'description',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'reference', 'description', 'supplier', 'status']
+
     ordering_fields = [
         'creation_date',
         'created_by',
@@ -892,6 +895,9 @@ class SalesOrderList(
         'project_code__code',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'reference', 'description', 'customer', 'status']
+
     ordering = '-reference'
 
 
@@ -1409,6 +1415,15 @@ class SalesOrderShipmentList(SalesOrderShipmentMixin, ListCreateAPI):
         'invoice_number',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = [
+        'pk',
+        'reference',
+        'order',
+        'shipment_date',
+        'tracking_number',
+    ]
+
 
 class SalesOrderShipmentDetail(SalesOrderShipmentMixin, RetrieveUpdateDestroyAPI):
     """API detail endpoint for SalesOrderShipment model."""
@@ -1559,6 +1574,9 @@ class ReturnOrderList(
         'project_code__code',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'reference', 'description', 'customer', 'status']
+
     ordering = '-reference'
 
 
@@ -16,7 +16,6 @@ from django.utils.translation import gettext_lazy as _
 
 import structlog
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
 from djmoney.money import Money
 from mptt.models import TreeForeignKey
 
@@ -31,7 +30,7 @@ import report.mixins
 import stock.models
 import users.models as UserModels
 from build.status_codes import BuildStatus
-from common.currency import currency_code_default
+from common.currency import convert_money, convert_money_list, currency_code_default
 from common.notifications import InvenTreeNotificationBodies
 from common.settings import get_global_setting
 from company.models import Address, Company, Contact, SupplierPart
@@ -143,35 +142,22 @@ class TotalPriceMixin(models.Model):
         if self.pk is None:
             return total
 
-        # order items
-        for line in self.lines.all():
-            if not line.price:
-                continue
-
-            try:
-                total += line.quantity * convert_money(line.price, target_currency)
-            except MissingRate:
-                log_error('order.calculate_total_price')
-                logger.exception("Missing exchange rate for '%s'", target_currency)
-
-                # Return None to indicate the calculated price is invalid
-                return None
-
-        # extra items
-        for line in self.extra_lines.all():
-            if not line.price:
-                continue
+        # order items and extra items
+        lines = [line for line in self.lines.all() if line.price]
+        lines += [line for line in self.extra_lines.all() if line.price]
 
-            try:
-                total += line.quantity * convert_money(line.price, target_currency)
-            except MissingRate:
-                # Record the error, try to press on
+        try:
+            # Exchange rates are looked up once per currency
+            prices = convert_money_list([line.price for line in lines], target_currency)
+        except MissingRate:
+            log_error('order.calculate_total_price')
+            logger.exception("Missing exchange rate for '%s'", target_currency)
 
-                log_error('order.calculate_total_price')
-                logger.exception("Missing exchange rate for '%s'", target_currency)
+            # Return None to indicate the calculated price is invalid
+            return None
 
-                # Return None to indicate the calculated price is invalid
-                return None
+        for line, price in zip(lines, prices, strict=True):
+            total += line.quantity * price
 
         # set decimal-places
         total.decimal_places = 4
@@ -221,6 +207,10 @@ class PurchaseOrderReportContext(report.mixins.BaseReportContext):
     supplier: Optional[Company]
 
 
+# Related data which is prefetched when generating PurchaseOrderReportContext for multiple orders
+PURCHASE_ORDER_REPORT_PREFETCH = ['lines__part__part', 'extra_lines']
+
+
 class SalesOrderReportContext(report.mixins.BaseReportContext):
     """Context for the sales order model.
 
@@ -243,6 +233,10 @@ class SalesOrderReportContext(report.mixins.BaseReportContext):
     customer: Optional[Company]
 
 
+# Related data which is prefetched when generating SalesOrderReportContext for multiple orders
+SALES_ORDER_REPORT_PREFETCH = ['lines__part', 'extra_lines']
+
+
 class ReturnOrderReportContext(report.mixins.BaseReportContext):
     """Context for the return order model.
 
@@ -265,6 +259,10 @@ class ReturnOrderReportContext(report.mixins.BaseReportContext):
     customer: Optional[Company]
 
 
+# Related data which is prefetched when generating ReturnOrderReportContext for multiple orders
+RETURN_ORDER_REPORT_PREFETCH = ['lines__item__part', 'extra_lines']
+
+
 class Order(
     StatusCodeMixin,
     StateTransitionMixin,
@@ -558,6 +556,8 @@ class PurchaseOrder(TotalPriceMixin, Order):
         super().clean_line_item(line)
         line.received = 0
 
+    REPORT_PREFETCH = PURCHASE_ORDER_REPORT_PREFETCH
+
     def report_context(self) -> PurchaseOrderReportContext:
         """Return report context data for this PurchaseOrder."""
         return {**super().report_context(), 'supplier': self.supplier}
@@ -1149,6 +1149,17 @@ class PurchaseOrder(TotalPriceMixin, Order):
 
             stock_items.extend(created_items)
 
+            # Add any linked barcodes to the global barcode index
+            if any(item.barcode_hash for item in bulk_create_items):
+                from plugin.base.barcodes.helper import update_barcode_index_bulk
+
+                update_barcode_index_bulk(created_items)
+
+            # Bulk creation bypasses the signals which invalidate cached buildability results
+            from part.buildability import invalidate_buildability
+
+            invalidate_buildability({item.part_id for item in bulk_create_items})
+
         # Generate a new tracking entry for each stock item
         for item in stock_items:
             tracking_entries.append(
@@ -1257,6 +1268,8 @@ class SalesOrder(TotalPriceMixin, Order):
         super().clean_line_item(line)
         line.shipped = 0
 
+    REPORT_PREFETCH = SALES_ORDER_REPORT_PREFETCH
+
     def report_context(self) -> SalesOrderReportContext:
         """Generate report context data for this SalesOrder."""
         return {**super().report_context(), 'customer': self.customer}
@@ -2205,6 +2218,13 @@ class SalesOrderShipmentReportContext(report.mixins.BaseReportContext):
     title: str
 
 
+# Related data which is prefetched when generating SalesOrderShipmentReportContext for multiple shipments
+SALES_ORDER_SHIPMENT_REPORT_PREFETCH = [
+    'allocations__item__part',
+    'allocations__line__part',
+]
+
+
 class SalesOrderShipment(
     Tracklet.models.InvenTreeAttachmentMixin,
     Tracklet.models.InvenTreeBarcodeMixin,
@@ -2259,6 +2279,8 @@ class SalesOrderShipment(
         """Return the API URL associated with the SalesOrderShipment model."""
         return reverse('api-so-shipment-list')
 
+    REPORT_PREFETCH = SALES_ORDER_SHIPMENT_REPORT_PREFETCH
+
     def report_context(self) -> SalesOrderShipmentReportContext:
         """Generate context data for the reporting interface."""
         return {
@@ -2655,6 +2677,8 @@ class ReturnOrder(TotalPriceMixin, Order):
         line.received_date = None
         line.outcome = ReturnOrderLineStatus.PENDING.value
 
+    REPORT_PREFETCH = RETURN_ORDER_REPORT_PREFETCH
+
     def report_context(self) -> ReturnOrderReportContext:
         """Generate report context data for this ReturnOrder."""
         return {**super().report_context(), 'customer': self.customer}
@@ -1812,6 +1812,11 @@ class SalesOrderSerialAllocationSerializer(serializers.Serializer):
         with transaction.atomic():
             order.models.SalesOrderAllocation.objects.bulk_create(allocations)
 
+        # Bulk creation bypasses the signals which invalidate cached buildability results
+        from part.buildability import invalidate_buildability
+
+        invalidate_buildability({item.part_id for item in stock_items})
+
 
 class SalesOrderShipmentAllocationSerializer(serializers.Serializer):
     """DRF serializer for allocation of stock items against a sales order / shipment."""
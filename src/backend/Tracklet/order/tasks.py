@@ -12,6 +12,7 @@ from opentelemetry import trace
 
 import common.notifications
 import Tracklet.helpers_model
+import Tracklet.tree
 import order.models
 from Tracklet.tasks import ScheduledTask, scheduled_task
 from order.events import PurchaseOrderEvents, SalesOrderEvents
@@ -259,6 +260,6 @@ def complete_sales_order_shipment(shipment_id: int, user_id: int) -> None:
 
     logger.info('Completing SalesOrderShipment <%s>', shipment)
 
-    with transaction.atomic():
+    with transaction.atomic(), Tracklet.tree.deferred_tree_rebuild():
         for allocation in shipment.allocations.all():
             allocation.complete_allocation(user=user)
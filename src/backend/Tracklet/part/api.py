@@ -258,6 +258,9 @@ class CategoryList(
 
     search_fields = ['name', 'description', 'pathstring']
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'name', 'description', 'pathstring', 'parent']
+
 
 class CategoryDetail(CategoryMixin, OutputOptionsMixin, CustomRetrieveUpdateDestroyAPI):
     """API endpoint for detail view of a single PartCategory object."""
@@ -1121,6 +1124,19 @@ class PartList(
         'tags__slug',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = [
+        'pk',
+        'name',
+        'IPN',
+        'revision',
+        'description',
+        'active',
+        'virtual',
+        'category',
+        'image',
+    ]
+
 
 class PartDetail(PartMixin, OutputOptionsMixin, RetrieveUpdateDestroyAPI):
     """API endpoint for detail view of a single Part object."""
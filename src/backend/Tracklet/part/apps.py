@@ -18,6 +18,8 @@ class PartConfig(AppConfig):
 
     def ready(self):
         """This function is called whenever the Part app is loaded."""
+        self.connect_buildability()
+
         # skip loading if plugin registry is not loaded or we run in a background thread
         if (
             not Tracklet.ready.isPluginRegistryLoaded()
@@ -35,6 +37,12 @@ class PartConfig(AppConfig):
             self.update_trackable_status()
             self.reset_part_pricing_flags()
 
+    def connect_buildability(self):
+        """Connect the signals which invalidate cached 'can build' quantities."""
+        import part.buildability
+
+        part.buildability.connect_signals()
+
     def update_trackable_status(self):
         """Check for any instances where a trackable part is used in the BOM for a non-trackable part.
 
@@ -0,0 +1,523 @@
+"""Multi-level "can build" calculations for assemblies.
+
+The number of assemblies which can be built is limited by the BOM line
+with the least available stock. Calculating this with per-line queryset
+annotations (or per-part queries) gets expensive when it is repeated for
+many assemblies, and cannot account for sub-assemblies which could
+themselves be built from available stock.
+
+The BuildabilityGraph loads the entire BOM structure below a set of assemblies,
+along with the available stock for every part in that structure, using a fixed
+number of queries per BOM level. From this, it calculates:
+
+- can_build: The number of assemblies which can be built from available stock
+- can_build_recursive: The number of assemblies which can be built, if any
+  sub-assemblies are first built from their own available components
+
+Note that the recursive calculation evaluates each sub-assembly independently,
+so components which are shared between sub-assemblies may be counted more
+than once. The result is therefore an upper bound.
+
+If the global cache is enabled, results are cached per part. Each cached result
+records a "token" for every part it depends on, and any change to stock,
+allocations or BOM data replaces the token for the affected part
+(invalidating any dependent results).
+"""
+
+import bisect
+import uuid
+from decimal import Decimal
+from typing import Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Subquery, Sum
+from django.db.models.signals import post_delete, post_save
+
+import structlog
+
+from build.status_codes import BuildStatusGroups
+from order.status_codes import SalesOrderStatusGroups
+
+logger = structlog.get_logger('inventree')
+
+# Maximum lifetime of a cached result (seconds)
+BUILDABILITY_CACHE_TIMEOUT = 600
+
+
+class BuildabilityGraph:
+    """The BOM structure and available stock below a set of assemblies."""
+
+    def __init__(self, part_ids: list[int], max_depth: Optional[int] = None):
+        """Load the BOM structure below the provided assemblies.
+
+        Stock quantities are loaded separately, via load_stock()
+
+        Arguments:
+            part_ids: The assemblies to load
+            max_depth: Maximum number of BOM levels to load (default = all levels)
+        """
+        # Tree information for each part: {pk: (tree_id, lft, rght, assembly)}
+        self.parts = {}
+
+        # Sorted (lft, pk) values for each part tree: {tree_id: [(lft, pk), ...]}
+        self.trees = {}
+
+        # BOM lines for each assembly: {pk: [line, ...]}
+        self.lines = {}
+
+        # Substitute parts for each BOM line: {bom_item: [pk, ...]}
+        self.substitutes = {}
+
+        # Memoized recursive results: {pk: quantity}
+        self.recursive = {}
+
+        self.roots = [int(pk) for pk in part_ids]
+        self.stock_loaded = False
+
+        self.load_trees(self.roots)
+
+        frontier = set(self.roots)
+        depth = 0
+
+        while frontier and (max_depth is None or depth < max_depth):
+            frontier = self.load_bom(frontier)
+            depth += 1
+
+    @property
+    def dependencies(self) -> set:
+        """Return the set of all parts which can affect the calculated results."""
+        return set(self.parts.keys())
+
+    def load_trees(self, part_ids):
+        """Load all parts within the variant trees of the provided parts."""
+        part_ids = [pk for pk in part_ids if pk not in self.parts]
+
+        if not part_ids:
+            return
+
+        Part = apps.get_model('part', 'part')
+
+        tree_ids = Part.objects.filter(pk__in=part_ids).values('tree_id')
+
+        queryset = (
+            Part.objects
+            .filter(tree_id__in=Subquery(tree_ids))
+            .exclude(tree_id__in=list(self.trees.keys()))
+            .order_by()
+        )
+
+        for pk, tree_id, lft, rght, assembly in queryset.values_list(
+            'pk', 'tree_id', 'lft', 'rght', 'assembly'
+        ):
+            self.parts[pk] = (tree_id, lft, rght, assembly)
+            self.trees.setdefault(tree_id, []).append((lft, pk))
+
+        for nodes in self.trees.values():
+            nodes.sort()
+
+    def get_descendants(self, part_id: int) -> list[int]:
+        """Return the variants (strict descendants) of the provided part."""
+        tree_id, lft, rght, _assembly = self.parts[part_id]
+        nodes = self.trees[tree_id]
+
+        start = bisect.bisect_right(nodes, (lft, part_id))
+
+        result = []
+
+        for node_lft, pk in nodes[start:]:
+            if node_lft >= rght:
+                break
+            result.append(pk)
+
+        return result
+
+    def get_ancestors(self, part_id: int) -> list[int]:
+        """Return the templates (strict ancestors) of the provided part."""
+        tree_id, lft, rght, _assembly = self.parts[part_id]
+
+        return [
+            pk
+            for _lft, pk in self.trees[tree_id]
+            if self.parts[pk][1] < lft and self.parts[pk][2] > rght
+        ]
+
+    def load_bom(self, assembly_ids: set) -> set:
+        """Load the BOM lines for the provided assemblies.
+
+        Inherited BOM lines (defined against template parts) are included.
+        Virtual and consumable BOM lines are ignored, as they do not limit
+        the number of assemblies which can be built.
+
+        Returns:
+            The set of sub-assemblies which have not yet been loaded
+        """
+        BomItem = apps.get_model('part', 'bomitem')
+        BomItemSubstitute = apps.get_model('part', 'bomitemsubstitute')
+
+        assembly_ids = {pk for pk in assembly_ids if pk in self.parts}
+
+        for pk in assembly_ids:
+            self.lines[pk] = []
+
+        ancestors = {pk: self.get_ancestors(pk) for pk in assembly_ids}
+        templates = set().union(*ancestors.values()) if ancestors else set()
+
+        queryset = (
+            BomItem.objects
+            .filter(
+                Q(part__in=assembly_ids) | Q(part__in=templates, inherited=True),
+                sub_part__virtual=False,
+                consumable=False,
+            )
+            .order_by()
+            .values(
+                'pk',
+                'part',
+                'sub_part',
+                'quantity',
+                'setup_quantity',
+                'attrition',
+                'inherited',
+            )
+        )
+
+        lines = list(queryset)
+
+        for line in lines:
+            for pk in assembly_ids:
+                if line['part'] == pk or (
+                    line['inherited'] and line['part'] in ancestors[pk]
+                ):
+                    self.lines[pk].append(line)
+
+        for bom_item, part_id in (
+            BomItemSubstitute.objects
+            .filter(bom_item__in=[line['pk'] for line in lines])
+            .order_by()
+            .values_list('bom_item', 'part')
+        ):
+            self.substitutes.setdefault(bom_item, []).append(part_id)
+
+        sub_parts = {line['sub_part'] for line in lines}
+
+        self.load_trees(
+            sub_parts.union(*[self.substitutes.get(line['pk'], []) for line in lines])
+        )
+
+        return {
+            pk
+            for pk in sub_parts
+            if pk in self.parts and self.parts[pk][3] and pk not in self.lines
+        }
+
+    def load_stock(self):
+        """Load the stock quantities for all parts in the graph.
+
+        - in_stock: Total 'in stock' quantity
+        - allocated: Quantity allocated to active build orders and pending sales orders
+        - variant_allocated: Quantity allocated (to any order) from 'in stock' items
+        """
+        BuildItem = apps.get_model('build', 'builditem')
+        SalesOrderAllocation = apps.get_model('order', 'salesorderallocation')
+        StockItem = apps.get_model('stock', 'stockitem')
+
+        part_ids = list(self.parts.keys())
+
+        stock_items = StockItem.objects.filter(
+            StockItem.IN_STOCK_FILTER, part__in=part_ids
+        )
+
+        build_items = BuildItem.objects.filter(
+            build_line__build__status__in=BuildStatusGroups.ACTIVE_CODES,
+            stock_item__part__in=part_ids,
+        )
+
+        sales_allocations = SalesOrderAllocation.objects.filter(
+            line__order__status__in=SalesOrderStatusGroups.OPEN,
+            shipment__shipment_date=None,
+            item__part__in=part_ids,
+        )
+
+        self.in_stock = self.aggregate(stock_items, 'part', 'quantity')
+
+        self.allocated = self.merge(
+            self.aggregate(build_items, 'stock_item__part', 'quantity'),
+            self.aggregate(sales_allocations, 'item__part', 'quantity'),
+        )
+
+        self.variant_allocated = self.merge(
+            self.aggregate(stock_items, 'part', 'allocations__quantity'),
+            self.aggregate(stock_items, 'part', 'sales_order_allocations__quantity'),
+        )
+
+        self.stock_loaded = True
+
+    @staticmethod
+    def aggregate(queryset, group: str, field: str) -> dict:
+        """Return the sum of the provided field, for each value of the group field."""
+        queryset = (
+            queryset
+            .order_by()
+            .values(group)
+            .annotate(total=Sum(field))
+            .values_list(group, 'total')
+        )
+
+        return {pk: Decimal(total) for pk, total in queryset if total is not None}
+
+    @staticmethod
+    def merge(*values: dict) -> dict:
+        """Add together multiple {pk: quantity} dicts."""
+        result = {}
+
+        for data in values:
+            for pk, quantity in data.items():
+                result[pk] = result.get(pk, Decimal(0)) + quantity
+
+        return result
+
+    def get_available(self, part_ids) -> Decimal:
+        """Return the total unallocated stock for a group of parts."""
+        total = sum(
+            (self.in_stock.get(pk, 0) - self.allocated.get(pk, 0) for pk in part_ids),
+            Decimal(0),
+        )
+
+        return max(total, Decimal(0))
+
+    def get_line_stock(self, line: dict) -> Decimal:
+        """Return the stock which is available for a particular BOM line.
+
+        This is the sum of the available stock for:
+        - The sub_part itself
+        - Any variants of the sub_part
+        - Any substitute parts
+        """
+        sub_part = line['sub_part']
+
+        variant_stock = sum(
+            (
+                self.in_stock.get(pk, 0) - self.variant_allocated.get(pk, 0)
+                for pk in self.get_descendants(sub_part)
+            ),
+            Decimal(0),
+        )
+
+        return (
+            self.get_available([sub_part])
+            + max(variant_stock, Decimal(0))
+            + self.get_available(self.substitutes.get(line['pk'], []))
+        )
+
+    def get_line_capacity(self, line: dict, extra: Decimal = Decimal(0)) -> Decimal:
+        """Return the number of assemblies which can be built, based on a single BOM line.
+
+        Arguments:
+            line: The BOM line data
+            extra: Additional stock which is available for the line (e.g. from sub-assemblies)
+        """
+        quantity = Decimal(line['quantity']) * (1 + Decimal(line['attrition']) / 100)
+
+        if quantity <= 0:
+            return Decimal(0)
+
+        stock = self.get_line_stock(line) + extra - Decimal(line['setup_quantity'])
+
+        return max(stock / quantity, Decimal(0))
+
+    def can_build(self, part_id: int) -> int:
+        """Return the number of units of the assembly which can be built from available stock."""
+        if not self.stock_loaded:
+            self.load_stock()
+
+        lines = self.lines.get(part_id, [])
+
+        if not lines:
+            return 0
+
+        return int(min(self.get_line_capacity(line) for line in lines))
+
+    def can_build_recursive(self, part_id: int, visiting: Optional[set] = None) -> int:
+        """Return the number of units which can be built, including buildable sub-assemblies.
+
+        Any sub-assemblies which can be built from available stock are
+        treated as additional stock for the BOM line.
+        """
+        if not self.stock_loaded:
+            self.load_stock()
+
+        if part_id in self.recursive:
+            return self.recursive[part_id]
+
+        visiting = visiting or set()
+
+        if part_id in visiting:
+            # Circular BOM reference
+            return 0
+
+        visiting.add(part_id)
+
+        capacity = None
+
+        for line in self.lines.get(part_id, []):
+            extra = Decimal(0)
+
+            if line['sub_part'] in self.lines:
+                extra = Decimal(self.can_build_recursive(line['sub_part'], visiting))
+
+            value = self.get_line_capacity(line, extra)
+            capacity = value if capacity is None else min(capacity, value)
+
+        visiting.discard(part_id)
+
+        self.recursive[part_id] = int(capacity) if capacity is not None else 0
+
+        return self.recursive[part_id]
+
+
+def buildability_cache_key(part_id: int) -> str:
+    """Return the cache key for the results of a particular assembly."""
+    return f'part_buildability_{part_id}'
+
+
+def buildability_token_key(part_id: int) -> str:
+    """Return the cache key for the invalidation token of a particular part."""
+    return f'part_buildability_token_{part_id}'
+
+
+def get_buildability_tokens(part_ids) -> Optional[dict]:
+    """Return the current invalidation tokens for the provided parts.
+
+    Returns None if the cache is not available.
+    Any missing tokens are created, so that a cached result which recorded
+    an evicted token can never be matched again.
+    """
+    if not settings.GLOBAL_CACHE_ENABLED:
+        return None
+
+    keys = {buildability_token_key(pk): pk for pk in part_ids}
+
+    try:
+        values = cache.get_many(list(keys.keys()))
+
+        if missing := [key for key in keys if values.get(key) is None]:
+            for key in missing:
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+
+            values.update(cache.get_many(missing))
+    except Exception:
+        return None
+
+    return {pk: values.get(key) for key, pk in keys.items()}
+
+
+def get_buildability(part_id: int, use_cache: bool = True) -> dict:
+    """Return the 'can build' quantities for the provided assembly.
+
+    Arguments:
+        part_id: The ID of the assembly part
+        use_cache: If True, return a cached result (if it is still valid)
+
+    Results are only cached if the global cache is enabled,
+    as invalidations must be visible to all server processes.
+
+    Returns:
+        dict: {'can_build': int, 'can_build_recursive': int}
+    """
+    part_id = int(part_id)
+    use_cache = use_cache and settings.GLOBAL_CACHE_ENABLED
+    key = buildability_cache_key(part_id)
+
+    if use_cache:
+        try:
+            entry = cache.get(key)
+        except Exception:
+            entry = None
+
+        if entry and get_buildability_tokens(entry['tokens'].keys()) == entry['tokens']:
+            return entry['result']
+
+    graph = BuildabilityGraph([part_id])
+
+    # Tokens are read *before* the stock data is loaded,
+    # so that any concurrent changes will invalidate the result
+    tokens = get_buildability_tokens(graph.dependencies)
+
+    result = {
+        'can_build': graph.can_build(part_id),
+        'can_build_recursive': graph.can_build_recursive(part_id),
+    }
+
+    if use_cache and tokens is not None:
+        try:
+            cache.set(
+                key,
+                {'tokens': tokens, 'result': result},
+                timeout=BUILDABILITY_CACHE_TIMEOUT,
+            )
+        except Exception:
+            pass
+
+    return result
+
+
+def invalidate_buildability(part_ids) -> None:
+    """Invalidate any cached results which depend on the provided parts."""
+    if not settings.GLOBAL_CACHE_ENABLED:
+        return
+
+    tokens = {buildability_token_key(pk): uuid.uuid4().hex for pk in part_ids if pk}
+
+    if not tokens:
+        return
+
+    try:
+        cache.set_many(tokens, timeout=None)
+    except Exception:
+        logger.warning('Failed to invalidate buildability cache')
+
+
+# Models which affect the buildability calculation,
+# and a function which returns the affected part(s) for each instance
+BUILDABILITY_MODELS = {
+    'part.part': lambda instance: [instance.pk, instance.variant_of_id],
+    'part.bomitem': lambda instance: [instance.part_id],
+    'part.bomitemsubstitute': lambda instance: [
+        instance.bom_item.part_id,
+        instance.part_id,
+    ],
+    'stock.stockitem': lambda instance: [instance.part_id],
+    'build.builditem': lambda instance: [instance.stock_item.part_id],
+    'order.salesorderallocation': lambda instance: [instance.item.part_id],
+}
+
+
+def after_buildability_data_changed(sender, instance, **kwargs):
+    """Invalidate cached buildability results when stock, allocation or BOM data changes."""
+    try:
+        part_ids = BUILDABILITY_MODELS[sender._meta.label_lower](instance)
+    except Exception:
+        # Related object may have already been deleted
+        return
+
+    invalidate_buildability(part_ids)
+
+
+def connect_signals():
+    """Connect the model signals which invalidate cached buildability results."""
+    for label in BUILDABILITY_MODELS:
+        model = apps.get_model(label)
+
+        post_save.connect(
+            after_buildability_data_changed,
+            sender=model,
+            dispatch_uid=f'buildability_saved_{label}',
+        )
+
+        post_delete.connect(
+            after_buildability_data_changed,
+            sender=model,
+            dispatch_uid=f'buildability_deleted_{label}',
+        )
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import decimal
 import hashlib
-import inspect
 import math
 import os
 import re
@@ -29,7 +28,6 @@ from django.utils.translation import gettext_lazy as _
 import structlog
 from django_cleanup import cleanup
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
 from djmoney.money import Money
 from mptt.managers import TreeManager
 from mptt.models import TreeForeignKey
@@ -49,7 +47,7 @@ import report.mixins
 import users.models
 from build import models as BuildModels
 from build.status_codes import BuildStatusGroups
-from common.currency import currency_code_default
+from common.currency import convert_money, currency_code_default
 from common.icons import validate_icon
 from common.settings import get_global_setting
 from company.models import SupplierPart
@@ -460,6 +458,10 @@ class PartReportContext(report.mixins.BaseReportContext):
     test_templates: dict[str, PartTestTemplate]
 
 
+# Related data which is prefetched when generating PartReportContext for multiple parts
+PART_REPORT_PREFETCH = ['category', 'parameters_list__template']
+
+
 @cleanup.ignore
 class Part(
     Tracklet.models.PluginValidationMixin,
@@ -552,6 +554,8 @@ class Part(
         """Return the associated barcode model type code for this model."""
         return 'PA'
 
+    REPORT_PREFETCH = PART_REPORT_PREFETCH
+
     def report_context(self) -> PartReportContext:
         """Return custom report context information."""
         return {
@@ -845,25 +849,16 @@ class Part(
 
         # First, throw the serial number against each of the loaded validation plugins
         from plugin import PluginMixinEnum, registry
+        from stock.serial_numbers import run_serial_number_validator
 
         for plugin in registry.with_mixin(PluginMixinEnum.VALIDATION):
             # Run the serial number through each custom validator
             # If the plugin returns 'True' we will skip any subsequent validation
 
             try:
-                result = False
-
-                if hasattr(plugin, 'validate_serial_number'):
-                    signature = inspect.signature(plugin.validate_serial_number)
-
-                    if 'stock_item' in signature.parameters:
-                        # 2024-08-21: New method signature accepts a 'stock_item' parameter
-                        result = plugin.validate_serial_number(
-                            serial, self, stock_item=stock_item
-                        )
-                    else:
-                        # Old method signature - does not accept a 'stock_item' parameter
-                        result = plugin.validate_serial_number(serial, self)
+                result = run_serial_number_validator(
+                    plugin, serial, self, stock_item=stock_item
+                )
 
                 if result is True:
                     return True
@@ -916,40 +911,14 @@ class Part(
             return True
 
     def find_conflicting_serial_numbers(self, serials: list) -> list:
-        """For a provided list of serials, return a list of those which are conflicting."""
-        # from part.models import Part
-        from stock.models import StockItem
-
-        conflicts = []
-
-        # First, check for raw conflicts based on efficient database queries
-        if get_global_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False):
-            # Serial number must be unique across *all* parts
-            parts = Part.objects.all()
-        else:
-            # Serial number must only be unique across this part "tree"
-            parts = Part.objects.filter(tree_id=self.tree_id)
-
-        items = StockItem.objects.filter(part__in=parts, serial__in=serials)
-        items = items.order_by('serial_int', 'serial')
-
-        for item in items:
-            conflicts.append(item.serial)
-
-        for serial in serials:
-            if serial in conflicts:
-                # Already found a conflict, no need to check further
-                continue
+        """For a provided list of serials, return a list of those which are conflicting.
 
-            try:
-                self.validate_serial_number(
-                    serial, raise_error=True, check_duplicates=False
-                )
-            except ValidationError:
-                # Serial number is invalid (as determined by plugin)
-                conflicts.append(serial)
+        Duplicate serial numbers are found with a single database query,
+        and the serial numbers are then validated (as a batch) by any validation plugins.
+        """
+        from stock.serial_numbers import find_conflicting_serial_numbers
 
-        return conflicts
+        return find_conflicting_serial_numbers(self, serials)
 
     def get_latest_serial_number(self, allow_plugins=True):
         """Find the 'latest' serial number for this Part.
@@ -998,7 +967,16 @@ class Part(
         return stock[0].serial
 
     def get_next_serial_number(self):
-        """Return the 'next' serial number in sequence."""
+        """Return the 'next' serial number in sequence.
+
+        If called within a transaction, the serial number namespace for this part
+        is locked until the transaction is complete, so that the returned serial number
+        cannot be allocated by a concurrent request in the meantime.
+        """
+        from stock.serial_numbers import lock_serial_numbers
+
+        lock_serial_numbers(self)
+
         sn = self.get_latest_serial_number()
 
         return Tracklet.helpers.increment_serial_number(sn, self)
@@ -1619,34 +1597,28 @@ class Part(
     @property
     def can_build(self):
         """Return the number of units that can be build with available stock."""
-        import part.filters
-
-        # If this part does NOT have a BOM, result is simply the currently available stock
-        if not self.has_bom:
-            return 0
-
-        # Ignore virtual parts when calculating the "can_build" quantity
-        queryset = self.get_bom_items(include_virtual=False)
+        return self.get_buildability()['can_build']
 
-        # Ignore 'consumable' BOM items for this calculation
-        queryset = queryset.filter(consumable=False)
+    @property
+    def can_build_recursive(self):
+        """Return the number of units that can be built, including any buildable sub-assemblies."""
+        return self.get_buildability()['can_build_recursive']
 
-        # Annotate the queryset with the 'can_build' quantity
-        queryset = part.filters.annotate_bom_item_can_build(queryset)
+    def get_buildability(self, use_cache: bool = True) -> dict:
+        """Return the 'can build' quantities for this part.
 
-        can_build_quantity = None
+        Arguments:
+            use_cache: If True, return a cached result (if it is still valid)
 
-        for value in queryset.values_list('can_build', flat=True):
-            if can_build_quantity is None:
-                can_build_quantity = value
-            else:
-                can_build_quantity = min(can_build_quantity, value)
+        Returns:
+            dict: {'can_build': int, 'can_build_recursive': int}
+        """
+        import part.buildability
 
-        if can_build_quantity is None:
-            # No BOM items, or no items which can be built
-            return 0
+        if not self.pk:
+            return {'can_build': 0, 'can_build_recursive': 0}
 
-        return int(max(can_build_quantity, 0))
+        return part.buildability.get_buildability(self.pk, use_cache=use_cache)
 
     @property
     def active_builds(self):
@@ -2768,6 +2740,10 @@ class PartPricing(common.models.MetaMixin):
         if money is None:
             return None
 
+        # Use the (rate caching) converter, if one has been provided
+        if converter := getattr(self, 'converter', None):
+            return converter.convert(money)
+
         target_currency = currency_code_default()
 
         try:
@@ -2923,24 +2899,44 @@ class PartPricing(common.models.MetaMixin):
 
         # Update parent assemblies and templates
         if pricing_changed and cascade:
-            self.update_assemblies(counter)
-            self.update_templates(counter)
+            self.schedule_rollup()
 
-    def update_assemblies(self, counter: int = 0):
-        """Schedule updates for any assemblies which use this part."""
-        # If the linked Part is used in any assemblies, schedule a pricing update for those assemblies
+    def schedule_rollup(self):
+        """Schedule a pricing update for all assemblies and templates which depend on this part.
 
-        used_in_parts = self.part.get_used_in()
+        The entire pricing graph above this part is recalculated in a single task,
+        rather than scheduling a separate update for each assembly / template.
 
-        for p in used_in_parts:
-            p.pricing.schedule_for_update(counter=counter + 1)
+        No update is scheduled if no other parts depend on the pricing of this part,
+        or if an update for this part is already pending.
+        """
+        import part.pricing
+        import part.tasks as part_tasks
 
-    def update_templates(self, counter: int = 0):
-        """Schedule updates for any template parts above this part."""
-        templates = self.part.get_ancestors(include_self=False)
+        if not self.has_dependents():
+            return
+
+        if not part.pricing.set_rollup_pending(self.part.pk):
+            logger.debug('Pricing rollup already pending for part %s', self.part.pk)
+            return
+
+        # Pricing calculations are performed in the background,
+        # unless the TESTING_PRICING flag is set
+        background = not settings.TESTING or not settings.TESTING_PRICING
+
+        Tracklet.tasks.offload_task(
+            part_tasks.rollup_part_pricing,
+            [self.part.pk],
+            force_async=background,
+            group='pricing',
+        )
+
+    def has_dependents(self) -> bool:
+        """Return True if the pricing of any assembly or template part depends on this part."""
+        if self.part.variant_of_id:
+            return True
 
-        for p in templates:
-            p.pricing.schedule_for_update(counter + 1)
+        return BomItem.objects.filter(self.part.get_used_in_bom_item_filter()).exists()
 
     def save(self, *args, **kwargs):
         """Whenever pricing model is saved, automatically update overall prices."""
@@ -0,0 +1,669 @@
+"""Whole-graph pricing calculations for assemblies and template parts.
+
+The BOM cost of an assembly depends on the pricing of each of its component parts
+(and any variants / substitutes which can be used in their place),
+and the variant cost of a template part depends on the pricing of its variants.
+
+Rather than recalculating pricing for each part individually (which requires
+a number of queries for each BOM line, and a separate background task for each
+assembly further up the tree), the pricing graph is loaded from the database
+in bulk, sorted topologically, and the BOM / variant / overall costs are
+calculated in a single pass. Results are written back using bulk_update.
+
+Note that only the BOM, variant and overall costs are recalculated here,
+the other pricing data (e.g. purchase or supplier cost) are used as-is.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from decimal import Decimal
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, Subquery
+
+import structlog
+from djmoney.contrib.exchange.exceptions import MissingRate
+from djmoney.money import Money
+
+from common.currency import currency_code_default, get_exchange_rate
+from common.settings import get_global_setting
+
+logger = structlog.get_logger('inventree')
+
+# Global cache key prefix for parts with a pending pricing rollup
+ROLLUP_PENDING_CACHE_KEY = 'pricing:rollup'
+
+# Maximum time (in seconds) that a pricing rollup is considered pending
+ROLLUP_PENDING_TIMEOUT = 600
+
+# PartPricing fields which are recalculated by the pricing graph
+GRAPH_PRICING_FIELDS = [
+    'bom_cost_min',
+    'bom_cost_max',
+    'variant_cost_min',
+    'variant_cost_max',
+    'overall_min',
+    'overall_max',
+]
+
+
+class CurrencyConverter:
+    """Convert money values into a single target currency.
+
+    Exchange rates are looked up once per source currency,
+    and then reused for all subsequent conversions.
+    """
+
+    def __init__(self, currency: Optional[str] = None):
+        """Initialize the converter for the provided target currency (default = base currency)."""
+        self.currency = currency or currency_code_default()
+        self.rates = {self.currency: Decimal(1)}
+
+    def get_rate(self, source: str) -> Optional[Decimal]:
+        """Return the exchange rate from the source currency (or None if not available)."""
+        source = str(source)
+
+        if source not in self.rates:
+            try:
+                self.rates[source] = get_exchange_rate(source, self.currency)
+            except MissingRate:
+                logger.warning(
+                    'No currency conversion rate available for %s -> %s',
+                    source,
+                    self.currency,
+                )
+                self.rates[source] = None
+
+        return self.rates[source]
+
+    def convert_amount(self, amount, currency: str) -> Optional[Decimal]:
+        """Convert a raw amount in the provided currency to the target currency."""
+        if amount is None:
+            return None
+
+        rate = self.get_rate(currency)
+
+        if rate is None:
+            return None
+
+        return Decimal(amount) * rate
+
+    def convert(self, money: Optional[Money]) -> Optional[Money]:
+        """Convert a Money value to the target currency."""
+        if money is None:
+            return None
+
+        amount = self.convert_amount(money.amount, money.currency)
+
+        if amount is None:
+            return None
+
+        return Money(amount, self.currency)
+
+
+class PricingGraph:
+    """The graph of pricing dependencies between parts.
+
+    Each assembly depends on all parts which can be used for each line in its BOM,
+    and each template part depends on all of its variants.
+    """
+
+    def __init__(self, part_ids: Optional[list] = None):
+        """Load the part, BOM and substitute data from the database.
+
+        Arguments:
+            part_ids: List of parts for which pricing has changed.
+                If provided, only the parts which (indirectly) depend on these parts are loaded,
+                along with the data required to calculate their pricing.
+                If None, the entire graph is loaded.
+        """
+        self.parts = {}
+
+        # Nodes in each tree, sorted by 'lft' value (for fast descendant lookup)
+        self.trees = {}
+
+        self.substitutes = defaultdict(list)
+        self.bom_items = defaultdict(list)
+
+        # Parts for which the complete BOM (including inherited lines) has been loaded
+        self.bom_loaded = set()
+
+        if part_ids is None:
+            self.load_parts()
+            self.load_bom()
+        else:
+            self.load_subgraph(part_ids)
+
+        self.variants_active_only = get_global_setting('PRICING_ACTIVE_VARIANTS', False)
+
+        # Map of part -> BOM lines (list of (quantity, [candidate parts]))
+        self.bom_lines = {}
+
+        # Map of part -> variant parts used for pricing
+        self.variants = {}
+
+        # Map of part -> parts which depend on its pricing
+        self.dependents = defaultdict(set)
+
+        for pk, part in self.parts.items():
+            if part['assembly'] and pk in self.bom_loaded:
+                self.bom_lines[pk] = self.get_bom_lines(pk)
+
+                for _quantity, candidates in self.bom_lines[pk]:
+                    for candidate in candidates:
+                        self.dependents[candidate].add(pk)
+
+            if part['template']:
+                self.variants[pk] = [
+                    variant
+                    for variant in self.get_descendants(pk)
+                    if self.parts[variant]['active'] or not self.variants_active_only
+                ]
+
+                for variant in self.variants[pk]:
+                    self.dependents[variant].add(pk)
+
+    def load_parts(self, part_ids: Optional[set] = None):
+        """Load the part data for entire variant trees.
+
+        Arguments:
+            part_ids: Load the trees which contain these parts (or all trees, if None)
+        """
+        from part.models import Part
+
+        queryset = Part.objects.all()
+
+        if part_ids is not None:
+            part_ids = [pk for pk in part_ids if pk not in self.parts]
+
+            if not part_ids:
+                return
+
+            tree_ids = Part.objects.filter(pk__in=part_ids).values('tree_id')
+            queryset = queryset.filter(tree_id__in=Subquery(tree_ids)).exclude(
+                tree_id__in=list(self.trees.keys())
+            )
+
+        trees = defaultdict(list)
+
+        for pk, parent, tree_id, lft, rght, active, trackable, assembly, template in (
+            queryset
+            .order_by()
+            .values_list(
+                'pk',
+                'variant_of_id',
+                'tree_id',
+                'lft',
+                'rght',
+                'active',
+                'trackable',
+                'assembly',
+                'is_template',
+            )
+            .iterator(chunk_size=5000)
+        ):
+            self.parts[pk] = {
+                'parent': parent,
+                'tree_id': tree_id,
+                'lft': lft,
+                'rght': rght,
+                'active': active,
+                'trackable': trackable,
+                'assembly': assembly,
+                'template': template,
+            }
+            trees[tree_id].append((lft, pk))
+
+        for tree_id, nodes in trees.items():
+            nodes.sort()
+            self.trees[tree_id] = (
+                [lft for lft, _pk in nodes],
+                [pk for _lft, pk in nodes],
+            )
+
+    def load_bom(self, part_ids: Optional[set] = None):
+        """Load the complete BOM (including inherited lines) for the specified parts.
+
+        The variant trees of all parts which can be used in these BOMs are also loaded.
+
+        Arguments:
+            part_ids: The parts to load the BOM for (or all parts, if None)
+        """
+        from part.models import BomItem, BomItemSubstitute
+
+        bom_items = BomItem.objects.all()
+        substitutes = BomItemSubstitute.objects.all()
+
+        if part_ids is not None:
+            # Inherited BOM lines are defined against the template parts
+            owners = set(part_ids)
+
+            for pk in part_ids:
+                owners.update(self.get_ancestors(pk))
+
+            owners -= self.bom_loaded
+
+            if not owners:
+                return
+
+            bom_items = bom_items.filter(part__in=owners)
+            substitutes = substitutes.filter(bom_item__part__in=owners)
+            self.bom_loaded.update(owners)
+        else:
+            self.bom_loaded.update(self.parts.keys())
+
+        required = set()
+
+        for bom_item_id, part_id in substitutes.values_list('bom_item_id', 'part_id'):
+            self.substitutes[bom_item_id].append(part_id)
+            required.add(part_id)
+
+        for (
+            pk,
+            part_id,
+            sub_part_id,
+            quantity,
+            allow_variants,
+            inherited,
+        ) in bom_items.values_list(
+            'pk', 'part_id', 'sub_part_id', 'quantity', 'allow_variants', 'inherited'
+        ).iterator(chunk_size=5000):
+            self.bom_items[part_id].append({
+                'pk': pk,
+                'sub_part': sub_part_id,
+                'quantity': quantity,
+                'allow_variants': allow_variants,
+                'inherited': inherited,
+            })
+            required.add(sub_part_id)
+
+        if part_ids is not None:
+            self.load_parts(required)
+
+    def load_subgraph(self, part_ids: list):
+        """Load the parts which (indirectly) depend on the pricing of the specified parts.
+
+        Starting from the specified parts, the graph is walked outward through
+        the template parts (variant pricing) and the BOMs which use each part
+        (directly, as a variant, or as a substitute).
+        """
+        from part.models import BomItem, BomItemSubstitute
+
+        searched = set()
+        pending = set(part_ids)
+
+        while pending:
+            self.load_parts(pending)
+
+            pending = {pk for pk in pending if pk in self.parts} - searched
+
+            if not pending:
+                break
+
+            searched.update(pending)
+
+            # Template parts depend on the pricing of their variants
+            found = set()
+
+            for pk in pending:
+                found.update(self.get_ancestors(pk))
+
+            # A BOM line may use a part via one of its templates (if variants are allowed)
+            used = pending | found
+
+            bom_item_ids = set(
+                BomItemSubstitute.objects.filter(part__in=used).values_list(
+                    'bom_item_id', flat=True
+                )
+            )
+
+            owners = set(
+                BomItem.objects
+                .filter(Q(sub_part__in=used) | Q(pk__in=bom_item_ids))
+                .order_by()
+                .values_list('part_id', 'inherited')
+                .distinct()
+            )
+
+            self.load_parts({part_id for part_id, _inherited in owners})
+
+            for part_id, inherited in owners:
+                if part_id not in self.parts:
+                    continue
+
+                found.add(part_id)
+
+                if inherited:
+                    # Inherited BOM lines apply to all variants of the assembly
+                    found.update(self.get_descendants(part_id))
+
+            pending = found - searched
+
+        self.load_bom(searched)
+
+    def get_descendants(self, pk: int) -> list:
+        """Return the variants (at any level) of the specified part."""
+        part = self.parts[pk]
+        lfts, pks = self.trees[part['tree_id']]
+
+        start = bisect_right(lfts, part['lft'])
+        end = bisect_left(lfts, part['rght'])
+
+        return pks[start:end]
+
+    def get_ancestors(self, pk: int) -> list:
+        """Return the template parts above the specified part."""
+        ancestors = []
+        parent = self.parts[pk]['parent']
+
+        while parent and parent in self.parts and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self.parts[parent]['parent']
+
+        return ancestors
+
+    def get_bom_lines(self, pk: int) -> list:
+        """Return the BOM lines for an assembly, and the parts which can be used for each line.
+
+        Matches the logic of Part.get_bom_items() and BomItem.get_valid_parts_for_allocation()
+        """
+        items = list(self.bom_items.get(pk, []))
+
+        for ancestor in self.get_ancestors(pk):
+            items.extend(
+                item for item in self.bom_items.get(ancestor, []) if item['inherited']
+            )
+
+        lines = []
+
+        for item in items:
+            sub_part = item['sub_part']
+
+            if sub_part not in self.parts:
+                continue
+
+            options = {sub_part}
+
+            if item['allow_variants']:
+                options.update(self.get_descendants(sub_part))
+
+            for substitute in self.substitutes.get(item['pk'], []):
+                if substitute not in self.parts:
+                    continue
+
+                options.add(substitute)
+
+                if item['allow_variants']:
+                    options.update(self.get_descendants(substitute))
+
+            trackable = self.parts[sub_part]['trackable']
+
+            candidates = [
+                option
+                for option in options
+                if self.parts[option]['trackable'] == trackable
+                and (option == sub_part or self.parts[option]['active'])
+            ]
+
+            lines.append((item['quantity'], candidates))
+
+        return lines
+
+    def get_dependencies(self, pk: int) -> set:
+        """Return the set of parts which the pricing of the specified part depends on."""
+        dependencies = set(self.variants.get(pk, []))
+
+        for _quantity, candidates in self.bom_lines.get(pk, []):
+            dependencies.update(candidates)
+
+        dependencies.discard(pk)
+
+        return dependencies
+
+    def get_affected_parts(self, part_ids: Optional[list] = None) -> set:
+        """Return the set of parts which require a pricing update.
+
+        Arguments:
+            part_ids: List of parts for which pricing has changed. If None, all assemblies and templates are affected.
+        """
+        if part_ids is None:
+            return set(self.bom_lines.keys()) | set(self.variants.keys())
+
+        affected = set()
+        queue = deque(part_ids)
+
+        while queue:
+            pk = queue.popleft()
+
+            for dependent in self.dependents.get(pk, []):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+
+        return affected
+
+    def sort(self, affected: set) -> list:
+        """Sort the affected parts, so that each part is calculated after its dependencies."""
+        dependencies = {pk: self.get_dependencies(pk) & affected for pk in affected}
+
+        order = []
+        queue = deque(sorted(pk for pk, deps in dependencies.items() if not deps))
+        remaining = {pk: len(deps) for pk, deps in dependencies.items()}
+
+        while queue:
+            pk = queue.popleft()
+            order.append(pk)
+
+            for dependent in self.dependents.get(pk, []):
+                if dependent in remaining and pk in dependencies[dependent]:
+                    remaining[dependent] -= 1
+
+                    if remaining[dependent] == 0:
+                        queue.append(dependent)
+
+        if len(order) < len(affected):
+            # A cycle exists in the graph - calculate the remaining parts in any order
+            cyclic = sorted(set(affected) - set(order))
+            logger.warning('Circular pricing dependency detected for parts: %s', cyclic)
+            order.extend(cyclic)
+
+        return order
+
+
+def set_rollup_pending(part_id: int) -> bool:
+    """Mark a pricing rollup as pending for the specified part.
+
+    This is used to coalesce rollups, when the pricing of a part changes
+    multiple times before the rollup task is run.
+    Pending rollups are tracked in the global cache (if enabled),
+    so that the flag is shared with the background worker which performs the rollup.
+
+    Returns:
+        bool: False if a rollup is already pending for this part, otherwise True
+    """
+    if not settings.GLOBAL_CACHE_ENABLED:
+        return True
+
+    try:
+        return cache.add(
+            f'{ROLLUP_PENDING_CACHE_KEY}:{part_id}',
+            True,
+            timeout=ROLLUP_PENDING_TIMEOUT,
+        )
+    except Exception:
+        # Cache is not available
+        return True
+
+
+def clear_rollup_pending(part_ids: list):
+    """Clear the pending rollup flag for the specified parts."""
+    if not settings.GLOBAL_CACHE_ENABLED:
+        return
+
+    try:
+        cache.delete_many([f'{ROLLUP_PENDING_CACHE_KEY}:{pk}' for pk in part_ids])
+    except Exception:
+        # Cache is not available
+        pass
+
+
+def rollup(values: list, func) -> Optional[Decimal]:
+    """Return the min / max of the provided values, ignoring null values."""
+    values = [value for value in values if value is not None]
+
+    return func(values) if values else None
+
+
+def update_bom_pricing(part_ids: Optional[list] = None) -> int:
+    """Recalculate BOM, variant and overall pricing across the pricing graph.
+
+    Arguments:
+        part_ids: List of parts for which pricing has changed.
+            All assemblies and templates which (indirectly) depend on these parts are updated.
+            If None, pricing is recalculated for all assemblies and templates.
+
+    Returns:
+        int: The number of PartPricing entries which were updated
+    """
+    from part.models import PartPricing
+
+    graph = PricingGraph(part_ids)
+    affected = graph.get_affected_parts(part_ids)
+
+    if not affected:
+        return 0
+
+    order = graph.sort(affected)
+
+    converter = CurrencyConverter()
+    currency = converter.currency
+
+    # Load (and convert) the current overall pricing for all dependencies
+    required = set(affected)
+
+    for pk in affected:
+        required.update(graph.get_dependencies(pk))
+
+    queryset = PartPricing.objects.all()
+
+    if part_ids is not None:
+        queryset = queryset.filter(part__in=required)
+
+    overall = {}
+
+    for (
+        part_id,
+        min_amount,
+        min_currency,
+        max_amount,
+        max_currency,
+    ) in queryset.values_list(
+        'part_id',
+        'overall_min',
+        'overall_min_currency',
+        'overall_max',
+        'overall_max_currency',
+    ).iterator(chunk_size=5000):
+        overall[part_id] = (
+            converter.convert_amount(min_amount, min_currency),
+            converter.convert_amount(max_amount, max_currency),
+        )
+
+    pricing_data = {
+        pricing.part_id: pricing
+        for pricing in queryset.iterator(chunk_size=1000)
+        if pricing.part_id in affected
+    }
+
+    to_update = []
+    to_create = []
+
+    for pk in order:
+        pricing = pricing_data.get(pk)
+        created = pricing is None
+
+        if created:
+            pricing = PartPricing(part_id=pk)
+
+        # Exchange rates are cached for the entire calculation
+        pricing.converter = converter
+
+        previous = [getattr(pricing, field) for field in GRAPH_PRICING_FIELDS]
+
+        bom_min = bom_max = None
+
+        if graph.parts[pk]['assembly']:
+            for quantity, candidates in graph.bom_lines.get(pk, []):
+                line_min = rollup(
+                    [overall.get(c, (None, None))[0] for c in candidates], min
+                )
+                line_max = rollup(
+                    [overall.get(c, (None, None))[1] for c in candidates], max
+                )
+
+                if line_min is not None:
+                    bom_min = (bom_min or Decimal(0)) + line_min * quantity
+
+                if line_max is not None:
+                    bom_max = (bom_max or Decimal(0)) + line_max * quantity
+
+        variants = graph.variants.get(pk, [])
+
+        variant_min = rollup([overall.get(v, (None, None))[0] for v in variants], min)
+        variant_max = rollup([overall.get(v, (None, None))[1] for v in variants], max)
+
+        pricing.bom_cost_min = None if bom_min is None else Money(bom_min, currency)
+        pricing.bom_cost_max = None if bom_max is None else Money(bom_max, currency)
+        pricing.variant_cost_min = (
+            None if variant_min is None else Money(variant_min, currency)
+        )
+        pricing.variant_cost_max = (
+            None if variant_max is None else Money(variant_max, currency)
+        )
+
+        pricing.currency = currency
+        pricing.update_overall_cost()
+
+        overall[pk] = (
+            converter.convert_amount(
+                getattr(pricing.overall_min, 'amount', None),
+                getattr(pricing.overall_min, 'currency', currency),
+            ),
+            converter.convert_amount(
+                getattr(pricing.overall_max, 'amount', None),
+                getattr(pricing.overall_max, 'currency', currency),
+            ),
+        )
+
+        if created:
+            to_create.append(pricing)
+        elif previous != [getattr(pricing, field) for field in GRAPH_PRICING_FIELDS]:
+            to_update.append(pricing)
+
+    fields = ['currency']
+
+    for field in GRAPH_PRICING_FIELDS:
+        fields.extend([field, f'{field}_currency'])
+
+    with transaction.atomic():
+        PartPricing.objects.bulk_update(to_update, fields, batch_size=500)
+
+        if to_create:
+            PartPricing.objects.bulk_create(to_create, batch_size=500)
+
+            # New entries still require a full pricing calculation
+            PartPricing.objects.filter(
+                part__in=[pricing.part_id for pricing in to_create]
+            ).update(updated=None)
+
+    logger.info(
+        'Updated BOM pricing',
+        parts=len(affected),
+        updated=len(to_update),
+        created=len(to_create),
+    )
+
+    return len(to_update) + len(to_create)
@@ -15,7 +15,6 @@ from django.utils.translation import gettext_lazy as _
 
 import structlog
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from sql_util.utils import SubqueryCount
@@ -1136,6 +1135,7 @@ class PartRequirementsSerializer(Tracklet.serializers.InvenTreeModelSerializer):
             'total_stock',
             'unallocated_stock',
             'can_build',
+            'can_build_recursive',
             'ordering',
             'building',
             'scheduled_to_build',
@@ -1153,6 +1153,12 @@ class PartRequirementsSerializer(Tracklet.serializers.InvenTreeModelSerializer):
 
     can_build = serializers.FloatField(read_only=True, label=_('Can Build'))
 
+    can_build_recursive = serializers.FloatField(
+        read_only=True,
+        label=_('Can Build (Recursive)'),
+        help_text=_('Quantity which can be built, including buildable sub-assemblies'),
+    )
+
     ordering = serializers.FloatField(
         source='on_order', read_only=True, label=_('On Order')
     )
@@ -1500,8 +1506,12 @@ class PartPricingSerializer(Tracklet.serializers.InvenTreeModelSerializer):
 
         if override_min is not None and override_max is not None:
             try:
-                override_min = convert_money(override_min, default_currency)
-                override_max = convert_money(override_max, default_currency)
+                override_min = common.currency.convert_money(
+                    override_min, default_currency
+                )
+                override_max = common.currency.convert_money(
+                    override_max, default_currency
+                )
             except MissingRate:
                 raise ValidationError(
                     _(
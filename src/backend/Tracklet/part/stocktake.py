@@ -1,19 +1,211 @@
-"""Stock history functionality."""
+"""Stock history functionality.
+
+Stocktake is performed in chunks of parts (iterated in primary key order),
+so that memory usage is independent of the number of parts and stock items.
+For each chunk, stock quantity and value are aggregated in the database
+(grouped by part), and new stocktake entries are created with a single query.
+"""
 
 from typing import Optional
 
 from django.core.files.base import ContentFile
+from django.db.models import Count, DecimalField, F, Q, Sum
 
 import structlog
 import tablib
-from djmoney.contrib.exchange.models import convert_money
 from djmoney.money import Money
 
 import common.models
+from common.currency import convert_money
 from Tracklet.helpers import current_date
 
 logger = structlog.get_logger('inventree')
 
+# Number of parts processed in each stocktake chunk
+STOCKTAKE_CHUNK_SIZE = 250
+
+
+def iterate_part_chunks(parts, chunk_size: int = STOCKTAKE_CHUNK_SIZE):
+    """Yield lists of parts from the provided queryset, using keyset pagination.
+
+    Each chunk is fetched with a "pk > last_pk" filter, which has a constant cost
+    (unlike OFFSET based slicing).
+    """
+    parts = parts.order_by('pk')
+    last_pk = None
+
+    while True:
+        queryset = parts if last_pk is None else parts.filter(pk__gt=last_pk)
+        chunk = list(queryset[:chunk_size])
+
+        if not chunk:
+            break
+
+        yield chunk
+
+        last_pk = chunk[-1].pk
+
+
+def stocktake_parts(
+    parts: list,
+    base_currency: str,
+    location=None,
+    exclude_external: bool = False,
+    skip_existing: bool = True,
+) -> list:
+    """Calculate stocktake entries for a chunk of parts.
+
+    Arguments:
+        parts: List of Part objects (with pricing_data selected)
+        base_currency: Currency code for the calculated stock value
+        location: Optional StockLocation to filter stock items
+        exclude_external: If True, exclude external stock items
+        skip_existing: If True, skip parts which already have a stocktake entry for today
+
+    Returns:
+        A list of (unsaved) PartStocktake objects
+
+    Stock for each part includes stock for any variants of that part.
+    The value of each stock item is calculated from its purchase price,
+    falling back to the overall pricing of the part.
+    """
+    import part.models as part_models
+    import stock.models as stock_models
+
+    if skip_existing:
+        existing = set(
+            part_models.PartStocktake.objects.filter(
+                part__in=parts, date__gte=current_date()
+            ).values_list('part', flat=True)
+        )
+
+        parts = [part for part in parts if part.pk not in existing]
+
+    if not parts:
+        return []
+
+    # Fetch 'in stock' items for these parts (and any variants)
+    items = stock_models.StockItem.objects.filter(
+        stock_models.StockItem.IN_STOCK_FILTER,
+        part__tree_id__in={part.tree_id for part in parts},
+    )
+
+    if exclude_external:
+        items = items.filter(location__external=False)
+
+    if location:
+        items = items.filter(location__in=location.get_descendants(include_self=True))
+
+    # Aggregate stock quantity and value, grouped by part and purchase currency
+    rows = (
+        items
+        .order_by()
+        .values('part__tree_id', 'part__lft', 'purchase_price_currency')
+        .annotate(
+            item_count=Count('pk'),
+            total_quantity=Sum('quantity'),
+            unpriced_quantity=Sum('quantity', filter=Q(purchase_price=None)),
+            total_value=Sum(
+                F('purchase_price') * F('quantity'), output_field=DecimalField()
+            ),
+        )
+    )
+
+    trees = {}
+
+    for row in rows:
+        trees.setdefault(row['part__tree_id'], []).append(row)
+
+    def convert(value: Money) -> Money:
+        try:
+            if value.currency != base_currency:
+                value = convert_money(value, base_currency)
+        except Exception:
+            value = Money(0, base_currency)
+
+        return value
+
+    entries = []
+
+    for part in parts:
+        try:
+            pricing = part.pricing_data
+        except Exception:
+            pricing = None
+
+        cost_min = (pricing.overall_min or pricing.overall_max) if pricing else None
+        cost_max = (pricing.overall_max or pricing.overall_min) if pricing else None
+
+        total_cost_min = Money(0, base_currency)
+        total_cost_max = Money(0, base_currency)
+
+        total_quantity = 0
+        items_count = 0
+
+        for row in trees.get(part.tree_id, []):
+            # Include stock for this part, and any variants
+            if not part.lft <= row['part__lft'] < part.rght:
+                continue
+
+            items_count += row['item_count']
+            total_quantity += row['total_quantity']
+
+            if row['total_value'] is not None:
+                # Stock items with a known purchase price
+                value = convert(
+                    Money(row['total_value'], row['purchase_price_currency'])
+                )
+                total_cost_min += value
+                total_cost_max += value
+
+            if quantity := row['unpriced_quantity']:
+                # Stock items without a purchase price use the part pricing
+                if cost_min is not None:
+                    total_cost_min += convert(cost_min * quantity)
+
+                if cost_max is not None:
+                    total_cost_max += convert(cost_max * quantity)
+
+        if location and items_count == 0:
+            # No stock items - skip this part if location is specified
+            continue
+
+        entries.append(
+            part_models.PartStocktake(
+                part=part,
+                item_count=items_count,
+                quantity=total_quantity,
+                cost_min=total_cost_min,
+                cost_max=total_cost_max,
+            )
+        )
+
+    return entries
+
+
+def perform_stocktake_chunk(part_ids: list[int], exclude_external: bool = False) -> int:
+    """Create stocktake entries for a list of parts.
+
+    This function is used to split a large stocktake across multiple background workers.
+
+    Returns:
+        The number of stocktake entries created
+    """
+    import part.models as part_models
+    from common.currency import currency_code_default
+
+    parts = list(
+        part_models.Part.objects.filter(pk__in=part_ids).select_related('pricing_data')
+    )
+
+    entries = stocktake_parts(
+        parts, currency_code_default(), exclude_external=exclude_external
+    )
+
+    part_models.PartStocktake.objects.bulk_create(entries)
+
+    return len(entries)
+
 
 def perform_stocktake(
     part_id: Optional[int] = None,
@@ -22,6 +214,8 @@ def perform_stocktake(
     exclude_external: Optional[bool] = None,
     generate_entry: bool = True,
     report_output_id: Optional[int] = None,
+    chunk_size: int = STOCKTAKE_CHUNK_SIZE,
+    workers: bool = False,
 ) -> None:
     """Capture a snapshot of stock-on-hand and stock value.
 
@@ -32,6 +226,8 @@ def perform_stocktake(
         exclude_external: If True, exclude external stock items from the stocktake
         generate_entry: If True, create stocktake entries in the database
         report_output_id: Optional ID of a DataOutput object for the stocktake report (e.g. for download)
+        chunk_size: Number of parts to process in each chunk
+        workers: If True, offload each chunk to a separate background task (only when no report is generated)
 
     The default implementation creates stocktake entries for all active parts,
     and writes these stocktake entries to the database.
@@ -39,10 +235,10 @@ def perform_stocktake(
     Alternatively, the scope of the stocktake can be limited by providing a queryset of parts,
     or by providing a category ID or location ID to filter the parts/stock items.
     """
-    import Tracklet.helpers
     import part.models as part_models
     import part.serializers as part_serializers
     import stock.models as stock_models
+    import Tracklet.tasks
     from common.currency import currency_code_default
     from common.settings import get_global_setting
 
@@ -70,9 +266,6 @@ def perform_stocktake(
     # Only use active parts
     parts = parts.filter(active=True)
 
-    # Prefetch related pricing information
-    parts = parts.prefetch_related('pricing_data', 'stock_items')
-
     # Filter part queryset by category, if provided
     if category_id is not None:
         # Filter parts by category (including subcategories)
@@ -97,13 +290,7 @@ def perform_stocktake(
         # Location limited, so we will disable saving of stocktake entries
         generate_entry = False
 
-    # New history entries to be created
-    history_entries = []
-
     base_currency = currency_code_default()
-    today = Tracklet.helpers.current_date()
-
-    logger.info('Creating new stock history entries for %s parts', parts.count())
 
     # Fetch report output object if provided
     if report_output_id is not None:
@@ -114,121 +301,64 @@ def perform_stocktake(
     else:
         report_output = None
 
+    n_parts = parts.count()
+
+    logger.info('Creating new stock history entries for %s parts', n_parts)
+
+    if workers and generate_entry and not report_output:
+        # Split the stocktake across multiple background workers
+        for chunk in iterate_part_chunks(parts.only('pk'), chunk_size):
+            Tracklet.tasks.offload_task(
+                perform_stocktake_chunk,
+                [part.pk for part in chunk],
+                exclude_external=exclude_external,
+                group='stocktake',
+            )
+
+        return
+
     if report_output:
         # Initialize progress on the report output
-        report_output.total = parts.count()
+        report_output.total = n_parts
         report_output.progress = 0
         report_output.complete = False
         report_output.save()
 
-    for part in parts:
-        # Is there a recent stock history record for this part?
-        if (
-            generate_entry
-            and part_models.PartStocktake.objects.filter(
-                part=part, date__gte=today
-            ).exists()
-        ):
-            continue
-
-        try:
-            pricing = part.pricing_data
-        except Exception:
-            pricing = None
-
-        # Fetch all 'in stock' items for this part
-        stock_items = part.stock_entries(
-            location=location,
-            in_stock=True,
-            include_external=not exclude_external,
-            include_variants=True,
-        )
-
-        total_cost_min = Money(0, base_currency)
-        total_cost_max = Money(0, base_currency)
-
-        total_quantity = 0
-        items_count = 0
-
-        if stock_items.count() == 0:
-            # No stock items - skip this part if location is specified
-            if location:
-                continue
-
-        for item in stock_items:
-            # Extract cost information
-
-            entry_cost_min = (
-                (pricing.overall_min or pricing.overall_max) if pricing else None
-            )
-            entry_cost_max = (
-                (pricing.overall_max or pricing.overall_min) if pricing else None
-            )
+        serializer = part_serializers.PartStocktakeSerializer(exclude_pk=True)
+        headers = serializer.generate_headers()
+        header_keys = list(headers.keys())
 
-            if item.purchase_price is not None:
-                entry_cost_min = item.purchase_price
-                entry_cost_max = item.purchase_price
+        dataset = tablib.Dataset(headers=list(headers.values()))
 
-            try:
-                entry_cost_min = entry_cost_min * item.quantity
-                entry_cost_max = entry_cost_max * item.quantity
+    today = current_date()
 
-                if entry_cost_min.currency != base_currency:
-                    entry_cost_min = convert_money(entry_cost_min, base_currency)
+    parts = parts.select_related('pricing_data')
 
-                if entry_cost_max.currency != base_currency:
-                    entry_cost_max = convert_money(entry_cost_max, base_currency)
-            except Exception:
-                entry_cost_min = Money(0, base_currency)
-                entry_cost_max = Money(0, base_currency)
+    for chunk in iterate_part_chunks(parts, chunk_size):
+        entries = stocktake_parts(
+            chunk,
+            base_currency,
+            location=location,
+            exclude_external=exclude_external,
+            skip_existing=generate_entry,
+        )
 
-            # Update total quantities
-            items_count += 1
-            total_quantity += item.quantity
-            total_cost_min += entry_cost_min
-            total_cost_max += entry_cost_max
+        if generate_entry:
+            # Bulk-create PartStocktake entries for this chunk
+            part_models.PartStocktake.objects.bulk_create(entries)
 
         if report_output:
-            report_output.progress += 1
-
-            # Update report progress every few items, to avoid excessive database writes
-            if report_output.progress % 50 == 0:
-                report_output.save()
-
-        # Add a new stocktake entry for this part
-        history_entries.append(
-            part_models.PartStocktake(
-                part=part,
-                item_count=items_count,
-                quantity=total_quantity,
-                cost_min=total_cost_min,
-                cost_max=total_cost_max,
-            )
-        )
+            for entry in entries:
+                entry.date = today
+                row = serializer.to_representation(entry)
+                dataset.append([row.get(header, '') for header in header_keys])
 
-    if generate_entry:
-        # Bulk-create PartStocktake entries
-        part_models.PartStocktake.objects.bulk_create(history_entries)
+            # Update report progress once per chunk
+            report_output.progress += len(chunk)
+            report_output.save(update_fields=['progress'])
 
     if report_output:
         # Save report data, and mark as complete
-
-        today = current_date()
-
-        serializer = part_serializers.PartStocktakeSerializer(exclude_pk=True)
-
-        headers = serializer.generate_headers()
-
-        # Export the data to a file
-        dataset = tablib.Dataset(headers=list(headers.values()))
-
-        header_keys = list(headers.keys())
-
-        for entry in history_entries:
-            entry.date = today
-            row = serializer.to_representation(entry)
-            dataset.append([row.get(header, '') for header in header_keys])
-
         datafile = dataset.export('csv')
 
         report_output.mark_complete(
@@ -242,6 +242,24 @@ def update_part_pricing(pricing: Model, counter: int = 0):
     )
 
 
+@tracer.start_as_current_span('rollup_part_pricing')
+def rollup_part_pricing(part_ids: Optional[list[int]] = None):
+    """Recalculate pricing for all assemblies and templates which depend on the specified parts.
+
+    Arguments:
+        part_ids: List of parts for which pricing has changed (if None, recalculate the entire pricing graph)
+    """
+    from part.pricing import clear_rollup_pending, update_bom_pricing
+
+    logger.info('Updating assembly pricing for parts: %s', part_ids)
+
+    # Clear the pending flag before calculating, so that later changes schedule a new rollup
+    if part_ids:
+        clear_rollup_pending(part_ids)
+
+    update_bom_pricing(part_ids)
+
+
 @tracer.start_as_current_span('check_missing_pricing')
 @scheduled_task(ScheduledTask.DAILY)
 def check_missing_pricing(limit=250):
@@ -349,7 +367,7 @@ def scheduled_stocktake_reports():
         return
 
     # Generate new stock history entries
-    part.stocktake.perform_stocktake()
+    part.stocktake.perform_stocktake(workers=True)
 
     # Record the date of this task run
     record_task_success('STOCKTAKE_RECENT_REPORT')
@@ -2007,6 +2007,7 @@ class PartDetailTests(PartImageTestMixin, PartAPITestBase):
             'total_stock',
             'unallocated_stock',
             'can_build',
+            'can_build_recursive',
             'ordering',
             'building',
             'scheduled_to_build',
@@ -3,8 +3,9 @@
 from decimal import Decimal
 
 import django.core.exceptions as django_exceptions
+from django.core.cache import cache
 from django.db import transaction
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 import build.models
 import stock.models
@@ -276,6 +277,70 @@ class BomItemTest(TestCase):
 
         self.assertEqual(assembly.can_build, 20)
 
+    @override_settings(GLOBAL_CACHE_ENABLED=True)
+    def test_can_build_recursive(self):
+        """Test the multi-level 'can_build' calculation."""
+        cache.clear()
+
+        assembly = Part.objects.create(
+            name='Top level', description='Top level assembly', assembly=True
+        )
+
+        sub_assembly = Part.objects.create(
+            name='Sub assembly', description='A sub-assembly', assembly=True
+        )
+
+        c1 = Part.objects.create(name='C1', description='Component C1')
+        c2 = Part.objects.create(name='C2', description='Component C2')
+
+        # New parts may be assigned a tree_id which clashes with the fixture data
+        Part.objects.rebuild()
+
+        for p in [assembly, sub_assembly, c1, c2]:
+            p.refresh_from_db()
+
+        BomItem.objects.create(part=assembly, sub_part=sub_assembly, quantity=2)
+        BomItem.objects.create(part=assembly, sub_part=c1, quantity=1)
+        BomItem.objects.create(part=sub_assembly, sub_part=c2, quantity=5)
+
+        item = stock.models.StockItem.objects.create(part=c1, quantity=100)
+        stock.models.StockItem.objects.create(part=sub_assembly, quantity=4)
+        stock.models.StockItem.objects.create(part=c2, quantity=50)
+
+        # Only 4 sub-assemblies are in stock
+        self.assertEqual(assembly.can_build, 2)
+
+        # Another 10 sub-assemblies can be built from available stock
+        self.assertEqual(sub_assembly.can_build, 10)
+        self.assertEqual(assembly.can_build_recursive, 7)
+
+        # Results are cached
+        with self.assertNumQueries(0):
+            self.assertEqual(assembly.can_build, 2)
+            self.assertEqual(assembly.can_build_recursive, 7)
+
+        # Stock changes invalidate the cached results
+        stock.models.StockItem.objects.create(part=c2, quantity=50)
+
+        self.assertEqual(assembly.can_build, 2)
+        self.assertEqual(assembly.can_build_recursive, 12)
+
+        item.quantity = 5
+        item.save()
+
+        self.assertEqual(assembly.can_build_recursive, 5)
+
+        # BOM changes invalidate the cached results
+        BomItem.objects.filter(part=assembly, sub_part=c1).delete()
+
+        self.assertEqual(assembly.can_build_recursive, 12)
+
+        # Results match the uncached calculation
+        self.assertEqual(
+            assembly.get_buildability(use_cache=False),
+            {'can_build': 2, 'can_build_recursive': 12},
+        )
+
     def test_metadata(self):
         """Unit tests for the metadata field."""
         for model in [BomItem]:
@@ -1,6 +1,7 @@
 """Tests for the Part model."""
 
 import os
+from unittest import mock
 
 from django.conf import settings
 from django.core.cache import cache
@@ -993,3 +994,62 @@ class PartStockHistoryTest(InvenTreeTestCase):
         N_STOCKTAKE = PartStocktake.objects.count()
         perform_stocktake()
         self.assertEqual(PartStocktake.objects.count(), N_STOCKTAKE)
+
+    def test_stock_history_chunks(self):
+        """Test that chunked stocktake matches the stock for each part."""
+        from part.models import Part, PartStocktake
+        from part.stocktake import perform_stocktake
+
+        set_global_setting('STOCKTAKE_ENABLE', True)
+        set_global_setting('STOCKTAKE_EXCLUDE_EXTERNAL', False)
+
+        PartStocktake.objects.all().delete()
+
+        # Use a very small chunk size, to ensure multiple chunks are processed
+        perform_stocktake(chunk_size=2)
+
+        parts = Part.objects.filter(active=True)
+
+        self.assertEqual(PartStocktake.objects.count(), parts.count())
+
+        for p in parts:
+            entry = p.stocktakes.get()
+            stock_items = p.stock_entries(in_stock=True, include_variants=True)
+
+            self.assertEqual(entry.item_count, stock_items.count())
+            self.assertEqual(entry.quantity, sum(i.quantity for i in stock_items))
+
+    def test_stock_history_workers(self):
+        """Test that the stocktake is split into chunks for the background workers."""
+        from part.models import Part, PartStocktake
+        from part.stocktake import perform_stocktake, perform_stocktake_chunk
+
+        set_global_setting('STOCKTAKE_ENABLE', True)
+        set_global_setting('STOCKTAKE_EXCLUDE_EXTERNAL', False)
+
+        PartStocktake.objects.all().delete()
+
+        part_ids = list(
+            Part.objects.filter(active=True).order_by('pk').values_list('pk', flat=True)
+        )
+
+        with mock.patch('Tracklet.tasks.offload_task') as mock_offload:
+            perform_stocktake(chunk_size=2, workers=True)
+
+        # Entries are only created by the offloaded tasks
+        self.assertEqual(PartStocktake.objects.count(), 0)
+
+        chunks = [call.args[1] for call in mock_offload.call_args_list]
+
+        self.assertEqual(len(chunks), (len(part_ids) + 1) // 2)
+        self.assertEqual([pk for chunk in chunks for pk in chunk], part_ids)
+
+        for call in mock_offload.call_args_list:
+            self.assertEqual(call.args[0], perform_stocktake_chunk)
+            self.assertEqual(call.kwargs['group'], 'stocktake')
+
+            perform_stocktake_chunk(
+                call.args[1], exclude_external=call.kwargs['exclude_external']
+            )
+
+        self.assertEqual(PartStocktake.objects.count(), len(part_ids))
@@ -1,5 +1,7 @@
 """Unit tests for Part pricing calculations."""
 
+from unittest import mock
+
 from django.core.exceptions import ObjectDoesNotExist
 from django.test.utils import override_settings
 
@@ -545,3 +547,97 @@ class PartPricingTests(InvenTreeTestCase):
 
         self.assertEqual(A1.pricing.overall_min, Money(a_min, 'USD'))
         self.assertEqual(A1.pricing.overall_max, Money(a_max, 'USD'))
+
+    @override_settings(TESTING_PRICING=True)
+    def test_pricing_graph(self):
+        """Test that assembly pricing is calculated across the entire pricing graph."""
+        from part.pricing import update_bom_pricing
+
+        def create_part(name, **kwargs):
+            return part.models.Part.objects.create(
+                name=name, description=name, component=True, **kwargs
+            )
+
+        def set_price(p, price_min, price_max, currency='USD'):
+            pricing = p.pricing
+            pricing.override_min = Money(price_min, currency)
+            pricing.override_max = Money(price_max, currency)
+            pricing.save()
+
+        assembly = create_part('Assembly', assembly=True)
+        sub_assembly = create_part('Sub assembly', assembly=True)
+        template = create_part('Template', is_template=True)
+        variant_1 = create_part('Variant 1', variant_of=template)
+        variant_2 = create_part('Variant 2', variant_of=template)
+        resistor = create_part('Resistor')
+        substitute = create_part('Substitute')
+
+        part.models.BomItem.objects.create(
+            part=assembly, sub_part=sub_assembly, quantity=2
+        )
+        part.models.BomItem.objects.create(
+            part=sub_assembly, sub_part=template, quantity=3, allow_variants=True
+        )
+        line = part.models.BomItem.objects.create(
+            part=sub_assembly, sub_part=resistor, quantity=10
+        )
+        part.models.BomItemSubstitute.objects.create(bom_item=line, part=substitute)
+
+        set_price(variant_1, 1, 2)
+        set_price(variant_2, 4.5, 6, 'AUD')
+        set_price(resistor, 0.5, 0.6)
+        set_price(substitute, 0.4, 1)
+
+        # Clear any existing assembly pricing
+        part.models.PartPricing.objects.filter(
+            part__in=[assembly, sub_assembly, template]
+        ).update(
+            bom_cost_min=None, bom_cost_max=None, overall_min=None, overall_max=None
+        )
+
+        self.assertEqual(update_bom_pricing([variant_1.pk, resistor.pk]), 3)
+
+        # Variant pricing (including currency conversion)
+        self.assertEqual(template.pricing.variant_cost_min, Money(1, 'USD'))
+        self.assertEqual(template.pricing.variant_cost_max, Money(4, 'USD'))
+
+        # Variants and substitutes are considered for each BOM line
+        pricing = sub_assembly.pricing
+        self.assertEqual(pricing.bom_cost_min, Money(3 * 1 + 10 * 0.4, 'USD'))
+        self.assertEqual(pricing.bom_cost_max, Money(3 * 4 + 10 * 1, 'USD'))
+
+        pricing = assembly.pricing
+        self.assertEqual(pricing.overall_min, Money(2 * 7, 'USD'))
+        self.assertEqual(pricing.overall_max, Money(2 * 22, 'USD'))
+
+        # No further changes required
+        self.assertEqual(update_bom_pricing([variant_1.pk, resistor.pk]), 0)
+
+        # Only the part of the graph which depends on the changed parts is loaded
+        from part.pricing import PricingGraph
+
+        unrelated = create_part('Unrelated', assembly=True)
+        part.models.BomItem.objects.create(part=unrelated, sub_part=resistor)
+
+        graph = PricingGraph([variant_2.pk])
+        affected = graph.get_affected_parts([variant_2.pk])
+
+        self.assertEqual(affected, {template.pk, sub_assembly.pk, assembly.pk})
+        self.assertEqual(affected, PricingGraph().get_affected_parts([variant_2.pk]))
+        self.assertNotIn(unrelated.pk, graph.parts)
+        self.assertEqual(graph.bom_loaded, affected | {variant_2.pk})
+
+        # Rollups are only scheduled for parts which have dependents
+        unused = create_part('Unused')
+
+        self.assertFalse(unused.pricing.has_dependents())
+        self.assertTrue(resistor.pricing.has_dependents())
+        self.assertTrue(substitute.pricing.has_dependents())
+        self.assertTrue(variant_2.pricing.has_dependents())
+
+        with mock.patch('Tracklet.tasks.offload_task') as mock_offload:
+            unused.pricing.schedule_rollup()
+            mock_offload.assert_not_called()
+
+            resistor.pricing.schedule_rollup()
+            mock_offload.assert_called_once()
@@ -501,9 +501,15 @@ class RegistryStatusView(APIView):
                         'message': message,
                     })
 
+        load_times = [
+            {'stage': stage, 'name': name, 'time': dt}
+            for stage, name, dt in registry.get_load_times()
+        ]
+
         result = PluginSerializers.PluginRegistryStatusSerializer({
             'registry_errors': error_list,
             'active_plugins': PluginConfig.objects.filter(active=True).count(),
+            'load_times': load_times,
         }).data
 
         return Response(result)
@@ -1,5 +1,9 @@
 """API endpoints for barcode plugins."""
 
+from typing import Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.db.models import F
 from django.urls import include, path
 from django.utils.translation import gettext_lazy as _
@@ -24,7 +28,9 @@ from Tracklet.filters import SEARCH_ORDER_FILTER
 from Tracklet.helpers import hash_barcode
 from Tracklet.mixins import ListAPI, RetrieveDestroyAPI
 from plugin import PluginMixinEnum, registry
-from users.permissions import check_user_permission
+from plugin.base.barcodes.helper import lookup_barcode_index
+from plugin.base.barcodes.scan_log import scan_log
+from users.permissions import check_user_permission, check_user_role
 
 from . import serializers as barcode_serializers
 
@@ -37,20 +43,40 @@ class BarcodeView(CreateAPIView):
     # Default serializer class (can be overridden)
     serializer_class = barcode_serializers.BarcodeSerializer
 
-    def log_scan(self, request, response=None, result: bool = False):
+    # Pre-computed scan results, keyed by barcode data (e.g. for a batch scan)
+    scan_cache: Optional[dict] = None
+
+    def log_scan(
+        self,
+        request,
+        response=None,
+        result: bool = False,
+        barcode: Optional[str] = None,
+        context: Optional[dict] = None,
+    ):
         """Log a barcode scan to the database.
 
+        Scan results are buffered, and written to the database in batches (refer to scan_log.py).
+
         Arguments:
             request: HTTP request object
             response: Optional response data
             result: Boolean indicating success or failure of the scan
+            barcode: Barcode data (if not provided, extracted from the request)
+            context: Context data for the scan (if not provided, extracted from the request)
         """
         from common.models import BarcodeScanResult
 
-        # Extract context data from the request
-        context = {**request.GET.dict(), **request.POST.dict(), **request.data}
+        if context is None:
+            # Extract context data from the request
+            context = {**request.GET.dict(), **request.POST.dict(), **request.data}
 
-        barcode = context.pop('barcode', '')
+        context = dict(context)
+
+        if barcode is None:
+            barcode = context.pop('barcode', '')
+        else:
+            context.pop('barcode', None)
 
         # Exit if storing barcode scans is disabled
         if not get_global_setting('BARCODE_STORE_RESULTS', backup=False, create=False):
@@ -76,32 +102,15 @@ class BarcodeView(CreateAPIView):
         if len(barcode) > BarcodeScanResult.BARCODE_SCAN_MAX_LEN:
             barcode = barcode[: BarcodeScanResult.BARCODE_SCAN_MAX_LEN]
 
-        try:
-            BarcodeScanResult.objects.create(
-                data=barcode,
-                user=request.user,
-                endpoint=request.path,
-                response=response,
-                result=result,
-                context=context,
-            )
-
-            # Ensure that we do not store too many scans
-            max_scans = int(get_global_setting('BARCODE_RESULTS_MAX_NUM', create=False))
-            num_scans = BarcodeScanResult.objects.count()
-
-            if num_scans > max_scans:
-                n = num_scans - max_scans
-                old_scan_ids = list(
-                    BarcodeScanResult.objects
-                    .all()
-                    .order_by('timestamp')
-                    .values_list('pk', flat=True)[:n]
-                )
-                BarcodeScanResult.objects.filter(pk__in=old_scan_ids).delete()
-        except Exception:
-            # Gracefully log error to database
-            log_error(f'{self.__class__.__name__}.log_scan', scope='barcode')
+        # The scan result is written to the database by a background thread
+        scan_log.add(
+            data=barcode,
+            user=request.user,
+            endpoint=request.path,
+            response=response,
+            result=result,
+            context=context,
+        )
 
     def queryset(self):
         """This API view does not have a queryset."""
@@ -129,6 +138,31 @@ class BarcodeView(CreateAPIView):
     def handle_barcode(self, barcode: str, request, **kwargs):
         """Handle barcode scan.
 
+        By default, the barcode is passed to the process_barcode method,
+        and the result is logged and returned.
+
+        Arguments:
+            barcode: Raw barcode value
+            request: HTTP request object
+
+        kwargs:
+            Any custom fields passed by the specific serializer
+        """
+        response = self.process_barcode(barcode, request, **kwargs)
+
+        self.log_scan(request, response, 'success' in response)
+
+        if 'error' in response:
+            raise ValidationError(response)
+
+        return Response(response)
+
+    def process_barcode(self, barcode: str, request, **kwargs) -> dict:
+        """Process a barcode scan, and return the response data.
+
+        Any error is reported via the 'error' key of the response data (rather than raising an exception).
+        The scan is not logged.
+
         Arguments:
             barcode: Raw barcode value
             request: HTTP request object
@@ -137,7 +171,7 @@ class BarcodeView(CreateAPIView):
             Any custom fields passed by the specific serializer
         """
         raise NotImplementedError(
-            f'handle_barcode not implemented for {self.__class__}'
+            f'process_barcode not implemented for {self.__class__}'
         )
 
     def scan_barcode(self, barcode: str, request, **kwargs):
@@ -145,12 +179,40 @@ class BarcodeView(CreateAPIView):
 
         Check each loaded plugin, and return the first valid match
         """
+        barcode_hash = hash_barcode(barcode)
+
+        if self.scan_cache and barcode in self.scan_cache:
+            return {
+                **self.scan_cache[barcode],
+                'barcode_data': barcode,
+                'barcode_hash': barcode_hash,
+            }
+
         plugins = registry.with_mixin(PluginMixinEnum.BARCODE)
 
         # Look for a barcode plugin which knows how to deal with this barcode
         plugin = None
         response = {}
 
+        # Linked (third-party) barcodes are resolved via the global barcode index,
+        # without passing the barcode through each plugin
+        internal_plugin = next(
+            (p for p in plugins if p.slug == 'inventreebarcode'), None
+        )
+
+        if internal_plugin and (instance := lookup_barcode_index(barcode_hash)):
+            response = {
+                **internal_plugin.format_matched_response(
+                    instance.barcode_model_type(), instance.__class__, instance
+                ),
+                'success': _('Found matching item'),
+                'plugin': internal_plugin.name,
+                'barcode_data': barcode,
+                'barcode_hash': barcode_hash,
+            }
+
+            return response
+
         for current_plugin in plugins:
             try:
                 result = current_plugin.scan(barcode)
@@ -181,7 +243,7 @@ class BarcodeView(CreateAPIView):
 
         response['plugin'] = plugin.name if plugin else None
         response['barcode_data'] = barcode
-        response['barcode_hash'] = hash_barcode(barcode)
+        response['barcode_hash'] = barcode_hash
 
         return response
 
@@ -196,7 +258,7 @@ class BarcodeScan(BarcodeView):
     or it could match to a third-party barcode format (e.g. Digikey).
     """
 
-    def handle_barcode(self, barcode: str, request, **kwargs):
+    def process_barcode(self, barcode: str, request, **kwargs) -> dict:
         """Perform barcode scan action.
 
         Arguments:
@@ -210,15 +272,10 @@ class BarcodeScan(BarcodeView):
 
         if response['plugin'] is None:
             response['error'] = _('No match found for barcode data')
-            self.log_scan(request, response, False)
-            raise ValidationError(response)
-
-        response['success'] = _('Match found for barcode data')
-
-        # Log the scan result
-        self.log_scan(request, response, True)
+        else:
+            response['success'] = _('Match found for barcode data')
 
-        return Response(response)
+        return response
 
 
 @extend_schema_view(
@@ -493,7 +550,7 @@ class BarcodePOReceive(BarcodeView):
 
     serializer_class = barcode_serializers.BarcodePOReceiveSerializer
 
-    def handle_barcode(self, barcode: str, request, **kwargs):
+    def process_barcode(self, barcode: str, request, **kwargs) -> dict:
         """Handle a barcode scan for a purchase order item."""
         logger.debug("BarcodePOReceive: scanned barcode - '%s'", barcode)
 
@@ -524,11 +581,14 @@ class BarcodePOReceive(BarcodeView):
             filter(lambda plugin: plugin.name == 'InvenTreeBarcode', plugins)
         )
 
-        if result := internal_barcode_plugin.scan(barcode):
-            if 'stockitem' in result:
-                response['error'] = _('Item has already been received')
-                self.log_scan(request, response, False)
-                raise ValidationError(response)
+        if self.scan_cache and barcode in self.scan_cache:
+            result = self.scan_cache[barcode]
+        else:
+            result = internal_barcode_plugin.scan(barcode)
+
+        if result and 'stockitem' in result:
+            response['error'] = _('Item has already been received')
+            return response
 
         # Now, look just for "supplier-barcode" plugins
         plugins = registry.with_mixin(PluginMixinEnum.SUPPLIER_BARCODE)
@@ -576,12 +636,7 @@ class BarcodePOReceive(BarcodeView):
         if plugin is None:
             response['error'] = _('No plugin match for supplier barcode')
 
-        self.log_scan(request, response, 'success' in response)
-
-        if 'error' in response:
-            raise ValidationError(response)
-
-        return Response(response)
+        return response
 
 
 class BarcodeSOAllocate(BarcodeView):
@@ -654,7 +709,7 @@ class BarcodeSOAllocate(BarcodeView):
         # If shipment cannot be determined, return None
         return None
 
-    def handle_barcode(self, barcode: str, request, **kwargs):
+    def process_barcode(self, barcode: str, request, **kwargs) -> dict:
         """Handle barcode scan for sales order allocation.
 
         Arguments:
@@ -684,8 +739,7 @@ class BarcodeSOAllocate(BarcodeView):
                 response['error'] = _('Barcode does not match an existing stock item')
 
         if 'error' in response:
-            self.log_scan(request, response, False)
-            raise ValidationError(response)
+            return response
 
         # At this stage, we have a valid StockItem object
 
@@ -702,8 +756,7 @@ class BarcodeSOAllocate(BarcodeView):
             response['error'] = str(e)
 
         if 'error' in response:
-            self.log_scan(request, response, False)
-            raise ValidationError(response)
+            return response
 
         quantity = kwargs.get('quantity')
 
@@ -746,12 +799,133 @@ class BarcodeSOAllocate(BarcodeView):
             response['error'] = _('Not enough information')
             response['action_required'] = True
 
-        self.log_scan(request, response, 'success' in response)
+        return response
 
-        if 'error' in response:
-            raise ValidationError(response)
-        else:
-            return Response(response)
+
+class BarcodeBatchScan(BarcodeView):
+    """Endpoint for processing multiple barcode scans in a single request.
+
+    This is intended for handheld devices which buffer scans (e.g. while offline):
+
+    - Internal and linked barcodes are resolved together, with bulk database lookups
+    - Each item is processed by the matching single scan endpoint (scan / po-receive / so-allocate)
+    - All receipts and allocations are applied within a single database transaction
+    - A failed item is rolled back, without affecting the other items
+
+    Results are returned in the same order as the provided items,
+    with either a 'success' or 'error' key for each item.
+    """
+
+    serializer_class = barcode_serializers.BarcodeBatchSerializer
+
+    # View classes which process each type of action
+    ACTION_VIEWS = {
+        'scan': BarcodeScan,
+        'po-receive': BarcodePOReceive,
+        'so-allocate': BarcodeSOAllocate,
+    }
+
+    # Role required for each type of action (in addition to the 'scan' permission)
+    ACTION_ROLES = {
+        'po-receive': ('purchase_order', 'add'),
+        'so-allocate': ('sales_order', 'add'),
+    }
+
+    def resolve_barcodes(self, barcodes: list) -> dict:
+        """Resolve internal and linked barcodes with bulk lookups.
+
+        Returns:
+            A dict of {barcode: scan result} for each barcode which was matched
+        """
+        plugins = registry.with_mixin(PluginMixinEnum.BARCODE)
+
+        internal_plugin = next(
+            (p for p in plugins if p.slug == 'inventreebarcode'), None
+        )
+
+        if internal_plugin is None:
+            return {}
+
+        results = internal_plugin.scan_batch(barcodes)
+
+        return {
+            barcode: {**result, 'plugin': internal_plugin.name}
+            for barcode, result in zip(barcodes, results, strict=True)
+            if result
+        }
+
+    def process_item(self, request, item: dict, scan_cache: dict) -> dict:
+        """Process a single item from the batch, and return the response data."""
+        data = dict(item)
+        action = data.pop('action', 'scan')
+        barcode = str(data.get('barcode', '')).strip()
+
+        if role := self.ACTION_ROLES.get(action):
+            if not check_user_role(request.user, *role):
+                return {
+                    'barcode_data': barcode,
+                    'error': _('User does not have permission to perform this action'),
+                }
+
+        view_class = self.ACTION_VIEWS[action]
+        view = view_class(request=request, format_kwarg=None, args=(), kwargs={})
+        view.scan_cache = scan_cache
+
+        serializer = view_class.serializer_class(
+            data=data, context={'request': request, 'view': view}
+        )
+
+        if not serializer.is_valid():
+            response = {'barcode_data': barcode, 'error': serializer.errors}
+            view.log_scan(request, response, False, barcode=barcode, context=data)
+            return response
+
+        kwargs = dict(serializer.validated_data)
+        kwargs.pop('barcode', None)
+
+        try:
+            # Each item is processed within a savepoint, which is rolled back on error
+            with transaction.atomic():
+                response = view.process_barcode(barcode, request, **kwargs)
+
+                if 'error' in response:
+                    transaction.set_rollback(True)
+        except (ValidationError, DjangoValidationError) as exc:
+            response = {'barcode_data': barcode, 'error': str(exc)}
+        except Exception:
+            log_error('BarcodeBatchScan.process_item', scope='barcode')
+            response = {
+                'barcode_data': barcode,
+                'error': _('An error occurred while processing the barcode'),
+            }
+
+        view.log_scan(
+            request, response, 'success' in response, barcode=barcode, context=data
+        )
+
+        return response
+
+    def create(self, request, *args, **kwargs):
+        """Process each barcode scan, and return the results in order."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        items = serializer.validated_data['items']
+
+        scan_cache = self.resolve_barcodes([
+            str(item['barcode']).strip() for item in items
+        ])
+
+        with transaction.atomic():
+            results = [self.process_item(request, item, scan_cache) for item in items]
+
+        n_errors = len([result for result in results if 'error' in result])
+
+        return Response({
+            'results': results,
+            'success': len(results) - n_errors,
+            'errors': n_errors,
+        })
 
 
 class BarcodeScanResultMixin:
@@ -825,6 +999,8 @@ barcode_api_urls = [
     path('po-allocate/', BarcodePOAllocate.as_view(), name='api-barcode-po-allocate'),
     # Allocate stock to a sales order by scanning barcode
     path('so-allocate/', BarcodeSOAllocate.as_view(), name='api-barcode-so-allocate'),
+    # Process multiple barcode scans
+    path('batch/', BarcodeBatchScan.as_view(), name='api-barcode-batch'),
     # Catch-all performs barcode 'scan'
     path('', BarcodeScan.as_view(), name='api-barcode-scan'),
 ]
@@ -1,6 +1,6 @@
 """Helper functions for barcode generation."""
 
-from typing import cast
+from typing import Optional, cast
 
 import structlog
 
@@ -64,3 +64,184 @@ def get_supported_barcode_model_codes_map():
         model.barcode_model_type_code(): model
         for model in get_supported_barcode_models()
     }
+
+
+def update_barcode_index(instance: InvenTreeBarcodeMixin):
+    """Update the barcode index entry for the provided model instance.
+
+    If the instance does not have a linked barcode, the index entry is removed.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from common.models import BarcodeIndexEntry
+
+    if not instance.pk:
+        return
+
+    model_type = ContentType.objects.get_for_model(instance.__class__)
+
+    if instance.barcode_hash:
+        BarcodeIndexEntry.objects.update_or_create(
+            model_type=model_type,
+            model_id=instance.pk,
+            defaults={'barcode_hash': instance.barcode_hash},
+        )
+    else:
+        BarcodeIndexEntry.objects.filter(
+            model_type=model_type, model_id=instance.pk
+        ).delete()
+
+
+def update_barcode_index_bulk(instances: list[InvenTreeBarcodeMixin]) -> int:
+    """Create or update barcode index entries for multiple model instances.
+
+    This is used when model instances are created in bulk (e.g. when receiving stock).
+
+    Returns:
+        The number of index entries created
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import transaction
+    from django.db.models import Q
+
+    from common.models import BarcodeIndexEntry
+
+    entries = []
+    query = Q()
+
+    for instance in instances:
+        if not instance.pk or not instance.barcode_hash:
+            continue
+
+        model_type = ContentType.objects.get_for_model(instance.__class__)
+        query |= Q(model_type=model_type, model_id=instance.pk)
+
+        entries.append(
+            BarcodeIndexEntry(
+                model_type=model_type,
+                model_id=instance.pk,
+                barcode_hash=instance.barcode_hash,
+            )
+        )
+
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        BarcodeIndexEntry.objects.filter(query).delete()
+        BarcodeIndexEntry.objects.bulk_create(entries)
+
+    return len(entries)
+
+
+def lookup_barcode_index(barcode_hash: str) -> Optional[InvenTreeBarcodeMixin]:
+    """Find the model instance which is linked to the provided barcode hash.
+
+    Index entries which no longer match the linked instance are removed.
+
+    Returns:
+        The linked model instance, or None if the barcode hash is not indexed
+    """
+    if not barcode_hash:
+        return None
+
+    return lookup_barcode_index_bulk([barcode_hash]).get(barcode_hash)
+
+
+def lookup_barcode_index_bulk(barcode_hashes: list[str]) -> dict:
+    """Find the model instances which are linked to the provided barcode hashes.
+
+    A single query is made against the index, and then a single query for each linked model type.
+    Index entries which no longer match the linked instance are removed.
+
+    Returns:
+        A dict of {barcode_hash: instance} for each barcode hash which is indexed
+    """
+    from common.models import BarcodeIndexEntry
+
+    barcode_hashes = {barcode_hash for barcode_hash in barcode_hashes if barcode_hash}
+
+    if not barcode_hashes:
+        return {}
+
+    entries = (
+        BarcodeIndexEntry.objects
+        .filter(barcode_hash__in=barcode_hashes)
+        .select_related('model_type')
+        .order_by('pk')
+    )
+
+    # Group the index entries by model type
+    models = {}
+
+    for entry in entries:
+        models.setdefault(entry.model_type, []).append(entry)
+
+    matches = {}
+    stale = []
+
+    for model_type, model_entries in models.items():
+        model = model_type.model_class()
+
+        if model is None or not issubclass(model, InvenTreeBarcodeMixin):
+            stale.extend(entry.pk for entry in model_entries)
+            continue
+
+        instances = model.objects.in_bulk([entry.model_id for entry in model_entries])
+
+        for entry in model_entries:
+            instance = instances.get(entry.model_id)
+
+            if instance is None or instance.barcode_hash != entry.barcode_hash:
+                # Stale entry (the barcode has been changed or the instance deleted)
+                stale.append(entry.pk)
+                continue
+
+            # If a barcode is linked to multiple instances, the first indexed instance is used
+            match = matches.get(entry.barcode_hash)
+
+            if match is None or entry.pk < match[0]:
+                matches[entry.barcode_hash] = (entry.pk, instance)
+
+    if stale:
+        BarcodeIndexEntry.objects.filter(pk__in=stale).delete()
+
+    return {barcode_hash: instance for barcode_hash, (_pk, instance) in matches.items()}
+
+
+def rebuild_barcode_index(batch_size: int = 500) -> int:
+    """Rebuild the barcode index for all models which support barcodes.
+
+    Returns:
+        The number of index entries created
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import transaction
+
+    from common.models import BarcodeIndexEntry
+
+    n = 0
+
+    with transaction.atomic():
+        BarcodeIndexEntry.objects.all().delete()
+
+        for model in get_supported_barcode_models():
+            model_type = ContentType.objects.get_for_model(model)
+
+            queryset = model.objects.exclude(barcode_hash='').values_list(
+                'pk', 'barcode_hash'
+            )
+
+            entries = [
+                BarcodeIndexEntry(
+                    model_type=model_type, model_id=pk, barcode_hash=barcode_hash
+                )
+                for pk, barcode_hash in queryset.iterator(chunk_size=batch_size)
+            ]
+
+            BarcodeIndexEntry.objects.bulk_create(entries, batch_size=batch_size)
+            n += len(entries)
+
+    logger.info('Rebuilt barcode index: %s entries', n)
+
+    return n
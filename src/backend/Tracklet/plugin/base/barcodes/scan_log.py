@@ -0,0 +1,129 @@
+"""Buffered logging of barcode scan results.
+
+Barcode scans are logged to the BarcodeScanResult table (if BARCODE_STORE_RESULTS is enabled).
+To keep the database write out of the scan request, scan results are added to an in-memory buffer,
+which is written to the database in batches by a background thread:
+
+- The buffer is flushed when it reaches SCAN_LOG_BATCH_SIZE entries
+- Otherwise, the buffer is flushed every SCAN_LOG_FLUSH_INTERVAL seconds
+- Any remaining entries are flushed when the process exits
+
+Old scan results are removed by the 'delete_old_barcode_scans' scheduled task,
+rather than when each scan is logged.
+"""
+
+import atexit
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+import structlog
+
+from Tracklet.exceptions import log_error
+
+logger = structlog.get_logger('inventree')
+
+# Maximum number of scan results to write in a single query
+SCAN_LOG_BATCH_SIZE = 50
+
+# Maximum time (in seconds) that a scan result is held in the buffer
+SCAN_LOG_FLUSH_INTERVAL = 5
+
+
+class BarcodeScanLog:
+    """Append-only buffer of barcode scan results, which are written to the database in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = SCAN_LOG_BATCH_SIZE,
+        interval: float = SCAN_LOG_FLUSH_INTERVAL,
+    ):
+        """Initialize the buffer.
+
+        Arguments:
+            batch_size: Number of buffered entries which triggers an immediate flush
+            interval: Time (in seconds) between periodic flushes
+        """
+        self.batch_size = batch_size
+        self.interval = interval
+
+        self.entries = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def add(self, **kwargs):
+        """Add a scan result to the buffer.
+
+        Keyword arguments are passed through to the BarcodeScanResult model.
+        """
+        if settings.TESTING:
+            # Write immediately when testing, so that the results can be checked
+            self.write([kwargs])
+            return
+
+        with self.lock:
+            self.entries.append(kwargs)
+            n = len(self.entries)
+
+        self.start()
+
+        if n >= self.batch_size:
+            self.wakeup.set()
+
+    def start(self):
+        """Start the background writer thread (if it is not already running)."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='barcode-scan-log', daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        """Background thread: flush the buffer periodically, or when it is full."""
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+
+            self.flush()
+
+            # The thread has its own database connection
+            close_old_connections()
+
+    def flush(self) -> int:
+        """Write all buffered scan results to the database.
+
+        Returns:
+            The number of scan results written
+        """
+        with self.lock:
+            entries = self.entries
+            self.entries = []
+
+        if entries:
+            self.write(entries)
+
+        return len(entries)
+
+    def write(self, entries: list[dict]):
+        """Write the provided scan results to the database."""
+        from common.models import BarcodeScanResult
+
+        try:
+            BarcodeScanResult.objects.bulk_create(
+                [BarcodeScanResult(**entry) for entry in entries],
+                batch_size=self.batch_size,
+            )
+        except Exception:
+            # Gracefully log error to database
+            log_error('BarcodeScanLog.write', scope='barcode')
+
+
+scan_log = BarcodeScanLog()
+
+atexit.register(scan_log.flush)
@@ -246,3 +246,45 @@ class BarcodeSOAllocateSerializer(BarcodeSerializer):
     quantity = serializers.IntegerField(
         required=False, help_text=_('Quantity to allocate')
     )
+
+
+class BarcodeBatchSerializer(serializers.Serializer):
+    """Serializer for processing multiple barcode scans in a single request.
+
+    Each item must provide the scanned 'barcode' data, and an optional 'action':
+
+    - scan: Generic barcode scan (default)
+    - po-receive: Receive items against a purchase order
+    - so-allocate: Allocate stock items to a sales order
+
+    Any other fields are passed through to the action
+    (refer to BarcodePOReceiveSerializer and BarcodeSOAllocateSerializer)
+    """
+
+    MAX_BATCH_SIZE = 500
+
+    ACTIONS = [
+        ('scan', _('Scan')),
+        ('po-receive', _('Receive Purchase Order Items')),
+        ('so-allocate', _('Allocate Sales Order Stock')),
+    ]
+
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+        help_text=_('List of barcode scans to process'),
+    )
+
+    def validate_items(self, items):
+        """Check that each item provides barcode data and a valid action."""
+        actions = [action for action, _label in self.ACTIONS]
+
+        for item in items:
+            if not item.get('barcode'):
+                raise ValidationError(_('Barcode data must be provided for each item'))
+
+            if item.get('action', 'scan') not in actions:
+                raise ValidationError(_('Invalid action') + f': {item.get("action")}')
+
+        return items
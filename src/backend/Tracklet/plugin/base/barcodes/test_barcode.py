@@ -1,6 +1,11 @@
 """Unit tests for Barcode endpoints."""
 
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 
 import company.models
 import order.models
@@ -116,6 +121,51 @@ class BarcodeAPITest(InvenTreeAPITestCase):
         for k in ['barcode_data', 'stockitem', 'success']:
             self.assertIn(k, response)
 
+    def test_scan_log_buffer(self):
+        """Test that barcode scan results are written to the database in batches."""
+        from plugin.base.barcodes.scan_log import BarcodeScanLog
+
+        n = BarcodeScanResult.objects.count()
+
+        scan_log = BarcodeScanLog(batch_size=10)
+
+        with override_settings(TESTING=False), mock.patch.object(scan_log, 'start'):
+            for idx in range(3):
+                scan_log.add(data=f'scan-{idx}', user=self.user, result=True)
+
+        # Nothing has been written yet
+        self.assertEqual(BarcodeScanResult.objects.count(), n)
+
+        self.assertEqual(scan_log.flush(), 3)
+        self.assertEqual(BarcodeScanResult.objects.count(), n + 3)
+
+        # The buffer is now empty
+        self.assertEqual(scan_log.flush(), 0)
+
+    def test_delete_old_scans(self):
+        """Test that old barcode scan results are removed by timestamp."""
+        from common.tasks import delete_old_barcode_scans
+
+        BarcodeScanResult.objects.all().delete()
+
+        for idx in range(5):
+            BarcodeScanResult.objects.create(data=f'scan-{idx}', result=True)
+
+        # Scans are removed once they exceed the maximum count
+        set_global_setting('BARCODE_RESULTS_MAX_NUM', 3)
+        delete_old_barcode_scans()
+
+        self.assertEqual(BarcodeScanResult.objects.count(), 3)
+
+        # Scans are removed once they exceed the maximum age
+        BarcodeScanResult.objects.update(timestamp=timezone.now() - timedelta(days=100))
+        BarcodeScanResult.objects.create(data='scan-new', result=True)
+
+        delete_old_barcode_scans()
+
+        self.assertEqual(BarcodeScanResult.objects.count(), 1)
+        self.assertEqual(BarcodeScanResult.objects.first().data, 'scan-new')
+
     def test_invalid_item(self):
         """Test response for invalid stock item."""
         response = self.post(
@@ -388,3 +438,57 @@ class SOAllocateTest(InvenTreeAPITestCase):
         self.line_item.refresh_from_db()
         self.assertEqual(self.line_item.allocated_quantity(), 10)
         self.assertTrue(self.line_item.is_fully_allocated())
+
+    def test_batch(self):
+        """Test processing multiple barcode scans in a single request."""
+        url = reverse('api-barcode-batch')
+
+        # At least one item must be provided
+        self.post(url, {'items': []}, expected_code=400)
+
+        # Invalid action
+        self.post(
+            url, {'items': [{'barcode': 'abc', 'action': 'xyz'}]}, expected_code=400
+        )
+
+        response = self.post(
+            url,
+            {
+                'items': [
+                    # Generic scan of an internal barcode
+                    {'barcode': self.stock_item.format_barcode()},
+                    # Generic scan of a linked barcode
+                    {'barcode': 'barcode'},
+                    # Barcode which does not match anything
+                    {'barcode': 'no-match'},
+                    # Allocation without a sales order
+                    {'barcode': 'barcode', 'action': 'so-allocate'},
+                    # Allocation of the linked stock item
+                    {
+                        'barcode': 'barcode',
+                        'action': 'so-allocate',
+                        'sales_order': self.sales_order.pk,
+                        'quantity': 4,
+                    },
+                ]
+            },
+            expected_code=200,
+        ).data
+
+        self.assertEqual(response['success'], 3)
+        self.assertEqual(response['errors'], 2)
+
+        results = response['results']
+        self.assertEqual(len(results), 5)
+
+        # Results are returned in order
+        self.assertEqual(results[0]['stockitem']['pk'], self.stock_item.pk)
+        self.assertEqual(results[0]['plugin'], 'InvenTreeBarcode')
+        self.assertEqual(results[1]['stockitem']['pk'], self.stock_item.pk)
+        self.assertIn('No match found', str(results[2]['error']))
+        self.assertIn('sales_order', results[3]['error'])
+        self.assertIn('Stock item allocated', str(results[4]['success']))
+        self.assertEqual(results[4]['quantity'], 4)
+
+        self.line_item.refresh_from_db()
+        self.assertEqual(self.line_item.allocated_quantity(), 4)
@@ -1,5 +1,7 @@
 """Functions for triggering and responding to server side events."""
 
+from typing import Optional
+
 from django.conf import settings
 from django.db import transaction
 from django.db.models.signals import post_delete, post_save
@@ -30,32 +32,83 @@ def trigger_event(event: str, *args, **kwargs) -> None:
 
     This event will be stored in the database, and the worker will respond to it later on.
     """
-    if not get_global_setting('ENABLE_PLUGINS_EVENTS', False):
-        # Do nothing if plugin events are not enabled
-        return
-
     # Ensure event name is stringified
     event = str(event).strip()
 
+    if not can_trigger_event(event):
+        return
+
+    logger.debug("Event triggered: '%s'", event)
+
+    kwargs['force_async'] = get_event_force_async(kwargs.pop('force_async', True))
+
+    offload_task(register_event, event, *args, group='plugin', **kwargs)
+
+
+def can_trigger_event(event: str) -> bool:
+    """Determine if plugin events can be triggered."""
+    if not get_global_setting('ENABLE_PLUGINS_EVENTS', False):
+        # Do nothing if plugin events are not enabled
+        return False
+
     # Make sure the database can be accessed and is not being tested rn
     if (
         not canAppAccessDatabase(allow_shell=True)
         and not settings.PLUGIN_TESTING_EVENTS
     ):
         logger.debug("Ignoring triggered event '%s' - database not ready", event)
-        return
+        return False
 
-    logger.debug("Event triggered: '%s'", event)
+    return True
 
-    force_async = kwargs.pop('force_async', True)
 
+def get_event_force_async(force_async: bool) -> bool:
+    """Determine if event processing should be forced to the background worker."""
     # If we are running in testing mode, we can enable or disable async processing
     if settings.PLUGIN_TESTING_EVENTS:
-        force_async = settings.PLUGIN_TESTING_EVENTS_ASYNC
+        return settings.PLUGIN_TESTING_EVENTS_ASYNC
 
-    kwargs['force_async'] = force_async
+    return force_async
 
-    offload_task(register_event, event, *args, group='plugin', **kwargs)
+
+@tracer.start_as_current_span('trigger_bulk_event')
+def trigger_bulk_event(
+    event: str, ids: list, table: Optional[str] = None, **kwargs
+) -> None:
+    """Trigger the same event for multiple model instances.
+
+    Arguments:
+        event: The event to trigger
+        ids: List of model instance IDs - the event is registered once for each ID
+        table: Optional database table name, used to check if table events are allowed
+        **kwargs: Additional keyword arguments to pass to the event handler
+
+    A single background task is offloaded for the entire batch,
+    rather than one task per instance.
+    """
+    event = str(event).strip()
+
+    if not ids:
+        return
+
+    if table and not allow_table_event(table):
+        return
+
+    if not can_trigger_event(event):
+        return
+
+    logger.debug("Bulk event triggered: '%s' (%s items)", event, len(ids))
+
+    kwargs['force_async'] = get_event_force_async(kwargs.pop('force_async', True))
+
+    offload_task(register_bulk_event, event, list(ids), group='plugin', **kwargs)
+
+
+@tracer.start_as_current_span('register_bulk_event')
+def register_bulk_event(event, ids: list, **kwargs):
+    """Register an event for each of the provided model instance IDs."""
+    for instance_id in ids:
+        register_event(event, id=instance_id, **kwargs)
 
 
 @tracer.start_as_current_span('register_event')
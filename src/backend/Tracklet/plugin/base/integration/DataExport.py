@@ -1,6 +1,7 @@
 """Plugin class for custom data exporting."""
 
 from collections import OrderedDict
+from collections.abc import Iterator
 from typing import Optional
 
 from django.contrib.auth.models import User
@@ -113,6 +114,62 @@ class DataExportMixin:
             queryset, many=True, exporting=True, context=serializer_context or {}
         ).data
 
+    def supports_streaming_export(self) -> bool:
+        """Return True if the data can be exported in chunks (via export_data_chunks).
+
+        Plugins which override 'export_data' (but not 'export_data_chunks')
+        are exported using the default in-memory path.
+        """
+        cls = type(self)
+
+        return (
+            cls.export_data is DataExportMixin.export_data
+            or cls.export_data_chunks is not DataExportMixin.export_data_chunks
+        )
+
+    def export_data_chunks(
+        self,
+        queryset: QuerySet,
+        serializer_class: serializers.Serializer,
+        headers: OrderedDict,
+        context: dict,
+        output: DataOutput,
+        serializer_context: Optional[dict] = None,
+        chunk_size: int = 500,
+        **kwargs,
+    ) -> Iterator[list]:
+        """Export data from the queryset, in chunks.
+
+        Arguments:
+            queryset: The queryset to export
+            serializer_class: The serializer class to use for exporting the data
+            headers: The headers for the export
+            context: Any custom context for the export (provided by the plugin serializer)
+            output: The DataOutput object for the export
+            serializer_context: Optional context for the serializer
+            chunk_size: The number of items to serialize at a time
+
+        Yields:
+            Exported data chunks (each a list of dict objects)
+        """
+        serializer_context = serializer_context or {}
+
+        chunk = []
+
+        for item in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(item)
+
+            if len(chunk) >= chunk_size:
+                yield serializer_class(
+                    chunk, many=True, exporting=True, context=serializer_context
+                ).data
+                chunk = []
+
+        if chunk:
+            yield serializer_class(
+                chunk, many=True, exporting=True, context=serializer_context
+            ).data
+
     def get_export_options_serializer(self, **kwargs) -> serializers.Serializer | None:
         """Return a serializer class with dynamic export options for this plugin.
 
@@ -52,8 +52,8 @@ class UrlsMixin:
                     urls_changed = True
             # if apps were changed or force loading base apps -> reload
             if urls_changed or force_reload or full_reload:
-                # update urls - must be last as models must be registered for creating admin routes
-                registry._update_urls()
+                # plugin urls are updated in place - the global URLConf does not need to be reloaded
+                registry._update_plugin_urls()
 
     def setup_urls(self):
         """Setup url endpoints for this plugin."""
@@ -172,6 +172,25 @@ class ValidationMixin:
         """
         return None
 
+    def validate_serial_numbers(
+        self, serials: list[str], part: part.models.Part
+    ) -> Optional[list[str]]:
+        """Validate a batch of proposed serial numbers.
+
+        A plugin which implements this method can validate many serial numbers at once
+        (e.g. when creating a large number of serialized stock items),
+        rather than having the 'validate_serial_number' method called for each serial number.
+
+        Arguments:
+            serials: The proposed serial numbers (list of strings)
+            part: The Part instance for which these serial numbers are being validated
+
+        Returns:
+            A list of the serial numbers which are objectionable (an empty list if all are valid),
+            or None to validate each serial number individually via the 'validate_serial_number' method
+        """
+        return None
+
     def convert_serial_to_int(self, serial: str) -> Optional[int]:
         """Convert a serial number (string) into an integer representation.
 
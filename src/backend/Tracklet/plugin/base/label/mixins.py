@@ -1,9 +1,12 @@
 """Plugin mixin classes for label plugins."""
 
+import io
+
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
 import pdf2image
+from pypdf import PdfReader, PdfWriter
 from rest_framework import serializers
 from rest_framework.request import Request
 
@@ -38,6 +41,15 @@ class LabelPrintingMixin:
 
     BLOCKING_PRINT = True
 
+    # Render all labels to a single PDF document, which is then split into pages
+    BATCH_RENDER = False
+
+    # Render each label to a PNG image (passed to print_label as 'png_file')
+    RENDER_PNG = True
+
+    # Number of labels printed between updates to the progress of the print job
+    PROGRESS_INTERVAL = 25
+
     def render_to_pdf(self, label: LabelTemplate, instance, request, **kwargs):
         """Render this label to PDF format.
 
@@ -45,9 +57,12 @@ class LabelPrintingMixin:
             label: The LabelTemplate object to render against
             instance: The model instance to render
             request: The HTTP request object which triggered this print job
+
+        Keyword Arguments:
+            context: The template context for this label (if already generated)
         """
         try:
-            return label.render(instance, request)
+            return label.render(instance, request, context=kwargs.get('context'))
         except Exception:
             log_error('render_to_pdf', plugin=self.slug)
             raise ValidationError(_('Error rendering label to PDF'))
@@ -59,9 +74,14 @@ class LabelPrintingMixin:
             label: The LabelTemplate object to render against
             instance: The model instance to render
             request: The HTTP request object which triggered this print job
+
+        Keyword Arguments:
+            context: The template context for this label (if already generated)
         """
         try:
-            return label.render_as_string(instance, request)
+            return label.render_as_string(
+                instance, request, context=kwargs.get('context')
+            )
         except Exception:
             log_error('render_to_html', plugin=self.slug)
             raise ValidationError(_('Error rendering label to HTML'))
@@ -87,19 +107,73 @@ class LabelPrintingMixin:
         if not pdf_data:
             pdf_data = self.render_to_pdf(label, instance, request, **kwargs)
 
-        pdf2image_kwargs = {
+        # Convert to png data
+        try:
+            return pdf2image.convert_from_bytes(
+                pdf_data, **self.get_pdf2image_kwargs(**kwargs)
+            )[0]
+        except Exception:
+            log_error('render_to_png', plugin=self.slug)
+            return None
+
+    def get_pdf2image_kwargs(self, **kwargs) -> dict:
+        """Return the keyword arguments passed to pdf2image when rendering PNG images."""
+        return {
             'dpi': kwargs.get('dpi', InvenTreeSetting.get_setting('LABEL_DPI', 300)),
             'use_pdftocairo': kwargs.get('use_cairo', True),
             **kwargs.get('pdf2image_kwargs', {}),
         }
 
-        # Convert to png data
+    def render_batch(
+        self, label: LabelTemplate, items: list, request, contexts: list, **kwargs
+    ):
+        """Render multiple labels with a single call to the PDF renderer.
+
+        The labels are rendered to a single PDF document (one page per label),
+        which is then split into individual pages, and rasterized in a single pass.
+
+        Arguments:
+            label: The LabelTemplate object to render against
+            items: The model instances to render
+            request: The HTTP request object which triggered this print job
+            contexts: The template context for each item
+
+        Returns:
+            A tuple of (document, pages), where document is the combined PDF data,
+            and pages is a list of (pdf_data, png_file) for each item.
+            Returns None if the labels cannot be rendered as a single document.
+        """
         try:
-            return pdf2image.convert_from_bytes(pdf_data, **pdf2image_kwargs)[0]
+            document = label.render_batch(items, request, contexts=contexts)
         except Exception:
-            log_error('render_to_png', plugin=self.slug)
+            log_error('render_batch', plugin=self.slug)
+            raise ValidationError(_('Error rendering label to PDF'))
+
+        if document is None:
             return None
 
+        pages = []
+
+        for page in PdfReader(io.BytesIO(document)).pages:
+            writer = PdfWriter()
+            writer.add_page(page)
+
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            pages.append(buffer.getvalue())
+
+        images = [None] * len(pages)
+
+        if self.RENDER_PNG:
+            try:
+                images = pdf2image.convert_from_bytes(
+                    document, **self.get_pdf2image_kwargs(**kwargs)
+                )
+            except Exception:
+                log_error('render_to_png', plugin=self.slug)
+
+        return document, list(zip(pages, images, strict=True))
+
     def print_labels(
         self,
         label: LabelTemplate,
@@ -127,6 +201,8 @@ class LabelPrintingMixin:
 
         The default implementation simply calls print_label() for each label, producing multiple single label output "jobs"
         but this can be overridden by the particular plugin.
+
+        If BATCH_RENDER is set, the labels are rendered to PDF with a single call to the renderer (see render_batch).
         """
         try:
             user = request.user
@@ -143,18 +219,38 @@ class LabelPrintingMixin:
         if N <= 0:
             raise ValidationError(_('No items provided to print'))
 
+        # Generate context data for all items (with related data prefetched)
+        contexts = label.get_contexts(items, request)
+
+        document = None
+        pages = None
+
+        if self.BATCH_RENDER and N > 1:
+            if batch := self.render_batch(label, items, request, contexts, **kwargs):
+                document, pages = batch
+
         # Generate a label output for each provided item
-        for item in items:
-            context = label.get_context(item, request)
+        for idx, (item, context) in enumerate(zip(items, contexts, strict=True)):
             filename = label.generate_filename(context)
-            pdf_data = self.render_to_pdf(label, item, request, **kwargs)
-            png_file = self.render_to_png(
-                label, item, request, pdf_data=pdf_data, **kwargs
-            )
+
+            if pages:
+                pdf_data, png_file = pages[idx]
+            else:
+                pdf_data = self.render_to_pdf(
+                    label, item, request, context=context, **kwargs
+                )
+                png_file = (
+                    self.render_to_png(
+                        label, item, request, pdf_data=pdf_data, **kwargs
+                    )
+                    if self.RENDER_PNG
+                    else None
+                )
 
             print_args = {
                 'pdf_data': pdf_data,
                 'png_file': png_file,
+                'document': document,
                 'filename': filename,
                 'context': context,
                 'output': output,
@@ -173,7 +269,12 @@ class LabelPrintingMixin:
                 # Offload the print task to the background worker
 
                 # Exclude the 'context' object - cannot be pickled
-                print_args.pop('context', None)
+                # Exclude the combined 'document' - not required for a single label
+                print_args = {
+                    key: value
+                    for key, value in print_args.items()
+                    if key not in ['context', 'document']
+                }
 
                 offload_task(
                     plugin_label.print_label,
@@ -182,9 +283,10 @@ class LabelPrintingMixin:
                     **print_args,
                 )
 
-            # Update the progress of the print job
-            output.progress += 1
-            output.save()
+            # Periodically update the progress of the print job
+            if (idx + 1) % self.PROGRESS_INTERVAL == 0 and idx + 1 < N:
+                output.progress = idx + 1
+                output.save()
 
         generated_file = self.get_generated_file(**print_args)
 
@@ -203,6 +305,8 @@ class LabelPrintingMixin:
 
         kwargs:
             pdf_data: Raw PDF data of the rendered label
+            png_file: PNG image of the rendered label (if RENDER_PNG is set)
+            document: Raw PDF data of all rendered labels (if BATCH_RENDER is set, otherwise None)
             filename: The filename of this PDF label
             label_instance: The instance of the label model which triggered the print_label() method
             item_instance: The instance of the database model against which the label is printed
@@ -1,5 +1,6 @@
 """Unit tests for the label printing mixin."""
 
+import io
 import json
 import os
 from unittest import mock
@@ -9,6 +10,7 @@ from django.urls import reverse
 
 from pdfminer.high_level import extract_text
 from PIL import Image
+from pypdf import PdfReader
 
 from Tracklet.config import get_testfolder_dir
 from Tracklet.unit_test import InvenTreeAPITestCase
@@ -220,6 +222,46 @@ class LabelMixinTests(PrintTestMixins, InvenTreeAPITestCase):
         # And that it is a valid image file
         Image.open(f'{test_path}.png')
 
+    def test_batch_render(self):
+        """Test that multiple labels can be rendered to a single PDF document."""
+        apps.get_app_config('report').create_default_labels()
+
+        template = LabelTemplate.objects.filter(
+            enabled=True, model_type='stockitem'
+        ).first()
+        self.assertIsNotNone(template)
+
+        items = list(StockItem.objects.all()[:5])
+
+        # Render all labels with a single call to the renderer
+        document = template.render_batch(items)
+        self.assertIsNotNone(document)
+
+        reader = PdfReader(io.BytesIO(document))
+        self.assertEqual(len(reader.pages), len(items))
+
+        # Print via the API, using the builtin PDF label plugin
+        response = self.post(
+            self.printing_url,
+            {
+                'template': template.pk,
+                'plugin': 'inventreelabel',
+                'items': [item.pk for item in items],
+            },
+            expected_code=201,
+        )
+
+        self.assertTrue(response.data['complete'])
+        self.assertEqual(response.data['progress'], len(items))
+
+        # Label content which overflows a single page cannot be batched
+        with mock.patch.object(
+            LabelTemplate,
+            'render_as_string',
+            return_value="<body><div style='height: 500mm;'>X</div></body>",
+        ):
+            self.assertIsNone(template.render_batch(items))
+
     def test_printing_options(self):
         """Test printing options."""
         # Ensure the labels were created
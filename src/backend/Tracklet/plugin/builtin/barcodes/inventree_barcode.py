@@ -9,7 +9,7 @@ references model objects actually exist in the database.
 
 import json
 import re
-from typing import cast
+from typing import Optional, cast
 
 from django.utils.translation import gettext_lazy as _
 
@@ -52,11 +52,24 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
         """Format a response for the scanned data."""
         return {label: instance.format_matched_response()}
 
-    def scan(self, barcode_data):
-        """Scan a barcode against this plugin.
+    def format_matched_instance(self, instance: InvenTreeBarcodeMixin) -> dict:
+        """Format a successful response for a matched model instance."""
+        return {
+            **self.format_matched_response(
+                instance.barcode_model_type(), instance.__class__, instance
+            ),
+            'success': _('Found matching item'),
+        }
 
-        Here we are looking for a dict object which contains a reference to a particular InvenTree database object
+    def parse_barcode(self, barcode_data) -> Optional[list]:
+        """Extract model references from an internal barcode (without querying the database).
+
+        Returns:
+            A list of (model, pk) tuples, in order of priority,
+            or None if the barcode cannot be matched by this plugin
         """
+        candidates = []
+
         # Internal Barcodes - Short Format
         # Attempt to match the barcode data against the short barcode format
         prefix = cast(str, self.get_setting('SHORT_BARCODE_PREFIX'))
@@ -75,13 +88,7 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
             if model is None:
                 return None
 
-            label = model.barcode_model_type()
-
-            try:
-                instance = model.objects.get(pk=int(pk))
-                return self.format_matched_response(label, model, instance)
-            except (ValueError, model.DoesNotExist):
-                pass
+            candidates.append((model, int(pk)))
 
         # Internal Barcodes - JSON Format
         # Attempt to coerce the barcode data into a dict object
@@ -96,42 +103,102 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
             except json.JSONDecodeError:
                 pass
 
-        supported_models = plugin.base.barcodes.helper.get_supported_barcode_models()
-
-        succcess_message = _('Found matching item')
-
         if barcode_dict is not None and type(barcode_dict) is dict:
             # Look for various matches. First good match will be returned
-            for model in supported_models:
+            for model in plugin.base.barcodes.helper.get_supported_barcode_models():
                 label = model.barcode_model_type()
 
                 if label in barcode_dict:
                     try:
-                        pk = int(barcode_dict[label])
-                        instance = model.objects.get(pk=pk)
-
-                        return {
-                            **self.format_matched_response(label, model, instance),
-                            'success': succcess_message,
-                        }
-                    except (ValueError, model.DoesNotExist):
+                        candidates.append((model, int(barcode_dict[label])))
+                    except (TypeError, ValueError):
                         pass
 
+        return candidates
+
+    def scan(self, barcode_data):
+        """Scan a barcode against this plugin.
+
+        Here we are looking for a dict object which contains a reference to a particular InvenTree database object
+        """
+        candidates = self.parse_barcode(barcode_data)
+
+        if candidates is None:
+            return None
+
+        for model, pk in candidates:
+            try:
+                instance = model.objects.get(pk=pk)
+                return self.format_matched_instance(instance)
+            except model.DoesNotExist:
+                pass
+
         # External Barcodes (Linked barcodes)
         # Create hash from raw barcode data
         barcode_hash = hash_barcode(barcode_data)
 
         # If no "direct" hits are found, look for assigned third-party barcodes
-        for model in supported_models:
-            label = model.barcode_model_type()
+        # First, check the global barcode index (single query)
+        if instance := plugin.base.barcodes.helper.lookup_barcode_index(barcode_hash):
+            return self.format_matched_instance(instance)
 
+        # Fall back to checking each model (e.g. if the barcode has not been indexed)
+        for model in plugin.base.barcodes.helper.get_supported_barcode_models():
             instance = model.lookup_barcode(barcode_hash)
 
             if instance is not None:
-                return {
-                    **self.format_matched_response(label, model, instance),
-                    'success': succcess_message,
-                }
+                # Add the barcode to the index, for subsequent scans
+                instance.update_barcode_index()
+
+                return self.format_matched_instance(instance)
+
+    def scan_batch(self, barcodes: list) -> list:
+        """Scan multiple barcodes against this plugin, using bulk database lookups.
+
+        Internal barcodes are resolved with a single query for each model type,
+        and linked barcodes are resolved via the global barcode index.
+        Linked barcodes which have not been indexed are not matched.
+
+        Returns:
+            A list of scan results (or None, if there is no match), in the same order as the provided barcodes
+        """
+        candidates = [self.parse_barcode(barcode) for barcode in barcodes]
+
+        # Fetch the referenced instances for each model type
+        model_pks = {}
+
+        for barcode_candidates in candidates:
+            for model, pk in barcode_candidates or []:
+                model_pks.setdefault(model, set()).add(pk)
+
+        instances = {
+            model: model.objects.in_bulk(list(pks)) for model, pks in model_pks.items()
+        }
+
+        results = [None] * len(barcodes)
+        barcode_hashes = {}
+
+        for idx, barcode_candidates in enumerate(candidates):
+            if barcode_candidates is None:
+                continue
+
+            for model, pk in barcode_candidates:
+                if instance := instances[model].get(pk):
+                    results[idx] = self.format_matched_instance(instance)
+                    break
+            else:
+                barcode_hashes[idx] = hash_barcode(barcodes[idx])
+
+        # Check the global barcode index for any linked barcodes
+        linked = plugin.base.barcodes.helper.lookup_barcode_index_bulk(
+            list(barcode_hashes.values())
+        )
+
+        for idx, barcode_hash in barcode_hashes.items():
+            if instance := linked.get(barcode_hash):
+                results[idx] = self.format_matched_instance(instance)
+
+        return results
 
     def generate(self, model_instance: InvenTreeBarcodeMixin):
         """Generate a barcode for a given model instance."""
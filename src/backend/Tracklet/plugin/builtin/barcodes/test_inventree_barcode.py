@@ -267,6 +267,51 @@ class TestInvenTreeBarcode(InvenTreeAPITestCase):
             self.assertIn('success', response.data)
             self.assertEqual(response.data['stockitem']['pk'], 1)
 
+    def test_barcode_index(self):
+        """Test that linked barcodes are resolved via the global barcode index."""
+        from common.models import BarcodeIndexEntry
+        from Tracklet.helpers import hash_barcode
+
+        si = stock.models.StockItem.objects.get(pk=1)
+        si.assign_barcode(barcode_data='index-barcode-1')
+
+        barcode_hash = hash_barcode('index-barcode-1')
+        entry = BarcodeIndexEntry.objects.get(barcode_hash=barcode_hash)
+        self.assertEqual(entry.model_id, si.pk)
+
+        response = self.scan({'barcode': 'index-barcode-1'}, expected_code=200)
+        self.assertEqual(response.data['stockitem']['pk'], si.pk)
+        self.assertEqual(response.data['plugin'], 'InvenTreeBarcode')
+
+        # Unassigning the barcode removes the index entry
+        si.unassign_barcode()
+        self.assertFalse(
+            BarcodeIndexEntry.objects.filter(barcode_hash=barcode_hash).exists()
+        )
+
+        self.scan({'barcode': 'index-barcode-1'}, expected_code=400)
+
+        # A barcode which is not indexed is added to the index when it is scanned
+        stock.models.StockItem.objects.filter(pk=si.pk).update(
+            barcode_hash=barcode_hash
+        )
+
+        response = self.scan({'barcode': 'index-barcode-1'}, expected_code=200)
+        self.assertEqual(response.data['stockitem']['pk'], si.pk)
+        self.assertTrue(
+            BarcodeIndexEntry.objects.filter(
+                barcode_hash=barcode_hash, model_id=si.pk
+            ).exists()
+        )
+
+        # Stale index entries are ignored (and removed)
+        stock.models.StockItem.objects.filter(pk=si.pk).update(barcode_hash='')
+
+        self.scan({'barcode': 'index-barcode-1'}, expected_code=400)
+        self.assertFalse(
+            BarcodeIndexEntry.objects.filter(barcode_hash=barcode_hash).exists()
+        )
+
     def test_scan_inventree_json(self):
         """Test scanning of first-party json barcodes."""
         # Scan a StockItem object (which does not exist)
@@ -1,5 +1,7 @@
 """Unit test for the exporter plugins."""
 
+from unittest import mock
+
 from django.urls import reverse
 
 from Tracklet.unit_test import InvenTreeAPITestCase
@@ -81,3 +83,39 @@ class StocktakeExporterTest(InvenTreeAPITestCase):
 
         # Reset plugin state
         registry.set_plugin_state(slug, False)
+
+
+class StreamingExportTest(InvenTreeAPITestCase):
+    """Test the chunked (streaming) export path of the default exporter."""
+
+    fixtures = ['category', 'part', 'location', 'stock']
+    roles = ['part.view', 'stock.view']
+
+    def test_streaming_export(self):
+        """Export data in small chunks, and check that all rows are exported."""
+        from openpyxl import load_workbook
+
+        from common.models import DataOutput
+        from part.api import PartList
+        from part.models import Part
+
+        url = reverse('api-part-list')
+        n = Part.objects.count()
+
+        with mock.patch.object(PartList, 'export_chunk_size', 3):
+            with self.export_data(url, export_format='csv') as data_file:
+                self.process_csv(
+                    data_file, required_rows=n, required_cols=['Name', 'IPN']
+                )
+
+            output = DataOutput.objects.order_by('-pk').first()
+            self.assertTrue(output.complete)
+            self.assertEqual(output.total, n)
+            self.assertEqual(output.progress, n)
+
+            with self.export_data(url, export_format='xlsx', decode=False) as data_file:
+                sheet = load_workbook(data_file).active
+                rows = list(sheet.iter_rows(values_only=True))
+
+                self.assertEqual(len(rows), n + 1)
+                self.assertIn('Name', rows[0])
@@ -22,11 +22,17 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, SettingsMixin, InvenTreePlugin):
     NAME = 'InvenTreeLabel'
     TITLE = _('InvenTree PDF label printer')
     DESCRIPTION = _('Provides native support for printing PDF labels')
-    VERSION = '1.1.0'
+    VERSION = '1.2.0'
     AUTHOR = _('InvenTree contributors')
 
     BLOCKING_PRINT = True
 
+    # Labels are rendered to a single PDF document
+    BATCH_RENDER = True
+
+    # PNG images are not required for the PDF output
+    RENDER_PNG = False
+
     SETTINGS = {
         'DEBUG': {
             'name': _('Debug mode'),
@@ -40,9 +46,13 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, SettingsMixin, InvenTreePlugin):
     # These will be stitched together at the end of printing
     outputs = []
 
+    # Combined PDF output (if all labels were rendered to a single document)
+    document = None
+
     def before_printing(self):
         """Reset the list of label outputs."""
         self.outputs = []
+        self.document = None
 
     def print_label(self, **kwargs):
         """Print a single label."""
@@ -55,6 +65,7 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, SettingsMixin, InvenTreePlugin):
         else:
             # Output is already provided
             output = kwargs.get('pdf_data')
+            self.document = kwargs.get('document')
 
         self.outputs.append(output)
 
@@ -67,6 +78,10 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, SettingsMixin, InvenTreePlugin):
             # Simple HTML output
             data = '\n'.join(self.outputs)
             filename = 'labels.html'
+        elif self.document and len(self.outputs) > 1:
+            # All labels have already been rendered to a single document
+            data = self.document
+            filename = kwargs.get('filename', 'labels.pdf')
         else:
             # Stitch together the PDF outputs
             pdf_writer = PdfWriter()
@@ -11,8 +11,9 @@ from common.models import InvenTreeUserSetting
 from Tracklet.serializers import DependentField
 from Tracklet.tasks import offload_task
 from machine.machine_types import LabelPrinterBaseDriver, LabelPrinterMachine
+from machine.tasks import process_print_job
 from plugin import InvenTreePlugin
-from plugin.machine import call_machine_function, registry
+from plugin.machine import registry
 from plugin.mixins import LabelPrintingMixin
 from report.models import LabelTemplate
 
@@ -60,7 +61,7 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, InvenTreePlugin):
     NAME = 'InvenTreeLabelMachine'
     TITLE = _('InvenTree machine label printer')
     DESCRIPTION = _('Provides support for printing using a machine')
-    VERSION = '1.0.0'
+    VERSION = '1.1.0'
     AUTHOR = _('InvenTree contributors')
 
     def print_labels(self, label: LabelTemplate, output, items, request, **kwargs):
@@ -99,21 +100,22 @@ class InvenTreeLabelPlugin(LabelPrintingMixin, InvenTreePlugin):
                 user=user,
             )
 
-        offload_task(
-            call_machine_function,
-            machine.pk,
-            'print_labels',
-            label,
-            items,
-            output=output,
-            force_sync=settings.TESTING or driver.USE_BACKGROUND_WORKER,
-            group='plugin',
-            **print_kwargs,
-        )
-
-        # Inform the user that the process has been offloaded to the printer
-        if output:
-            output.mark_complete()
+        # The output is marked as complete (or failed) by the print job queue
+        if driver.USE_BACKGROUND_WORKER:
+            # Add the job to the print job queue for this machine, in the background worker
+            offload_task(
+                process_print_job,
+                machine.pk,
+                label,
+                items,
+                output=output,
+                force_sync=settings.TESTING,
+                group='plugin',
+                **print_kwargs,
+            )
+        else:
+            # Add the job to the print job queue for this machine, in the current process
+            machine.submit_print_job(label, items, output=output, **print_kwargs)
 
     class PrintingOptionsSerializer(serializers.Serializer):
         """Printing options serializer that adds a machine select and the machines options."""
@@ -121,8 +121,12 @@ class InvenTreeLabelSheetPlugin(LabelPrintingMixin, SettingsMixin, InvenTreePlug
         if n_cells == 0:
             raise ValidationError(_('Label is too large for page size'))
 
+        # Prefetch related data for all items
+        items = list(items)
+        label.prefetch_instances(items)
+
         # Prepend the required number of skipped null labels
-        items = [None] * skip + list(items)
+        items = [None] * skip + items
 
         n_labels = len(items)
 
@@ -1,5 +1,6 @@
 """Helpers for plugin app."""
 
+import hashlib
 import inspect
 import os
 import pathlib
@@ -168,8 +169,14 @@ def get_git_log(path):
 
 
 # region plugin finders
-def get_modules(pkg, path=None):
-    """Get all modules in a package."""
+def get_modules(pkg, path=None, names=None):
+    """Get all modules in a package.
+
+    Args:
+        pkg: The package to search
+        path: Path(s) to search for modules (defaults to the package path)
+        names: If provided, only load modules with these names (packages are always loaded)
+    """
     context = {}
 
     if path is None:
@@ -181,13 +188,17 @@ def get_modules(pkg, path=None):
 
     while True:
         try:
-            finder, name, _ = next(packages)
+            finder, name, ispkg = next(packages)
         except StopIteration:
             break
         except Exception as error:
             log_registry_error({pkg.__name__: str(error)}, 'discovery')
             continue
 
+        # Packages must be loaded so that their submodules can be discovered
+        if names is not None and not ispkg and name not in names:
+            continue
+
         try:
             if sys.version_info < (3, 12):
                 module = finder.find_module(name).load_module(name)
@@ -221,15 +232,16 @@ def get_classes(module) -> list:
         return []
 
 
-def get_plugins(pkg, baseclass, path=None):
+def get_plugins(pkg, baseclass, path=None, names=None):
     """Return a list of all modules under a given package.
 
     - Modules must be a subclass of the provided 'baseclass'
     - Modules must have a non-empty NAME parameter
+    - If 'names' is provided, only modules with these names are searched
     """
     plugins = []
 
-    modules = get_modules(pkg, path=path)
+    modules = get_modules(pkg, path=path, names=names)
 
     # Iterate through each module in the package
     for mod in modules:
@@ -242,4 +254,33 @@ def get_plugins(pkg, baseclass, path=None):
     return plugins
 
 
+def get_package_signature(paths) -> str:
+    """Return a signature of the python source files in the provided package paths.
+
+    The signature changes whenever a source file is added, removed or modified,
+    and is used to determine if a cached plugin discovery manifest is still valid.
+    Only directories which are python packages (contain an __init__.py file) are searched.
+    """
+    entries = []
+
+    def scan(directory: pathlib.Path):
+        try:
+            children = sorted(directory.iterdir())
+        except OSError:
+            return
+
+        for child in children:
+            if child.is_dir():
+                if child.joinpath('__init__.py').exists():
+                    scan(child)
+            elif child.suffix == '.py':
+                stat = child.stat()
+                entries.append(f'{child}:{stat.st_mtime_ns}:{stat.st_size}')
+
+    for path in paths:
+        scan(pathlib.Path(path))
+
+    return hashlib.md5('\n'.join(entries).encode()).hexdigest()
+
+
 # endregion
@@ -19,6 +19,7 @@ from typing import Any, Optional
 from django.apps import apps
 from django.conf import settings
 from django.contrib import admin
+from django.core.cache import cache
 from django.db.utils import IntegrityError, OperationalError, ProgrammingError
 from django.urls import clear_url_caches, path
 from django.utils.text import slugify
@@ -36,6 +37,7 @@ from .helpers import (
     IntegrationPluginError,
     MixinNotImplementedError,
     get_entrypoints,
+    get_package_signature,
     get_plugins,
     handle_error,
     log_registry_error,
@@ -44,6 +46,12 @@ from .plugin import InvenTreePlugin
 
 logger = structlog.get_logger('inventree')
 
+# Global cache key for the plugin registry hash (shared between processes)
+PLUGIN_REGISTRY_HASH_CACHE_KEY = 'plugin:registry_hash'
+
+# Global cache key prefix for plugin discovery manifests (one for each plugin directory)
+PLUGIN_MANIFEST_CACHE_KEY = 'plugin:manifest'
+
 
 def registry_entrypoint(check_reload: bool = True, default_value: Any = None) -> Any:
     """Function decorator for registry entrypoints methods.
@@ -123,11 +131,22 @@ class PluginsRegistry:
         # Keep an internal hash of the plugin registry state
         self.registry_hash: Optional[str] = None
 
+        # Last known value of the shared registry hash (and when it was read)
+        self.shared_hash: Optional[str] = None
+        self.shared_hash_time: float = 0
+
+        # Precomputed results of with_mixin(), valid for the current registry hash
+        self.mixin_cache: dict[tuple, list[InvenTreePlugin]] = {}
+        self.mixin_cache_hash: Optional[str] = None
+
         self.plugin_modules: list[InvenTreePlugin] = []  # Holds all discovered plugins
         self.mixin_modules: dict[str, Any] = {}  # Holds all discovered mixins
 
         self.errors: dict[str, list[Any]] = {}  # Holds errors discovered during loading
 
+        # Time taken (in seconds) for each stage of loading, per plugin (or plugin directory)
+        self.load_times: dict[str, dict[str, float]] = {}
+
         self.loading_lock = Lock()  # Lock to prevent multiple loading at the same time
 
         # flags
@@ -308,6 +327,18 @@ class PluginsRegistry:
             active (bool, optional): Filter by 'active' status of plugin. Defaults to True.
             builtin (bool, optional): Filter by 'builtin' status of plugin. Defaults to None.
         """
+        mixin = str(mixin).lower().strip()
+
+        # Return the precomputed list of plugins, if the registry has not changed
+        mixin_key = (mixin, active, builtin)
+
+        if self.mixin_cache_enabled():
+            if self.mixin_cache_hash != self.registry_hash:
+                self.mixin_cache = {}
+                self.mixin_cache_hash = self.registry_hash
+            elif mixin_key in self.mixin_cache:
+                return list(self.mixin_cache[mixin_key])
+
         # We can store the PluginConfig objects against the session cache,
         # which allows us to avoid hitting the database multiple times (per session)
         # As we have already checked the registry hash, this is a valid cache key
@@ -328,8 +359,6 @@ class PluginsRegistry:
                 logger.warning('plugin.registry.with_mixin: Database not ready')
                 return []
 
-        mixin = str(mixin).lower().strip()
-
         plugins = []
 
         for plugin in self.plugins.values():
@@ -353,7 +382,21 @@ class PluginsRegistry:
 
             plugins.append(plugin)
 
-        return plugins
+        if self.mixin_cache_enabled():
+            self.mixin_cache[mixin_key] = plugins
+
+        return list(plugins)
+
+    def mixin_cache_enabled(self) -> bool:
+        """Return True if the results of with_mixin() can be precomputed.
+
+        Results are not cached while the registry is loading (or has no hash yet),
+        or during unit testing (unless plugin reloading is being tested).
+        """
+        if settings.TESTING and not settings.PLUGIN_TESTING_RELOAD:
+            return False
+
+        return bool(self.registry_hash) and not self.is_loading
 
     # endregion
 
@@ -446,6 +489,8 @@ class PluginsRegistry:
         except Exception:
             plugin_on_startup = False
 
+        t_start = time.time()
+
         try:
             logger.info(
                 'Plugin Registry: Reloading plugins - Force: %s, Full: %s, Collect: %s',
@@ -469,7 +514,15 @@ class PluginsRegistry:
             self._load_plugins(full_reload=full_reload, _internal=_internal)
 
             self.update_plugin_hash()
-            logger.info('Plugin Registry: Loaded %s plugins', len(self.plugins))
+            logger.info(
+                'Plugin Registry: Loaded %s plugins in %.3fs',
+                len(self.plugins),
+                time.time() - t_start,
+            )
+
+            # Report the plugins which were slowest to load
+            for stage, name, dt in self.get_load_times()[:5]:
+                logger.debug('Plugin Registry: %s `%s` took %.3fs', stage, name, dt)
 
             # Ensure that each loaded plugin has a valid configuration object in the database
             for plugin in self.plugins.values():
@@ -558,10 +611,15 @@ class PluginsRegistry:
         """Collect plugins from all possible ways of loading. Returned as list."""
         collected_plugins = []
 
+        self.load_times['discovery'] = {}
+
         # Collect plugins from paths
         for plugin_dir in self.plugin_dirs():
             logger.debug("Loading plugins from directory '%s'", plugin_dir)
 
+            t_start = time.time()
+            manifest_key = plugin_dir
+
             parent_path = None
             parent_obj = Path(plugin_dir)
 
@@ -585,11 +643,27 @@ class PluginsRegistry:
             else:
                 raw_module = importlib.import_module(plugin_dir)
 
-            modules = get_plugins(raw_module, InvenTreePlugin, path=parent_path)
+            search_paths = [parent_path] if parent_path else list(raw_module.__path__)
+
+            # Only load modules which are known to contain plugins (if the directory is unchanged)
+            signature, names = self.get_plugin_manifest(manifest_key, search_paths)
+            n_errors = len(self.errors.get('discovery', []))
+
+            modules = get_plugins(
+                raw_module, InvenTreePlugin, path=parent_path, names=names
+            )
+
+            # A module which failed to load may contain plugins - do not record a manifest
+            if names is None and len(self.errors.get('discovery', [])) == n_errors:
+                self.set_plugin_manifest(
+                    manifest_key, search_paths, signature, modules or []
+                )
 
             for item in modules or []:
                 collected_plugins.append(item)
 
+            self.load_times['discovery'][manifest_key] = time.time() - t_start
+
         # From this point any plugins are considered "external" and only loaded if plugins are explicitly enabled
         if settings.PLUGINS_ENABLED:
             # Check if not running in testing mode and apps should be loaded from hooks
@@ -602,6 +676,8 @@ class PluginsRegistry:
                         "Loading plugin '%s' from module '%s'", entry.name, entry.module
                     )
 
+                    t_start = time.time()
+
                     try:
                         plugin = entry.load()
                         plugin.is_package = True
@@ -611,12 +687,109 @@ class PluginsRegistry:
                     except Exception as error:  # pragma: no cover
                         handle_error(error, do_raise=False, log_name='discovery')
 
+                    self.load_times['discovery'][entry.name] = time.time() - t_start
+
         # Log collected plugins
         logger.info('Collected %s plugins', len(collected_plugins))
         logger.debug(', '.join([a.__module__ for a in collected_plugins]))
 
         return collected_plugins
 
+    def get_plugin_manifest(
+        self, plugin_dir: str, paths: list[str]
+    ) -> tuple[Optional[str], Optional[list[str]]]:
+        """Read the cached discovery manifest for a plugin directory.
+
+        The manifest lists the modules (within the directory) which contain plugin classes.
+        It is stored in the global cache, so that it is shared between processes (and server restarts).
+
+        Args:
+            plugin_dir: The plugin directory (used as the manifest key)
+            paths: The filesystem paths which are searched for plugins
+
+        Returns:
+            A tuple of (signature, names), where 'signature' is the current signature of the directory,
+            and 'names' is the list of cached module names (or None if no valid manifest is available)
+        """
+        if not settings.GLOBAL_CACHE_ENABLED:
+            return None, None
+
+        try:
+            signature = get_package_signature(paths)
+            manifest = cache.get(f'{PLUGIN_MANIFEST_CACHE_KEY}:{plugin_dir}')
+        except Exception:
+            # Cache is not available - perform a full discovery
+            return None, None
+
+        if manifest and manifest.get('signature') == signature:
+            logger.debug("Using cached plugin manifest for '%s'", plugin_dir)
+            return signature, manifest.get('modules', [])
+
+        return signature, None
+
+    def set_plugin_manifest(
+        self, plugin_dir: str, paths: list[str], signature: Optional[str], plugins: list
+    ):
+        """Store the discovery manifest for a plugin directory.
+
+        The manifest is only stored if every discovered plugin is defined in a module
+        which was loaded from the searched paths (under the same module name),
+        otherwise a plugin could be missed when loading only the listed modules.
+
+        Args:
+            plugin_dir: The plugin directory (used as the manifest key)
+            paths: The filesystem paths which were searched for plugins
+            signature: The signature of the directory at the time of discovery
+            plugins: The plugin classes which were discovered
+        """
+        if not signature:
+            return
+
+        modules = set()
+
+        for plugin in plugins:
+            name = plugin.__module__
+
+            try:
+                filename = Path(sys.modules[name].__file__).resolve()
+            except Exception:
+                return
+
+            # Expected locations of the module, if it was loaded from one of the searched paths
+            locations = [Path(p).resolve().joinpath(*name.split('.')) for p in paths]
+
+            if not any(
+                filename in [loc.with_suffix('.py'), loc.joinpath('__init__.py')]
+                for loc in locations
+            ):
+                return
+
+            modules.add(name)
+
+        try:
+            cache.set(
+                f'{PLUGIN_MANIFEST_CACHE_KEY}:{plugin_dir}',
+                {'signature': signature, 'modules': sorted(modules)},
+                timeout=None,
+            )
+        except Exception:
+            # Cache is not available
+            pass
+
+    def get_load_times(self) -> list[tuple[str, str, float]]:
+        """Return the time taken for each stage of loading the plugin registry.
+
+        Returns:
+            A list of (stage, name, time) tuples, sorted by time (slowest first)
+        """
+        times = [
+            (stage, name, dt)
+            for stage, entries in self.load_times.items()
+            for name, dt in entries.items()
+        ]
+
+        return sorted(times, key=lambda x: x[2], reverse=True)
+
     def discover_mixins(self):
         """Discover all mixins from plugins and register them."""
         collected_mixins = {}
@@ -710,6 +883,8 @@ class PluginsRegistry:
             # Initialize package - we can be sure that an admin has activated the plugin
             logger.debug('Loading plugin `%s`', plg_name)
 
+            t_start = time.time()
+
             # If this is a third-party plugin, reload the source module
             # This is required to ensure that separate processes are using the same code
             if not builtin and not sample:
@@ -735,9 +910,9 @@ class PluginsRegistry:
                         logger.exception('Failed to reload plugin `%s`', plg_name)
 
             try:
-                t_start = time.time()
                 plg_i: InvenTreePlugin = plugin()
                 dt = time.time() - t_start
+                self.load_times.setdefault('init', {})[plg_key] = dt
                 logger.debug('Loaded plugin `%s` in %.3fs', plg_name, dt)
 
                 if mandatory and not plg_db.active:  # pragma: no cover
@@ -801,6 +976,8 @@ class PluginsRegistry:
         # Fetch and cache list of existing plugin configuration instances
         plugin_configs = {cfg.key: cfg for cfg in PluginConfig.objects.all()}
 
+        self.load_times['init'] = {}
+
         # Initialize plugins
         for plg in self.plugin_modules:
             # Attempt to load each individual plugin
@@ -859,8 +1036,12 @@ class PluginsRegistry:
         plugins = self.plugins.items()
         logger.info('Found %s active plugins', len(plugins))
 
+        self.load_times['activate'] = {}
+
         for mixin in self.__get_mixin_order():
             if hasattr(mixin, '_activate_mixin'):
+                t_start = time.time()
+
                 mixin._activate_mixin(
                     self,
                     plugins,
@@ -869,6 +1050,8 @@ class PluginsRegistry:
                     _internal=_internal,
                 )
 
+                self.load_times['activate'][mixin.__name__] = time.time() - t_start
+
         logger.debug('Done activating')
 
     def _deactivate_plugins(self, force_reload: bool = False):
@@ -936,6 +1119,8 @@ class PluginsRegistry:
         self.plugins_inactive: dict[str, InvenTreePlugin] = {}
         self.plugins_full: dict[str, InvenTreePlugin] = {}
 
+        self.mixin_cache = {}
+
     def _update_urls(self):
         """Due to the order in which plugins are loaded, the patterns in urls.py may be out of date.
 
@@ -946,7 +1131,6 @@ class PluginsRegistry:
         as any custom AppMixin plugins require admin integration
         """
         from Tracklet.urls import urlpatterns
-        from plugin.urls import get_plugin_urls
 
         for index, url in enumerate(urlpatterns):
             app_name = getattr(url, 'app_name', None)
@@ -958,12 +1142,21 @@ class PluginsRegistry:
                     f'{admin_url}/', admin.site.urls, name='inventree-admin'
                 )
 
-            if app_name == 'plugin':
-                urlpatterns[index] = get_plugin_urls()
+        self._update_plugin_urls()
 
         # Refresh the URL cache
         clear_url_caches()
 
+    def _update_plugin_urls(self):
+        """Update the URL patterns provided by plugins.
+
+        The plugin URLs are mounted via a dedicated resolver, which is updated in place.
+        This does not require the global URLConf to be reloaded.
+        """
+        from plugin.urls import update_plugin_urls
+
+        update_plugin_urls()
+
     # endregion
 
     # region plugin registry hash calculations
@@ -992,6 +1185,55 @@ class PluginsRegistry:
                 # Some other exception, we want to know about it
                 logger.exception('Failed to update plugin registry hash: %s', exc)
 
+        self.set_shared_hash(self.registry_hash)
+
+    def get_shared_hash(self) -> str:
+        """Return the registry hash shared between all processes.
+
+        To avoid a database query for each request, the shared hash is read at most once
+        every PLUGIN_REGISTRY_CHECK_INTERVAL seconds (per process).
+        If the global cache is enabled, the hash is read from the cache rather than the database.
+        """
+        now = time.monotonic()
+
+        if (
+            self.shared_hash is not None
+            and now - self.shared_hash_time < settings.PLUGIN_REGISTRY_CHECK_INTERVAL
+        ):
+            return self.shared_hash
+
+        if settings.GLOBAL_CACHE_ENABLED:
+            try:
+                if reg_hash := cache.get(PLUGIN_REGISTRY_HASH_CACHE_KEY):
+                    self.shared_hash = reg_hash
+                    self.shared_hash_time = now
+                    return reg_hash
+            except Exception:
+                # Cache is not available - fall back to the database
+                pass
+
+        reg_hash = get_global_setting('_PLUGIN_REGISTRY_HASH', '', create=False)
+
+        self.set_shared_hash(reg_hash)
+
+        return reg_hash
+
+    def set_shared_hash(self, reg_hash: Optional[str]):
+        """Record the registry hash shared between all processes.
+
+        The hash is also stored in the global cache (if enabled),
+        so that other processes can read it without a database query.
+        """
+        self.shared_hash = reg_hash
+        self.shared_hash_time = time.monotonic()
+
+        if reg_hash and settings.GLOBAL_CACHE_ENABLED:
+            try:
+                cache.set(PLUGIN_REGISTRY_HASH_CACHE_KEY, reg_hash, timeout=None)
+            except Exception:
+                # Cache is not available
+                pass
+
     def plugin_settings_keys(self):
         """A list of keys which are used to store plugin settings."""
         return [
@@ -1061,7 +1303,7 @@ class PluginsRegistry:
             self.registry_hash = self.calculate_plugin_hash()
 
         try:
-            reg_hash = get_global_setting('_PLUGIN_REGISTRY_HASH', '', create=False)
+            reg_hash = self.get_shared_hash()
         except Exception as exc:
             logger.exception('Failed to retrieve plugin registry hash: %s', exc)
             return False
@@ -307,16 +307,32 @@ class PluginRegistryErrorSerializer(serializers.Serializer):
     message = serializers.CharField()
 
 
+class PluginRegistryLoadTimeSerializer(serializers.Serializer):
+    """Serializer for the time taken by a plugin registry loading stage."""
+
+    class Meta:
+        """Meta for serializer."""
+
+        fields = ['stage', 'name', 'time']
+
+    stage = serializers.CharField()
+    name = serializers.CharField()
+    time = serializers.FloatField(help_text=_('Time taken (in seconds)'))
+
+
 class PluginRegistryStatusSerializer(serializers.Serializer):
     """Serializer for plugin registry status."""
 
     class Meta:
         """Meta for serializer."""
 
-        fields = ['active_plugins', 'registry_errors']
+        fields = ['active_plugins', 'registry_errors', 'load_times']
 
     active_plugins = serializers.IntegerField(read_only=True)
     registry_errors = serializers.ListField(child=PluginRegistryErrorSerializer())
+    load_times = serializers.ListField(
+        child=PluginRegistryLoadTimeSerializer(), read_only=True
+    )
 
 
 @extend_schema_field(OpenApiTypes.STR)
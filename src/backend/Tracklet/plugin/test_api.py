@@ -488,7 +488,11 @@ class PluginDetailAPITest(PluginMixin, InvenTreeAPITestCase):
         self.user.is_superuser = True
         self.user.save()
 
-        self.get(url, expected_code=200)
+        response = self.get(url, expected_code=200)
+
+        # Plugin loading times are reported
+        stages = {entry['stage'] for entry in response.data['load_times']}
+        self.assertIn('init', stages)
 
         self.user.is_superuser = False
         self.user.save()
@@ -16,6 +16,7 @@ from django.test import TestCase, override_settings
 import plugin.templatetags.plugin_extras as plugin_tags
 from Tracklet.unit_test import PluginRegistryMixin, TestQueryMixin
 from plugin import InvenTreePlugin, PluginMixinEnum
+from plugin.helpers import get_plugins
 from plugin.registry import registry
 from plugin.samples.integration.another_sample import (
     NoIntegrationPlugin,
@@ -484,6 +485,61 @@ class RegistryTests(TestQueryMixin, PluginRegistryMixin, TestCase):
             registry.registry_hash = 'abc'
             self.assertTrue(registry.check_reload())
 
+    def test_with_mixin_cache(self):
+        """Test that with_mixin results are precomputed until the registry changes."""
+        with self.settings(TESTING=False, PLUGIN_TESTING_RELOAD=True):
+            registry.reload_plugins(full_reload=True, collect=True, force_reload=True)
+
+            plugins = registry.with_mixin(PluginMixinEnum.BARCODE)
+            self.assertGreater(len(plugins), 0)
+            self.assertEqual(registry.mixin_cache_hash, registry.registry_hash)
+
+            # The shared registry hash and the plugin list are not read from the database
+            with self.assertNumQueries(0):
+                self.assertEqual(registry.with_mixin(PluginMixinEnum.BARCODE), plugins)
+
+            # A change to the registry hash invalidates the precomputed results
+            registry.registry_hash = 'abc'
+
+            plugins = registry.with_mixin(PluginMixinEnum.BARCODE)
+            self.assertGreater(len(plugins), 0)
+            self.assertNotEqual(registry.registry_hash, 'abc')
+            self.assertEqual(registry.mixin_cache_hash, registry.registry_hash)
+
+    def test_plugin_manifest(self):
+        """Test that plugin discovery uses a cached manifest for unchanged directories."""
+        from django.core.cache import cache
+
+        from plugin.registry import PLUGIN_MANIFEST_CACHE_KEY
+
+        key = f'{PLUGIN_MANIFEST_CACHE_KEY}:plugin.samples'
+        cache.delete(key)
+
+        with self.settings(GLOBAL_CACHE_ENABLED=True):
+            registry.reload_plugins(full_reload=True, collect=True)
+            slugs = set(registry.plugins_full.keys())
+
+            manifest = cache.get(key)
+            self.assertIsNotNone(manifest)
+            self.assertIn('integration.sample', manifest['modules'])
+            self.assertIn('plugin.samples', registry.load_times['discovery'])
+
+            # Only the listed modules are loaded - the same plugins are discovered
+            with patch(
+                'plugin.registry.get_plugins', wraps=get_plugins
+            ) as mock_get_plugins:
+                registry.reload_plugins(full_reload=True, collect=True)
+
+            self.assertIn(
+                mock.call(
+                    mock.ANY, InvenTreePlugin, path=None, names=manifest['modules']
+                ),
+                mock_get_plugins.call_args_list,
+            )
+            self.assertEqual(set(registry.plugins_full.keys()), slugs)
+
+        cache.delete(key)
+
     def test_builtin_mandatory_plugins(self):
         """Test that mandatory builtin plugins are always loaded."""
         from plugin.models import PluginConfig
@@ -1,8 +1,9 @@
 """URL lookup for plugin app."""
 
 from django.conf import settings
-from django.urls import include, re_path
+from django.urls import URLResolver, include, re_path
 from django.urls.exceptions import Resolver404
+from django.urls.resolvers import RegexPattern, get_ns_resolver
 from django.views.generic.base import RedirectView
 
 from common.validators import get_global_setting
@@ -12,8 +13,49 @@ from plugin import PluginMixinEnum
 PLUGIN_BASE = 'plugin'  # Constant for links
 
 
-def get_plugin_urls():
-    """Returns a urlpattern that can be integrated into the global urls."""
+class PluginURLResolver(URLResolver):
+    """URL resolver which mounts the URL patterns provided by plugins.
+
+    The plugin URL patterns change whenever the plugin registry is reloaded.
+    Rather than rebuilding the entire URLConf (and clearing all URL caches),
+    the patterns of this resolver are replaced in place, and only its own lookup tables are reset.
+    """
+
+    def __init__(self):
+        """Initialize the resolver with the current plugin URL patterns."""
+        super().__init__(
+            RegexPattern(f'^{PLUGIN_BASE}/'),
+            get_plugin_url_patterns(),
+            app_name='plugin',
+            namespace='plugin',
+        )
+
+    def update_patterns(self):
+        """Replace the URL patterns with those of the currently loaded plugins."""
+        patterns = get_plugin_url_patterns()
+
+        self.urlconf_name = patterns
+
+        # Reset the cached patterns and lookup tables (populated again on first use)
+        self.__dict__.pop('urlconf_module', None)
+        self.__dict__.pop('url_patterns', None)
+
+        self._reverse_dict = {}
+        self._namespace_dict = {}
+        self._app_dict = {}
+        self._callback_strs = set()
+        self._populated = False
+
+        # Namespaced reverse lookups hold a reference to the previous patterns
+        get_ns_resolver.cache_clear()
+
+
+# Resolver instance which is mounted into the global URLConf
+plugin_url_resolver: PluginURLResolver | None = None
+
+
+def get_plugin_url_patterns() -> list:
+    """Returns a list of URL patterns for all active plugins which provide custom URLs."""
     from plugin.registry import registry
 
     urls = []
@@ -54,4 +96,23 @@ def get_plugin_urls():
         )
     )
 
-    return re_path(f'^{PLUGIN_BASE}/', include((urls, 'plugin')))
+    return urls
+
+
+def get_plugin_urls() -> PluginURLResolver:
+    """Returns a urlpattern that can be integrated into the global urls."""
+    global plugin_url_resolver
+
+    if plugin_url_resolver is None:
+        plugin_url_resolver = PluginURLResolver()
+
+    return plugin_url_resolver
+
+
+def update_plugin_urls():
+    """Update the mounted plugin URL patterns, after the plugin registry has changed."""
+    if plugin_url_resolver is None:
+        # Plugin URLs are not mounted (yet) - patterns are generated when the resolver is created
+        return
+
+    plugin_url_resolver.update_patterns()
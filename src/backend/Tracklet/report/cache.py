@@ -0,0 +1,121 @@
+"""Caching of encoded report assets.
+
+Template tags such as 'uploaded_image' and 'encode_svg_image' read image files from disk,
+validate them, and encode them as base64 data. When the same image is rendered many times
+(e.g. a logo or part image on every label), the encoded data is cached in memory.
+
+Cache entries are keyed on the (path, mtime, size) of the source file,
+and the transform applied to it, so a modified file is never served from the cache.
+
+The cache (and the compiled template cache) is also cleared when
+a report template, snippet or asset is uploaded.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+
+logger = structlog.get_logger('inventree')
+
+# Maximum total size (in bytes) of encoded data held in the asset cache
+ASSET_CACHE_MAX_SIZE = 32 * 1024 * 1024
+
+
+class AssetCache:
+    """In-memory LRU cache of data generated from report asset files."""
+
+    def __init__(self, max_size: int = ASSET_CACHE_MAX_SIZE):
+        """Initialize the cache.
+
+        Arguments:
+            max_size: Maximum total size (in bytes) of cached data
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def file_key(path) -> tuple | None:
+        """Return a (path, mtime, size) key for a file, or None if the file does not exist."""
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError, ValueError):
+            return None
+
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def sizeof(value: Any) -> int:
+        """Return the (approximate) size of a cached value."""
+        if isinstance(value, (str, bytes)):
+            return len(value)
+
+        return 1
+
+    def get(self, path, transform: Any, func: Callable[[], Any]) -> Any:
+        """Return the cached value for a file, or generate (and cache) a new value.
+
+        Arguments:
+            path: Path to the source file
+            transform: Hashable description of the transform applied to the file
+            func: Function which generates the value (if not cached)
+        """
+        file_key = self.file_key(path)
+
+        if file_key is None:
+            return func()
+
+        key = (*file_key, transform)
+
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        value = func()
+
+        self.set(key, value)
+
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        """Add a value to the cache, evicting the least recently used entries if required."""
+        size = self.sizeof(value)
+
+        if size > self.max_size:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                return
+
+            self.entries[key] = value
+            self.size += size
+
+            while self.size > self.max_size:
+                _key, old = self.entries.popitem(last=False)
+                self.size -= self.sizeof(old)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+asset_cache = AssetCache()
+
+
+def clear_report_cache() -> None:
+    """Clear the report asset cache, and invalidate compiled report templates."""
+    from Tracklet.template import clear_report_template_cache
+
+    logger.debug('Clearing report cache')
+
+    asset_cache.clear()
+    clear_report_template_cache()
@@ -57,3 +57,53 @@ class InvenTreeReportMixin(models.Model):
         ```
         """
         return {}
+
+    # Related data which is prefetched when generating report contexts for this model
+    # A list of lookups passed to prefetch_related (see prefetch_report_instances)
+    REPORT_PREFETCH: list = []
+
+    @classmethod
+    def prefetch_report_instances(cls, instances: list) -> None:
+        """Prefetch related data for a list of instances which are rendered together.
+
+        - Each forward (foreign key) relation of the model is fetched with a single query,
+          rather than a separate query for each instance
+        - Any related data declared in REPORT_PREFETCH is also fetched
+
+        Arguments:
+            instances: A list of model instances (of this model type)
+        """
+        if not instances:
+            return
+
+        lookups = []
+
+        if len(instances) > 1:
+            lookups += [
+                field.name
+                for field in cls._meta.get_fields()
+                if field.is_relation
+                and field.concrete
+                and (field.many_to_one or field.one_to_one)
+            ]
+
+        lookups += [lookup for lookup in cls.REPORT_PREFETCH if lookup not in lookups]
+
+        if lookups:
+            models.prefetch_related_objects(instances, *lookups)
+
+    @classmethod
+    def report_contexts(cls, instances: list) -> list[BaseReportContext]:
+        """Generate report context data for a list of instances.
+
+        Related data is prefetched for all instances (see prefetch_report_instances),
+        before the context data is generated for each instance.
+
+        Arguments:
+            instances: A list of model instances (of this model type)
+        """
+        instances = list(instances)
+
+        cls.prefetch_report_instances(instances)
+
+        return [instance.report_context() for instance in instances]
@@ -2,6 +2,7 @@
 
 import io
 import os
+import re
 import sys
 from datetime import date, datetime
 from typing import Optional, TypedDict, cast
@@ -13,6 +14,8 @@ from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.validators import FileExtensionValidator, MinValueValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.template import Context, Template
 from django.template.exceptions import TemplateDoesNotExist, TemplateSyntaxError
 from django.template.loader import render_to_string
@@ -25,6 +28,7 @@ from pypdf import PdfWriter
 import Tracklet.exceptions
 import Tracklet.helpers
 import Tracklet.models
+import report.cache
 import report.helpers
 import report.validators
 from common.models import DataOutput, RenderChoices
@@ -45,6 +49,15 @@ except OSError as err:  # pragma: no cover
 
 logger = structlog.getLogger('inventree')
 
+# Split a rendered label into (head, body, tail) sections
+LABEL_BODY_REGEX = re.compile(
+    r'^(?P<head>.*?<body[^>]*>)(?P<body>.*)(?P<tail></body>.*)$',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Separator between labels which are rendered to a single document
+LABEL_PAGE_BREAK = "<div style='break-before: page;'></div>"
+
 
 def log_report_error(*args, **kwargs):
     """Log an error message when a report fails to render."""
@@ -348,6 +361,28 @@ class ReportTemplateBase(MetadataMixin, Tracklet.models.InvenTreeModel):
 
         return context
 
+    def prefetch_instances(self, instances: list) -> None:
+        """Prefetch related data for a list of model instances which are rendered together."""
+        model = self.get_model()
+
+        if model and instances:
+            model.prefetch_report_instances(instances)
+
+    def get_contexts(self, instances: list, request=None, **kwargs) -> list[dict]:
+        """Supply context data for a list of model instances which are rendered together.
+
+        Related data is prefetched for all instances before the contexts are generated.
+
+        Arguments:
+            instances: The model instances we are printing against
+            request: The request object (optional)
+        """
+        instances = list(instances)
+
+        self.prefetch_instances(instances)
+
+        return [self.get_context(instance, request, **kwargs) for instance in instances]
+
 
 class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
     """Class representing the ReportTemplate database model."""
@@ -462,6 +497,112 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
             except Exception:
                 Tracklet.exceptions.log_error('report_callback', plugin=plugin.slug)
 
+    def render_output(self, instance, request, context, output, as_string=False):
+        """Render a single report output.
+
+        Arguments:
+            instance: The model instance to render against
+            request: A HTTPRequest object (optional)
+            context: Django template language contexts
+            output: The DataOutput object, which is marked as failed if rendering fails
+            as_string: If True, render to a HTML string (rather than PDF)
+
+        Raises:
+            ValidationError: If there is an error rendering the report
+        """
+        try:
+            if as_string:
+                return self.render_as_string(instance, request, context)
+            return self.render(instance, request, context)
+        except TemplateDoesNotExist as e:
+            t_name = str(e) or self.template
+            msg = f'Template file {t_name} does not exist'
+            output.mark_failure(error=msg)
+            raise ValidationError(msg)
+        except TemplateSyntaxError as e:
+            msg = _('Template syntax error')
+            output.mark_failure(error=msg)
+            raise ValidationError(f'{msg}: {e!s}')
+        except ValidationError as e:
+            output.mark_failure(str(e))
+            raise e
+        except Exception as e:
+            msg = _('Error rendering report')
+            output.mark_failure(error=msg)
+            raise ValidationError(f'{msg}: {e!s}')
+
+    def use_render_pool(self, items: list, debug_mode: bool = False) -> bool:
+        """Determine whether reports for the provided items are rendered by a pool of worker processes."""
+        if debug_mode or self.merge:
+            return False
+
+        return (
+            settings.REPORT_RENDER_WORKERS > 1
+            and len(items) > settings.REPORT_RENDER_CHUNK_SIZE
+        )
+
+    def render_parallel(
+        self, items: list, contexts: list, request, output, report_name
+    ) -> bytes:
+        """Render reports for multiple items to a single PDF file, using a pool of worker processes.
+
+        Each report is rendered to HTML in this process, and rendered to PDF by a worker process.
+        Intermediate PDF files are written to a temporary directory, and merged in order.
+
+        Returns:
+            bytes: The merged PDF data
+        """
+        from report.render import ReportRenderError, ReportRenderPool
+
+        items = list(items)
+
+        # Attachments and plugin callbacks require the PDF data for each report
+        callbacks = self.attach_to_model or registry.with_mixin(PluginMixinEnum.REPORT)
+
+        pdf_writer = PdfWriter()
+
+        def collect(pool, block=False):
+            """Merge the rendered PDF files, and update the progress of the output."""
+            results = pool.collect(block=block)
+
+            for idx, path in results:
+                if callbacks:
+                    report = path.read_bytes()
+                    self.handle_attachment(
+                        items[idx], report, report_name, request, False
+                    )
+                    self.notify_plugins(items[idx], report, request)
+
+                pdf_writer.append(str(path))
+
+            if results:
+                output.progress += len(results)
+                output.save()
+
+        try:
+            with ReportRenderPool() as pool:
+                for instance, context in zip(items, contexts, strict=True):
+                    pool.add(
+                        self.render_output(
+                            instance, request, context, output, as_string=True
+                        )
+                    )
+                    collect(pool)
+
+                collect(pool, block=True)
+
+                pdf_file = io.BytesIO()
+                pdf_writer.write(pdf_file)
+        except ReportRenderError as e:
+            msg = _('Error rendering report')
+            output.mark_failure(error=msg)
+            raise ValidationError(f'{msg}: {e!s}')
+
+        data = pdf_file.getvalue()
+        pdf_file.close()
+
+        return data
+
     def print(self, items: list, request=None, output=None, **kwargs) -> DataOutput:
         """Print reports for a list of items against this template.
 
@@ -480,6 +621,9 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
             Currently, all items are rendered separately into PDF files,
             and then combined into a single PDF file.
 
+            When printing a large number of items, the PDF files are rendered
+            concurrently by a pool of worker processes (see report.render).
+
             Further work is required to allow the following extended features:
             - Render a single PDF file with the collated items (optional per template)
             - Render a raw file (do not convert to PDF) - allows for other file types
@@ -488,6 +632,9 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
 
         outputs = []
 
+        # Merged PDF data (if rendered by the worker pool)
+        data = None
+
         debug_mode = get_global_setting('REPORT_DEBUG_MODE', False)
 
         # Start with a default report name
@@ -516,8 +663,13 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
                 base_context = super().base_context(request)
                 report_context = self.get_report_context()
                 item_contexts = []
-                for instance in items:
-                    instance_context = instance.report_context()
+
+                # Generate the item contexts in bulk, with related data prefetched
+                instance_contexts = self.get_model().report_contexts(items)
+
+                for instance, instance_context in zip(
+                    items, instance_contexts, strict=True
+                ):
                     instance_context = self.get_plugin_context(
                         instance, request, instance_context
                     )
@@ -532,27 +684,9 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
                 if report_name is None:
                     report_name = self.generate_filename(contexts)
 
-                try:
-                    if debug_mode:
-                        report = self.render_as_string(instance, request, contexts)
-                    else:
-                        report = self.render(instance, request, contexts)
-                except TemplateDoesNotExist as e:
-                    t_name = str(e) or self.template
-                    msg = f'Template file {t_name} does not exist'
-                    output.mark_failure(error=msg)
-                    raise ValidationError(msg)
-                except TemplateSyntaxError as e:
-                    msg = _('Template syntax error')
-                    output.mark_failure(msg)
-                    raise ValidationError(f'{msg}: {e!s}')
-                except ValidationError as e:
-                    output.mark_failure(str(e))
-                    raise e
-                except Exception as e:
-                    msg = _('Error rendering report')
-                    output.mark_failure(msg)
-                    raise ValidationError(f'{msg}: {e!s}')
+                report = self.render_output(
+                    instance, request, contexts, output, as_string=debug_mode
+                )
 
                 outputs.append(report)
                 self.handle_attachment(
@@ -564,45 +698,32 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
                 output.progress += 1
                 output.save()
             else:
-                for instance in items:
-                    context = self.get_context(instance, request)
-
-                    if report_name is None:
-                        report_name = self.generate_filename(context)
-
-                    # Render the report output
-                    try:
-                        if debug_mode:
-                            report = self.render_as_string(instance, request, None)
-                        else:
-                            report = self.render(instance, request, None)
-                    except TemplateDoesNotExist as e:
-                        t_name = str(e) or self.template
-                        msg = f'Template file {t_name} does not exist'
-                        output.mark_failure(error=msg)
-                        raise ValidationError(msg)
-                    except TemplateSyntaxError as e:
-                        msg = _('Template syntax error')
-                        output.mark_failure(error=_('Template syntax error'))
-                        raise ValidationError(f'{msg}: {e!s}')
-                    except ValidationError as e:
-                        output.mark_failure(str(e))
-                        raise e
-                    except Exception as e:
-                        msg = _('Error rendering report')
-                        output.mark_failure(error=msg)
-                        raise ValidationError(f'{msg}: {e!s}')
-
-                    outputs.append(report)
+                contexts = self.get_contexts(items, request)
 
-                    self.handle_attachment(
-                        instance, report, report_name, request, debug_mode
+                if report_name is None and contexts:
+                    report_name = self.generate_filename(contexts[0])
+
+                if self.use_render_pool(items, debug_mode):
+                    data = self.render_parallel(
+                        items, contexts, request, output, report_name
                     )
-                    self.notify_plugins(instance, report, request)
+                else:
+                    for instance, context in zip(items, contexts, strict=True):
+                        # Render the report output
+                        report = self.render_output(
+                            instance, request, context, output, as_string=debug_mode
+                        )
+
+                        outputs.append(report)
+
+                        self.handle_attachment(
+                            instance, report, report_name, request, debug_mode
+                        )
+                        self.notify_plugins(instance, report, request)
 
-                    # Update the progress of the report generation
-                    output.progress += 1
-                    output.save()
+                        # Update the progress of the report generation
+                        output.progress += 1
+                        output.save()
 
         except Exception as exc:
             # Something went wrong during the report generation process
@@ -624,7 +745,7 @@ class ReportTemplate(TemplateUploadMixin, ReportTemplateBase):
         if debug_mode:
             data = '\n'.join(outputs)
             report_name = report_name.replace('.pdf', '.html')
-        else:
+        elif data is None:
             # Merge the outputs back together into a single PDF file
             pdf_writer = PdfWriter()
 
@@ -727,6 +848,59 @@ class LabelTemplate(TemplateUploadMixin, ReportTemplateBase):
 
         return context
 
+    def render_batch(self, items: list, request=None, contexts=None) -> Optional[bytes]:
+        """Render multiple labels to a single PDF document, with one label per page.
+
+        Each label is rendered to HTML, and the <body> content of each label is
+        combined into a single HTML document (separated by page breaks),
+        which is then rendered to PDF with a single call to WeasyPrint.
+
+        Arguments:
+            items: The model instances to render against
+            request: A HTTPRequest object (optional)
+            contexts: Django template language contexts for each item (optional)
+
+        Returns:
+            bytes: PDF data, or None if the labels cannot be rendered as a single document
+        """
+        if contexts is None:
+            contexts = self.get_contexts(items, request)
+
+        head = tail = None
+        bodies = []
+
+        for item, context in zip(items, contexts, strict=True):
+            html = self.render_as_string(item, request, context=context)
+
+            match = LABEL_BODY_REGEX.match(html)
+
+            if not match:
+                return None
+
+            if head is None:
+                head, tail = match['head'], match['tail']
+            elif match['head'] != head or match['tail'] != tail:
+                # Document structure differs between labels
+                return None
+
+            bodies.append(match['body'])
+
+        if not bodies:
+            return None
+
+        html = head + LABEL_PAGE_BREAK.join(bodies) + tail
+
+        document = HTML(string=html).render()
+
+        if len(document.pages) != len(bodies):
+            # Label content has overflowed onto multiple pages
+            logger.info(
+                "Label template '%s' cannot be rendered as a single document", self.name
+            )
+            return None
+
+        return document.write_pdf(pdf_forms=True)
+
     def print(
         self,
         items: list,
@@ -841,3 +1015,18 @@ class ReportAsset(TemplateUploadMixin, models.Model):
         verbose_name=_('Description'),
         help_text=_('Asset file description'),
     )
+
+
+@receiver(post_save, sender=ReportTemplate, dispatch_uid='report_template_post_save')
+@receiver(post_save, sender=LabelTemplate, dispatch_uid='label_template_post_save')
+@receiver(post_save, sender=ReportSnippet, dispatch_uid='report_snippet_post_save')
+@receiver(post_save, sender=ReportAsset, dispatch_uid='report_asset_post_save')
+@receiver(
+    post_delete, sender=ReportTemplate, dispatch_uid='report_template_post_delete'
+)
+@receiver(post_delete, sender=LabelTemplate, dispatch_uid='label_template_post_delete')
+@receiver(post_delete, sender=ReportSnippet, dispatch_uid='report_snippet_post_delete')
+@receiver(post_delete, sender=ReportAsset, dispatch_uid='report_asset_post_delete')
+def clear_report_cache(sender, instance, **kwargs):
+    """Clear the report asset and template caches when a template file is uploaded or removed."""
+    report.cache.clear_report_cache()
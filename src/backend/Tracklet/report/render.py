@@ -0,0 +1,221 @@
+"""Parallel rendering of reports to PDF.
+
+Rendering a HTML document to PDF (with WeasyPrint) is CPU bound,
+and is the most expensive step when printing a large number of reports.
+
+The ReportRenderPool class passes rendered HTML documents to a pool of worker processes,
+which render the PDF files concurrently:
+
+- Each worker process renders a "chunk" of documents, to amortize the process startup cost
+- HTML documents and PDF files are written to a temporary directory, rather than held in memory
+- Rendered PDF files are returned in the order in which the documents were added
+
+Worker processes are started as subprocesses (python -m report.render ...),
+as the background worker processes (which print reports) are daemonic,
+and are not permitted to start multiprocessing child processes.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+import structlog
+
+logger = structlog.get_logger('inventree')
+
+
+class ReportRenderError(Exception):
+    """Raised when a worker process fails to render a report."""
+
+
+class ReportRenderPool:
+    """Render HTML documents to PDF files, using a pool of worker processes.
+
+    Usage:
+        with ReportRenderPool() as pool:
+            for html in documents:
+                pool.add(html)
+
+            for idx, path in pool.collect(block=True):
+                ...
+    """
+
+    def __init__(self, workers: int | None = None, chunk_size: int | None = None):
+        """Initialize the pool.
+
+        Arguments:
+            workers: Maximum number of concurrent worker processes (default = REPORT_RENDER_WORKERS)
+            chunk_size: Number of documents rendered by each worker process (default = REPORT_RENDER_CHUNK_SIZE)
+        """
+        self.workers = max(1, workers or settings.REPORT_RENDER_WORKERS)
+        self.chunk_size = max(1, chunk_size or settings.REPORT_RENDER_CHUNK_SIZE)
+
+        self.directory = None
+
+        # Number of documents added to the pool
+        self.count = 0
+
+        # Documents which have not yet been submitted to a worker process
+        self.pending = []
+
+        # Running worker processes: [(process, chunk), ...]
+        self.running = []
+
+        # Documents which have been rendered
+        self.completed = set()
+
+        # Number of documents returned by collect()
+        self.returned = 0
+
+    def __enter__(self):
+        """Create the temporary directory for the pool."""
+        self.directory = tempfile.TemporaryDirectory(prefix='inventree-report-')
+        return self
+
+    def __exit__(self, *args):
+        """Stop any running worker processes, and remove all temporary files."""
+        for process, _chunk in self.running:
+            process.kill()
+            process.wait()
+
+        self.running = []
+        self.directory.cleanup()
+
+    def html_path(self, idx: int) -> Path:
+        """Return the path of the HTML file for the specified document."""
+        return Path(self.directory.name, f'{idx}.html')
+
+    def pdf_path(self, idx: int) -> Path:
+        """Return the path of the PDF file for the specified document."""
+        return Path(self.directory.name, f'{idx}.pdf')
+
+    def log_path(self, idx: int) -> Path:
+        """Return the path of the log file for the chunk starting at the specified document."""
+        return Path(self.directory.name, f'{idx}.log')
+
+    def add(self, html: str) -> None:
+        """Add a HTML document to be rendered."""
+        idx = self.count
+        self.count += 1
+
+        self.html_path(idx).write_text(html, encoding='utf-8')
+        self.pending.append(idx)
+
+        if len(self.pending) >= self.chunk_size:
+            self.submit()
+
+    def submit(self) -> None:
+        """Submit the pending documents to a new worker process.
+
+        If the maximum number of worker processes are running,
+        wait for one of the running processes to complete.
+        """
+        if not self.pending:
+            return
+
+        while len(self.running) >= self.workers:
+            self.wait()
+
+        chunk, self.pending = self.pending, []
+
+        args = []
+
+        for idx in chunk:
+            args += [str(self.html_path(idx)), str(self.pdf_path(idx))]
+
+        with self.log_path(chunk[0]).open('wb') as log:
+            process = subprocess.Popen(
+                [sys.executable, '-m', 'report.render', *args],
+                cwd=settings.BASE_DIR,
+                stdout=subprocess.DEVNULL,
+                stderr=log,
+            )
+
+        self.running.append((process, chunk))
+
+    def wait(self, block: bool = True) -> None:
+        """Check for completed worker processes.
+
+        Arguments:
+            block: If True, wait until at least one worker process has completed
+
+        Raises:
+            ReportRenderError: If a worker process failed
+        """
+        while True:
+            finished = [
+                (process, chunk)
+                for process, chunk in self.running
+                if process.poll() is not None
+            ]
+
+            if finished or not block or not self.running:
+                break
+
+            # Wait for the oldest worker process to complete
+            self.running[0][0].wait()
+
+        for process, chunk in finished:
+            self.running.remove((process, chunk))
+
+            if process.returncode != 0:
+                error = self.log_path(chunk[0]).read_text(errors='replace')
+                logger.error('Report render worker failed: %s', error)
+                lines = error.strip().splitlines()
+                raise ReportRenderError(
+                    lines[-1] if lines else f'Exit code {process.returncode}'
+                )
+
+            for idx in chunk:
+                self.html_path(idx).unlink(missing_ok=True)
+
+            self.completed.update(chunk)
+
+    def collect(self, block: bool = False) -> list[tuple[int, Path]]:
+        """Return the documents which have been rendered since the last call.
+
+        Documents are returned in the order in which they were added,
+        so a rendered document is not returned until all preceding documents have been rendered.
+
+        Arguments:
+            block: If True, wait for all documents to be rendered
+
+        Returns:
+            A list of (index, path) tuples for each rendered PDF file
+        """
+        if block:
+            self.submit()
+
+            while self.running:
+                self.wait()
+        else:
+            self.wait(block=False)
+
+        results = []
+
+        while self.returned in self.completed:
+            results.append((self.returned, self.pdf_path(self.returned)))
+            self.returned += 1
+
+        return results
+
+
+def render_files(files: list[tuple[str, str]]) -> None:
+    """Render a list of HTML files to PDF files (run in the worker process).
+
+    Arguments:
+        files: A list of (html_file, pdf_file) paths
+    """
+    from weasyprint import HTML
+
+    for html_file, pdf_file in files:
+        html = Path(html_file).read_text(encoding='utf-8')
+        HTML(string=html).write_pdf(pdf_file, pdf_forms=True)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    render_files(list(zip(args[::2], args[1::2], strict=True)))
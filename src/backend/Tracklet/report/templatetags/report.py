@@ -17,7 +17,6 @@ from django.utils.safestring import SafeString, mark_safe
 from django.utils.translation import gettext_lazy as _
 
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
 from djmoney.money import Money
 from PIL import Image
 
@@ -26,6 +25,7 @@ import common.icons
 import common.models
 import Tracklet.helpers
 import Tracklet.helpers_model
+import report.cache
 import report.helpers
 from common.settings import get_global_setting
 from company.models import Company
@@ -218,7 +218,13 @@ def uploaded_image(
         except Exception:  # pragma: no cover
             exists = False  # pragma: no cover
 
-    if exists and validate and not Tracklet.helpers.TestIfImage(full_path):
+    if (
+        exists
+        and validate
+        and not report.cache.asset_cache.get(
+            full_path, 'valid', lambda: Tracklet.helpers.TestIfImage(full_path)
+        )
+    ):
         logger.warning("File '%s' is not a valid image", filename)
         exists = False
 
@@ -234,13 +240,6 @@ def uploaded_image(
     elif not exists:
         full_path = settings.STATIC_ROOT.joinpath('img', replacement_file).resolve()
 
-    # Load the image, check that it is valid
-    if full_path.exists() and full_path.is_file():
-        img = Image.open(full_path)
-    else:
-        # A placeholder image showing that the image is missing
-        img = Image.new('RGB', (64, 64), color='red')
-
     if width is not None:
         try:
             width = int(width)
@@ -253,6 +252,41 @@ def uploaded_image(
         except ValueError:
             height = None
 
+    if rotate is not None:
+        try:
+            rotate = int(rotate)
+        except ValueError:
+            rotate = None
+
+    # Return a base-64 encoded image (cached against the image file)
+    return report.cache.asset_cache.get(
+        full_path,
+        ('image', width, height, rotate),
+        lambda: encode_image_file(full_path, width, height, rotate),
+    )
+
+
+def encode_image_file(
+    full_path,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    rotate: Optional[int] = None,
+) -> str:
+    """Load an image file, apply any transforms, and return base-64 encoded image data.
+
+    Arguments:
+        full_path: The path to the image file
+        width: Optional width of the image
+        height: Optional height of the image
+        rotate: Optional rotation to apply to the image
+    """
+    # Load the image, check that it is valid
+    if full_path.exists() and full_path.is_file():
+        img = Image.open(full_path)
+    else:
+        # A placeholder image showing that the image is missing
+        img = Image.new('RGB', (64, 64), color='red')
+
     if width is not None and height is not None:
         # Resize the image, width *and* height are provided
         img = img.resize((width, height))
@@ -269,16 +303,10 @@ def uploaded_image(
 
     # Optionally rotate the image
     if rotate is not None:
-        try:
-            rotate = int(rotate)
-            img = img.rotate(rotate)
-        except ValueError:
-            pass
+        img = img.rotate(rotate)
 
     # Return a base-64 encoded image
-    img_data = report.helpers.encode_image_base64(img)
-
-    return img_data
+    return report.helpers.encode_image_base64(img)
 
 
 @register.simple_tag()
@@ -301,11 +329,17 @@ def encode_svg_image(filename: str) -> str:
     if not exists:
         raise FileNotFoundError(_('Image file not found') + f": '{filename}'")
 
-    # Read the file data
+    # Return the base64-encoded data (cached against the image file)
+    return report.cache.asset_cache.get(
+        full_path, 'svg', lambda: encode_svg_file(full_path)
+    )
+
+
+def encode_svg_file(full_path) -> str:
+    """Read a svg file, and return base64-encoded svg image data."""
     with open(full_path, 'rb') as f:
         data = f.read()
 
-    # Return the base64-encoded data
     return 'data:image/svg+xml;charset=utf-8;base64,' + base64.b64encode(data).decode(
         'utf-8'
     )
@@ -659,7 +693,7 @@ def convert_currency(money: Money, currency: Optional[str] = None, **kwargs):
         )
 
     try:
-        converted = convert_money(money, currency)
+        converted = common.currency.convert_money(money, currency)
     except MissingRate:
         # Re-throw error with more context
         raise ValidationError(
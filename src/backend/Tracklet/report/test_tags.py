@@ -1,6 +1,7 @@
 """Test for custom report tags."""
 
 from decimal import Decimal
+from unittest import mock
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
@@ -18,6 +19,7 @@ from Tracklet.config import get_testfolder_dir
 from Tracklet.unit_test import InvenTreeTestCase
 from part.models import Part  # TODO fix import: PartParameter, PartParameterTemplate
 from part.test_api import PartImageTestMixin
+import report.cache
 from report.templatetags import barcode as barcode_tags
 from report.templatetags import report as report_tags
 
@@ -148,6 +150,47 @@ class ReportTagTest(PartImageTestMixin, InvenTreeTestCase):
         )
         self.assertTrue(img.startswith('data:image/png;charset=utf-8;base64,'))
 
+    def test_asset_cache(self):
+        """Test that encoded images are cached against the image file."""
+        self.debug_mode(False)
+
+        img_path = settings.MEDIA_ROOT.joinpath('part', 'images')
+        img_path.mkdir(parents=True, exist_ok=True)
+        img_file = img_path.joinpath('cached.png')
+
+        Image.new('RGB', (64, 64), color='RED').save(img_file)
+
+        report.cache.clear_report_cache()
+
+        with mock.patch.object(
+            report_tags, 'encode_image_file', wraps=report_tags.encode_image_file
+        ) as encode:
+            img = report_tags.uploaded_image('part/images/cached.png')
+
+            for _idx in range(5):
+                self.assertEqual(
+                    report_tags.uploaded_image('part/images/cached.png'), img
+                )
+
+            self.assertEqual(encode.call_count, 1)
+
+            # A different transform is cached separately
+            report_tags.uploaded_image('part/images/cached.png', width=32)
+            self.assertEqual(encode.call_count, 2)
+
+            # Modifying the file invalidates the cached data
+            Image.new('RGB', (128, 128), color='BLUE').save(img_file)
+
+            self.assertNotEqual(
+                report_tags.uploaded_image('part/images/cached.png'), img
+            )
+            self.assertEqual(encode.call_count, 3)
+
+            # Clearing the cache forces the image to be encoded again
+            report.cache.clear_report_cache()
+            report_tags.uploaded_image('part/images/cached.png')
+            self.assertEqual(encode.call_count, 4)
+
     def test_part_image(self):
         """Unit tests for the 'part_image' tag."""
         with self.assertRaises(TypeError):
@@ -6,8 +6,12 @@ from io import StringIO
 from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
+from django.template.loader import get_template
+from django.test import override_settings
 from django.urls import reverse
 
+from pypdf import PdfReader
+
 import report.models as report_models
 from build.models import Build
 from common.models import Attachment
@@ -299,6 +303,80 @@ class ReportTest(InvenTreeAPITestCase):
         self.assertIsNotNone(output.output)
         self.assertTrue(output.output.name.endswith('.pdf'))
 
+    def test_template_cache(self):
+        """Test that compiled report templates are cached until the template is updated."""
+        template = ReportTemplate.objects.filter(enabled=True).first()
+
+        t1 = get_template(template.template_name)
+        t2 = get_template(template.template_name)
+
+        # The compiled template is re-used
+        self.assertIs(t1.template, t2.template)
+
+        # Saving the template invalidates the compiled template
+        template.save()
+
+        t3 = get_template(template.template_name)
+        self.assertIsNot(t1.template, t3.template)
+
+    def test_report_contexts(self):
+        """Test that report contexts can be generated in bulk, with prefetched data."""
+        for model in [Build, Part, ReturnOrder, SalesOrder, StockItem]:
+            items = list(model.objects.all()[0:5])
+            self.assertGreater(len(items), 0)
+
+            # Check that the declared prefetch lookups are valid
+            contexts = model.report_contexts(items)
+            self.assertEqual(len(contexts), len(items))
+
+        items = list(StockItem.objects.filter(test_results__isnull=False).distinct())
+        self.assertGreater(len(items), 0)
+
+        contexts = StockItem.report_contexts(items)
+
+        for item, context in zip(items, contexts, strict=True):
+            self.assertIn('test_results', item._prefetched_objects_cache)
+            self.assertIs(context['item'], item)
+
+            # Prefetched data matches the data fetched for a single item
+            expected = StockItem.objects.get(pk=item.pk).report_context()
+
+            self.assertEqual(context['results'], expected['results'])
+            self.assertEqual(context['installed_items'], expected['installed_items'])
+            self.assertEqual(context['parameters'], expected['parameters'])
+
+            # No database queries are required to access prefetched test results
+            with self.assertNumQueries(0):
+                item.testResultMap()
+
+    def test_print_parallel(self):
+        """Test that reports can be rendered by a pool of worker processes."""
+        template = ReportTemplate.objects.filter(
+            enabled=True, model_type='stockitem'
+        ).first()
+
+        items = list(StockItem.objects.all()[0:5])
+
+        def page_count(output):
+            with output.output.open('rb') as f:
+                return len(PdfReader(f).pages)
+
+        # Render the reports in this process
+        self.assertFalse(template.use_render_pool(items))
+        n_pages = page_count(template.print(items))
+
+        with override_settings(REPORT_RENDER_WORKERS=2, REPORT_RENDER_CHUNK_SIZE=2):
+            self.assertTrue(template.use_render_pool(items))
+
+            output = template.print(items)
+
+        self.assertTrue(output.complete)
+        self.assertEqual(output.progress, 5)
+        self.assertTrue(output.output.name.endswith('.pdf'))
+
+        # Each report is merged into a single file
+        self.assertEqual(page_count(output), n_pages)
+
 
 class LabelTest(InvenTreeAPITestCase):
     """Unit tests for label templates."""
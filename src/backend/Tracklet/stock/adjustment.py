@@ -0,0 +1,481 @@
+"""Bulk stock adjustments.
+
+The StockAdjustment class applies count / add / remove / move operations to many stock items at once:
+
+- All affected stock items are locked (and their quantities refreshed) before any changes are made
+- Batch code and plugin validation is run for each stock item, before any changes are written
+- Stock items are updated with a single UPDATE query for each distinct set of new values
+- Stock tracking entries are created with a single bulk insert
+- Low stock notifications and pricing updates are triggered once per affected part
+- Consolidated plugin events are triggered once per affected part, alongside the per-item events
+
+Operations which require special handling are passed through to the existing StockItem methods:
+
+- Partial moves (which split the stock item)
+- Removing all stock from an item which is deleted when depleted
+- Changing the status of a stock item
+- Counting a serialized stock item
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+import structlog
+
+import common.search
+import Tracklet.helpers
+import Tracklet.tree
+from common.settings import get_global_setting
+from plugin.events import trigger_event
+from stock.events import StockEvents
+from stock.models import StockItem, StockItemTracking, after_save_stock_item
+from stock.status_codes import StockHistoryCode
+
+logger = structlog.get_logger('inventree')
+
+
+class StockAdjustment:
+    """Apply a set of stock adjustments in bulk.
+
+    Operations are queued with the count / add / remove / move methods,
+    and are then applied (within a single transaction) by calling commit().
+    """
+
+    def __init__(self, user: User | None = None, notes: str = ''):
+        """Initialize the adjustment.
+
+        Arguments:
+            user: The user performing the adjustment
+            notes: Notes for the stock tracking entries
+        """
+        self.user = user
+        self.notes = notes
+
+        # Queued operations: (action, item, quantity, location, fields)
+        self.operations = []
+
+    def count(self, item: StockItem, quantity, **kwargs):
+        """Queue a stocktake (count) of a stock item."""
+        self.operations.append(('count', item, quantity, None, kwargs))
+
+    def add(self, item: StockItem, quantity, **kwargs):
+        """Queue the addition of stock to a stock item."""
+        self.operations.append(('add', item, quantity, None, kwargs))
+
+    def remove(self, item: StockItem, quantity, **kwargs):
+        """Queue the removal of stock from a stock item."""
+        self.operations.append(('remove', item, quantity, None, kwargs))
+
+    def move(self, item: StockItem, location, quantity=None, **kwargs):
+        """Queue a transfer of a stock item (or some of its quantity) to a new location."""
+        self.operations.append(('move', item, quantity, location, kwargs))
+
+    def lock_items(self) -> dict:
+        """Lock the affected stock items, and refresh the stock quantities.
+
+        Returns:
+            A dict of {pk: StockItem}, with a single instance for each affected stock item
+        """
+        instances = {}
+
+        for _action, item, *_args in self.operations:
+            instances.setdefault(item.pk, item)
+
+        # Note: The part is required for each tracking entry
+        locked = {
+            item.pk: item
+            for item in StockItem.objects
+            .select_for_update(of=('self',))
+            .select_related('part')
+            .filter(pk__in=instances.keys())
+            .only('pk', 'quantity', 'part')
+        }
+
+        for pk, item in instances.items():
+            if pk not in locked:
+                raise ValidationError(_('Stock item does not exist') + f': {pk}')
+
+            item.quantity = locked[pk].quantity
+
+            if not StockItem.part.is_cached(item):
+                item.part = locked[pk].part
+
+        return instances
+
+    def commit(self) -> int:
+        """Apply all queued operations.
+
+        Returns:
+            The number of operations which were applied
+        """
+        if not self.operations:
+            return 0
+
+        with transaction.atomic(), Tracklet.tree.deferred_tree_rebuild():
+            n = self.apply()
+
+        return n
+
+    def apply(self) -> int:
+        """Apply all queued operations (must be called within a transaction)."""
+        instances = self.lock_items()
+
+        # New field values for each stock item: {pk: {field: value}}
+        self.values = {}
+
+        # New tracking entries
+        self.tracking = []
+
+        # Stock items which have been adjusted via the StockItem methods
+        self.fallback = set()
+
+        # Items for consolidated plugin events: {(event, part_id): [pk, ...]}
+        self.events = {}
+
+        # Per-item plugin events: [(event, kwargs), ...]
+        self.item_events = []
+
+        n = 0
+
+        for action, item, quantity, location, fields in self.operations:
+            item = instances[item.pk]
+
+            # Extract status information (handled separately)
+            fields = dict(fields)
+            status = fields.pop('status', None) or fields.pop('status_custom_key', None)
+
+            if status is not None and item.compare_status(status):
+                status = None
+
+            if status is not None:
+                fields['status'] = status
+
+            if item.pk in self.fallback or status is not None:
+                self.apply_fallback(action, item, quantity, location, fields)
+                n += 1
+                continue
+
+            func = getattr(self, f'apply_{action}')
+
+            if func(item, quantity, location, fields):
+                n += 1
+
+        self.update_items(instances)
+
+        # Any tracking entries for deleted items are retained, without an item link
+        for entry in self.tracking:
+            if entry.item.pk is None:
+                entry.item = None
+
+        StockItemTracking.objects.bulk_create(self.tracking)
+
+        self.after_update(instances)
+
+        return n
+
+    def apply_fallback(self, action, item, quantity, location, fields) -> bool:
+        """Apply an operation using the (single item) StockItem methods."""
+        self.fallback.add(item.pk)
+
+        notes = self.notes
+
+        if action == 'count':
+            return item.stocktake(quantity, self.user, notes=notes, **fields)
+        elif action == 'add':
+            return item.add_stock(quantity, self.user, notes=notes, **fields)
+        elif action == 'remove':
+            return item.take_stock(quantity, self.user, notes=notes, **fields)
+        elif action == 'move':
+            if quantity is not None:
+                fields['quantity'] = quantity
+
+            return item.move(location, notes, self.user, **fields)
+
+        return False
+
+    def set_fields(self, item: StockItem, fields: dict, deltas: dict):
+        """Set optional field values (e.g. batch or packaging) on a stock item."""
+        for field in StockItem.optional_transfer_fields():
+            if field in fields:
+                setattr(item, field, fields[field])
+                self.values[item.pk][field] = fields[field]
+                deltas[field] = fields[field]
+
+    def add_tracking(self, item: StockItem, code, deltas: dict):
+        """Construct a new tracking entry for a stock item."""
+        self.tracking.append(
+            item.add_tracking_entry(
+                code, self.user, notes=self.notes, deltas=deltas, commit=False
+            )
+        )
+
+    def add_event(self, event, item: StockItem, item_event, **kwargs):
+        """Record a stock item against a consolidated plugin event.
+
+        Arguments:
+            event: The consolidated event (triggered once per part)
+            item: The affected stock item
+            item_event: The per-item event (triggered once per stock item)
+            **kwargs: Additional arguments for the per-item event
+        """
+        self.events.setdefault((event, item.part_id), []).append(item.pk)
+        self.item_events.append((item_event, {'id': item.pk, **kwargs}))
+
+    def is_depleted(self, item: StockItem, quantity: Decimal) -> bool:
+        """Return True if the stock item would be deleted at the provided quantity."""
+        return quantity <= 0 and item.delete_on_deplete and item.can_delete()
+
+    def apply_count(self, item, quantity, location, fields) -> bool:
+        """Count the quantity of a stock item."""
+        try:
+            quantity = Decimal(quantity)
+        except (InvalidOperation, TypeError, ValueError):
+            return False
+
+        if quantity < 0:
+            return False
+
+        if item.serialized or self.is_depleted(item, quantity):
+            return self.apply_fallback('count', item, quantity, location, fields)
+
+        item.quantity = quantity
+        item.stocktake_date = Tracklet.helpers.current_date()
+        item.stocktake_user = self.user
+
+        values = self.values.setdefault(item.pk, {})
+        values['quantity'] = item.quantity
+        values['stocktake_date'] = item.stocktake_date
+        values['stocktake_user_id'] = self.user.pk if self.user else None
+
+        deltas = {'quantity': float(quantity)}
+        self.set_fields(item, fields, deltas)
+
+        self.add_tracking(item, StockHistoryCode.STOCK_COUNT, deltas)
+        self.add_event(
+            StockEvents.ITEMS_COUNTED,
+            item,
+            StockEvents.ITEM_COUNTED,
+            quantity=float(item.quantity),
+        )
+
+        return True
+
+    def apply_add(self, item, quantity, location, fields) -> bool:
+        """Add stock to a stock item."""
+        # Cannot add items to a serialized part
+        if item.serialized:
+            return False
+
+        try:
+            quantity = Decimal(quantity)
+        except (InvalidOperation, TypeError, ValueError):
+            return False
+
+        if quantity <= 0:
+            return False
+
+        item.quantity += quantity
+
+        values = self.values.setdefault(item.pk, {})
+        values['quantity'] = item.quantity
+
+        deltas = {'added': float(quantity), 'quantity': float(item.quantity)}
+        self.set_fields(item, fields, deltas)
+
+        self.add_tracking(item, StockHistoryCode.STOCK_ADD, deltas)
+        self.add_event(
+            StockEvents.ITEMS_QUANTITY_UPDATED,
+            item,
+            StockEvents.ITEM_QUANTITY_UPDATED,
+            quantity=float(item.quantity),
+        )
+
+        return True
+
+    def apply_remove(self, item, quantity, location, fields) -> bool:
+        """Remove stock from a stock item."""
+        # Cannot remove items from a serialized part
+        if item.serialized:
+            return False
+
+        try:
+            quantity = Decimal(quantity)
+        except (InvalidOperation, TypeError, ValueError):
+            return False
+
+        if quantity <= 0:
+            return False
+
+        remaining = max(item.quantity - quantity, Decimal(0))
+
+        if self.is_depleted(item, remaining):
+            return self.apply_fallback('remove', item, quantity, location, fields)
+
+        item.quantity = remaining
+
+        values = self.values.setdefault(item.pk, {})
+        values['quantity'] = item.quantity
+
+        deltas = {'removed': float(quantity), 'quantity': float(item.quantity)}
+        self.set_fields(item, fields, deltas)
+
+        self.add_tracking(item, StockHistoryCode.STOCK_REMOVE, deltas)
+        self.add_event(
+            StockEvents.ITEMS_QUANTITY_UPDATED,
+            item,
+            StockEvents.ITEM_QUANTITY_UPDATED,
+            quantity=float(item.quantity),
+        )
+
+        return True
+
+    def apply_move(self, item, quantity, location, fields) -> bool:
+        """Move a stock item to a new location."""
+        try:
+            quantity = Decimal(item.quantity if quantity is None else quantity)
+        except (InvalidOperation, TypeError, ValueError):
+            return False
+
+        if not self.allow_out_of_stock_transfer and not item.is_in_stock(
+            check_status=False, check_in_production=False
+        ):
+            raise ValidationError(_('StockItem cannot be moved as it is not in stock'))
+
+        if quantity <= 0 or location is None:
+            return False
+
+        if quantity < item.quantity:
+            # Partial move - the stock item must be split
+            return self.apply_fallback('move', item, quantity, location, fields)
+
+        deltas = {'quantity': float(quantity)}
+
+        old_location = item.location_id
+
+        if location.pk == item.location_id:
+            # Moving into the same location triggers a different history code
+            code = StockHistoryCode.STOCK_UPDATE
+        else:
+            code = StockHistoryCode.STOCK_MOVE
+            deltas['location'] = location.pk
+
+        item.location = location
+
+        values = self.values.setdefault(item.pk, {})
+        values['location_id'] = location.pk
+
+        self.set_fields(item, fields, deltas)
+
+        self.add_tracking(item, code, deltas)
+        self.add_event(
+            StockEvents.ITEMS_MOVED,
+            item,
+            StockEvents.ITEM_MOVED,
+            old_location=old_location,
+            new_location=location.pk,
+            quantity=float(quantity),
+        )
+
+        return True
+
+    @property
+    def allow_out_of_stock_transfer(self) -> bool:
+        """Return True if stock items which are not in stock can be transferred."""
+        if not hasattr(self, '_allow_out_of_stock_transfer'):
+            self._allow_out_of_stock_transfer = get_global_setting(
+                'STOCK_ALLOW_OUT_OF_STOCK_TRANSFER', backup_value=False, cache=False
+            )
+
+        return self._allow_out_of_stock_transfer
+
+    def validate_items(self, instances: dict):
+        """Run batch code and plugin validation for each stock item which is to be updated.
+
+        The stock items are written with UPDATE queries (which bypass StockItem.save),
+        so the validation which would otherwise be performed on save is run here.
+
+        Raises:
+            ValidationError: If any of the stock items fail validation
+        """
+        for pk, values in self.values.items():
+            if pk in self.fallback or not values:
+                continue
+
+            item = instances[pk]
+
+            if 'batch' in values:
+                # Strip batch code field (as per StockItem.clean)
+                if type(item.batch) is str:
+                    item.batch = values['batch'] = item.batch.strip()
+
+                item.validate_batch_code()
+
+            item.run_plugin_validation()
+
+    def update_items(self, instances: dict):
+        """Write the new field values to the database.
+
+        Stock items with identical new values are updated with a single query.
+        """
+        self.validate_items(instances)
+
+        groups = {}
+
+        for pk, values in self.values.items():
+            if pk in self.fallback or not values:
+                # Already saved via the StockItem methods
+                continue
+
+            groups.setdefault(tuple(sorted(values.items())), []).append(pk)
+
+        for values, pks in groups.items():
+            StockItem.objects.filter(pk__in=pks).update(**dict(values))
+
+        for pk, values in self.values.items():
+            if pk not in self.fallback:
+                instances[pk].take_field_snapshot(fields=list(values.keys()))
+
+    def after_update(self, instances: dict):
+        """Trigger side effects once for each affected part."""
+        from part.buildability import invalidate_buildability
+
+        updated = [pk for pk in self.values if pk not in self.fallback]
+
+        if not updated:
+            return
+
+        items = [instances[pk] for pk in updated]
+
+        # Low stock notification and pricing update - once per part
+        parts = {}
+
+        for item in items:
+            parts.setdefault(item.part_id, item)
+
+        for item in parts.values():
+            after_save_stock_item(StockItem, item, created=False)
+
+        # No post_save signal is sent, so invalidate any cached 'can build' quantities
+        invalidate_buildability(list(parts.keys()))
+
+        # Location, batch and packaging information is included in the search index
+        common.search.update_index_bulk(StockItem, updated)
+
+        # Consolidated plugin events - once per part
+        for (event, part_id), pks in self.events.items():
+            trigger_event(event, part=part_id, ids=pks)
+
+        # Per-item plugin events - as triggered by the StockItem methods
+        for event, kwargs in self.item_events:
+            trigger_event(event, **kwargs)
+
+        logger.info(
+            'Adjusted %s stock items for %s parts (user=%s)',
+            len(updated),
+            len(parts),
+            self.user,
+        )
@@ -7,6 +7,7 @@ from .models import (
     StockItem,
     StockItemTestResult,
     StockItemTracking,
+    StockItemTrackingArchive,
     StockLocation,
     StockLocationType,
 )
@@ -84,6 +85,15 @@ class StockTrackingAdmin(admin.ModelAdmin):
     autocomplete_fields = ['item']
 
 
+@admin.register(StockItemTrackingArchive)
+class StockTrackingArchiveAdmin(admin.ModelAdmin):
+    """Admin class for archived StockTracking entries."""
+
+    list_display = ('item', 'date', 'archived', 'tracking_type')
+
+    autocomplete_fields = ['item']
+
+
 @admin.register(StockItemTestResult)
 class StockItemTestResultAdmin(admin.ModelAdmin):
     """Admin class for StockItemTestResult."""
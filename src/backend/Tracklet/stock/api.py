@@ -47,6 +47,7 @@ from stock.models import (
     StockLocation,
     StockLocationType,
 )
+from stock.serial_numbers import lock_serial_numbers
 from stock.status_codes import StockHistoryCode, StockStatus
 from Tracklet.api import (
     BulkCreateMixin,
@@ -448,6 +449,9 @@ class StockLocationList(
 
     search_fields = ['name', 'description', 'pathstring', 'tags__name', 'tags__slug']
 
+    # Lightweight field set for global search results
+    search_projection_fields = ['pk', 'name', 'description', 'pathstring', 'parent']
+
     ordering_fields = ['name', 'pathstring', 'items', 'level', 'tree_id', 'lft']
 
     ordering = ['tree_id', 'lft', 'name']
@@ -1150,6 +1154,48 @@ class StockList(
     filterset_class = StockFilter
     output_options = StockOutputOptions
 
+    def get_serial_numbers(self, part, serial_numbers, quantity) -> list:
+        """Extract and validate the provided serial numbers for the given part.
+
+        The serial number namespace for the part should be locked by the caller,
+        so that the returned serial numbers remain available until they are created.
+
+        Raises:
+            ValidationError: If the serial numbers are invalid, or already exist
+        """
+        try:
+            serials = extract_serial_numbers(
+                serial_numbers, quantity, part.get_latest_serial_number(), part=part
+            )
+
+            # Determine if any of the specified serial numbers are invalid
+            # Note "invalid" means either they already exist, or do not pass custom rules
+            invalid = []
+            errors = []
+
+            try:
+                invalid = part.find_conflicting_serial_numbers(serials)
+            except DjangoValidationError as exc:
+                errors.append(exc.message)
+
+            if len(invalid) > 0:
+                msg = _('The following serial numbers already exist or are invalid')
+                msg += ' : '
+                msg += ','.join([str(e) for e in invalid])
+
+                errors.append(msg)
+
+            if len(errors) > 0:
+                raise ValidationError({'serial_numbers': errors})
+
+        except DjangoValidationError as e:
+            raise ValidationError({
+                'quantity': e.messages,
+                'serial_numbers': e.messages,
+            })
+
+        return serials
+
     def create(self, request, *args, **kwargs):
         """Create a new StockItem object via the API.
 
@@ -1256,40 +1302,8 @@ class StockList(
                     ]
                 })
 
-            # If serial numbers are specified, check that they match!
-            try:
-                serials = extract_serial_numbers(
-                    serial_numbers, quantity, part.get_latest_serial_number(), part=part
-                )
-
-                # Determine if any of the specified serial numbers are invalid
-                # Note "invalid" means either they already exist, or do not pass custom rules
-                invalid = []
-                errors = []
-
-                try:
-                    invalid = part.find_conflicting_serial_numbers(serials)
-                except DjangoValidationError as exc:
-                    errors.append(exc.message)
-
-                if len(invalid) > 0:
-                    msg = _('The following serial numbers already exist or are invalid')
-                    msg += ' : '
-                    msg += ','.join([str(e) for e in invalid])
-
-                    errors.append(msg)
-
-                if len(errors) > 0:
-                    raise ValidationError({'serial_numbers': errors})
-
-            except DjangoValidationError as e:
-                raise ValidationError({
-                    'quantity': e.messages,
-                    'serial_numbers': e.messages,
-                })
-
-        if serials is not None:
-            """If the stock item is going to be serialized, set the quantity to 1."""
+            # The stock item is going to be serialized, so set the quantity to 1
+            # Note: The serial numbers are extracted once the namespace is locked (below)
             data['quantity'] = 1
 
         # De-serialize the provided data
@@ -1300,6 +1314,12 @@ class StockList(
         location = serializer.validated_data.get('location', None)
 
         with transaction.atomic():
+            if serial_numbers:
+                # Lock the serial number namespace for the part, so that
+                # concurrent requests cannot allocate the same serial numbers
+                lock_serial_numbers(part)
+                serials = self.get_serial_numbers(part, serial_numbers, quantity)
+
             if serials:
                 # Create multiple serialized StockItem objects
                 items = StockItem._create_serial_numbers(
@@ -1419,6 +1439,18 @@ class StockList(
         'tags__slug',
     ]
 
+    # Lightweight field set for global search results
+    search_projection_fields = [
+        'pk',
+        'title',
+        'part',
+        'quantity',
+        'serial',
+        'batch',
+        'location',
+        'status',
+    ]
+
 
 class StockDetail(StockApiMixin, OutputOptionsMixin, RetrieveUpdateDestroyAPI):
     """API detail endpoint for a single StockItem instance."""
@@ -1727,6 +1759,13 @@ class StockItemTestResultList(
         test_result.user = self.request.user
         test_result.save()
 
+    def perform_bulk_create(self, serializer, instances: list) -> list:
+        """Create multiple test results, capturing the user information."""
+        for instance in instances:
+            instance.user = self.request.user
+
+        return super().perform_bulk_create(serializer, instances)
+
 
 class StockTrackingDetail(RetrieveAPI):
     """Detail API endpoint for StockItemTracking model."""
@@ -1751,7 +1790,38 @@ class StockTrackingFilter(FilterSet):
         """Metaclass options."""
 
         model = StockItemTracking
-        fields = ['item', 'user']
+        fields = ['user']
+
+    include_inherited = rest_filters.BooleanFilter(
+        label=_('Include Inherited'), method='filter_include_inherited'
+    )
+
+    def filter_include_inherited(self, queryset, name, value):
+        """Filter by whether or not to include inherited tracking entries.
+
+        Note:
+        - This filter does nothing by itself, and is only used to modify the behavior of the 'item' filter.
+        - Refer to the 'filter_item' method for more information on how this works.
+        """
+        return queryset
+
+    item = rest_filters.ModelChoiceFilter(
+        label=_('Stock Item'), queryset=StockItem.objects.all(), method='filter_item'
+    )
+
+    def filter_item(self, queryset, name, item):
+        """Filter StockTracking entries by the linked stock item.
+
+        Note:
+        - If the 'include_inherited' filter is set, tracking entries of any ancestor items
+          (up until the item was split from its ancestor) are also included.
+        """
+        include_inherited = str2bool(self.data.get('include_inherited', False))
+
+        if include_inherited:
+            return queryset.filter(item.get_tracking_history_filter())
+        else:
+            return queryset.filter(item=item)
 
     include_variants = rest_filters.BooleanFilter(
         label=_('Include Part Variants'), method='filter_include_variants'
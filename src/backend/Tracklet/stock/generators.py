@@ -10,6 +10,7 @@ from jinja2 import Template
 import common.models
 import Tracklet.exceptions
 import Tracklet.helpers
+from stock.serial_numbers import generate_serial_numbers
 
 
 def generate_batch_code(**kwargs):
@@ -97,20 +98,9 @@ def generate_serial_number(part=None, quantity=1, **kwargs) -> Optional[str]:
 
     # If we are here, no plugins were available to generate a serial number
     # In this case, we will generate a simple serial number based on the provided part
-    sn = part.get_latest_serial_number()
-
-    serials = []
-
-    # Generate the required quantity of serial numbers
-    # Note that this call gets passed through to the plugin system
-    while quantity > 0:
-        sn = Tracklet.helpers.increment_serial_number(sn, part=part)
-
-        # Exit if an empty or duplicated serial is generated
-        if not sn or sn in serials:
-            break
-
-        serials.append(sn)
-        quantity -= 1
+    # Note that each increment gets passed through to the plugin system
+    serials = generate_serial_numbers(
+        part, quantity, start=part.get_latest_serial_number()
+    )
 
     return ','.join(serials)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.11 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [('stock', '0124_seed_stock_categories')]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockitem',
+            index=models.Index(fields=['serial'], name='stock_item_serial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockitem',
+            index=models.Index(
+                fields=['serial_int', 'serial'], name='stock_item_serial_int_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.11 on 2026-10-19 15:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('part', '0147_alter_part_image'),
+        ('stock', '0125_stockitem_serial_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stockitemtracking',
+            index=models.Index(
+                fields=['item', 'date'], name='stock_tracking_item_date_idx'
+            ),
+        ),
+        migrations.CreateModel(
+            name='StockItemTrackingArchive',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('tracking_id', models.IntegerField(unique=True)),
+                ('tracking_type', models.IntegerField(default=0)),
+                ('date', models.DateTimeField()),
+                ('archived', models.DateTimeField(auto_now_add=True)),
+                ('notes', models.CharField(blank=True, max_length=512, null=True)),
+                ('deltas', models.JSONField(blank=True, null=True)),
+                (
+                    'item',
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='archived_tracking_info',
+                        to='stock.stockitem',
+                    ),
+                ),
+                (
+                    'part',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='archived_stock_tracking_info',
+                        to='part.part',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Archived Stock Item Tracking',
+                'indexes': [
+                    models.Index(
+                        fields=['item', 'date'], name='stock_archive_item_date_idx'
+                    ),
+                    models.Index(fields=['date'], name='stock_archive_date_idx'),
+                ],
+            },
+        ),
+    ]
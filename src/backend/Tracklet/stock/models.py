@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 from datetime import timedelta
 from decimal import Decimal, InvalidOperation
+from itertools import pairwise
 
 from django.conf import settings
 from django.contrib.auth.models import User
@@ -20,7 +21,6 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 import structlog
-from djmoney.contrib.exchange.models import convert_money
 from mptt.managers import TreeManager
 from mptt.models import TreeForeignKey
 from taggit.managers import TaggableManager
@@ -29,12 +29,14 @@ import build.models
 import common.models
 import order.models
 import report.mixins
+import stock.serial_numbers
 import stock.tasks
 import Tracklet.exceptions
 import Tracklet.helpers
 import Tracklet.models
 import Tracklet.ready
 import Tracklet.tasks
+from common.currency import convert_money
 from common.icons import validate_icon
 from common.settings import get_global_setting
 from company import models as CompanyModels
@@ -441,6 +443,16 @@ class StockItemReportContext(report.mixins.BaseReportContext):
     test_templates: dict[str, PartModels.PartTestTemplate]
 
 
+# Related data which is prefetched when generating StockItemReportContext for multiple items
+STOCK_ITEM_REPORT_PREFETCH = [
+    'part__category',
+    'part__parameters_list__template',
+    'test_results__template',
+    'installed_parts__part',
+    'installed_parts__test_results__template',
+]
+
+
 class StockItem(
     Tracklet.models.PluginValidationMixin,
     Tracklet.models.InvenTreeAttachmentMixin,
@@ -481,6 +493,9 @@ class StockItem(
 
     STATUS_CLASS = StockStatus
 
+    # Track changes against the values loaded from the database
+    FIELD_SNAPSHOT = True
+
     class Availability(models.TextChoices):
         AVAILABLE = 'AVAILABLE', _('Available')
         RESERVED = 'RESERVED', _('Reserved')
@@ -493,6 +508,12 @@ class StockItem(
         """Model meta options."""
 
         verbose_name = _('Stock Item')
+        indexes = [
+            models.Index(fields=['serial'], name='stock_item_serial_idx'),
+            models.Index(
+                fields=['serial_int', 'serial'], name='stock_item_serial_int_idx'
+            ),
+        ]
 
     class MPTTMeta:
         """MPTT metaclass options."""
@@ -531,6 +552,8 @@ class StockItem(
 
         return list(keys)
 
+    REPORT_PREFETCH = STOCK_ITEM_REPORT_PREFETCH
+
     def report_context(self) -> StockItemReportContext:
         """Generate custom report context data for this StockItem."""
         return {
@@ -595,8 +618,10 @@ class StockItem(
         This method uses bulk_create to create multiple StockItem objects in a single query,
         which is much more efficient than creating them one-by-one.
 
-        However, it does not perform any validation checks on the provided serial numbers,
-        and also does not generate any "stock tracking entries".
+        The serial number namespace for the part is locked while the items are created,
+        and the provided serial numbers are checked against existing stock items (in a single query).
+        However, the serial numbers are not passed through the plugin validation system,
+        and this method also does not generate any "stock tracking entries".
 
         Note: This is an 'internal' function and should not be used by external code / plugins.
         """
@@ -681,8 +706,19 @@ class StockItem(
             # Construct a new StockItem from the provided dict
             items.append(StockItem(**data))
 
-        # Create the StockItem objects in bulk
-        StockItem.objects.bulk_create(items)
+        with transaction.atomic():
+            # Ensure that no other process has created these serial numbers in the meantime
+            stock.serial_numbers.check_serial_numbers(
+                part, [serial for serial in serials if serial is not None]
+            )
+
+            # Create the StockItem objects in bulk
+            StockItem.objects.bulk_create(items)
+
+        # Bulk creation bypasses the signals which invalidate cached buildability results
+        from part.buildability import invalidate_buildability
+
+        invalidate_buildability([part.pk])
 
         # We will need to rebuild the stock item tree manually, due to the bulk_create operation
         if parent and parent.tree_id:
@@ -824,6 +860,12 @@ class StockItem(
         Performs a number of checks:
         - Unique serial number requirement
         - Adds a transaction note when the item is first created.
+
+        Keyword Arguments:
+            user: The user performing the action
+            add_note: If False, no tracking entries are created (default = True)
+            notes: Notes for any created tracking entry
+            check_tracking: If False, existing items are not checked for missing tracking information (default = True)
         """
         self.validate_unique()
         self.clean()
@@ -853,6 +895,10 @@ class StockItem(
 
         notes = kwargs.pop('notes', '')
 
+        check_tracking = kwargs.pop('check_tracking', True)
+
+        created = self._state.adding or not self.pk
+
         if self.pk:
             # StockItem has already been saved
 
@@ -860,7 +906,11 @@ class StockItem(
             # (we wish to record these as historical records)
 
             try:
-                old = StockItem.objects.get(pk=self.pk)
+                old = self.get_db_instance()
+
+                if old is None:
+                    raise StockItem.DoesNotExist
+
                 old_custom_status = old.get_custom_status()
                 custom_status = self.get_custom_status()
 
@@ -898,18 +948,22 @@ class StockItem(
 
         super().save(*args, **kwargs)
 
-        # If user information is provided, and no existing note exists, create one!
-        if add_note and self.tracking_info.count() == 0:
-            tracking_info = {'status': self.status}
+        if not add_note:
+            return
 
-            self.add_tracking_entry(
-                StockHistoryCode.CREATED,
-                user,
-                deltas=tracking_info,
-                notes=notes,
-                location=self.location,
-                quantity=float(self.quantity),
-            )
+        # A newly created item cannot have any tracking information
+        if not created and (not check_tracking or self.tracking_info.exists()):
+            return
+
+        # If no existing note exists, create one!
+        self.add_tracking_entry(
+            StockHistoryCode.CREATED,
+            user,
+            deltas={'status': self.status},
+            notes=notes,
+            location=self.location,
+            quantity=float(self.quantity),
+        )
 
     @property
     def status_label(self):
@@ -1749,7 +1803,8 @@ class StockItem(
         """
         installed = set()
 
-        items = StockItem.objects.filter(belongs_to=self)
+        # Note: This will use pre-fetched data, if available
+        items = self.installed_parts.all()
 
         for item in items:
             # Prevent duplication or recursion
@@ -2124,11 +2179,68 @@ class StockItem(
 
     @transaction.atomic
     def copyHistoryFrom(self, other):
-        """Copy stock history from another StockItem."""
+        """Copy stock history from another StockItem.
+
+        Note that stock items which are split from a parent item do not need to copy
+        the history of the parent item, as this is shared by reference (see get_tracking_history).
+        """
+        entries = []
+
         for item in other.tracking_info.all():
             item.item = self
+            item.part = self.part
             item.pk = None
-            item.save()
+            entries.append(item)
+
+        StockItemTracking.objects.bulk_create(entries)
+
+    def get_tracking_history_filter(self) -> Q:
+        """Return a query filter for the full tracking history of this StockItem.
+
+        The history of a StockItem includes:
+        - Tracking entries which are directly linked to this StockItem
+        - Tracking entries of any ancestor items, up until this item (or its ancestor) was split from it
+
+        In this way, the history of a parent item is shared with any child items
+        (e.g. items which are split from the parent) without duplicating any tracking entries.
+        """
+        query = Q(item=self)
+
+        if not self.parent_id:
+            return query
+
+        # Ancestor items, from the immediate parent up to the root item
+        chain = [self, *self.get_ancestors(ascending=True)]
+
+        # The first tracking entry for each item marks the point at which it was split from its parent
+        # Note: These entries are never archived (refer to stock.tasks.exclude_first_tracking_entries)
+        created = dict(
+            StockItemTracking.objects
+            .filter(item__in=chain[:-1])
+            .order_by()
+            .values('item')
+            .annotate(first=models.Min('date'))
+            .values_list('item', 'first')
+        )
+
+        for child, ancestor in pairwise(chain):
+            if child.pk not in created:
+                # Cannot determine when the child item was created
+                break
+
+            query |= Q(item=ancestor, date__lte=created[child.pk])
+
+        return query
+
+    def get_tracking_history(self, inherited: bool = True) -> QuerySet:
+        """Return the tracking history for this StockItem.
+
+        Arguments:
+            inherited: If True, include tracking entries inherited from any ancestor items
+        """
+        query = self.get_tracking_history_filter() if inherited else Q(item=self)
+
+        return StockItemTracking.objects.filter(query)
 
     @transaction.atomic
     def copyTestResultsFrom(self, other: StockItem, filters: dict | None = None):
@@ -2378,8 +2490,8 @@ class StockItem(
     def splitStock(self, quantity, location=None, user=None, **kwargs):
         """Split this stock item into two items, in the same location.
 
-        Stock tracking notes for this StockItem will be duplicated,
-        and added to the new StockItem.
+        Stock tracking notes for this StockItem are not duplicated,
+        but are shared with the new StockItem (refer to get_tracking_history).
 
         Args:
             quantity: Number of stock items to remove from this entity, and pass to the next
@@ -2651,6 +2763,102 @@ class StockItem(
 
         return True
 
+    @transaction.atomic
+    def fast_update(
+        self,
+        user: User | None = None,
+        quantity: Decimal | None = None,
+        location: StockLocation | None = None,
+        code: StockHistoryCode = StockHistoryCode.STOCK_UPDATE,
+        notes: str = '',
+        deltas: dict | None = None,
+    ) -> bool:
+        """Update the quantity and / or location of this StockItem, with minimal overhead.
+
+        This writes a single UPDATE query, and a single tracking entry.
+        Unlike save(), full model validation, plugin validation and the
+        post_save signal handlers are *not* run. The side effects of a stock
+        change (low stock notification, pricing update, plugin event) are still triggered.
+
+        Arguments:
+            user: The user performing the action
+            quantity: The new quantity of the item (optional)
+            location: The new location of the item (optional)
+            code: The stock history code for the tracking entry
+            notes: Optional notes for the tracking entry
+            deltas: Additional tracking information
+
+        Returns:
+            True if the item was updated, otherwise False
+        """
+        from part.buildability import invalidate_buildability
+
+        if not self.pk:
+            return False
+
+        values = {}
+        deltas = dict(deltas or {})
+
+        if quantity is not None:
+            # Do not adjust quantity of a serialized part
+            if self.serialized:
+                return False
+
+            try:
+                quantity = max(Decimal(quantity), Decimal(0))
+            except (InvalidOperation, TypeError, ValueError):
+                return False
+
+            values['quantity'] = quantity
+            deltas['quantity'] = float(quantity)
+
+        if location is not None:
+            if location.structural:
+                raise ValidationError({
+                    'location': _(
+                        'Stock items cannot be located into structural stock locations!'
+                    )
+                })
+
+            values['location'] = location
+            deltas['location'] = location.pk
+
+        if not values:
+            return False
+
+        old_location = self.location_id
+
+        StockItem.objects.filter(pk=self.pk).update(**values)
+
+        for field, value in values.items():
+            setattr(self, field, value)
+
+        self.take_field_snapshot(fields=list(values.keys()))
+
+        self.add_tracking_entry(code, user, notes=notes, deltas=deltas)
+
+        after_save_stock_item(StockItem, self, created=False)
+
+        # No post_save signal is sent, so invalidate any cached 'can build' quantities
+        invalidate_buildability([self.part_id])
+
+        if location is not None and location.pk != old_location:
+            trigger_event(
+                StockEvents.ITEM_MOVED,
+                id=self.pk,
+                old_location=old_location,
+                new_location=location.pk,
+                quantity=float(self.quantity),
+            )
+        elif quantity is not None:
+            trigger_event(
+                StockEvents.ITEM_QUANTITY_UPDATED,
+                id=self.pk,
+                quantity=float(self.quantity),
+            )
+
+        return True
+
     @transaction.atomic
     def stocktake(self, count, user, **kwargs):
         """Perform item stocktake.
@@ -2907,7 +3115,13 @@ class StockItem(
 
         # Filter results by "date", so that newer results
         # will override older ones.
-        results = self.getTestResults(**kwargs).order_by('date')
+        if not kwargs and 'test_results' in getattr(
+            self, '_prefetched_objects_cache', {}
+        ):
+            # Use pre-fetched test results (e.g. when generating multiple reports)
+            results = sorted(self.test_results.all(), key=lambda result: result.date)
+        else:
+            results = self.getTestResults(**kwargs).order_by('date')
 
         result_map = {}
 
@@ -3043,6 +3257,9 @@ class StockItemTracking(Tracklet.models.InvenTreeModel):
         """Meta data for the StockItemTracking class."""
 
         verbose_name = _('Stock Item Tracking')
+        indexes = [
+            models.Index(fields=['item', 'date'], name='stock_tracking_item_date_idx')
+        ]
 
     @staticmethod
     def get_api_url():
@@ -3100,6 +3317,78 @@ class StockItemTracking(Tracklet.models.InvenTreeModel):
     deltas = models.JSONField(null=True, blank=True)
 
 
+class StockItemTrackingArchive(models.Model):
+    """Archived stock tracking entry.
+
+    Old StockItemTracking entries are moved into this table (rather than being deleted),
+    if the STOCK_TRACKING_ARCHIVE_OLD_ENTRIES setting is enabled.
+    This keeps the "live" tracking table small, while retaining the full history.
+
+    Attributes:
+        tracking_id: The primary key of the original StockItemTracking entry
+        item: ForeignKey reference to a particular StockItem
+        part: ForeignKey reference to the Part associated with this StockItem
+        date: Date that the original tracking info was created
+        archived: Date that this entry was archived
+        tracking_type: The type of tracking information
+        notes: Associated notes (input by user)
+        user: The user associated with this tracking info
+        deltas: The changes associated with this history item
+    """
+
+    class Meta:
+        """Meta data for the StockItemTrackingArchive class."""
+
+        verbose_name = _('Archived Stock Item Tracking')
+        indexes = [
+            models.Index(fields=['item', 'date'], name='stock_archive_item_date_idx'),
+            models.Index(fields=['date'], name='stock_archive_date_idx'),
+        ]
+
+    # Fields which are copied from the original StockItemTracking entry
+    TRACKING_FIELDS = [
+        'tracking_type',
+        'item_id',
+        'part_id',
+        'date',
+        'notes',
+        'user_id',
+        'deltas',
+    ]
+
+    tracking_id = models.IntegerField(unique=True)
+
+    tracking_type = models.IntegerField(default=StockHistoryCode.LEGACY)
+
+    item = models.ForeignKey(
+        StockItem,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=False,
+        related_name='archived_tracking_info',
+    )
+
+    part = models.ForeignKey(
+        'part.part',
+        on_delete=models.CASCADE,
+        related_name='archived_stock_tracking_info',
+        null=True,
+        blank=True,
+    )
+
+    date = models.DateTimeField()
+
+    archived = models.DateTimeField(auto_now_add=True, editable=False)
+
+    notes = models.CharField(blank=True, null=True, max_length=512)
+
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, blank=True, null=True, related_name='+'
+    )
+
+    deltas = models.JSONField(null=True, blank=True)
+
+
 def rename_stock_item_test_result_attachment(instance, filename):
     """Rename test result."""
     return os.path.join(
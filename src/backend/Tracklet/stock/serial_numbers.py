@@ -0,0 +1,234 @@
+"""Serial number validation and allocation for serialized stock items.
+
+Serial numbers are validated for an entire batch at once:
+- Duplicate serial numbers are found with a single (indexed) database query
+- Validation plugins are invoked once per batch, if they support batch validation
+
+Serial numbers must be unique across a "namespace" - either the part variant tree,
+or the entire database (if SERIAL_NUMBER_GLOBALLY_UNIQUE is set).
+
+To prevent concurrent requests from allocating the same serial numbers,
+each namespace is locked (with SELECT ... FOR UPDATE) for the remainder of the
+enclosing transaction, before serial numbers are allocated or created.
+"""
+
+import inspect
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+import structlog
+
+import Tracklet.exceptions
+import Tracklet.helpers
+from common.settings import get_global_setting
+
+logger = structlog.get_logger('inventree')
+
+# Maximum number of serial numbers to check in a single database query
+SERIAL_QUERY_CHUNK_SIZE = 500
+
+
+def get_serial_number_queryset(part):
+    """Return a queryset of all StockItem objects which share a serial number namespace with the provided part."""
+    from stock.models import StockItem
+
+    items = StockItem.objects.all()
+
+    if not get_global_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False):
+        # Serial number must only be unique across this part "tree"
+        items = items.filter(part__tree_id=part.tree_id)
+
+    return items
+
+
+def lock_serial_numbers(part) -> None:
+    """Lock the serial number namespace for the provided part.
+
+    The lock is held until the end of the enclosing transaction.
+    If there is no enclosing transaction, no lock is acquired.
+
+    The root part of the variant tree is used as the lock object,
+    or the first root part (by ID) if serial numbers are globally unique.
+    """
+    from part.models import Part
+
+    if not transaction.get_connection().in_atomic_block:
+        return
+
+    parts = Part.objects.filter(level=0)
+
+    if not get_global_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False):
+        parts = parts.filter(tree_id=part.tree_id)
+
+    list(parts.order_by('pk').select_for_update().values_list('pk', flat=True)[:1])
+
+
+def find_existing_serial_numbers(part, serials: list, stock_item=None) -> set[str]:
+    """Return the subset of the provided serial numbers which already exist in the database.
+
+    Arguments:
+        part: The Part instance which the serial numbers are assigned to
+        serials: List of proposed serial numbers
+        stock_item: (optional) A StockItem instance to exclude from the query
+    """
+    serials = list({str(serial).strip() for serial in serials})
+
+    items = get_serial_number_queryset(part)
+
+    if stock_item:
+        items = items.exclude(pk=stock_item.pk)
+
+    existing = set()
+
+    for idx in range(0, len(serials), SERIAL_QUERY_CHUNK_SIZE):
+        existing.update(
+            items
+            .filter(serial__in=serials[idx : idx + SERIAL_QUERY_CHUNK_SIZE])
+            .order_by()
+            .values_list('serial', flat=True)
+        )
+
+    return existing
+
+
+def run_serial_number_validator(plugin, serial: str, part, stock_item=None):
+    """Pass a single serial number to the 'validate_serial_number' method of a plugin.
+
+    Returns:
+        The result of the plugin method (None or True)
+
+    Raises:
+        ValidationError: If the plugin rejects the serial number
+    """
+    if not hasattr(plugin, 'validate_serial_number'):
+        return None
+
+    signature = inspect.signature(plugin.validate_serial_number)
+
+    if 'stock_item' in signature.parameters:
+        # 2024-08-21: New method signature accepts a 'stock_item' parameter
+        return plugin.validate_serial_number(serial, part, stock_item=stock_item)
+
+    # Old method signature - does not accept a 'stock_item' parameter
+    return plugin.validate_serial_number(serial, part)
+
+
+def find_invalid_serial_numbers(part, serials: list) -> set[str]:
+    """Run the provided serial numbers through the loaded validation plugins.
+
+    Plugins which implement the 'validate_serial_numbers' method are passed the entire batch,
+    otherwise each serial number is passed to the 'validate_serial_number' method.
+
+    Returns:
+        The subset of serial numbers which were rejected by a plugin
+    """
+    from plugin import PluginMixinEnum, registry
+
+    invalid = set()
+
+    # Serial numbers which have not yet been accepted or rejected
+    pending = [str(serial).strip() for serial in serials]
+
+    for plugin in registry.with_mixin(PluginMixinEnum.VALIDATION):
+        if not pending:
+            break
+
+        try:
+            rejected = plugin.validate_serial_numbers(pending, part)
+        except Exception:
+            Tracklet.exceptions.log_error('validate_serial_numbers', plugin=plugin.slug)
+            rejected = None
+
+        if rejected is not None:
+            # The plugin has validated the entire batch
+            rejected = {str(serial).strip() for serial in rejected}
+            invalid.update(rejected)
+            pending = [serial for serial in pending if serial not in rejected]
+            continue
+
+        # Fall back to validating each serial number individually
+        remaining = []
+
+        for serial in pending:
+            try:
+                result = run_serial_number_validator(plugin, serial, part)
+            except ValidationError:
+                invalid.add(serial)
+                continue
+            except Exception:
+                Tracklet.exceptions.log_error(
+                    'validate_serial_number', plugin=plugin.slug
+                )
+                result = None
+
+            # If the plugin returns 'True' we skip any subsequent validation
+            if result is not True:
+                remaining.append(serial)
+
+        pending = remaining
+
+    return invalid
+
+
+def find_conflicting_serial_numbers(part, serials: list) -> list:
+    """For a provided list of serials, return a list of those which are conflicting.
+
+    A serial number is conflicting if it already exists, or is rejected by a validation plugin.
+    """
+    conflicts = find_existing_serial_numbers(part, serials)
+
+    # Only pass the remaining serial numbers through the plugin system
+    remaining = [serial for serial in serials if str(serial).strip() not in conflicts]
+
+    conflicts.update(find_invalid_serial_numbers(part, remaining))
+
+    return [serial for serial in serials if str(serial).strip() in conflicts]
+
+
+def check_serial_numbers(part, serials: list) -> None:
+    """Check that the provided serial numbers are (still) available for the provided part.
+
+    The serial number namespace is locked first, so that the check remains valid
+    until the enclosing transaction is complete.
+
+    Raises:
+        ValidationError: If any of the serial numbers already exist
+    """
+    lock_serial_numbers(part)
+
+    if existing := find_existing_serial_numbers(part, serials):
+        raise ValidationError({
+            'serial_numbers': _('Serial numbers already exist')
+            + ': '
+            + ','.join(sorted(existing))
+        })
+
+
+def generate_serial_numbers(part, quantity: int, start=None) -> list[str]:
+    """Generate sequential serial numbers for the provided part.
+
+    Generation stops early if an empty or duplicated serial number is generated.
+
+    Arguments:
+        part: The Part instance to generate serial numbers for
+        quantity: The number of serial numbers to generate
+        start: The serial number which precedes the generated sequence (or None)
+    """
+    serial = start
+    serials = []
+    generated = set()
+
+    while len(serials) < quantity:
+        # Note that this call gets passed through to the plugin system
+        serial = Tracklet.helpers.increment_serial_number(serial, part=part)
+
+        # Exit if an empty or duplicated serial is generated
+        if not serial or serial in generated:
+            break
+
+        serials.append(serial)
+        generated.add(serial)
+
+    return serials
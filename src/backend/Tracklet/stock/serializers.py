@@ -40,6 +40,7 @@ from Tracklet.serializers import (
 )
 from users.serializers import UserSerializer
 
+from .adjustment import StockAdjustment
 from .models import (
     StockCategory,
     StockItem,
@@ -211,6 +212,7 @@ class StockCategorySerializer(Tracklet.serializers.InvenTreeModelSerializer):
 
 @register_importer()
 class StockItemTestResultSerializer(
+    Tracklet.serializers.BulkCreateSerializerMixin,
     Tracklet.serializers.FilterableSerializerMixin,
     DataImportExportSerializerMixin,
     Tracklet.serializers.InvenTreeModelSerializer,
@@ -244,7 +246,7 @@ class StockItemTestResultSerializer(
         prefetch_fields=['user'],
     )
 
-    template = serializers.PrimaryKeyRelatedField(
+    template = Tracklet.serializers.BulkPrimaryKeyRelatedField(
         queryset=part_models.PartTestTemplate.objects.all(),
         many=False,
         required=False,
@@ -1759,19 +1761,22 @@ class StockCountSerializer(StockAdjustmentSerializer):
         items = data['items']
         notes = data.get('notes', '')
 
-        with transaction.atomic():
-            for item in items:
-                stock_item = item['pk']
-                quantity = item['quantity']
+        adjustment = StockAdjustment(request.user, notes=notes)
 
-                # Optional fields
-                extra = {}
+        for item in items:
+            stock_item = item['pk']
+            quantity = item['quantity']
 
-                for field_name in StockItem.optional_transfer_fields():
-                    if field_value := item.get(field_name, None):
-                        extra[field_name] = field_value
+            # Optional fields
+            extra = {}
+
+            for field_name in StockItem.optional_transfer_fields():
+                if field_value := item.get(field_name, None):
+                    extra[field_name] = field_value
 
-                stock_item.stocktake(quantity, request.user, notes=notes, **extra)
+            adjustment.count(stock_item, quantity, **extra)
+
+        adjustment.commit()
 
 
 class StockAddSerializer(StockAdjustmentSerializer):
@@ -1784,23 +1789,26 @@ class StockAddSerializer(StockAdjustmentSerializer):
         data = self.validated_data
         notes = data.get('notes', '')
 
-        with transaction.atomic():
-            for item in data['items']:
-                stock_item = item['pk']
-                quantity = item['quantity']
+        adjustment = StockAdjustment(request.user, notes=notes)
 
-                if quantity is None or quantity <= 0:
-                    # Ignore in this case - no stock to add
-                    continue
+        for item in data['items']:
+            stock_item = item['pk']
+            quantity = item['quantity']
 
-                # Optional fields
-                extra = {}
+            if quantity is None or quantity <= 0:
+                # Ignore in this case - no stock to add
+                continue
 
-                for field_name in StockItem.optional_transfer_fields():
-                    if field_value := item.get(field_name, None):
-                        extra[field_name] = field_value
+            # Optional fields
+            extra = {}
+
+            for field_name in StockItem.optional_transfer_fields():
+                if field_value := item.get(field_name, None):
+                    extra[field_name] = field_value
 
-                stock_item.add_stock(quantity, request.user, notes=notes, **extra)
+            adjustment.add(stock_item, quantity, **extra)
+
+        adjustment.commit()
 
 
 class StockRemoveSerializer(StockAdjustmentSerializer):
@@ -1813,23 +1821,26 @@ class StockRemoveSerializer(StockAdjustmentSerializer):
         data = self.validated_data
         notes = data.get('notes', '')
 
-        with transaction.atomic():
-            for item in data['items']:
-                stock_item = item['pk']
-                quantity = item['quantity']
+        adjustment = StockAdjustment(request.user, notes=notes)
 
-                # Ignore in this case - no stock to remove
-                if quantity is None or quantity <= 0:
-                    continue
+        for item in data['items']:
+            stock_item = item['pk']
+            quantity = item['quantity']
 
-                # Optional fields
-                extra = {}
+            # Ignore in this case - no stock to remove
+            if quantity is None or quantity <= 0:
+                continue
 
-                for field_name in StockItem.optional_transfer_fields():
-                    if field_value := item.get(field_name, None):
-                        extra[field_name] = field_value
+            # Optional fields
+            extra = {}
+
+            for field_name in StockItem.optional_transfer_fields():
+                if field_value := item.get(field_name, None):
+                    extra[field_name] = field_value
+
+            adjustment.remove(stock_item, quantity, **extra)
 
-                stock_item.take_stock(quantity, request.user, notes=notes, **extra)
+        adjustment.commit()
 
 
 class StockTransferSerializer(StockAdjustmentSerializer):
@@ -1861,22 +1872,24 @@ class StockTransferSerializer(StockAdjustmentSerializer):
         notes = data.get('notes', '')
         location = data['location']
 
-        with transaction.atomic():
-            for item in items:
-                # Required fields
-                stock_item = item['pk']
-                quantity = item['quantity']
+        # Partial transfers split the stock items - each tree is rebuilt only once
+        adjustment = StockAdjustment(request.user, notes=notes)
 
-                # Optional fields
-                kwargs = {}
+        for item in items:
+            # Required fields
+            stock_item = item['pk']
+            quantity = item['quantity']
 
-                for field_name in StockItem.optional_transfer_fields():
-                    if field_value := item.get(field_name, None):
-                        kwargs[field_name] = field_value
+            # Optional fields
+            kwargs = {}
 
-                stock_item.move(
-                    location, notes, request.user, quantity=quantity, **kwargs
-                )
+            for field_name in StockItem.optional_transfer_fields():
+                if field_value := item.get(field_name, None):
+                    kwargs[field_name] = field_value
+
+            adjustment.move(stock_item, location, quantity=quantity, **kwargs)
+
+        adjustment.commit()
 
 
 class StockReturnSerializer(StockAdjustmentSerializer):
@@ -45,11 +45,16 @@ def rebuild_stock_item_tree(tree_id: int, rebuild_on_fail: bool = True) -> bool:
         bool: True if the partial tree rebuild was successful, False otherwise.
 
     - If the rebuild fails, schedule a rebuild of the entire StockItem tree.
+    - If tree rebuilds are currently deferred, the tree is marked for a later rebuild.
     """
     from Tracklet.exceptions import log_error
     from Tracklet.sentry import report_exception
+    from Tracklet.tree import mark_tree_dirty
     from stock.models import StockItem
 
+    if tree_id and mark_tree_dirty(StockItem, tree_id):
+        return True
+
     if tree_id:
         try:
             StockItem.objects.partial_rebuild(tree_id)
@@ -71,10 +76,81 @@ def rebuild_stock_item_tree(tree_id: int, rebuild_on_fail: bool = True) -> bool:
         return True
 
 
+def exclude_first_tracking_entries(queryset):
+    """Exclude the first tracking entry for each stock item from the provided queryset.
+
+    The first tracking entry for a stock item marks the point at which it was created
+    (or split from its parent item), and is required to determine which entries it
+    inherits from its ancestors - refer to StockItem.get_tracking_history_filter.
+
+    Entries which are not linked to a stock item are not excluded.
+    """
+    from django.db.models import Exists, OuterRef, Q
+
+    from stock.models import StockItemTracking
+
+    earlier = StockItemTracking.objects.filter(item=OuterRef('item')).filter(
+        Q(date__lt=OuterRef('date')) | Q(date=OuterRef('date'), pk__lt=OuterRef('pk'))
+    )
+
+    return queryset.filter(Q(item=None) | Exists(earlier))
+
+
+def archive_stock_tracking(queryset, chunk_size: int = 1000) -> int:
+    """Move the provided stock tracking entries into the archive table.
+
+    Entries are archived in chunks (ordered by date),
+    with each chunk being copied and deleted within a single transaction.
+
+    Returns:
+        The number of archived entries
+    """
+    from django.db import transaction
+
+    from stock.models import StockItemTracking, StockItemTrackingArchive
+
+    fields = StockItemTrackingArchive.TRACKING_FIELDS
+
+    n = 0
+
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                queryset.order_by('date', 'pk').values('pk', *fields)[:chunk_size]
+            )
+
+            if not chunk:
+                break
+
+            StockItemTrackingArchive.objects.bulk_create(
+                [
+                    StockItemTrackingArchive(
+                        tracking_id=row['pk'], **{f: row[f] for f in fields}
+                    )
+                    for row in chunk
+                ],
+                ignore_conflicts=True,
+            )
+
+            StockItemTracking.objects.filter(
+                pk__in=[row['pk'] for row in chunk]
+            ).delete()
+
+        n += len(chunk)
+
+    return n
+
+
 @tracer.start_as_current_span('delete_old_stock_tracking')
 @scheduled_task(ScheduledTask.DAILY)
 def delete_old_stock_tracking():
-    """Remove old stock tracking entries before a certain date."""
+    """Remove old stock tracking entries before a certain date.
+
+    If the STOCK_TRACKING_ARCHIVE_OLD_ENTRIES setting is enabled,
+    the old entries are moved to the archive table instead.
+
+    The first tracking entry for each stock item is always retained.
+    """
     from stock.models import StockItemTracking
 
     if not get_global_setting('STOCK_TRACKING_DELETE_OLD_ENTRIES', False):
@@ -84,9 +160,17 @@ def delete_old_stock_tracking():
 
     threshold = datetime.now() - timedelta(days=delete_n_days)
 
-    old_entries = StockItemTracking.objects.filter(date__lte=threshold)
+    old_entries = exclude_first_tracking_entries(
+        StockItemTracking.objects.filter(date__lte=threshold)
+    )
+
+    if not old_entries.exists():
+        return
 
-    if old_entries.exists():
+    if get_global_setting('STOCK_TRACKING_ARCHIVE_OLD_ENTRIES', False):
+        n = archive_stock_tracking(old_entries)
+        logger.info('Archived old stock tracking entries', count=n, threshold=threshold)
+    else:
         logger.info(
             'Deleting old stock tracking entries',
             count=old_entries.count(),
@@ -7,6 +7,8 @@ from enum import IntEnum
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import pytest
@@ -2285,7 +2287,20 @@ class StockTestResultTest(StockAPITestCase):
             for item in stock_items
         ]
 
-        data = self.post(url, data=test_data, expected_code=201).data
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.post(url, data=test_data, expected_code=201).data
+
+        # Test results are inserted with a single query (where supported)
+        table = StockItemTestResult._meta.db_table
+
+        inserts = [
+            q
+            for q in ctx.captured_queries
+            if q['sql'].startswith('INSERT INTO') and table in q['sql']
+        ]
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            self.assertEqual(len(inserts), 1)
 
         self.assertEqual(len(data), 10)
         self.assertEqual(test_template.test_results.count(), N + 10)
@@ -2294,6 +2309,14 @@ class StockTestResultTest(StockAPITestCase):
             item_id = item['stock_item']
             self.assertEqual(item['template'], test_template.pk)
             self.assertEqual(item['value'], f'Test value: {item_id}')
+            self.assertEqual(item['user'], self.user.pk)
+
+        # Invalid stock item reference
+        test_data[3]['stock_item'] = 999999
+
+        response = self.post(url, data=test_data, expected_code=400)
+        self.assertIn('stock_item', response.data[3])
+        self.assertEqual(test_template.test_results.count(), N + 10)
 
     def test_post_bitmap(self):
         """2021-08-25.
@@ -1,19 +1,24 @@
 """Tests for stock app."""
 
 import datetime
+from unittest import mock
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.models import Sum
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from djmoney.money import Money
 
+import Tracklet.tree
 from build.models import Build
 from common.models import InvenTreeSetting
 from company.models import Company
 from Tracklet.unit_test import AdminTestCase, InvenTreeTestCase
 from order.models import SalesOrder
 from part.models import Part, PartTestTemplate
+from stock.events import StockEvents
 from stock.status_codes import StockHistoryCode, StockStatus
 
 from .models import (
@@ -346,6 +351,87 @@ class StockTest(StockTestBase):
         stock.splitStock(stock.quantity, None, self.user)
         self.assertEqual(StockItem.objects.filter(part=3).count(), n + 1)
 
+    def test_split_stock_history(self):
+        """Test that stock history is shared with split items."""
+        stock = StockItem.objects.get(id=1234)
+        stock.take_stock(10, self.user, notes='Before split')
+
+        shared = set(stock.tracking_info.values_list('pk', flat=True))
+        self.assertGreater(len(shared), 0)
+
+        child = stock.splitStock(100, None, self.user)
+
+        # History entries are not copied to the new items
+        self.assertEqual(
+            child.tracking_info.get().tracking_type,
+            StockHistoryCode.SPLIT_FROM_PARENT.value,
+        )
+
+        grandchild = child.splitStock(10, None, self.user)
+
+        self.assertEqual(grandchild.tracking_info.count(), 1)
+        self.assertEqual(grandchild.get_tracking_history(inherited=False).count(), 1)
+
+        # But the history of the parent item is shared with the new items
+        for item in [child, grandchild]:
+            history = set(item.get_tracking_history().values_list('pk', flat=True))
+            self.assertTrue(shared.issubset(history))
+
+        # Entries created after the split are not shared
+        stock.take_stock(5, self.user, notes='After split')
+        entry = stock.tracking_info.latest('id')
+
+        for item in [child, grandchild]:
+            self.assertFalse(item.get_tracking_history().filter(pk=entry.pk).exists())
+
+    def test_archive_tracking(self):
+        """Test that old stock tracking entries can be archived."""
+        from stock.models import StockItemTrackingArchive
+        from stock.tasks import delete_old_stock_tracking
+
+        item = StockItem.objects.get(pk=1234)
+
+        for idx in range(5):
+            item.add_tracking_entry(StockHistoryCode.LEGACY, self.user, notes=str(idx))
+
+        old_date = datetime.datetime.now() - datetime.timedelta(days=500)
+        item.tracking_info.all().update(date=old_date)
+
+        N = item.tracking_info.count()
+        self.assertGreaterEqual(N, 5)
+
+        first = item.tracking_info.order_by('date', 'pk').first()
+
+        InvenTreeSetting.set_setting('STOCK_TRACKING_DELETE_OLD_ENTRIES', True)
+        InvenTreeSetting.set_setting('STOCK_TRACKING_ARCHIVE_OLD_ENTRIES', True)
+
+        delete_old_stock_tracking()
+
+        # The old entries have been moved to the archive table
+        # Note: The first entry for the item is retained
+        self.assertEqual(
+            list(item.tracking_info.values_list('pk', flat=True)), [first.pk]
+        )
+        self.assertEqual(item.archived_tracking_info.count(), N - 1)
+
+        archived = StockItemTrackingArchive.objects.filter(item=item)
+        self.assertFalse(archived.filter(tracking_id=first.pk).exists())
+        self.assertEqual(archived.filter(notes='4').count(), 1)
+
+        # The inherited history of a split item is still determined correctly
+        child = item.splitStock(1, None, self.user)
+        child.add_tracking_entry(StockHistoryCode.LEGACY, self.user, notes='child')
+
+        old_date = datetime.datetime.now() - datetime.timedelta(days=400)
+        child.tracking_info.all().update(date=old_date)
+
+        delete_old_stock_tracking()
+
+        self.assertEqual(
+            child.tracking_info.get().tracking_type, StockHistoryCode.SPLIT_FROM_PARENT
+        )
+        self.assertTrue(child.get_tracking_history().filter(pk=first.pk).exists())
+
     def test_stocktake(self):
         """Test stocktake function."""
         # Perform stocktake
@@ -534,6 +620,194 @@ class StockTest(StockTestBase):
         with self.assertRaises(StockItem.DoesNotExist):
             w2 = StockItem.objects.get(pk=101)
 
+    def test_field_snapshot(self):
+        """Test that field changes are tracked against the values loaded from the database."""
+        item = StockItem.objects.get(pk=2)
+
+        # The loaded instance is available without another query
+        with self.assertNumQueries(0):
+            self.assertIsNone(item.get_field_deltas().get('quantity'))
+            db_instance = item.get_db_instance()
+
+        self.assertEqual(db_instance.pk, item.pk)
+
+        item.quantity = 999
+        item.status = StockStatus.DAMAGED.value
+
+        deltas = item.get_field_deltas()
+        self.assertEqual(deltas['quantity']['new'], 999)
+        self.assertEqual(deltas['status']['new'], StockStatus.DAMAGED.value)
+
+        item.save()
+
+        # Change of status is recorded in the tracking history
+        track = StockItemTracking.objects.filter(item=item).latest('id')
+        self.assertEqual(track.tracking_type, StockHistoryCode.EDITED)
+        self.assertEqual(track.deltas['status'], StockStatus.DAMAGED.value)
+
+        # The snapshot has been updated after saving
+        self.assertEqual(item.get_field_deltas(), {})
+
+        # Mutable values are not copied into the snapshot when the item is loaded
+        item.metadata = {'color': 'red'}
+        item.save()
+
+        item = StockItem.objects.get(pk=2)
+        self.assertNotIn('metadata', item._field_snapshot)
+
+        # But in-place edits are still detected (with a single query)
+        item.metadata['color'] = 'blue'
+
+        with self.assertNumQueries(1):
+            deltas = item.get_field_deltas()
+
+        self.assertEqual(deltas['metadata']['old'], {'color': 'red'})
+        self.assertEqual(deltas['metadata']['new'], {'color': 'blue'})
+
+    def test_check_tracking(self):
+        """Test that the tracking probe can be skipped for existing items."""
+        item = StockItem.objects.get(pk=2)
+        item.tracking_info.all().delete()
+
+        item.save(check_tracking=False)
+        self.assertEqual(item.tracking_info.count(), 0)
+
+        item.save()
+        self.assertEqual(item.tracking_info.count(), 1)
+
+    def test_fast_update(self):
+        """Test the 'fast_update' method."""
+        item = StockItem.objects.get(pk=2)
+        n_tracking = item.tracking_info.count()
+
+        self.assertFalse(item.fast_update(None))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(item.fast_update(None, quantity=50, location=self.drawer1))
+
+        # A single UPDATE query is used to adjust the item
+        updates = [
+            q['sql']
+            for q in queries.captured_queries
+            if q['sql'].startswith('UPDATE') and 'stock_stockitem"' in q['sql']
+        ]
+
+        self.assertEqual(len(updates), 1)
+
+        self.assertEqual(item.tracking_info.count(), n_tracking + 1)
+
+        item = StockItem.objects.get(pk=2)
+        self.assertEqual(item.quantity, 50)
+        self.assertEqual(item.location, self.drawer1)
+
+        track = item.tracking_info.latest('id')
+        self.assertEqual(track.tracking_type, StockHistoryCode.STOCK_UPDATE)
+        self.assertEqual(track.deltas['quantity'], 50)
+        self.assertEqual(track.deltas['location'], self.drawer1.pk)
+
+        # Structural locations are not allowed
+        self.office.structural = True
+        self.office.save()
+
+        with self.assertRaises(ValidationError):
+            item.fast_update(None, location=self.office)
+
+    def test_bulk_adjustment(self):
+        """Test that stock adjustments can be applied in bulk."""
+        from stock.adjustment import StockAdjustment
+
+        counted = StockItem.objects.get(pk=2)
+        added = StockItem.objects.get(pk=1234)
+        moved = StockItem.objects.get(pk=100)
+
+        n_tracking = StockItemTracking.objects.count()
+        q_added = added.quantity
+        old_location = moved.location_id
+
+        adjustment = StockAdjustment(self.user, notes='Bulk adjustment')
+        adjustment.count(counted, 100)
+        adjustment.add(added, 10, batch='B-123')
+        adjustment.remove(added, 4)
+        adjustment.move(moved, self.diningroom)
+
+        # Invalid quantities are ignored
+        adjustment.add(moved, -5)
+
+        with (
+            CaptureQueriesContext(connection) as queries,
+            mock.patch('stock.adjustment.trigger_event') as trigger,
+        ):
+            self.assertEqual(adjustment.commit(), 4)
+
+        # A single UPDATE query is used for each distinct set of values
+        updates = [
+            q['sql']
+            for q in queries.captured_queries
+            if q['sql'].startswith('UPDATE') and 'stock_stockitem"' in q['sql']
+        ]
+
+        self.assertEqual(len(updates), 3)
+
+        # Tracking entries are created with a single query
+        inserts = [
+            q['sql']
+            for q in queries.captured_queries
+            if q['sql'].startswith('INSERT') and 'stock_stockitemtracking"' in q['sql']
+        ]
+
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(StockItemTracking.objects.count(), n_tracking + 4)
+
+        counted.refresh_from_db()
+        self.assertEqual(counted.quantity, 100)
+        self.assertEqual(counted.stocktake_user, self.user)
+
+        added.refresh_from_db()
+        self.assertEqual(added.quantity, q_added + 6)
+        self.assertEqual(added.batch, 'B-123')
+
+        track = added.tracking_info.latest('id')
+        self.assertEqual(track.tracking_type, StockHistoryCode.STOCK_REMOVE)
+        self.assertEqual(track.deltas['removed'], 4)
+        self.assertEqual(track.notes, 'Bulk adjustment')
+
+        moved.refresh_from_db()
+        self.assertEqual(moved.location, self.diningroom)
+
+        # Per-item events are triggered alongside the consolidated events
+        events = [call.args[0] for call in trigger.call_args_list]
+
+        self.assertIn(StockEvents.ITEMS_MOVED, events)
+        self.assertEqual(events.count(StockEvents.ITEM_MOVED), 1)
+        self.assertEqual(events.count(StockEvents.ITEM_COUNTED), 1)
+        self.assertEqual(events.count(StockEvents.ITEM_QUANTITY_UPDATED), 2)
+
+        trigger.assert_any_call(
+            StockEvents.ITEM_MOVED,
+            id=moved.pk,
+            old_location=old_location,
+            new_location=self.diningroom.pk,
+            quantity=float(moved.quantity),
+        )
+
+        # Batch codes are validated before any changes are written
+        adjustment = StockAdjustment(self.user)
+        adjustment.add(added, 10, batch='BAD')
+
+        with (
+            mock.patch.object(
+                StockItem,
+                'validate_batch_code',
+                side_effect=ValidationError({'batch': 'Invalid batch code'}),
+            ),
+            self.assertRaises(ValidationError),
+        ):
+            adjustment.commit()
+
+        added.refresh_from_db()
+        self.assertEqual(added.quantity, q_added + 6)
+        self.assertEqual(added.batch, 'B-123')
+
     def test_serials(self):
         """Tests for stock serialization."""
         p = Part.objects.create(
@@ -933,6 +1207,48 @@ class VariantTest(StockTestBase):
         item.serial = int(n) + 2
         item.save()
 
+    def test_serial_number_batch(self):
+        """Test batch validation and reservation of serial numbers."""
+        from stock.serial_numbers import (
+            find_existing_serial_numbers,
+            generate_serial_numbers,
+        )
+
+        InvenTreeSetting.set_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False, self.user)
+
+        chair = Part.objects.get(pk=10000)
+        variant = Part.objects.get(pk=10003)
+
+        serials = [str(x) for x in range(1, 1200)]
+
+        # Existing serial numbers are found (across the variant tree) with a fixed number of queries
+        with CaptureQueriesContext(connection) as ctx:
+            existing = find_existing_serial_numbers(variant, serials)
+
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+        self.assertEqual(
+            existing, {'1', '2', '3', '4', '5', '10', '11', '12', '20', '21', '22'}
+        )
+
+        # Generate a range of serial numbers following the latest serial number
+        self.assertEqual(chair.get_next_serial_number(), '23')
+
+        serials = generate_serial_numbers(
+            chair, 3, start=chair.get_latest_serial_number()
+        )
+        self.assertEqual(serials, ['23', '24', '25'])
+
+        items = StockItem._create_serial_numbers(serials, part=chair)
+        self.assertEqual(items.count(), 3)
+
+        self.assertEqual(variant.get_next_serial_number(), '26')
+
+        # Creating the same serial numbers again should fail
+        with self.assertRaises(ValidationError):
+            StockItem._create_serial_numbers(['24', '30'], part=variant)
+
+        self.assertFalse(StockItem.objects.filter(serial='30').exists())
+
 
 class StockLocationTreeTest(StockTestBase):
     """Unit test for the StockLocation tree structure."""
@@ -1263,6 +1579,38 @@ class StockTreeTest(StockTestBase):
         self.assertEqual(item.get_children().count(), 12)
         self.assertEqual(item.get_descendants(include_self=True).count(), 13)
 
+    def test_deferred_tree_rebuild(self):
+        """Test that tree rebuilds can be deferred for bulk operations."""
+        part = Part.objects.create(name='My part', description='My part description')
+        item = StockItem.objects.create(part=part, quantity=1000)
+
+        # Note: The patch must remain active while the on_commit callbacks are executed
+        with (
+            mock.patch(
+                'Tracklet.tree.rebuild_trees', wraps=Tracklet.tree.rebuild_trees
+            ) as rebuild,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            with Tracklet.tree.deferred_tree_rebuild():
+                for _idx in range(5):
+                    item.splitStock(10)
+
+                self.assertTrue(Tracklet.tree.is_rebuild_deferred())
+                rebuild.assert_not_called()
+
+        # Each dirty tree is rebuilt exactly once
+        rebuild.assert_called_once_with('stock.StockItem', [item.tree_id])
+        self.assertFalse(Tracklet.tree.is_rebuild_deferred())
+
+        item.refresh_from_db()
+
+        self.assertEqual(item.get_children().count(), 5)
+        self.assertEqual(item.get_descendants(include_self=True).count(), 6)
+
+        for child in item.get_children():
+            self.assertGreater(child.lft, item.lft)
+            self.assertLess(child.rght, item.rght)
+
     def test_serialize(self):
         """Test that StockItem serialization maintains tree structure."""
         part = Part.objects.create(
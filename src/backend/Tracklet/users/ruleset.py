@@ -118,6 +118,7 @@ def get_ruleset_models() -> dict:
         RuleSetEnum.STOCK: [
             'stock_stockitem',
             'stock_stockitemtracking',
+            'stock_stockitemtrackingarchive',
             'stock_stockitemtestresult',
         ],
         RuleSetEnum.BUILD: [
@@ -198,6 +199,8 @@ def get_ruleset_ignore() -> list[str]:
         'common_inventreecustomuserstatemodel',
         'common_selectionlistentry',
         'common_selectionlist',
+        'common_searchindexentry',
+        'common_barcodeindexentry',
         'users_owner',
         'users_userprofile',  # User profile is handled in the serializer - only own user can change
         # Third-party tables
@@ -112,7 +112,8 @@ export default function SystemSettings() {
               'BARCODE_SHOW_TEXT',
               'BARCODE_GENERATION_PLUGIN',
               'BARCODE_STORE_RESULTS',
-              'BARCODE_RESULTS_MAX_NUM'
+              'BARCODE_RESULTS_MAX_NUM',
+              'BARCODE_RESULTS_DELETE_DAYS'
             ]}
           />
         )
@@ -270,7 +271,8 @@ export default function SystemSettings() {
               heading={t`Stock Tracking`}
               keys={[
                 'STOCK_TRACKING_DELETE_OLD_ENTRIES',
-                'STOCK_TRACKING_DELETE_DAYS'
+                'STOCK_TRACKING_DELETE_DAYS',
+                'STOCK_TRACKING_ARCHIVE_OLD_ENTRIES'
               ]}
             />
           </Stack>
@@ -293,6 +293,7 @@ export function StockTrackingTable({
       props={{
         params: {
           item: itemId,
+          include_inherited: itemId ? true : undefined,
           part: partId,
           part_detail: partId ? true : undefined,
           item_detail: partId ? true : undefined,